@@ -21,6 +21,7 @@ from typing import Any, Dict, TYPE_CHECKING
 from virtual_diary import load_entries
 from config import Config, get_emoji_weights
 from hook_manager import HookManager
+from proposal_tally import USER_FIELDS as TALLY_USER_FIELDS, ProposalTally
 
 if TYPE_CHECKING:
     from superNova_2177 import (
@@ -58,7 +59,7 @@ except Exception:  # pragma: no cover - graceful fallback
 
 # Provide a minimal fallback implementation of ``LogChain`` if the real
 # class is unavailable at runtime. Tests only require ``add``,
-# ``replay_events``, ``verify`` and ``entries`` attributes.
+# ``replay_events``, ``verify``, ``sync`` and ``len()`` support.
 try:  # pragma: no cover - prefer real implementation when present
     LogChain  # type: ignore[name-defined]
 except Exception:  # pragma: no cover - lightweight stub for tests
@@ -73,11 +74,25 @@ except Exception:  # pragma: no cover - lightweight stub for tests
         def add(self, event: Dict[str, Any]) -> None:
             self.entries.append(event)
 
-        def replay_events(self, handler: Any, since: Any = None) -> None:
-            for event in self.entries:
+        def __len__(self) -> int:
+            return len(self.entries)
+
+        @property
+        def position(self) -> tuple[int, str]:
+            return len(self.entries), ""
+
+        def replay_events(
+            self, handler: Any, since: Any = None, *, after: Any = None
+        ) -> None:
+            for event in self.entries[after or 0:]:
                 handler(event)
 
-        def verify(self) -> bool:
+        def sync(self) -> None:
+            pass
+
+        def verify(
+            self, since: Any = None, *, after: Any = None, head: Any = None
+        ) -> bool:
             return True
 
 
@@ -123,6 +138,8 @@ class RemixAgent:
             filename = os.environ.get("LOGCHAIN_FILE", "remix_logchain.log")
         if snapshot is None:
             snapshot = os.environ.get("SNAPSHOT_FILE", "remix_snapshot.json")
+        filename = os.path.join(self.config.DATA_DIR, filename)
+        snapshot = os.path.join(self.config.DATA_DIR, snapshot)
         self.logchain = LogChain(filename)
         self.storage = (
             SQLAlchemyStorage(SessionLocal)
@@ -134,6 +151,9 @@ class RemixAgent:
         self.lock = threading.RLock()
         self.snapshot = snapshot
         self.hooks = HookManager()
+        self.tally = ProposalTally(
+            self.config.SPECIES, self.config.GENESIS_BONUS_DECAY_YEARS
+        )
         # Track awarded fork badges for users
         self.fork_badges: Dict[str, list[str]] = {}
         # Register hook for cross remix creation events
@@ -167,10 +187,14 @@ class RemixAgent:
 
     def load_state(self) -> None:
         snapshot_timestamp = None
+        log_seq = log_hash = None
         if os.path.exists(self.snapshot):
             with open(self.snapshot, "r") as f:
                 data = json.load(f)
-            snapshot_timestamp = data.get("timestamp")
+            log_seq, log_hash = data.get("log_seq"), data.get("log_hash")
+            if log_seq is None:
+                # Snapshots written before log positions were recorded
+                snapshot_timestamp = data.get("timestamp")
             self.treasury = Decimal(data.get("treasury", "0"))
             self.total_system_karma = Decimal(data.get("total_system_karma", "0"))
             for u in data.get("users", []):
@@ -181,10 +205,12 @@ class RemixAgent:
                 self.storage.set_proposal(p["proposal_id"], p)
             for l in data.get("marketplace_listings", []):
                 self.storage.set_marketplace_listing(l["listing_id"], l)
-        self.logchain.replay_events(self._apply_event, snapshot_timestamp)
-        self.event_count = len(self.logchain.entries)
-        if not self.logchain.verify():
+        # Only events appended after the snapshot's log position are replayed
+        # and verified; earlier history is already reflected in its state.
+        if not self.logchain.verify(snapshot_timestamp, after=log_seq, head=log_hash):
             raise ValueError("Logchain verification failed.")
+        self.logchain.replay_events(self._apply_event, snapshot_timestamp, after=log_seq)
+        self.event_count = len(self.logchain)
 
     def save_snapshot(self) -> None:
         with self.lock:
@@ -205,6 +231,11 @@ class RemixAgent:
                 ],
                 "timestamp": ts(),
             }
+            # The log position is the replay cutoff, so every event before
+            # it must be durable first.
+            data["log_seq"], data["log_hash"] = self.logchain.position
+            self.logchain.sync()
+            os.makedirs(os.path.dirname(os.path.abspath(self.snapshot)), exist_ok=True)
             with open(self.snapshot, "w") as f:
                 json.dump(data, f, default=str)
 
@@ -507,6 +538,7 @@ class RemixAgent:
                     stored_user["action_timestamps"] = {}
                     self.storage.set_user(username, stored_user)
                 self._update_total_karma(user.effective_karma())
+                self._reindex_user(username)
                 logging.info(
                     f"User {username} added successfully with root coin {user.root_coin_id}"
                 )
@@ -753,6 +785,7 @@ class RemixAgent:
             return
         proposal["votes"][event["voter"]] = event["vote"]
         self.storage.set_proposal(event["proposal_id"], proposal)
+        self.tally.record_vote(event["proposal_id"], event["voter"], event["vote"])
 
     def _get_dynamic_threshold(
         self, total_voters: int, is_constitutional: bool, avg_yes: Decimal
@@ -851,6 +884,7 @@ class RemixAgent:
         with user_obj.lock:
             user_obj.revoke_consent()
             self.storage.set_user(user, user_obj.to_dict())
+        self._reindex_user(user)
 
     def _apply_FORK_UNIVERSE(self, event: ForkUniversePayload) -> None:
         # Forking handled by CosmicNexus for unified governance
@@ -902,89 +936,69 @@ class RemixAgent:
             )
 
     def _apply_DAILY_DECAY(self, event: ApplyDailyDecayPayload) -> None:
-        users = self.storage.get_all_users()
-        for u in users:
-            user_obj = User.from_dict(u, self.config)
-            with user_obj.lock:
-                user_obj.karma *= self.config.DAILY_DECAY
-                if user_obj.is_genesis:
-                    # Apply genesis bonus decay
-                    join_time = datetime.datetime.fromisoformat(
-                        u["join_time"].replace("Z", "+00:00")
-                    )
-                    decay_factor = calculate_genesis_bonus_decay(
-                        join_time, self.config.GENESIS_BONUS_DECAY_YEARS
-                    )
-                    user_obj.karma *= decay_factor
-                self.storage.set_user(u["name"], user_obj.to_dict())
+        # Column-wise pass: no per-user objects or locks, one batched write
+        with self.storage.transaction():
+            names, cols = self.storage.get_user_columns(
+                ["karma", "is_genesis", "join_time"]
+            )
+            daily = self.config.DAILY_DECAY
+            karma = [
+                Decimal(str(k if k is not None else "0")) * daily
+                for k in cols["karma"]
+            ]
+            genesis = [i for i, g in enumerate(cols["is_genesis"]) if g]
+            factors = calculate_genesis_bonus_decay_many(
+                [cols["join_time"][i] for i in genesis],
+                self.config.GENESIS_BONUS_DECAY_YEARS,
+            )
+            for i, factor in zip(genesis, factors):
+                karma[i] *= factor
+            self.storage.update_user_fields(
+                "karma", {name: str(k) for name, k in zip(names, karma)}
+            )
+        self.tally.refresh_decay()
+
+    def _build_tally(self, as_of: Any = None) -> ProposalTally:
+        tally = ProposalTally(self.config.SPECIES, self.config.GENESIS_BONUS_DECAY_YEARS)
+        names, cols = self.storage.get_user_columns(TALLY_USER_FIELDS)
+        tally.rebuild(names, cols, as_of=as_of)
+        return tally
+
+    def _reindex_user(self, username: str) -> None:
+        """Refresh ``username``'s tally weight after harmony or consent changes."""
+        data = self.storage.get_user(username)
+        if data is None:
+            self.tally.remove_user(username)
+        else:
+            self.tally.upsert_user(username, data)
 
     def _tally_proposal(self, proposal_id: str) -> Dict[str, Decimal]:
         """
         Tally votes for a proposal using tri-species harmony model.
         Weights votes by Harmony Score, adjusted for genesis decay.
         Returns {'yes': fraction, 'no': fraction, 'quorum': fraction}.
+
+        Served from the running accumulators in :attr:`tally`; with
+        ``Config.TALLY_VERIFY`` set, the result is checked against a full
+        storage rescan and the index is replaced if they disagree.
         """
         proposal_data = self.storage.get_proposal(proposal_id)
         if not proposal_data:
             raise VoteError("Proposal not found.")
-        proposal = proposal_data
-        users_data = self.storage.get_all_users()
-        total_harmony = Decimal("0")
-        for u in users_data:
-            harmony_score = safe_decimal(u["harmony_score"])
-            is_genesis = u["is_genesis"]
-            join_time = datetime.datetime.fromisoformat(
-                u["join_time"].replace("Z", "+00:00")
-            )
-            decay = (
-                calculate_genesis_bonus_decay(
-                    join_time, self.config.GENESIS_BONUS_DECAY_YEARS
-                )
-                if is_genesis
-                else Decimal("1")
-            )
-            total_harmony += harmony_score * decay
-        species_votes = {
-            s: {"yes": Decimal("0"), "no": Decimal("0"), "total": Decimal("0")}
-            for s in self.config.SPECIES
-        }
-        voted_harmony = Decimal("0")
-        for voter, vote in proposal["votes"].items():
-            user_data = next((ud for ud in users_data if ud["name"] == voter), None)
-            if user_data and user_data["consent"]:
-                harmony_score = safe_decimal(user_data["harmony_score"])
-                is_genesis = user_data["is_genesis"]
-                join_time = datetime.datetime.fromisoformat(
-                    user_data["join_time"].replace("Z", "+00:00")
-                )
-                decay = (
-                    calculate_genesis_bonus_decay(
-                        join_time, self.config.GENESIS_BONUS_DECAY_YEARS
-                    )
-                    if is_genesis
-                    else Decimal("1")
-                )
-                weight = harmony_score * decay
-                s = user_data["species"]
-                species_votes[s][vote] += weight
-                species_votes[s]["total"] += weight
-                voted_harmony += weight
-        active_species = [s for s, v in species_votes.items() if v["total"] > 0]
-        if not active_species:
-            return {"yes": Decimal("0"), "no": Decimal("0"), "quorum": Decimal("0")}
-        species_weight = Decimal("1") / len(active_species)
-        final_yes = sum(
-            (sv["yes"] / sv["total"]) * species_weight
-            for s, sv in species_votes.items()
-            if sv["total"] > 0
-        )
-        final_no = sum(
-            (sv["no"] / sv["total"]) * species_weight
-            for s, sv in species_votes.items()
-            if sv["total"] > 0
-        )
-        quorum = voted_harmony / total_harmony if total_harmony > 0 else Decimal("0")
-        return {"yes": final_yes, "no": final_no, "quorum": quorum}
+        votes = proposal_data["votes"]
+        if not self.tally.ready:
+            self.tally = self._build_tally()
+        if not self.tally.tracks(proposal_id):
+            self.tally.load_votes(proposal_id, votes)
+        if getattr(self.config, "TALLY_VERIFY", False):
+            fresh = self._build_tally(as_of=self.tally.as_of)
+            fresh.load_votes(proposal_id, votes)
+            expected = fresh.tally(proposal_id)
+            if not self.tally.verify(proposal_id, expected):
+                logging.warning("Rebuilt proposal tally index after drift")
+                self.tally = fresh
+                return expected
+        return self.tally.tally(proposal_id)
 
     def _process_proposal_lifecycle(self) -> None:
         """
@@ -1044,6 +1058,7 @@ class RemixAgent:
                 if proposal["status"] == "rejected":
                     proposal["status"] = "closed"
                 self.storage.set_proposal(proposal["proposal_id"], proposal)
+                self.tally.discard(proposal["proposal_id"])
                 logging.info(
                     f"Processed proposal {proposal['proposal_id']} "
                     f"to status {proposal['status']} with threshold {dynamic_threshold}"
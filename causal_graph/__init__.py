@@ -114,6 +114,8 @@ except Exception:  # pragma: no cover - optional dependency
 
 from scientific_utils import ScientificModel, VerifiedScientificModel
 
+from .influence import InfluenceEngine
+
 
 class CausalGraph:
     """Wrapper around :class:`networkx.DiGraph` with time weighted edges."""
@@ -311,25 +313,34 @@ class CausalGraph:
     def query_influence(self, source: Any, target: Any) -> float:
         """Compute influence probability from ``source`` to ``target``.
 
-        The method enumerates all simple directed paths between ``source`` and
-        ``target`` and returns the maximum product of edge weights along any
-        path. If no path exists the return value is ``0.0``.
+        Returns the maximum product of edge weights along any simple directed
+        path, or ``0.0`` if no path exists.
 
         Notes
         -----
-        Enumerating all simple paths has worst-case exponential complexity in
-        the number of nodes between ``source`` and ``target``.
+        Answered by :class:`~causal_graph.influence.InfluenceEngine`, a
+        Dijkstra search on ``-log(w)`` that runs in ``O(E log V)`` for
+        weights in ``[0, 1]``.
         """
         if not self.has_path(source, target):
             return 0.0
-        paths = self.all_simple_paths(source, target)
-        strengths = []
-        for p in paths:
-            w = 1.0
-            for u, v in zip(p[:-1], p[1:]):
-                w *= self.graph[u][v].get("weight", 1.0)
-            strengths.append(w)
-        return max(strengths) if strengths else 0.0
+        return self.influence_engine().influence(source, target)
+
+    def influence_engine(self) -> InfluenceEngine:
+        """Return an :class:`InfluenceEngine` over the current edges.
+
+        Build one engine and reuse it when issuing many queries against an
+        unchanged graph.
+        """
+        return InfluenceEngine(self.graph)
+
+    def query_influence_from(self, source: Any) -> Dict[Any, float]:
+        """Strongest-path influence from ``source`` to every reachable node."""
+        return self.influence_engine().influence_from(source)
+
+    def top_influenced(self, source: Any, k: int) -> List[tuple]:
+        """Return the ``k`` most influenced ``(node, strength)`` pairs."""
+        return self.influence_engine().top_k(source, k)
 
 
 def build_causal_graph(db) -> "InfluenceGraph":
@@ -496,9 +507,18 @@ class InfluenceGraph(CausalGraph):
 
         return results
 
-    def snapshot_graph(self, db_session, key_prefix: str = "graph_snapshot") -> str:
-        """Serialize the graph and store it in ``SystemState``."""
+    def snapshot_graph(
+        self,
+        db_session,
+        key_prefix: str = "graph_snapshot",
+        extra: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Serialize the graph and store it in ``SystemState``.
+
+        ``extra`` entries are stored alongside ``nodes`` and ``edges``.
+        """
         snapshot = {
+            **(extra or {}),
             "timestamp": datetime.utcnow().isoformat(),
             "nodes": [
                 {"id": n, **(self.graph.nodes.get(n, {}))} for n in self.graph.nodes
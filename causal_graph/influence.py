@@ -0,0 +1,243 @@
+"""Polynomial-time max-product influence queries.
+
+For edge weights in ``[0, 1]`` the strongest path (maximum product of
+weights) is the shortest path under ``-log(w)``.  :class:`InfluenceEngine`
+runs Dijkstra directly in product space: extending a path never increases
+its product, so the first time a node is popped from the max-heap its
+strength is final.  Products are accumulated left to right along the path,
+exactly as the old simple-path enumeration multiplied them.
+
+Graphs carrying weights outside ``[0, 1]`` (e.g. inhibitory edges stored as
+negative weights) do not satisfy that monotonicity; for those the engine
+falls back to enumerating simple paths.
+
+Path counts feed only the heuristic confidence score, so
+:meth:`InfluenceEngine.count_paths` stops at a cap and bounds its search by
+an expansion budget, restricted to nodes that can still reach the target.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("superNova_2177.influence")
+
+
+class Config:
+    # Paths counted before the confidence estimate saturates
+    PATH_COUNT_CAP = 1000
+    # DFS node expansions allowed per counted path
+    PATH_COUNT_BUDGET_FACTOR = 50
+
+
+class InfluenceEngine:
+    """Snapshot of a weighted digraph answering max-product path queries."""
+
+    def __init__(self, graph: Any) -> None:
+        self._adj: Dict[Any, List[Tuple[Any, float]]] = {}
+        self.monotone = True
+        for node in graph.nodes:
+            nbrs = []
+            for v, data in graph[node].items():
+                w = data.get("weight", 1.0)
+                if not 0.0 <= w <= 1.0:
+                    self.monotone = False
+                nbrs.append((v, w))
+            self._adj[node] = nbrs
+
+    def __contains__(self, node: Any) -> bool:
+        return node in self._adj
+
+    def perturbed(self, factor: Callable[[], float]) -> "InfluenceEngine":
+        """Copy with each weight scaled by ``factor()`` and capped at ``1``."""
+        clone = InfluenceEngine.__new__(InfluenceEngine)
+        clone._adj = {
+            u: [(v, min(1.0, w * factor())) for v, w in nbrs]
+            for u, nbrs in self._adj.items()
+        }
+        clone.monotone = all(
+            w >= 0.0 for nbrs in clone._adj.values() for _, w in nbrs
+        )
+        return clone
+
+    # ------------------------------------------------------------------
+    # Strongest paths
+    def _search(
+        self, source: Any, target: Any = None, limit: Optional[int] = None
+    ) -> Tuple[Dict[Any, float], Dict[Any, Any], List[Any]]:
+        """Dijkstra from ``source``; returns strengths, parents, pop order."""
+        best: Dict[Any, float] = {source: 1.0}
+        parent: Dict[Any, Any] = {source: None}
+        done = set()
+        order: List[Any] = []
+        tie = itertools.count()
+        heap = [(-1.0, next(tie), source)]
+        while heap:
+            neg, _, node = heapq.heappop(heap)
+            if node in done:
+                continue
+            done.add(node)
+            if node != source:
+                order.append(node)
+                if node == target or (limit is not None and len(order) >= limit):
+                    break
+            strength = -neg
+            for v, w in self._adj.get(node, ()):
+                if v in done or w <= 0.0:
+                    continue
+                cand = strength * w
+                if cand > best.get(v, 0.0):
+                    best[v] = cand
+                    parent[v] = node
+                    heapq.heappush(heap, (-cand, next(tie), v))
+        return {n: best[n] for n in order}, parent, order
+
+    def strongest_path(self, source: Any, target: Any) -> Tuple[float, List[Any]]:
+        """Return ``(strength, path)`` of the strongest ``source``->``target`` path.
+
+        ``source == target`` and unreachable targets give ``(0.0, [])``,
+        matching the simple-path definition (no non-trivial simple path).
+        """
+        if source == target or source not in self._adj:
+            return 0.0, []
+        if not self.monotone:
+            return self._enumerate(source, target)
+        strengths, parent, _ = self._search(source, target)
+        if target not in strengths:
+            return 0.0, []
+        path = [target]
+        while path[-1] != source:
+            path.append(parent[path[-1]])
+        path.reverse()
+        # Recompute in path order so the value matches a left-to-right product
+        value = 1.0
+        for u, v in zip(path[:-1], path[1:]):
+            value *= self._weight(u, v)
+        return value, path
+
+    def influence(self, source: Any, target: Any) -> float:
+        return self.strongest_path(source, target)[0]
+
+    def influence_from(self, source: Any) -> Dict[Any, float]:
+        """Strongest-path strength from ``source`` to every reachable node."""
+        if source not in self._adj:
+            return {}
+        if not self.monotone:
+            return {
+                t: p
+                for t in self._adj
+                if t != source and (p := self._enumerate(source, t)[0]) != 0.0
+            }
+        return self._search(source)[0]
+
+    def top_k(self, source: Any, k: int) -> List[Tuple[Any, float]]:
+        """The ``k`` nodes ``source`` influences most, strongest first."""
+        if k <= 0 or source not in self._adj:
+            return []
+        if not self.monotone:
+            ranked = sorted(self.influence_from(source).items(), key=lambda kv: -kv[1])
+            return ranked[:k]
+        strengths, _, order = self._search(source, limit=k)
+        return [(n, strengths[n]) for n in order]
+
+    def _weight(self, u: Any, v: Any) -> float:
+        for nbr, w in self._adj.get(u, ()):
+            if nbr == v:
+                return w
+        return 0.0
+
+    def _enumerate(self, source: Any, target: Any) -> Tuple[float, List[Any]]:
+        """Exhaustive fallback for weights outside ``[0, 1]``."""
+        logger.debug("Non-probabilistic weights; enumerating simple paths")
+        best: Optional[float] = None
+        best_path: List[Any] = []
+        for path in self._simple_paths(source, target):
+            value = 1.0
+            for u, v in zip(path[:-1], path[1:]):
+                value *= self._weight(u, v)
+            if best is None or value > best:
+                best, best_path = value, path
+        return (best if best is not None else 0.0), best_path
+
+    def _simple_paths(self, source: Any, target: Any) -> Iterable[List[Any]]:
+        path = [source]
+        visited = {source}
+        stack = [iter(self._adj.get(source, ()))]
+        while stack:
+            for v, _ in stack[-1]:
+                if v in visited:
+                    continue
+                if v == target:
+                    yield path + [v]
+                    continue
+                path.append(v)
+                visited.add(v)
+                stack.append(iter(self._adj.get(v, ())))
+                break
+            else:
+                stack.pop()
+                visited.discard(path.pop())
+
+    # ------------------------------------------------------------------
+    # Confidence support
+    def _reaching(self, target: Any) -> set:
+        reverse: Dict[Any, List[Any]] = {}
+        for u, nbrs in self._adj.items():
+            for v, _ in nbrs:
+                reverse.setdefault(v, []).append(u)
+        seen = {target}
+        stack = [target]
+        while stack:
+            for u in reverse.get(stack.pop(), ()):
+                if u not in seen:
+                    seen.add(u)
+                    stack.append(u)
+        return seen
+
+    def count_paths(
+        self, source: Any, target: Any, cap: int = Config.PATH_COUNT_CAP
+    ) -> Tuple[int, bool]:
+        """Count simple paths up to ``cap``; returns ``(count, exact)``.
+
+        The DFS only enters nodes that can reach ``target`` and gives up after
+        ``cap * PATH_COUNT_BUDGET_FACTOR`` expansions, so ``exact`` is
+        ``False`` whenever the count is a lower bound.
+        """
+        if source == target or source not in self._adj or target not in self._adj:
+            return 0, True
+        allowed = self._reaching(target)
+        if source not in allowed:
+            return 0, True
+        budget = cap * Config.PATH_COUNT_BUDGET_FACTOR
+        count = 0
+        path = [source]
+        visited = {source}
+        stack = [iter(self._adj.get(source, ()))]
+        while stack:
+            for v, _ in stack[-1]:
+                if v in visited or v not in allowed:
+                    continue
+                if v == target:
+                    count += 1
+                    if count >= cap:
+                        return count, False
+                    continue
+                budget -= 1
+                if budget <= 0:
+                    return count, False
+                path.append(v)
+                visited.add(v)
+                stack.append(iter(self._adj.get(v, ())))
+                break
+            else:
+                stack.pop()
+                visited.discard(path.pop())
+        return count, True
+
+
+def path_count_confidence(count: int) -> float:
+    """Heuristic confidence ``1 - 1/(count + 1)`` used by influence queries."""
+    return max(0.0, min(1.0, 1.0 - 1.0 / (count + 1)))
@@ -0,0 +1,440 @@
+"""Process-wide incremental influence graph.
+
+:class:`InfluenceGraphService` builds the follow/like/remix
+:class:`~causal_graph.InfluenceGraph` once with column-only queries and then
+keeps it current from ``hooks.events`` notifications published on
+:data:`hooks.bus.content_hooks` by the follow, like and remix endpoints.  Every
+mutation bumps :attr:`InfluenceGraphService.version`; readers receive a copy
+taken at the current version, so a query never observes a half-applied
+update and the copy is shared until the next mutation.
+
+Each follow, like and remix row the graph reflects is tracked by its key
+(follower/followed pair, liker/VibeNode pair, remix VibeNode id).  Events for
+rows that are already reflected, or already gone, are ignored, so an event
+that arrives after a rebuild has picked up its row is not applied twice.
+
+Staleness is detected with an aggregate fingerprint (user count, highest user
+id and the follow, like and remix row counts), checked at most every
+``Config.REVALIDATE_SECONDS``.  Events adjust the tracked fingerprint as they
+are applied; when the database disagrees the service adds newly registered
+users by id range or, for any other drift (e.g. rows written without an
+event), rebuilds.  Checkpoints are written with
+:meth:`InfluenceGraph.snapshot_graph` on a background thread, from a copy of
+the graph, so a restarted process restores the latest one whose fingerprint
+still matches instead of rescanning every table.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, aliased
+
+from hook_manager import HookManager
+from hooks import events
+from hooks.bus import content_hooks
+
+from . import InfluenceGraph, build_causal_graph
+
+logger = logging.getLogger("superNova_2177.influence_graph")
+
+
+class Config:
+    # Seconds between fingerprint checks against the database (0 = every read)
+    REVALIDATE_SECONDS = 30.0
+    # Mutations between checkpoints written to ``SystemState``
+    CHECKPOINT_EVERY = 500
+    # Checkpoints retained; older keys are pruned after each write
+    CHECKPOINT_KEEP = 2
+    CHECKPOINT_PREFIX = "influence_graph_checkpoint"
+
+
+# Later entries win when several interaction types share an edge, matching
+# the insertion order of :func:`build_causal_graph`.
+EDGE_PRECEDENCE = ("follow", "like", "remix")
+FINGERPRINT_FIELDS = ("users", "max_user_id", "follows", "likes", "remixes")
+
+
+def _bind_url(bind: Any) -> str:
+    return str(getattr(bind, "url", bind))
+
+
+class InfluenceGraphService:
+    """Incrementally maintained influence graph with versioned snapshots."""
+
+    def __init__(self, hooks: Optional[HookManager] = None) -> None:
+        self.lock = threading.RLock()
+        self.version = 0
+        self.fingerprint: Optional[Dict[str, int]] = None
+        self._graph: Optional[InfluenceGraph] = None
+        # (source, target) -> {edge_type: interaction count}
+        self._interactions: Dict[Tuple[Any, Any], Dict[str, int]] = {}
+        # Fingerprint field -> keys of the rows reflected in the graph
+        self._rows: Dict[str, Set[Any]] = {f: set() for f in FINGERPRINT_FIELDS[2:]}
+        self._snapshot: Optional[InfluenceGraph] = None
+        self._snapshot_version = -1
+        self._bind: Any = None
+        self._url: Optional[str] = None
+        self._checked_at = 0.0
+        self._checkpoint_version = 0
+        self._checkpointer: Optional[threading.Thread] = None
+        self.rebuilds = 0
+        hooks = hooks if hooks is not None else content_hooks
+        hooks.register_hook(events.USER_FOLLOWED, self.on_follow)
+        hooks.register_hook(events.USER_UNFOLLOWED, self.on_unfollow)
+        hooks.register_hook(events.VIBENODE_LIKED, self.on_like)
+        hooks.register_hook(events.VIBENODE_UNLIKED, self.on_unlike)
+        hooks.register_hook(events.VIBENODE_REMIXED, self.on_remix)
+
+    # ------------------------------------------------------------------
+    # Database access
+    @staticmethod
+    def _fetch_fingerprint(db: Any) -> Dict[str, int]:
+        from db_models import Harmonizer, VibeNode, harmonizer_follows, vibenode_likes
+
+        row = db.execute(
+            select(
+                select(func.count()).select_from(Harmonizer).scalar_subquery(),
+                select(func.max(Harmonizer.id)).scalar_subquery(),
+                select(func.count()).select_from(harmonizer_follows).scalar_subquery(),
+                select(func.count()).select_from(vibenode_likes).scalar_subquery(),
+                select(func.count())
+                .select_from(VibeNode)
+                .where(VibeNode.parent_vibenode_id.isnot(None))
+                .scalar_subquery(),
+            )
+        ).one()
+        return {k: int(v or 0) for k, v in zip(FINGERPRINT_FIELDS, row)}
+
+    def _build(self, db: Any) -> None:
+        """Full rebuild from column-only queries."""
+        from db_models import Harmonizer, VibeNode, harmonizer_follows, vibenode_likes
+
+        fingerprint = self._fetch_fingerprint(db)
+        child = aliased(VibeNode)
+        parent = aliased(VibeNode)
+        graph = InfluenceGraph()
+        self._graph = graph
+        self._interactions = {}
+        rows = self._rows = {f: set() for f in FINGERPRINT_FIELDS[2:]}
+        for (uid,) in db.execute(select(Harmonizer.id)):
+            graph.add_node(uid)
+        for u, v in db.execute(
+            select(harmonizer_follows.c.follower_id, harmonizer_follows.c.followed_id)
+        ):
+            rows["follows"].add((u, v))
+            self._add(u, v, "follow")
+        for u, node_id, v in db.execute(
+            select(
+                vibenode_likes.c.harmonizer_id, vibenode_likes.c.vibenode_id, VibeNode.author_id
+            ).join(VibeNode, VibeNode.id == vibenode_likes.c.vibenode_id)
+        ):
+            rows["likes"].add((u, node_id))
+            self._add(u, v, "like")
+        for node_id, u, v in db.execute(
+            select(child.id, child.author_id, parent.author_id).join(
+                parent, child.parent_vibenode_id == parent.id
+            )
+        ):
+            rows["remixes"].add(node_id)
+            self._add(u, v, "remix")
+        # Counts the graph was built against; a concurrent write is caught
+        # on the next revalidation.
+        self.fingerprint = fingerprint
+        self.rebuilds += 1
+        self._bump()
+        logger.info(
+            "Influence graph rebuilt: %d nodes, %d edges",
+            graph.graph.number_of_nodes(),
+            graph.graph.number_of_edges(),
+        )
+
+    def _add_new_users(self, db: Any, current: Dict[str, int]) -> bool:
+        """Index users registered since the last check; ``False`` on drift."""
+        from db_models import Harmonizer
+
+        tracked = self.fingerprint or {}
+        if any(current[k] != tracked.get(k) for k in ("follows", "likes", "remixes")):
+            return False
+        new_ids = db.execute(
+            select(Harmonizer.id).where(Harmonizer.id > tracked.get("max_user_id", 0))
+        ).scalars().all()
+        if tracked.get("users", 0) + len(new_ids) != current["users"]:
+            return False
+        for uid in new_ids:
+            self._graph.add_node(uid)
+        self.fingerprint = dict(current)
+        if new_ids:
+            self._bump()
+        return True
+
+    def ensure(self, db: Any) -> None:
+        """Load, restore or revalidate the graph for ``db``'s engine."""
+        bind = db.get_bind()
+        url = _bind_url(bind)
+        with self.lock:
+            now = time.monotonic()
+            if (
+                self._graph is not None
+                and url == self._url
+                and now - self._checked_at < Config.REVALIDATE_SECONDS
+            ):
+                return
+            current = self._fetch_fingerprint(db)
+            self._checked_at = now
+            if url != self._url:
+                self._graph = None
+                self._bind, self._url = bind, url
+            if self._graph is None:
+                if self._restore(db, current):
+                    return
+                self._build(db)
+                self._schedule_checkpoint()
+            elif current != self.fingerprint and not self._add_new_users(db, current):
+                logger.info("Influence graph drifted from %s; rebuilding", current)
+                self._build(db)
+
+    # ------------------------------------------------------------------
+    # Incremental updates
+    def _add(self, source: Any, target: Any, edge_type: str) -> None:
+        counts = self._interactions.setdefault((source, target), {})
+        counts[edge_type] = counts.get(edge_type, 0) + 1
+        self._set_edge(source, target, counts)
+
+    def _remove(self, source: Any, target: Any, edge_type: str) -> None:
+        counts = self._interactions.get((source, target))
+        if not counts or edge_type not in counts:
+            return
+        counts[edge_type] -= 1
+        if counts[edge_type] <= 0:
+            del counts[edge_type]
+        if counts:
+            self._set_edge(source, target, counts)
+            return
+        del self._interactions[(source, target)]
+        graph = self._graph.graph
+        if hasattr(graph, "remove_edge"):
+            graph.remove_edge(source, target)
+        else:  # pragma: no cover - fallback DiGraph without networkx
+            del graph[source][target]
+
+    def _set_edge(self, source: Any, target: Any, counts: Dict[str, int]) -> None:
+        edge_type = [t for t in EDGE_PRECEDENCE if counts.get(t)][-1]
+        data = self._graph.get_edge_data(source, target)
+        if data is None:
+            self._graph.add_interaction(source, target, edge_type=edge_type)
+        else:
+            data["edge_type"] = edge_type
+
+    def _bump(self) -> None:
+        self.version += 1
+
+    def _apply(self, field: str, row: Any, delta: int, change: Any, *args: Any) -> None:
+        with self.lock:
+            if self._graph is None:
+                return
+            rows = self._rows[field]
+            if (row in rows) == (delta > 0):
+                # Already reflected, e.g. by a rebuild that read the committed
+                # row before its event was published
+                return
+            if delta > 0:
+                rows.add(row)
+            else:
+                rows.discard(row)
+            change(*args)
+            self.fingerprint[field] += delta
+            self._bump()
+            if self.version - self._checkpoint_version >= Config.CHECKPOINT_EVERY:
+                self._schedule_checkpoint()
+
+    def on_follow(self, payload: Dict[str, Any]) -> None:
+        pair = (payload["follower_id"], payload["followed_id"])
+        self._apply("follows", pair, 1, self._add, *pair, "follow")
+
+    def on_unfollow(self, payload: Dict[str, Any]) -> None:
+        pair = (payload["follower_id"], payload["followed_id"])
+        self._apply("follows", pair, -1, self._remove, *pair, "follow")
+
+    def on_like(self, payload: Dict[str, Any]) -> None:
+        row = (payload["user_id"], payload["vibenode_id"])
+        self._apply("likes", row, 1, self._add, payload["user_id"], payload["author_id"], "like")
+
+    def on_unlike(self, payload: Dict[str, Any]) -> None:
+        row = (payload["user_id"], payload["vibenode_id"])
+        self._apply(
+            "likes", row, -1, self._remove, payload["user_id"], payload["author_id"], "like"
+        )
+
+    def on_remix(self, payload: Dict[str, Any]) -> None:
+        self._apply(
+            "remixes",
+            payload["vibenode_id"],
+            1,
+            self._add,
+            payload["author_id"],
+            payload["parent_author_id"],
+            "remix",
+        )
+
+    # ------------------------------------------------------------------
+    # Reading
+    def snapshot(self) -> InfluenceGraph:
+        """Return a read-only copy of the graph at the current version."""
+        with self.lock:
+            if self._snapshot_version != self.version:
+                snap = InfluenceGraph()
+                if self._graph is not None:
+                    snap.graph = self._graph.graph.copy()
+                self._snapshot = snap
+                self._snapshot_version = self.version
+            return self._snapshot
+
+    def graph(self, db: Any) -> InfluenceGraph:
+        self.ensure(db)
+        return self.snapshot()
+
+    # ------------------------------------------------------------------
+    # Checkpoints
+    def _schedule_checkpoint(self) -> None:
+        """Start a background checkpoint unless one is already running."""
+        with self.lock:
+            if self._checkpointer is not None and self._checkpointer.is_alive():
+                return
+            self._checkpointer = threading.Thread(
+                target=self._checkpoint_quietly, name="influence-graph-checkpoint", daemon=True
+            )
+            self._checkpointer.start()
+
+    def _checkpoint_quietly(self) -> None:
+        try:
+            self.checkpoint()
+        except Exception as exc:  # pragma: no cover - best effort
+            logger.warning("Influence graph checkpoint failed: %s", exc)
+
+    def join_checkpoint(self, timeout: Optional[float] = None) -> None:
+        """Wait for a running background checkpoint to finish."""
+        thread = self._checkpointer
+        if thread is not None:
+            thread.join(timeout)
+
+    def checkpoint(self) -> str:
+        """Write the graph to ``SystemState`` and prune older checkpoints.
+
+        Only copying the state holds :attr:`lock`; serializing and writing
+        run without it so events and readers are not blocked.
+        """
+        from db_models import SystemState
+
+        with self.lock:
+            if self._graph is None or self._bind is None:
+                return ""
+            graph = self.snapshot()
+            version = self.version
+            bind = self._bind
+            extra = {
+                "version": version,
+                "fingerprint": dict(self.fingerprint),
+                "interactions": [
+                    [u, v, dict(counts)] for (u, v), counts in self._interactions.items()
+                ],
+                "rows": {field: list(rows) for field, rows in self._rows.items()},
+            }
+        with Session(bind=bind) as session:
+            key = graph.snapshot_graph(
+                session, key_prefix=Config.CHECKPOINT_PREFIX, extra=extra
+            )
+            stale = session.execute(
+                select(SystemState.id)
+                .where(SystemState.key.like(f"{Config.CHECKPOINT_PREFIX}_%"))
+                .order_by(SystemState.id.desc())
+                .offset(Config.CHECKPOINT_KEEP)
+            ).scalars().all()
+            if stale:
+                session.query(SystemState).filter(SystemState.id.in_(stale)).delete(
+                    synchronize_session=False
+                )
+                session.commit()
+        with self.lock:
+            self._checkpoint_version = max(self._checkpoint_version, version)
+        return key
+
+    def _restore(self, db: Any, current: Dict[str, int]) -> bool:
+        from db_models import SystemState
+
+        value = db.execute(
+            select(SystemState.value)
+            .where(SystemState.key.like(f"{Config.CHECKPOINT_PREFIX}_%"))
+            .order_by(SystemState.id.desc())
+            .limit(1)
+        ).scalar_one_or_none()
+        if value is None:
+            return False
+        try:
+            data = json.loads(value)
+        except ValueError:
+            logger.warning("Unreadable influence graph checkpoint ignored")
+            return False
+        rows = data.get("rows")
+        if data.get("fingerprint") != current or not isinstance(rows, dict):
+            return False
+        graph = InfluenceGraph()
+        for node in data.get("nodes", []):
+            graph.add_node(node["id"])
+        for edge in data.get("edges", []):
+            ts = edge.get("timestamp")
+            try:
+                ts = datetime.fromisoformat(ts) if ts else None
+            except (TypeError, ValueError):
+                ts = None
+            graph.add_interaction(
+                edge["source"],
+                edge["target"],
+                weight=edge.get("weight", 1.0),
+                edge_type=edge.get("edge_type", "follow"),
+                timestamp=ts,
+            )
+        self._graph = graph
+        self._interactions = {
+            (u, v): dict(counts) for u, v, counts in data.get("interactions", [])
+        }
+        self._rows = {
+            field: {tuple(row) if isinstance(row, list) else row for row in rows.get(field, [])}
+            for field in FINGERPRINT_FIELDS[2:]
+        }
+        self.fingerprint = dict(current)
+        self.version = max(self.version, int(data.get("version", 0))) + 1
+        self._checkpoint_version = self.version
+        logger.info("Influence graph restored from checkpoint v%s", data.get("version"))
+        return True
+
+
+_SERVICE: Optional[InfluenceGraphService] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_influence_graph_service() -> InfluenceGraphService:
+    """Return the process-wide :class:`InfluenceGraphService` instance."""
+    global _SERVICE
+    with _SERVICE_LOCK:
+        if _SERVICE is None:
+            _SERVICE = InfluenceGraphService()
+        return _SERVICE
+
+
+def get_influence_graph(db: Any) -> InfluenceGraph:
+    """Return the current influence graph snapshot for ``db``.
+
+    Sessions without an engine (test doubles) fall back to a one-off
+    :func:`build_causal_graph`.
+    """
+    if not hasattr(db, "get_bind") or not hasattr(db, "execute"):
+        return build_causal_graph(db)
+    return get_influence_graph_service().graph(db)
+
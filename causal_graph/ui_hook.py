@@ -6,7 +6,7 @@ from sqlalchemy.orm import Session
 
 from hook_manager import HookManager
 from frontend_bridge import register_route_once
-from . import build_causal_graph
+from .service import get_influence_graph
 
 try:  # pragma: no cover - optional dependency during tests
     from superNova_2177 import simulate_social_entanglement
@@ -21,7 +21,7 @@ ui_hook_manager = HookManager()
 
 async def build_graph_ui(_: Dict[str, Any], db: Session, **__: Any) -> Dict[str, Any]:
     """Return the causal graph structure for the current database."""
-    graph = build_causal_graph(db)
+    graph = get_influence_graph(db)
     data = {
         "nodes": [{"id": n, **graph.graph.nodes.get(n, {})} for n in graph.graph.nodes],
         "edges": [
@@ -60,6 +60,8 @@ class Config:
 
     # --- Background task tuning ---
     PASSIVE_AURA_UPDATE_INTERVAL_SECONDS: int = 3600
+    # Harmonizers credited per passive aura UPDATE batch
+    PASSIVE_AURA_BATCH_SIZE: int = 1000
     PROPOSAL_LIFECYCLE_INTERVAL_SECONDS: int = 300
     NONCE_CLEANUP_INTERVAL_SECONDS: int = 3600
     NONCE_EXPIRATION_SECONDS: int = 86400
@@ -73,6 +75,9 @@ class Config:
     SELF_IMPROVE_INTERVAL_SECONDS: int = 3600
     ANNUAL_AUDIT_INTERVAL_SECONDS: int = 86400 * 365
     METRICS_PORT: int = int(os.environ.get("METRICS_PORT", "8001"))
+    # Directory holding the event log segments and state snapshots; relative
+    # log and snapshot names are resolved against it
+    DATA_DIR: str = os.environ.get("SUPERNOVA_DATA_DIR", "data")
 
     # Cooldown to prevent excessive universe forking
     FORK_COOLDOWN_SECONDS: int = 3600
@@ -95,6 +100,8 @@ class Config:
     GOV_EXECUTION_TIMELOCK_SEC: int = 259200  # 3 days
     ALLOWED_POLICY_KEYS: List[str] = ["DAILY_DECAY", "KARMA_MINT_THRESHOLD"]
     SPECIES: List[str] = ["human", "ai", "company"]
+    # Cross-check incremental proposal tallies against a full storage rescan
+    TALLY_VERIFY: bool = False
 
     # --- Meta-evaluation tuning ---
     # Minimum number of records required before bias analysis is considered
@@ -106,6 +113,12 @@ class Config:
     # Days before unresolved hypotheses are considered stale in meta analyses
     UNRESOLVED_HYPOTHESIS_THRESHOLD_DAYS: int = 60
 
+    # --- Hypothesis reasoning ---
+    # Days without a score or status change before an open hypothesis is stale
+    HYPOTHESIS_STALENESS_THRESHOLD_DAYS: int = 30
+    # Normalized Levenshtein similarity for conflict and redundancy checks
+    TEXT_SIMILARITY_THRESHOLD: float = 0.7
+
 
 @lru_cache(maxsize=1)
 def get_emoji_weights() -> Dict[str, Decimal]:
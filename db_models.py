@@ -18,6 +18,7 @@ try:
         DateTime,
         ForeignKey,
         UniqueConstraint,
+        Index,
         Table,
         Float,
         JSON,
@@ -72,6 +73,9 @@ except Exception:  # pragma: no cover - optional dependency
     def UniqueConstraint(*_a, **_kw):
         return None
 
+    def Index(*_a, **_kw):
+        return None
+
     class DeclarativeBase:
         metadata = type(
             "Meta",
@@ -112,12 +116,15 @@ harmonizer_follows = Table(
     Base.metadata,
     Column("follower_id", Integer, ForeignKey("harmonizers.id"), primary_key=True),
     Column("followed_id", Integer, ForeignKey("harmonizers.id"), primary_key=True),
+    # Reverse lookups (followers of a user) page through this index
+    Index("ix_harmonizer_follows_followed", "followed_id", "follower_id"),
 )
 vibenode_likes = Table(
     "vibenode_likes",
     Base.metadata,
     Column("harmonizer_id", Integer, ForeignKey("harmonizers.id"), primary_key=True),
     Column("vibenode_id", Integer, ForeignKey("vibenodes.id"), primary_key=True),
+    Index("ix_vibenode_likes_vibenode", "vibenode_id", "harmonizer_id"),
 )
 group_members = Table(
     "group_members",
@@ -174,6 +181,9 @@ class Harmonizer(Base):
     engagement_streaks = Column(JSON, default=dict)
     network_centrality = Column(Float, default=0.0)
     karma_score = Column(Float, default=0.0)
+    # Maintained by ``engagement.toggle_follow``
+    followers_count = Column(Integer, default=0)
+    following_count = Column(Integer, default=0)
     last_passive_aura_timestamp = Column(DateTime, default=datetime.datetime.utcnow)
     vibenodes = relationship(
         "VibeNode", back_populates="author", cascade="all, delete-orphan"
@@ -241,6 +251,8 @@ class VibeNode(Base):
     engagement_catalyst = Column(String, default="0.0")
     negentropy_score = Column(String, default="0.0")
     tags = Column(JSON, default=list)
+    # Maintained by ``engagement.toggle_like``
+    likes_count = Column(Integer, default=0)
     patron_saint_id = Column(Integer, ForeignKey("ai_personas.id"), nullable=True)
     author = relationship("Harmonizer", back_populates="vibenodes")
     sub_nodes = relationship(
@@ -438,21 +450,45 @@ class LogEntry(Base):
     timestamp = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
     event_type = Column(String, nullable=False)
     payload = Column(Text)
-    previous_hash = Column(String, nullable=False)
+    # Unique so two writers chaining from the same head cannot both commit
+    previous_hash = Column(String, unique=True, nullable=False)
     current_hash = Column(String, unique=True, nullable=False)
 
     def chain_of_remix(self, db: Session) -> list[str]:
-        """Return lineage of remix hashes leading to this entry."""
-        chain = []
-        prev = self.previous_hash
-        while prev:
-            entry = db.query(LogEntry).filter_by(current_hash=prev).first()
-            if not entry:
-                logging.error("Broken remix chain at %s", prev)
-                raise ValueError(f"Missing log entry for hash {prev}")
-            chain.append(entry.current_hash)
-            prev = entry.previous_hash
-        return chain
+        """Return lineage of remix hashes leading to this entry.
+
+        Ancestors are fetched in a single recursive query.
+        """
+        from sqlalchemy import literal, select
+        from sqlalchemy.orm import aliased
+
+        if not self.previous_hash:
+            return []
+        lineage = (
+            select(
+                LogEntry.current_hash,
+                LogEntry.previous_hash,
+                literal(0).label("depth"),
+            )
+            .where(LogEntry.current_hash == self.previous_hash)
+            .cte("lineage", recursive=True)
+        )
+        parent = aliased(LogEntry)
+        lineage = lineage.union_all(
+            select(
+                parent.current_hash, parent.previous_hash, lineage.c.depth + 1
+            ).where(parent.current_hash == lineage.c.previous_hash)
+        )
+        rows = db.execute(
+            select(lineage.c.current_hash, lineage.c.previous_hash).order_by(
+                lineage.c.depth
+            )
+        ).all()
+        prev = rows[-1].previous_hash if rows else self.previous_hash
+        if prev:
+            logging.error("Broken remix chain at %s", prev)
+            raise ValueError(f"Missing log entry for hash {prev}")
+        return [row.current_hash for row in rows]
 
     def compute_hash(self) -> str:
         """Return SHA-256 hash for this entry."""
@@ -511,7 +547,7 @@ class HypothesisRecord(Base):
     # causal_trigger.py, audit_bridge.py etc. refs (SystemState keys)
 
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow, index=True)
 
     tags = Column(JSON, default=lambda: []) #
     notes = Column(Text, default="") # Summary of events/updates
@@ -702,7 +738,9 @@ def init_db(db_url: str | None = None) -> None:
                     creative_spark FLOAT DEFAULT 0.0,
                     network_centrality FLOAT DEFAULT 0.0,
                     karma_score FLOAT DEFAULT 0.0,
-                    engagement_streaks INTEGER DEFAULT 0
+                    engagement_streaks INTEGER DEFAULT 0,
+                    followers_count INTEGER DEFAULT 0,
+                    following_count INTEGER DEFAULT 0
                 );
                 """
             )
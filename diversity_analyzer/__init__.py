@@ -14,7 +14,7 @@ sentiment scoring or other bottlenecks::
 """
 
 import logging
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Tuple, Union
 from functools import lru_cache
 from datetime import datetime
 from statistics import mean
@@ -24,6 +24,7 @@ from difflib import SequenceMatcher
 from validators.reputation_influence_tracker import compute_validator_reputations
 from temporal_consistency_checker import analyze_temporal_consistency
 from network.network_coordination_detector import detect_score_coordination
+from validation_batch import ValidationBatch
 
 logger = logging.getLogger("superNova_2177.certifier")
 logger.propagate = False
@@ -79,7 +80,9 @@ def _score_validation_cached(confidence: float, signal: float, note: str) -> flo
     )
 
 
-def compute_diversity_score(validations: List[Dict[str, Any]]) -> Dict[str, Any]:
+def compute_diversity_score(
+    validations: Union[List[Dict[str, Any]], ValidationBatch]
+) -> Dict[str, Any]:
     """Compute a simple diversity metric for a list of validations.
 
     The score is based on the proportion of unique ``validator_id``,
@@ -90,7 +93,8 @@ def compute_diversity_score(validations: List[Dict[str, Any]]) -> Dict[str, Any]
     ----------
     validations:
         Sequence of validation dictionaries which may contain the keys
-        ``validator_id``, ``specialty`` and ``affiliation``.
+        ``validator_id``, ``specialty`` and ``affiliation``, or an already
+        parsed :class:`~validation_batch.ValidationBatch`.
 
     Returns
     -------
@@ -99,19 +103,14 @@ def compute_diversity_score(validations: List[Dict[str, Any]]) -> Dict[str, Any]
         optional ``flags`` if low diversity is detected.  Counts of unique
         fields are also returned for debugging purposes.
     """
-    # For very large datasets consider numpy vectorization; profile with
-    # ``cProfile`` to identify any set-building bottlenecks.
-
-    total = len(validations) or 1
-
-    ids = {v.get("validator_id") for v in validations if v.get("validator_id")}
-    specialties = {v.get("specialty") for v in validations if v.get("specialty")}
-    affiliations = {v.get("affiliation") for v in validations if v.get("affiliation")}
-    types = {
-        v.get("validator_type") or v.get("type")
-        for v in validations
-        if v.get("validator_type") or v.get("type")
-    }
+    # Interned value tables already hold each distinct non-empty value once
+    batch = ValidationBatch.of(validations)
+    total = batch.size or 1
+
+    ids = batch.tables["validator"]
+    specialties = batch.tables["specialty"]
+    affiliations = batch.tables["affiliation"]
+    types = batch.tables["validator_type"]
 
     ratios = [
         len(ids) / total,
@@ -0,0 +1,316 @@
+"""Shared sentence-embedding service.
+
+One :class:`EmbeddingService` per model name holds the only warm
+``SentenceTransformer`` in the process.  Vectors are keyed by the SHA-256 of
+their text and persisted in an :class:`EmbeddingStore`: an append-only
+float32 file read back through ``numpy.memmap`` plus a parallel file of
+keys, so unchanged texts (e.g. a parent ``VibeNode`` description) are never
+re-encoded, across requests or restarts.
+
+Cache misses are queued to a single encoder thread which drains every
+request that arrives within ``Config.BATCH_WINDOW_SECONDS`` (up to
+``Config.MAX_BATCH_SIZE`` texts) into one ``model.encode`` call.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock
+    fcntl = None  # type: ignore[assignment]
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+logger = logging.getLogger("superNova_2177.embeddings")
+
+
+class Config:
+    MODEL_NAME = "all-MiniLM-L6-v2"
+    CACHE_DIR = os.environ.get(
+        "EMBEDDING_CACHE_DIR",
+        os.path.join(os.path.expanduser("~"), ".cache", "superNova_2177", "embeddings"),
+    )
+    # How long the encoder waits for more requests before running a batch
+    BATCH_WINDOW_SECONDS = 0.005
+    MAX_BATCH_SIZE = 64
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """Content-hash keyed float32 vectors in an append-only memmapped file.
+
+    Several processes may share one cache directory.  Appends take an
+    exclusive ``flock`` on ``<path>/lock`` and first read any keys other
+    processes appended, so the next row is always the number of keys on
+    disk and keys stay aligned with their vectors.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.lock = threading.Lock()
+        self.dim: Optional[int] = None
+        self._rows: Dict[str, int] = {}
+        # Key lines read so far and the byte offset just past them
+        self._key_lines = 0
+        self._keys_offset = 0
+        self._map: Any = None
+        self._vectors_path = os.path.join(path, "vectors.f32")
+        self._keys_path = os.path.join(path, "keys.txt")
+        self._meta_path = os.path.join(path, "meta.json")
+        self._lock_path = os.path.join(path, "lock")
+        if os.path.exists(self._meta_path):
+            with self.lock, self._file_lock():
+                self._sync()
+
+    @contextmanager
+    def _file_lock(self) -> Iterator[None]:
+        os.makedirs(self.path, exist_ok=True)
+        with open(self._lock_path, "a") as fh:
+            if fcntl is not None:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+    def _sync(self) -> None:
+        """Read keys appended since the last sync; caller holds both locks."""
+        if self.dim is None:
+            if not os.path.exists(self._meta_path):
+                return
+            with open(self._meta_path) as fh:
+                self.dim = int(json.load(fh)["dim"])
+        if not os.path.exists(self._keys_path):
+            return
+        size = os.path.getsize(self._vectors_path) if os.path.exists(self._vectors_path) else 0
+        # Vectors are written before keys, so a torn append leaves at most an
+        # orphaned vector, never a key without its row.
+        complete = size // (self.dim * 4)
+        with open(self._keys_path, "rb") as fh:
+            fh.seek(self._keys_offset)
+            data = fh.read()
+        offset = 0
+        while offset < len(data):
+            newline = data.find(b"\n", offset)
+            key = data[offset:newline].decode("ascii", "replace") if newline >= 0 else ""
+            if newline < 0 or len(key) != 64 or self._key_lines >= complete:
+                # Torn or orphaned key from a writer that died mid-append;
+                # cut it so the next append stays aligned
+                with open(self._keys_path, "r+b") as fh:
+                    fh.truncate(self._keys_offset + offset)
+                break
+            self._rows[key] = self._key_lines
+            self._key_lines += 1
+            offset = newline + 1
+        self._keys_offset += offset
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """Return copies of the stored vectors for the ``keys`` present."""
+        with self.lock:
+            if any(k not in self._rows for k in keys) and self._has_new_keys():
+                with self._file_lock():
+                    self._sync()
+            rows = {k: self._rows[k] for k in keys if k in self._rows}
+            if not rows:
+                return {}
+            needed = max(rows.values()) + 1
+            if self._map is None or len(self._map) < needed:
+                self._map = np.memmap(
+                    self._vectors_path,
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(self._key_lines, self.dim),
+                )
+            return {k: np.array(self._map[r]) for k, r in rows.items()}
+
+    def _has_new_keys(self) -> bool:
+        try:
+            return os.path.getsize(self._keys_path) > self._keys_offset
+        except OSError:
+            return False
+
+    def put_many(self, items: Sequence[Tuple[str, Any]]) -> None:
+        with self.lock, self._file_lock():
+            self._sync()
+            items = [(k, v) for k, v in items if k not in self._rows]
+            if not items:
+                return
+            block = np.asarray([v for _, v in items], dtype=np.float32)
+            if self.dim is None:
+                self.dim = int(block.shape[1])
+                with open(self._meta_path, "w") as fh:
+                    json.dump({"dim": self.dim}, fh)
+            if block.shape[1] != self.dim:
+                raise ValueError(f"Expected {self.dim}-d vectors, got {block.shape[1]}")
+            # Every key on disk has its row, so the next row is the key count;
+            # anything past it is an orphan from a torn append
+            base = self._key_lines
+            exists = os.path.exists(self._vectors_path)
+            with open(self._vectors_path, "r+b" if exists else "wb") as fh:
+                fh.seek(base * self.dim * 4)
+                fh.write(block.tobytes())
+                fh.truncate()
+            data = "".join(f"{k}\n" for k, _ in items).encode("ascii")
+            with open(self._keys_path, "ab") as fh:
+                fh.write(data)
+            for i, (key, _) in enumerate(items):
+                self._rows[key] = base + i
+            self._key_lines += len(items)
+            self._keys_offset += len(data)
+
+
+class EmbeddingService:
+    """Process-wide encoder with a persistent cache and micro-batching."""
+
+    def __init__(
+        self,
+        model_name: str = Config.MODEL_NAME,
+        cache_dir: Optional[str] = Config.CACHE_DIR,
+        loader: Optional[Callable[[str], Any]] = None,
+    ) -> None:
+        self.model_name = model_name
+        self.store = (
+            EmbeddingStore(os.path.join(cache_dir, model_name.replace("/", "__")))
+            if cache_dir
+            else None
+        )
+        self._loader = loader or _load_sentence_transformer
+        self._model: Any = None
+        self._load_error: Optional[BaseException] = None
+        self._model_lock = threading.Lock()
+        self._queue: "queue.Queue[Tuple[str, Future]]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        self.encode_calls = 0
+
+    # ------------------------------------------------------------------
+    # Model
+    def model(self) -> Any:
+        """Load the model once; later calls re-raise a cached load failure."""
+        with self._model_lock:
+            if self._model is None:
+                if self._load_error is not None:
+                    raise self._load_error
+                try:
+                    self._model = self._loader(self.model_name)
+                except Exception as exc:
+                    self._load_error = exc
+                    raise
+            return self._model
+
+    # ------------------------------------------------------------------
+    # Micro-batching
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-encoder", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + Config.BATCH_WINDOW_SECONDS
+            while len(batch) < Config.MAX_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._encode_batch(batch)
+
+    def _encode_batch(self, batch: List[Tuple[str, Future]]) -> None:
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        try:
+            self.encode_calls += 1
+            vectors = np.asarray(
+                self.model().encode(texts, convert_to_numpy=True), dtype=np.float32
+            )
+        except BaseException as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        by_text = dict(zip(texts, vectors))
+        for text, future in batch:
+            future.set_result(by_text[text])
+
+    def _submit(self, texts: Sequence[str]) -> List[Future]:
+        self._ensure_worker()
+        futures = []
+        for text in texts:
+            future: Future = Future()
+            self._queue.put((text, future))
+            futures.append(future)
+        return futures
+
+    # ------------------------------------------------------------------
+    # Public API
+    def encode(self, texts: Sequence[str]) -> Any:
+        """Return an ``(n, dim)`` float32 array of embeddings for ``texts``.
+
+        Raises whatever the model loader raised when the model is unavailable.
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        keys = [text_key(t) for t in texts]
+        found = self.store.get_many(keys) if self.store is not None else {}
+        missing = {k: t for k, t in zip(keys, texts) if k not in found}
+        if missing:
+            futures = self._submit(list(missing.values()))
+            fresh = {k: f.result() for k, f in zip(missing, futures)}
+            if self.store is not None:
+                try:
+                    self.store.put_many(list(fresh.items()))
+                except OSError as exc:
+                    logger.warning("Embedding cache write failed: %s", exc)
+            found.update(fresh)
+        return np.stack([found[k] for k in keys])
+
+    def encode_one(self, text: str) -> Any:
+        return self.encode([text])[0]
+
+
+def _load_sentence_transformer(model_name: str) -> Any:
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+
+_SERVICES: Dict[str, EmbeddingService] = {}
+_SERVICES_LOCK = threading.Lock()
+
+
+def get_embedding_service(model_name: str = Config.MODEL_NAME) -> EmbeddingService:
+    """Return the process-wide :class:`EmbeddingService` for ``model_name``."""
+    with _SERVICES_LOCK:
+        service = _SERVICES.get(model_name)
+        if service is None:
+            service = _SERVICES[model_name] = EmbeddingService(model_name)
+        return service
@@ -0,0 +1,178 @@
+"""Likes and follows without loading association collections.
+
+``user in vibenode.likes`` and ``user.following.append(...)`` load every row
+of the collection into ORM objects.  These helpers work on the
+``vibenode_likes`` and ``harmonizer_follows`` rows directly:
+
+- membership is an ``EXISTS`` probe on the association table's primary key;
+- toggling inserts or deletes the one association row and adjusts the
+  denormalized ``VibeNode.likes_count`` and ``Harmonizer.followers_count`` /
+  ``following_count`` columns with ``count = count +/- 1`` in the same
+  transaction;
+- likers, followers and followed users are listed in id order with keyset
+  pagination, served by the reverse ``(target, actor)`` indexes.
+
+The helpers never commit; the caller's transaction covers the row change
+and the counter update together.  Toggles return ``(state, changed)``:
+when a concurrent request already made the same change, ``changed`` is
+false and callers skip their side effects.
+"""
+
+from __future__ import annotations
+
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, exists, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from db_models import Harmonizer, VibeNode, harmonizer_follows, vibenode_likes
+
+
+class Config:
+    DEFAULT_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 1000
+
+
+Page = Tuple[List[str], Optional[int]]
+Toggle = Tuple[bool, bool]
+
+
+def _match(table: Any, **keys: int) -> Any:
+    return and_(*(table.c[name] == value for name, value in keys.items()))
+
+
+def _exists(db: Session, table: Any, **keys: int) -> bool:
+    return bool(db.execute(select(exists().where(_match(table, **keys)))).scalar())
+
+
+def _adjust(db: Session, column: Any, row_id: int, delta: int) -> None:
+    model = column.class_
+    db.execute(
+        update(model)
+        .where(model.id == row_id)
+        .values({column.key: func.coalesce(column, 0) + delta})
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _toggle(db: Session, table: Any, counters: List[Tuple[Any, int]], **keys: int) -> Toggle:
+    """Flip membership of ``keys`` in ``table``; return ``(now set, changed here)``."""
+    if _exists(db, table, **keys):
+        removed = db.execute(delete(table).where(_match(table, **keys))).rowcount
+        if not removed:
+            # A concurrent request removed the row first
+            return False, False
+        for column, row_id in counters:
+            _adjust(db, column, row_id, -1)
+        return False, True
+    try:
+        with db.begin_nested():
+            db.execute(insert(table).values(**keys))
+    except IntegrityError:
+        # A concurrent request added the same row first
+        return True, False
+    for column, row_id in counters:
+        _adjust(db, column, row_id, 1)
+    return True, True
+
+
+def _page(
+    db: Session, table: Any, key: str, value: int, other: str, limit: int, after: Optional[int]
+) -> Page:
+    limit = max(1, min(int(limit), Config.MAX_PAGE_SIZE))
+    other_col = table.c[other]
+    query = (
+        select(other_col, Harmonizer.username)
+        .join(Harmonizer, Harmonizer.id == other_col)
+        .where(table.c[key] == value)
+    )
+    if after is not None:
+        query = query.where(other_col > after)
+    rows = db.execute(query.order_by(other_col).limit(limit + 1)).all()
+    next_cursor = rows[limit - 1][0] if len(rows) > limit else None
+    return [username for _, username in rows[:limit]], next_cursor
+
+
+# ----------------------------------------------------------------------
+# Likes
+def has_liked(db: Session, user_id: int, vibenode_id: int) -> bool:
+    return _exists(db, vibenode_likes, harmonizer_id=user_id, vibenode_id=vibenode_id)
+
+
+def toggle_like(db: Session, user_id: int, vibenode_id: int) -> Toggle:
+    """Like or unlike ``vibenode_id``; return ``(now liked, changed here)``."""
+    return _toggle(
+        db,
+        vibenode_likes,
+        [(VibeNode.likes_count, vibenode_id)],
+        harmonizer_id=user_id,
+        vibenode_id=vibenode_id,
+    )
+
+
+def list_likers(
+    db: Session, vibenode_id: int, limit: int = Config.DEFAULT_PAGE_SIZE, after: Optional[int] = None
+) -> Page:
+    """Return usernames liking ``vibenode_id`` after user id ``after`` and the next cursor."""
+    return _page(db, vibenode_likes, "vibenode_id", vibenode_id, "harmonizer_id", limit, after)
+
+
+# ----------------------------------------------------------------------
+# Follows
+def is_following(db: Session, follower_id: int, followed_id: int) -> bool:
+    return _exists(db, harmonizer_follows, follower_id=follower_id, followed_id=followed_id)
+
+
+def toggle_follow(db: Session, follower_id: int, followed_id: int) -> Toggle:
+    """Follow or unfollow ``followed_id``; return ``(now following, changed here)``."""
+    return _toggle(
+        db,
+        harmonizer_follows,
+        [
+            (Harmonizer.following_count, follower_id),
+            (Harmonizer.followers_count, followed_id),
+        ],
+        follower_id=follower_id,
+        followed_id=followed_id,
+    )
+
+
+def list_followers(
+    db: Session, user_id: int, limit: int = Config.DEFAULT_PAGE_SIZE, after: Optional[int] = None
+) -> Page:
+    """Return follower usernames of ``user_id`` after id ``after`` and the next cursor."""
+    return _page(db, harmonizer_follows, "followed_id", user_id, "follower_id", limit, after)
+
+
+def list_following(
+    db: Session, user_id: int, limit: int = Config.DEFAULT_PAGE_SIZE, after: Optional[int] = None
+) -> Page:
+    """Return usernames ``user_id`` follows after id ``after`` and the next cursor."""
+    return _page(db, harmonizer_follows, "follower_id", user_id, "followed_id", limit, after)
+
+
+# ----------------------------------------------------------------------
+# Maintenance
+def recount(db: Session) -> None:
+    """Recompute every engagement counter from the association tables."""
+
+    def _count(column: Any, key: Any) -> Any:
+        return (
+            select(func.count())
+            .select_from(column.table)
+            .where(column == key)
+            .scalar_subquery()
+        )
+
+    db.execute(
+        update(VibeNode).values(
+            likes_count=_count(vibenode_likes.c.vibenode_id, VibeNode.id)
+        )
+    )
+    db.execute(
+        update(Harmonizer).values(
+            followers_count=_count(harmonizer_follows.c.followed_id, Harmonizer.id),
+            following_count=_count(harmonizer_follows.c.follower_id, Harmonizer.id),
+        )
+    )
@@ -1,64 +1,257 @@
 import asyncio
+import concurrent.futures
+import functools
 import inspect
 import logging
+import threading
+import time
 from collections import defaultdict
 from dataclasses import dataclass, field
-from typing import Any, Awaitable, Callable, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+
+class Config:
+    # Seconds a single callback may take before its result is dropped
+    HOOK_TIMEOUT_SECONDS: Optional[float] = 5.0
+    # Worker threads shared by every manager for offloaded sync callbacks
+    EXECUTOR_WORKERS = 8
+
+
+_EXECUTOR: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def get_hook_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Return the process-wide executor used for sync hook callbacks."""
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+                max_workers=Config.EXECUTOR_WORKERS, thread_name_prefix="hook"
+            )
+        return _EXECUTOR
+
+
+def _label(func: Callable[..., Any]) -> str:
+    return getattr(func, "__name__", repr(func))
+
+
+async def _resolve(awaitable: Awaitable[Any]) -> Any:
+    return await awaitable
+
+
+@dataclass
+class HookStats:
+    """Latency and outcome counters for one registered callback."""
+
+    calls: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def record(self, elapsed: float, outcome: str) -> None:
+        self.calls += 1
+        self.total_seconds += elapsed
+        self.max_seconds = max(self.max_seconds, elapsed)
+        if outcome == "error":
+            self.errors += 1
+        elif outcome == "timeout":
+            self.timeouts += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        avg = self.total_seconds / self.calls if self.calls else 0.0
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "avg_ms": round(avg * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
 
 
 @dataclass
 class HookManager:
-    """Mystical plugin bus to orchestrate quantum hooks across the metaverse."""
+    """Mystical plugin bus to orchestrate quantum hooks across the metaverse.
+
+    Inside an event loop, :meth:`trigger` runs every callback concurrently:
+    coroutines on the loop and sync callbacks on a worker thread, each bounded
+    by its timeout, so a slow subscriber cannot stall the others or the loop.
+    :meth:`fire_hooks` is the synchronous entry point and :meth:`submit` the
+    thread-safe one.
+    """
 
     hooks: Dict[str, List[Callable[..., Any]]] = field(
         default_factory=lambda: defaultdict(list)
     )
+    timeout: Optional[float] = field(default_factory=lambda: Config.HOOK_TIMEOUT_SECONDS)
+    executor: Optional[concurrent.futures.Executor] = None
+    loop: Optional[asyncio.AbstractEventLoop] = field(default=None, repr=False, compare=False)
+    timeouts: Dict[Tuple[str, Callable[..., Any]], Optional[float]] = field(
+        default_factory=dict, repr=False, compare=False
+    )
+    stats: Dict[str, Dict[Callable[..., Any], HookStats]] = field(
+        default_factory=lambda: defaultdict(dict), repr=False, compare=False
+    )
+    _stats_lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+    _tasks: Set["asyncio.Task[Any]"] = field(default_factory=set, repr=False, compare=False)
+
+    def register_hook(
+        self, name: str, func: Callable[..., Any], timeout: Optional[float] = None
+    ) -> None:
+        """Safely register a hook callback under a cosmic name.
 
-    def register_hook(self, name: str, func: Callable[..., Any]) -> None:
-        """Safely register a hook callback under a cosmic name."""
+        ``timeout`` overrides the manager-wide limit for this callback.
+        """
         if not callable(func):
             raise TypeError("Hook must be callable")
         self.hooks[name].append(func)
-        logging.debug("🔮 Registered hook '%s' -> %s", name, getattr(func, "__name__", repr(func)))
+        if timeout is not None:
+            self.timeouts[(name, func)] = timeout
+        logging.debug("🔮 Registered hook '%s' -> %s", name, _label(func))
 
-    async def _invoke(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
-        try:
-            if inspect.iscoroutinefunction(func):
-                return await func(*args, **kwargs)
+    def bind_loop(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        """Route :meth:`submit` calls to ``loop`` (default: the running loop)."""
+        self.loop = loop or asyncio.get_running_loop()
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    def _record(self, name: str, func: Callable[..., Any], elapsed: float, outcome: str) -> None:
+        with self._stats_lock:
+            stats = self.stats[name].get(func)
+            if stats is None:
+                stats = self.stats[name][func] = HookStats()
+            stats.record(elapsed, outcome)
+
+    async def _call(
+        self, func: Callable[..., Any], offload: bool, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> Any:
+        if inspect.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
+        if offload:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self.executor or get_hook_executor(), functools.partial(func, *args, **kwargs)
+            )
+        else:
             result = func(*args, **kwargs)
-            if inspect.isawaitable(result):
-                return await result
-            return result
+        if inspect.isawaitable(result):
+            return await result
+        return result
+
+    async def _invoke(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        offload: bool,
+        args: Tuple[Any, ...],
+        kwargs: Dict[str, Any],
+    ) -> Any:
+        timeout = self.timeouts.get((name, func), self.timeout)
+        outcome = "ok"
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(self._call(func, offload, args, kwargs), timeout)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            logging.warning("⏳ Hook '%s' timed out in %s after %ss", name, _label(func), timeout)
+            return None
         except Exception:  # pragma: no cover - we log but never raise
-            logging.exception("💥 Hook '%s' raised an exception", getattr(func, "__name__", repr(func)))
+            outcome = "error"
+            logging.exception("💥 Hook '%s' raised an exception", _label(func))
             return None
+        finally:
+            self._record(name, func, time.perf_counter() - start, outcome)
 
-    async def trigger(self, name: str, *args: Any, **kwargs: Any) -> List[Any]:
-        """Invoke all callbacks bound to *name* with given arguments."""
+    async def _dispatch(
+        self, name: str, offload: bool, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> List[Any]:
         callbacks = list(self.hooks.get(name, []))
         logging.debug("✨ Triggering hook '%s' with %d callbacks", name, len(callbacks))
+        results = await asyncio.gather(
+            *(self._invoke(name, func, offload, args, kwargs) for func in callbacks)
+        )
+        logging.debug("🌠 Hook '%s' executed -> %r", name, results)
+        return list(results)
+
+    def _run_inline(
+        self, name: str, callbacks: List[Callable[..., Any]], args: Tuple[Any, ...], kwargs: Dict[str, Any]
+    ) -> List[Any]:
         results: List[Any] = []
         for func in callbacks:
-            result = await self._invoke(func, *args, **kwargs)
+            outcome = "ok"
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    result = asyncio.run(_resolve(result))
+            except Exception:  # pragma: no cover - we log but never raise
+                outcome = "error"
+                logging.exception("💥 Hook '%s' raised an exception", _label(func))
+                result = None
+            finally:
+                self._record(name, func, time.perf_counter() - start, outcome)
             results.append(result)
-            logging.debug(
-                "🌠 Hook '%s' executed %s -> %r",
-                name,
-                getattr(func, "__name__", repr(func)),
-                result,
-            )
         return results
 
+    async def trigger(self, name: str, *args: Any, **kwargs: Any) -> List[Any]:
+        """Invoke all callbacks bound to *name* concurrently.
+
+        Results are returned in registration order; callbacks that raise or
+        time out contribute ``None``.
+        """
+        if self.loop is None or not self.loop.is_running():
+            self.loop = asyncio.get_running_loop()
+        return await self._dispatch(name, True, args, kwargs)
+
     def fire_hooks(self, name: str, *args: Any, **kwargs: Any) -> List[Any]:
-        """Public entry point to trigger hooks synchronously or asynchronously."""
-        coro = self.trigger(name, *args, **kwargs)
+        """Public entry point to trigger hooks synchronously or asynchronously.
+
+        Without a running loop the callbacks complete before this returns;
+        sync callbacks run inline on the calling thread so they may share its
+        locks.  Inside a running loop the dispatch is scheduled as a task and
+        an empty list is returned.
+        """
+        callbacks = list(self.hooks.get(name, []))
+        if not callbacks:
+            return []
         try:
             loop = asyncio.get_running_loop()
         except RuntimeError:
-            return asyncio.run(coro)
-        else:
-            return loop.run_until_complete(coro)
+            if not any(inspect.iscoroutinefunction(func) for func in callbacks):
+                return self._run_inline(name, callbacks, args, kwargs)
+            return asyncio.run(self._dispatch(name, False, args, kwargs))
+        task = loop.create_task(self.trigger(name, *args, **kwargs))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return []
+
+    def submit(self, name: str, *args: Any, **kwargs: Any) -> "concurrent.futures.Future[List[Any]]":
+        """Thread-safe dispatch returning a future for the callback results.
+
+        Runs on the bound event loop when it is running, otherwise on the
+        shared hook executor.
+        """
+        loop = self.loop
+        if loop is not None and loop.is_running():
+            return asyncio.run_coroutine_threadsafe(self.trigger(name, *args, **kwargs), loop)
+        return (self.executor or get_hook_executor()).submit(self.fire_hooks, name, *args, **kwargs)
+
+    def dump_hooks(self, with_stats: bool = False) -> Dict[str, List[Any]]:
+        """Inspect current hook bindings for audit clarity.
 
-    def dump_hooks(self) -> Dict[str, List[str]]:
-        """Inspect current hook bindings for audit clarity."""
-        return {n: [getattr(f, "__name__", repr(f)) for f in cbs] for n, cbs in self.hooks.items()}
+        With ``with_stats`` each callback is reported with its call, error and
+        timeout counts and its average and maximum latency in milliseconds.
+        """
+        if not with_stats:
+            return {n: [_label(f) for f in cbs] for n, cbs in self.hooks.items()}
+        with self._stats_lock:
+            return {
+                n: [
+                    {"callback": _label(f), **self.stats[n].get(f, HookStats()).as_dict()}
+                    for f in cbs
+                ]
+                for n, cbs in self.hooks.items()
+            }
@@ -0,0 +1,23 @@
+"""Process-wide bus for committed content and social-graph mutations.
+
+Endpoints publish :mod:`hooks.events` notifications on :data:`content_hooks`
+once their transaction has committed.  In-memory indexes such as the
+influence graph and the tag histogram register their handlers here.
+"""
+
+import logging
+from typing import Any, Dict
+
+from hook_manager import HookManager
+
+logger = logging.getLogger("superNova_2177.hooks")
+
+content_hooks = HookManager()
+
+
+def publish(event: str, payload: Dict[str, Any]) -> None:
+    """Notify subscribers of a committed mutation; failures are logged."""
+    try:
+        content_hooks.fire_hooks(event, payload)
+    except Exception:  # pragma: no cover - subscribers resync on their next read
+        logger.exception("Failed to publish %s", event)
@@ -30,4 +30,12 @@ CROSS_REMIX_CREATED = "cross_remix_created"
 CROSS_REMIX = "cross_remix"
 ENTROPY_DIVERGENCE = "entropy_divergence"
 
+# Committed content and social graph mutations (see ``hooks.bus``)
+VIBENODE_CREATED = "vibenode_created"
+USER_FOLLOWED = "user_followed"
+USER_UNFOLLOWED = "user_unfollowed"
+VIBENODE_LIKED = "vibenode_liked"
+VIBENODE_UNLIKED = "vibenode_unliked"
+VIBENODE_REMIXED = "vibenode_remixed"
+
 __all__ = [name for name in globals() if name.isupper()]
@@ -0,0 +1,184 @@
+"""Character n-gram candidate index for hypothesis text similarity.
+
+``hypothesis_reasoner`` flags pairs whose normalized Levenshtein similarity
+``1 - d / max_len`` reaches ``TEXT_SIMILARITY_THRESHOLD``.  Comparing every
+pair is ``O(H² · L²)``; :class:`HypothesisIndex` instead keeps the
+normalized text of each hypothesis as a multiset of ``Config.NGRAM_SIZE``
+character grams in inverted lists, and proposes only pairs that can still
+reach the threshold:
+
+- length filter: ``|len_a - len_b| <= d <= (1 - t) · max_len``, and
+- count filter: strings within edit distance ``k`` share at least
+  ``max_len - q + 1 - k · q`` grams.
+
+Both bounds are necessary conditions, so exact Levenshtein on the surviving
+candidates yields the same pairs as the all-pairs scan.  The index is kept
+current by ``hypothesis_tracker.register_hypothesis`` and
+``update_hypothesis_score``; :meth:`HypothesisIndex.sync` picks up records
+written elsewhere.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, Optional, Set
+
+# Slack for float rounding when turning the similarity threshold into an
+# edit budget; erring high only admits extra candidates.
+_EPS = 1e-9
+
+
+class Config:
+    NGRAM_SIZE = 3
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and keep alphanumerics, as the Levenshtein comparison does."""
+    return "".join(filter(str.isalnum, (text or "").lower()))
+
+
+def _grams(norm: str, q: int) -> Counter:
+    return Counter(norm[i : i + q] for i in range(len(norm) - q + 1))
+
+
+class _Entry:
+    __slots__ = ("text", "norm", "grams")
+
+    def __init__(self, text: str, norm: str, grams: Counter) -> None:
+        self.text = text
+        self.norm = norm
+        self.grams = grams
+
+
+class HypothesisIndex:
+    """Inverted n-gram lists over hypothesis texts keyed by hypothesis id."""
+
+    def __init__(self, q: int = Config.NGRAM_SIZE) -> None:
+        self.q = q
+        self.lock = threading.RLock()
+        self._entries: Dict[str, _Entry] = {}
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._by_length: Dict[int, Set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, hypothesis_id: str) -> bool:
+        return hypothesis_id in self._entries
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    def add(self, hypothesis_id: str, text: Optional[str]) -> None:
+        """Index ``text`` under ``hypothesis_id``, replacing any earlier text."""
+        text = text or ""
+        with self.lock:
+            entry = self._entries.get(hypothesis_id)
+            if entry is not None:
+                if entry.text == text:
+                    return
+                self.remove(hypothesis_id)
+            norm = normalize_text(text)
+            entry = _Entry(text, norm, _grams(norm, self.q))
+            self._entries[hypothesis_id] = entry
+            self._by_length[len(norm)].add(hypothesis_id)
+            for gram, count in entry.grams.items():
+                self._postings[gram][hypothesis_id] = count
+
+    def remove(self, hypothesis_id: str) -> None:
+        with self.lock:
+            entry = self._entries.pop(hypothesis_id, None)
+            if entry is None:
+                return
+            ids = self._by_length[len(entry.norm)]
+            ids.discard(hypothesis_id)
+            if not ids:
+                del self._by_length[len(entry.norm)]
+            for gram in entry.grams:
+                posting = self._postings[gram]
+                posting.pop(hypothesis_id, None)
+                if not posting:
+                    del self._postings[gram]
+
+    def sync(self, hypotheses: Iterable[Dict[str, Any]]) -> None:
+        """Index any of ``hypotheses`` that are missing or whose text changed."""
+        with self.lock:
+            for hyp in hypotheses:
+                hyp_id = hyp.get("hypothesis_id") or hyp.get("id")
+                if hyp_id:
+                    self.add(hyp_id, hyp.get("text", ""))
+
+    # ------------------------------------------------------------------
+    # Queries
+    def candidates(
+        self,
+        hypothesis_id: str,
+        threshold: float,
+        among: Optional[Set[str]] = None,
+    ) -> Set[str]:
+        """Ids that may reach ``threshold`` similarity with ``hypothesis_id``.
+
+        The result is a superset of the true matches (restricted to ``among``
+        when given) and never contains ``hypothesis_id`` itself.
+        """
+        with self.lock:
+            entry = self._entries.get(hypothesis_id)
+            if entry is None:
+                return set()
+            found = self._candidates(entry, threshold)
+            found.discard(hypothesis_id)
+            if among is not None:
+                found &= among
+            return found
+
+    def _candidates(self, entry: _Entry, threshold: float) -> Set[str]:
+        if threshold <= 0:
+            return set(self._entries)
+        la = len(entry.norm)
+        if la == 0:
+            # Empty normalized text only ever matches other empty texts
+            return set(self._by_length.get(0, ()))
+
+        found: Set[str] = set()
+        # Lengths whose count bound is vacuous are admitted wholesale; the
+        # rest need enough shared grams.
+        required_by_length: Dict[int, int] = {}
+        lo = max(1, math.ceil(threshold * la - _EPS))
+        hi = math.floor(la / threshold + _EPS)
+        for lb in self._by_length:
+            if lb < lo or lb > hi:
+                continue
+            longest = max(la, lb)
+            budget = math.floor((1.0 - threshold) * longest + _EPS)
+            if budget < abs(la - lb):
+                continue
+            required = longest - self.q + 1 - budget * self.q
+            if required <= 0:
+                found.update(self._by_length[lb])
+            else:
+                required_by_length[lb] = required
+
+        if required_by_length:
+            shared: Counter = Counter()
+            for gram, count in entry.grams.items():
+                for other, other_count in self._postings.get(gram, {}).items():
+                    shared[other] += min(count, other_count)
+            for other, common in shared.items():
+                required = required_by_length.get(len(self._entries[other].norm))
+                if required is not None and common >= required:
+                    found.add(other)
+        return found
+
+
+_INDEX: Optional[HypothesisIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_hypothesis_index() -> HypothesisIndex:
+    """Return the process-wide :class:`HypothesisIndex` instance."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = HypothesisIndex()
+        return _INDEX
@@ -8,7 +8,7 @@ simulates a "scientific conscience"—closing the feedback loop of automated rea
 
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Any, Tuple, cast
+from typing import List, Dict, Optional, Any, Tuple
 import collections
 import math
 import dateutil.parser  # type: ignore[import]
@@ -20,6 +20,7 @@ from sqlalchemy import func
 import hypothesis_tracker as ht # For accessing hypothesis records and their schema
 import audit_bridge # Potentially for getting full audit data if needed for entropy deltas
 from db_models import SystemState # For storing meta-evaluation results
+from hypothesis_repository import get_hypothesis_repository
 
 # --- Configuration Placeholder ---
 # These would typically come from superNova_2177.Config
@@ -41,23 +42,8 @@ CONFIG: Any = SystemConfig
 
 
 def _get_all_hypotheses_with_parsed_metadata(db: Session) -> List[Dict[str, Any]]:
-    """Helper to retrieve all hypothesis records and ensure metadata is parsed."""
-    all_hypotheses = []
-    records = db.query(SystemState).filter(
-        SystemState.key.like("hypothesis_HYP_%")
-    ).all()
-    for record in records:
-        try:
-            value_str = cast(str, record.value)
-            hyp_data = json.loads(value_str)
-            # Ensure metadata is a dict, not just assumed from schema
-            if "metadata" not in hyp_data or not isinstance(hyp_data["metadata"], dict):
-                hyp_data["metadata"] = {}
-            all_hypotheses.append(hyp_data)
-        except json.JSONDecodeError:
-            print(f"Warning: Malformed hypothesis record found for key: {record.key}")
-            continue
-    return all_hypotheses
+    """Helper to retrieve all hypothesis records; ``metadata`` is always a dict."""
+    return get_hypothesis_repository().list(db)
 
 
 def _parse_datetime_safely(dt_str: str) -> Optional[datetime]:
@@ -6,22 +6,20 @@ aspects of scientific judgment by reasoning over stored hypotheses based on
 evidence strength, conflicting predictions, and entropy deltas.
 """
 
-import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Any, Tuple
 import math
-import itertools # For combinations in conflict detection
 import textwrap # Added for text summarization
 import logging
 
 logger = logging.getLogger(__name__)
 logger.propagate = False
 from sqlalchemy.orm import Session
-from sqlalchemy import func, select
 
 # Assuming these modules are available in the same directory or Python path
-from db_models import SystemState # For accessing hypothesis records
 import hypothesis_tracker as ht # For retrieving and updating hypothesis records
+from hypothesis_index import get_hypothesis_index
+from hypothesis_repository import get_hypothesis_repository
 
 # --- Configuration Placeholder ---
 # In a real scenario, this would come from a central Config object (e.g., superNova_2177.Config)
@@ -38,24 +36,9 @@ except ImportError:
     CONFIG = TempConfig
 
 
-def _get_all_hypotheses(db: Session) -> List[Dict[str, Any]]:
-    """Helper to retrieve all hypothesis records from SystemState."""
-    stmt = select(SystemState).where(
-        SystemState.key.like("hypothesis_HYP_%")  # Assuming prefix from hypothesis_tracker
-    )
-    rows = db.execute(stmt).scalars().all()
-    parsed_hypotheses = []
-    for entry in rows:
-        try:
-            parsed_hypotheses.append(json.loads(entry.value))
-        except json.JSONDecodeError:
-            # Log error for malformed entry, but continue
-            logger.warning(
-                "Warning: Malformed hypothesis record found for key: %s",
-                entry.key,
-            )
-            continue
-    return parsed_hypotheses
+def _get_all_hypotheses(db: Session, statuses: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """Helper to retrieve hypothesis records, optionally only those in ``statuses``."""
+    return get_hypothesis_repository().list(db, statuses)
 
 
 def _calculate_hypothesis_trend(history: List[Dict[str, Any]]) -> str:
@@ -168,41 +151,51 @@ def detect_conflicting_hypotheses(db: Session) -> List[Tuple[str, str]]:
     - Textual similarity exceeds a threshold (initially: normalized Levenshtein distance)
     - But scores or evidence (supporting_nodes, validation_log_ids) differ significantly.
     """
-    all_hypotheses = _get_all_hypotheses(db)
+    all_hypotheses = _get_all_hypotheses(db, ["open"])
     conflicting_pairs = []
 
     open_hypotheses = [h for h in all_hypotheses if h.get("status") == "open"]
 
-    # Iterate through all unique pairs of open hypotheses
-    for hyp1, hyp2 in itertools.combinations(open_hypotheses, 2):
-        text1 = hyp1.get("text", "")
-        text2 = hyp2.get("text", "")
+    # Only pairs the n-gram index cannot rule out are compared exactly; they
+    # are visited in the same order as itertools.combinations would.
+    index = get_hypothesis_index()
+    index.sync(open_hypotheses)
+    position = {h.get("hypothesis_id"): i for i, h in enumerate(open_hypotheses)}
+    open_ids = set(position)
+    for i, hyp1 in enumerate(open_hypotheses):
+        candidates = index.candidates(
+            hyp1.get("hypothesis_id"), CONFIG.TEXT_SIMILARITY_THRESHOLD, open_ids
+        )
+        later = sorted(position[c] for c in candidates if position[c] > i)
+        for hyp2 in (open_hypotheses[j] for j in later):
+            text1 = hyp1.get("text", "")
+            text2 = hyp2.get("text", "")
 
-        # Check textual similarity
-        similarity = _levenshtein_distance_normalized(text1, text2)
+            # Check textual similarity
+            similarity = _levenshtein_distance_normalized(text1, text2)
         
-        if similarity >= CONFIG.TEXT_SIMILARITY_THRESHOLD:
-            # Check for diverging evidence/scores for similar texts
-            score1 = hyp1.get("score", 0.0)
-            score2 = hyp2.get("score", 0.0)
+            if similarity >= CONFIG.TEXT_SIMILARITY_THRESHOLD:
+                # Check for diverging evidence/scores for similar texts
+                score1 = hyp1.get("score", 0.0)
+                score2 = hyp2.get("score", 0.0)
             
-            # Simple check for significant score difference (e.g., > 0.3 on a 0-1 scale)
-            if abs(score1 - score2) > 0.3:
-                conflicting_pairs.append((hyp1["hypothesis_id"], hyp2["hypothesis_id"]))
-                continue
+                # Simple check for significant score difference (e.g., > 0.3 on a 0-1 scale)
+                if abs(score1 - score2) > 0.3:
+                    conflicting_pairs.append((hyp1["hypothesis_id"], hyp2["hypothesis_id"]))
+                    continue
             
-            # Check for diverging supporting evidence (nodes)
-            nodes1 = set(hyp1.get("supporting_nodes", []))
-            nodes2 = set(hyp2.get("supporting_nodes", []))
+                # Check for diverging supporting evidence (nodes)
+                nodes1 = set(hyp1.get("supporting_nodes", []))
+                nodes2 = set(hyp2.get("supporting_nodes", []))
             
-            # If texts are similar but supporting nodes are largely disjoint
-            # Use a slightly lower threshold for nodes if text is very similar
-            if similarity > 0.8 and len(nodes1.intersection(nodes2)) / max(len(nodes1), len(nodes2), 1) < 0.2:
-                 conflicting_pairs.append((hyp1["hypothesis_id"], hyp2["hypothesis_id"]))
-                 continue
+                # If texts are similar but supporting nodes are largely disjoint
+                # Use a slightly lower threshold for nodes if text is very similar
+                if similarity > 0.8 and len(nodes1.intersection(nodes2)) / max(len(nodes1), len(nodes2), 1) < 0.2:
+                     conflicting_pairs.append((hyp1["hypothesis_id"], hyp2["hypothesis_id"]))
+                     continue
             
-            # Further checks on validation_log_ids or prediction differences can be added here
-            # For v3.8, keep it focused on score and nodes.
+                # Further checks on validation_log_ids or prediction differences can be added here
+                # For v3.8, keep it focused on score and nodes.
 
     return conflicting_pairs
 
@@ -214,7 +207,7 @@ def synthesize_consensus_hypothesis(hypothesis_ids: List[str], db: Session) -> s
     """
     source_hypotheses = []
     for hyp_id in hypothesis_ids:
-        hyp = ht._get_hypothesis_record(db, hyp_id)
+        hyp = get_hypothesis_repository().get(db, hyp_id)
         if not hyp:
             raise ValueError(f"Source hypothesis {hyp_id} not found.")
         source_hypotheses.append(hyp)
@@ -250,7 +243,7 @@ def synthesize_consensus_hypothesis(hypothesis_ids: List[str], db: Session) -> s
 
     # Create new hypothesis record using hypothesis_tracker's register function
     new_hypothesis_id = ht.register_hypothesis(fused_text, db)
-    new_hypothesis_record = ht._get_hypothesis_record(db, new_hypothesis_id) # Retrieve the fresh record
+    new_hypothesis_record = get_hypothesis_repository().get(db, new_hypothesis_id) # Retrieve the fresh record
 
     new_hypothesis_record["supporting_nodes"] = list(fused_supporting_nodes)
     new_hypothesis_record["validation_log_ids"] = list(fused_validation_log_ids)
@@ -276,7 +269,7 @@ def synthesize_consensus_hypothesis(hypothesis_ids: List[str], db: Session) -> s
 
     # Optionally, mark original hypotheses as 'merged'
     for hyp_id in hypothesis_ids:
-        original_hyp = ht._get_hypothesis_record(db, hyp_id)
+        original_hyp = get_hypothesis_repository().get(db, hyp_id)
         if original_hyp and original_hyp.get("status") in ["open", "validated"]: # Only update if not already falsified/inconclusive
             original_hyp["status"] = "merged"
             original_hyp["notes"].append(f"Merged into consensus hypothesis: {new_hypothesis_id}")
@@ -293,13 +286,18 @@ def auto_flag_stale_or_redundant(db: Session) -> List[str]:
     Flags them as "inconclusive" with a note.
     Returns list of affected hypothesis_ids.
     """
-    all_hypotheses = _get_all_hypotheses(db)
+    all_hypotheses = _get_all_hypotheses(db, ["open", "validated"])
     affected_hypothesis_ids = []
     
     now = datetime.utcnow()
     staleness_threshold_date = now - timedelta(days=CONFIG.HYPOTHESIS_STALENESS_THRESHOLD_DAYS)
 
     validated_hypotheses = [h for h in all_hypotheses if h.get("status") == "validated"]
+    validated_by_id = {h.get("hypothesis_id"): h for h in validated_hypotheses}
+    validated_ids = set(validated_by_id)
+    index = get_hypothesis_index()
+    index.sync(validated_hypotheses)
+    index.sync(h for h in all_hypotheses if h.get("status") == "open")
 
     for hyp in all_hypotheses:
         hyp_id = hyp.get("hypothesis_id")
@@ -329,7 +327,10 @@ def auto_flag_stale_or_redundant(db: Session) -> List[str]:
         # Check for redundancy against validated hypotheses
         hyp_text = hyp.get("text", "")
         is_redundant = False
-        for validated_hyp in validated_hypotheses:
+        candidates = index.candidates(
+            hyp_id, CONFIG.TEXT_SIMILARITY_THRESHOLD, validated_ids
+        )
+        for validated_hyp in (validated_by_id[c] for c in candidates):
             validated_text = validated_hyp.get("text", "")
             similarity = _levenshtein_distance_normalized(hyp_text, validated_text)
             if similarity >= CONFIG.TEXT_SIMILARITY_THRESHOLD: # Using same threshold for conflict and redundancy
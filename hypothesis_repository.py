@@ -0,0 +1,270 @@
+"""Cached access to hypotheses stored as ``HypothesisRecord`` rows.
+
+Hypotheses used to live as JSON blobs under ``hypothesis_HYP_*`` keys in
+``SystemState``, and every reasoning pass scanned and decoded all of them.
+:class:`HypothesisRepository` reads the typed ``hypotheses`` table instead:
+
+- the first access to a database copies any remaining blobs into
+  ``HypothesisRecord`` rows once, guarded by a ``SystemState`` marker;
+- parsed records are cached per status, each partition stamped with the
+  ``(count, max(updated_at))`` of its rows.  A read costs one grouped query
+  on the ``status``/``updated_at`` indexes, and only partitions whose stamp
+  moved are refetched, and only the rows touched since the last stamp when
+  that accounts for the whole change.
+
+Records are returned in the dictionary shape the reasoning layers have always
+consumed (``hypothesis_id``, ``text``, ``supporting_nodes``, ``notes`` as a
+list of lines, ...).
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+
+from db_models import HypothesisRecord, SystemState
+
+logger = logging.getLogger("superNova_2177.hypotheses")
+
+LEGACY_KEY_PREFIX = "hypothesis_"
+MIGRATION_MARKER_KEY = "hypothesis_records_migrated"
+
+Stamp = Tuple[int, Optional[datetime.datetime]]
+
+
+def _iso(value: Any) -> str:
+    return value.isoformat() if isinstance(value, datetime.datetime) else (value or "")
+
+
+def _parse_dt(value: Any) -> Optional[datetime.datetime]:
+    if isinstance(value, datetime.datetime):
+        return value
+    try:
+        return datetime.datetime.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def hypothesis_to_dict(record: HypothesisRecord) -> Dict[str, Any]:
+    """Return ``record`` in the legacy hypothesis dictionary shape."""
+    metadata = dict(record.metadata_json) if isinstance(record.metadata_json, dict) else {}
+    return {
+        "hypothesis_id": record.id,
+        "text": record.description or "",
+        "status": record.status,
+        "score": record.score if record.score is not None else 0.0,
+        "metadata": metadata,
+        "supporting_nodes": list(metadata.get("supporting_nodes_history", [])),
+        "validation_log_ids": list(record.validation_log_ids or []),
+        "audit_sources": list(record.audit_sources or []),
+        "history": list(record.history or []),
+        "notes": [line for line in (record.notes or "").splitlines() if line],
+        "created_at": _iso(record.created_at),
+        "updated_at": _iso(record.updated_at),
+        **({"merged_from": metadata["merged_from"]} if "merged_from" in metadata else {}),
+    }
+
+
+def apply_dict(record: HypothesisRecord, data: Dict[str, Any]) -> None:
+    """Copy a legacy hypothesis dictionary onto ``record``."""
+    text = data.get("text", record.description or "")
+    metadata = dict(data.get("metadata") or {})
+    if "supporting_nodes" in data:
+        metadata["supporting_nodes_history"] = list(data["supporting_nodes"])
+    if "merged_from" in data:
+        metadata["merged_from"] = list(data["merged_from"])
+    notes = data.get("notes", "")
+    record.title = text[:255]
+    record.description = text
+    record.status = data.get("status", record.status or "open")
+    record.score = data.get("score", record.score or 0.0)
+    record.metadata_json = metadata
+    record.validation_log_ids = list(data.get("validation_log_ids", []))
+    record.audit_sources = list(data.get("audit_sources", []))
+    record.history = list(data.get("history", []))
+    record.notes = "".join(f"{n}\n" for n in notes) if isinstance(notes, list) else notes
+    created_at = _parse_dt(data.get("created_at"))
+    if created_at is not None:
+        record.created_at = created_at
+
+
+class _Partition:
+    __slots__ = ("stamp", "records")
+
+    def __init__(self) -> None:
+        self.stamp: Stamp = (0, None)
+        self.records: Dict[str, Dict[str, Any]] = {}
+
+
+class HypothesisRepository:
+    """Process-wide, version-stamped cache of parsed hypothesis records."""
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.version = 0
+        self._url: Optional[str] = None
+        self._partitions: Dict[Optional[str], _Partition] = {}
+
+    # ------------------------------------------------------------------
+    # Migration
+    def migrate(self, db: Any) -> int:
+        """Copy legacy ``SystemState`` blobs into ``HypothesisRecord`` once.
+
+        Returns the number of records created.  Existing rows win over blobs
+        with the same id, and the blobs themselves are left in place.
+        """
+        conn = db.connection()
+        HypothesisRecord.__table__.create(conn, checkfirst=True)
+        for index in HypothesisRecord.__table__.indexes:
+            index.create(conn, checkfirst=True)
+        marker = db.execute(
+            select(SystemState.id).where(SystemState.key == MIGRATION_MARKER_KEY)
+        ).first()
+        if marker is not None:
+            return 0
+
+        existing = set(db.execute(select(HypothesisRecord.id)).scalars())
+        rows = db.execute(
+            select(SystemState.key, SystemState.value).where(
+                SystemState.key.like(f"{LEGACY_KEY_PREFIX}HYP_%")
+            )
+        ).all()
+        created = 0
+        for key, value in rows:
+            try:
+                data = json.loads(value)
+            except (TypeError, json.JSONDecodeError):
+                logger.warning("Malformed hypothesis record found for key: %s", key)
+                continue
+            hyp_id = data.get("hypothesis_id") or key[len(LEGACY_KEY_PREFIX):]
+            if hyp_id in existing:
+                continue
+            record = HypothesisRecord(id=hyp_id)
+            apply_dict(record, data)
+            db.add(record)
+            existing.add(hyp_id)
+            created += 1
+        db.add(
+            SystemState(
+                key=MIGRATION_MARKER_KEY,
+                value=json.dumps({"migrated": created, "at": datetime.datetime.utcnow().isoformat()}),
+            )
+        )
+        db.commit()
+        if created:
+            logger.info("Migrated %d hypotheses from SystemState", created)
+        return created
+
+    # ------------------------------------------------------------------
+    # Cache maintenance
+    def _stamps(self, db: Any) -> Dict[Optional[str], Stamp]:
+        rows = db.execute(
+            select(
+                HypothesisRecord.status,
+                func.count(),
+                func.max(HypothesisRecord.updated_at),
+            ).group_by(HypothesisRecord.status)
+        ).all()
+        return {status: (count, latest) for status, count, latest in rows}
+
+    def _load(self, db: Any, status: Optional[str], since: Optional[datetime.datetime]) -> List[HypothesisRecord]:
+        stmt = select(HypothesisRecord).where(
+            HypothesisRecord.status.is_(None) if status is None else HypothesisRecord.status == status
+        )
+        if since is not None:
+            stmt = stmt.where(HypothesisRecord.updated_at >= since)
+        # Bypass stale identity-map instances held by a long-lived session
+        return list(db.execute(stmt.execution_options(populate_existing=True)).scalars())
+
+    def _bind(self, db: Any) -> None:
+        url = str(getattr(db.get_bind(), "url", ""))
+        if url != self._url:
+            self.migrate(db)
+            self._url = url
+            self._partitions = {}
+            self.version += 1
+
+    def _refresh(self, db: Any, statuses: Optional[Iterable[Optional[str]]]) -> None:
+        self._bind(db)
+        stamps = self._stamps(db)
+        wanted = set(stamps) | set(self._partitions) if statuses is None else set(statuses)
+        for status in wanted:
+            stamp = stamps.get(status, (0, None))
+            part = self._partitions.setdefault(status, _Partition())
+            if part.stamp == stamp:
+                continue
+            count, latest = part.stamp
+            since = latest if count and stamp[0] >= count else None
+            fresh = {r.id: hypothesis_to_dict(r) for r in self._load(db, status, since)}
+            records = {**part.records, **fresh} if since is not None else fresh
+            if len(records) != stamp[0]:
+                # Rows left the partition or changed without bumping
+                # ``updated_at``; fall back to a full reload.
+                records = {r.id: hypothesis_to_dict(r) for r in self._load(db, status, None)}
+            part.records = records
+            part.stamp = stamp
+            self.version += 1
+
+    # ------------------------------------------------------------------
+    # Public API
+    def list(self, db: Any, statuses: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """Return parsed hypotheses, optionally only those in ``statuses``.
+
+        Results are ordered by creation time.  Each dictionary and its
+        ``notes`` list are copies; the other nested values are shared with the
+        cache and must not be mutated.
+        """
+        statuses = None if statuses is None else list(statuses)
+        with self.lock:
+            self._refresh(db, statuses)
+            parts = (
+                self._partitions.values()
+                if statuses is None
+                else (self._partitions[s] for s in statuses)
+            )
+            records = [r for part in parts for r in part.records.values()]
+        records.sort(key=lambda r: (r["created_at"], r["hypothesis_id"]))
+        return [dict(r, notes=list(r["notes"])) for r in records]
+
+    def get(self, db: Any, hypothesis_id: str) -> Optional[Dict[str, Any]]:
+        """Return one parsed hypothesis, read straight from its row."""
+        with self.lock:
+            self._bind(db)
+        record = db.get(HypothesisRecord, hypothesis_id)
+        return hypothesis_to_dict(record) if record is not None else None
+
+    def save(self, db: Any, data: Dict[str, Any]) -> bool:
+        """Write a legacy hypothesis dictionary back to its row."""
+        with self.lock:
+            self._bind(db)
+        hyp_id = data.get("hypothesis_id") or data.get("id")
+        if not hyp_id:
+            return False
+        record = db.get(HypothesisRecord, hyp_id) or HypothesisRecord(id=hyp_id)
+        apply_dict(record, data)
+        db.add(record)
+        try:
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Error saving hypothesis record %s", hyp_id)
+            return False
+        return True
+
+
+_REPOSITORY: Optional[HypothesisRepository] = None
+_REPOSITORY_LOCK = threading.Lock()
+
+
+def get_hypothesis_repository() -> HypothesisRepository:
+    """Return the process-wide :class:`HypothesisRepository` instance."""
+    global _REPOSITORY
+    with _REPOSITORY_LOCK:
+        if _REPOSITORY is None:
+            _REPOSITORY = HypothesisRepository()
+        return _REPOSITORY
@@ -44,6 +44,8 @@ def safe_db_query(db, model, id_field, fallback=None):
 
 # Import the new HypothesisRecord ORM model directly
 from db_models import HypothesisRecord #
+from hypothesis_index import get_hypothesis_index
+from hypothesis_repository import get_hypothesis_repository
 
 
 def _load_hypothesis_record_from_db(db: Session, hypothesis_id: str) -> Optional[HypothesisRecord]:
@@ -98,6 +100,11 @@ def _get_hypothesis_record(db: Session, hypothesis_id: str) -> Optional[Dict[str
     }
 
 
+def _save_hypothesis_record(db: Session, record: Dict[str, Any]) -> bool:
+    """Write a hypothesis dictionary (as returned by the repository) back to its row."""
+    return get_hypothesis_repository().save(db, record)
+
+
 def register_hypothesis(text: str, db: Session, metadata: Optional[Dict[str, Any]] = None) -> str:
     """
     Registers a new hypothesis, storing it using the HypothesisRecord ORM model.
@@ -143,6 +150,7 @@ def register_hypothesis(text: str, db: Session, metadata: Optional[Dict[str, Any
     new_hypothesis_record.notes = "Initial registration.\n" # Start notes as a string
 
     _store_hypothesis_record_to_db(new_hypothesis_record, db)
+    get_hypothesis_index().add(hypothesis_id, text)
     return hypothesis_id
 
 
@@ -219,6 +227,7 @@ def update_hypothesis_score(
     record.history.append(history_entry)
 
     _store_hypothesis_record_to_db(record, db)
+    get_hypothesis_index().add(hypothesis_id, record.description)
     return True
 
 
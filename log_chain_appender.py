@@ -0,0 +1,188 @@
+"""Single-writer, batched appender for the ``log_chain`` hash chain.
+
+Request handlers call :meth:`LogChainAppender.append`, which stamps the
+entry, queues it and returns a future for its hash.  One background thread
+per database drains the queue in arrival order:
+
+- every queued entry is chained in sequence from the current head, so
+  concurrent handlers never race to read the same head;
+- a batch of up to ``Config.FLUSH_BATCH_SIZE`` entries costs one
+  transaction: one head lookup, one insert flush and one commit;
+- ``previous_hash`` is unique, so only one writer can chain onto a given
+  head.  If another process committed onto the head first, the commit fails
+  on that constraint and the batch is re-chained from the new head and
+  retried, up to ``Config.MAX_RETRIES`` times.
+
+The last written hash is kept as :attr:`LogChainAppender.head`; each batch
+re-reads the head inside its own transaction, and the constraint turns a
+head that moved after that read into a retry instead of a fork.
+"""
+
+from __future__ import annotations
+
+import atexit
+import concurrent.futures
+import datetime
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from db_models import LogEntry
+
+logger = logging.getLogger("superNova_2177.log_chain")
+
+
+class Config:
+    # Seconds the writer waits to gather more entries into one batch
+    FLUSH_INTERVAL_SECONDS = 0.05
+    FLUSH_BATCH_SIZE = 256
+    # Times a batch is re-chained after losing the head to another writer
+    MAX_RETRIES = 5
+
+
+@dataclass
+class _Pending:
+    timestamp: datetime.datetime
+    event_type: str
+    payload: Optional[str]
+    future: "concurrent.futures.Future[str]" = field(
+        default_factory=concurrent.futures.Future
+    )
+
+
+class LogChainAppender:
+    """Queue ``LogEntry`` rows for one database and append them in batches."""
+
+    def __init__(self, bind: Any) -> None:
+        self.bind = bind
+        self.head: Optional[str] = None
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._write_lock = threading.Lock()
+        self._pending: List[_Pending] = []
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+
+    def append(
+        self,
+        event_type: str,
+        payload: Optional[str],
+        timestamp: Optional[datetime.datetime] = None,
+    ) -> "concurrent.futures.Future[str]":
+        """Queue an entry; the future resolves to its ``current_hash``."""
+        item = _Pending(timestamp or datetime.datetime.utcnow(), event_type, payload)
+        with self._lock:
+            self._pending.append(item)
+            closed = self._closed
+            if not closed:
+                if self._flusher is None or not self._flusher.is_alive():
+                    self._flusher = threading.Thread(
+                        target=self._run, name="log-chain-appender", daemon=True
+                    )
+                    self._flusher.start()
+                if len(self._pending) == 1 or len(self._pending) >= Config.FLUSH_BATCH_SIZE:
+                    self._wake.notify()
+        if closed:
+            self.flush()
+        return item.future
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._closed:
+                    self._wake.wait()
+                if self._closed:
+                    return
+                if len(self._pending) < Config.FLUSH_BATCH_SIZE:
+                    self._wake.wait(Config.FLUSH_INTERVAL_SECONDS)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to append to the log chain")
+
+    def flush(self) -> None:
+        """Write every queued entry, one transaction per batch."""
+        with self._write_lock:
+            while True:
+                with self._lock:
+                    batch = self._pending[: Config.FLUSH_BATCH_SIZE]
+                    del self._pending[: len(batch)]
+                if not batch:
+                    return
+                self._write(batch)
+
+    def _write(self, batch: List[_Pending]) -> None:
+        error: Optional[BaseException] = None
+        for _ in range(Config.MAX_RETRIES + 1):
+            with Session(bind=self.bind) as db:
+                head = db.execute(
+                    select(LogEntry.current_hash).order_by(LogEntry.id.desc()).limit(1)
+                ).scalar_one_or_none() or ""
+                if self.head is not None and head != self.head:
+                    logger.info("Log chain head moved outside this appender")
+                entries = []
+                for item in batch:
+                    entry = LogEntry(
+                        timestamp=item.timestamp,
+                        event_type=item.event_type,
+                        payload=item.payload,
+                        previous_hash=head,
+                        current_hash="",
+                    )
+                    entry.current_hash = head = entry.compute_hash()
+                    entries.append(entry)
+                db.add_all(entries)
+                try:
+                    db.commit()
+                except IntegrityError as exc:
+                    db.rollback()
+                    error = exc
+                    logger.warning("Log chain head changed during append; retrying")
+                    continue
+                except Exception as exc:
+                    db.rollback()
+                    error = exc
+                    break
+                hashes = [entry.current_hash for entry in entries]
+            self.head = head
+            for item, entry_hash in zip(batch, hashes):
+                item.future.set_result(entry_hash)
+            return
+        for item in batch:
+            item.future.set_exception(error)
+        raise error
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._wake.notify_all()
+        self.flush()
+
+
+_APPENDERS: Dict[Any, LogChainAppender] = {}
+_APPENDERS_LOCK = threading.Lock()
+
+
+def get_log_chain_appender(bind: Any) -> LogChainAppender:
+    """Return the process-wide :class:`LogChainAppender` for ``bind``."""
+    with _APPENDERS_LOCK:
+        appender = _APPENDERS.get(bind)
+        if appender is None:
+            appender = _APPENDERS[bind] = LogChainAppender(bind)
+        return appender
+
+
+@atexit.register
+def _flush_all() -> None:
+    with _APPENDERS_LOCK:
+        appenders = list(_APPENDERS.values())
+    for appender in appenders:
+        try:
+            appender.close()
+        except Exception:
+            logger.exception("Failed to append to the log chain")
@@ -0,0 +1,395 @@
+"""Append-only, hash-chained event log backed by rotating segment files.
+
+Each event is written as one JSON line carrying the wall-clock append time,
+the hash of the previous entry and its own SHA-256 hash.  Segments roll over
+at ``LogChainConfig.SEGMENT_MAX_BYTES`` and fsyncs are grouped so that a burst
+of events costs one disk flush instead of one per entry.
+
+A sparse index (``<filename>.idx``) records ``(time, segment, offset, seq,
+hash)`` every ``INDEX_INTERVAL`` entries and at the start of each segment.
+``replay_events(after=...)`` bisects this index by sequence number and seeks
+straight to the tail of the log, so restart cost scales with the events
+recorded after the last snapshot rather than with the full history.
+Snapshots store :attr:`LogChain.position` rather than a time: append times
+are only as monotonic as the clock they were first read from.
+"""
+
+from __future__ import annotations
+
+import bisect
+import datetime
+import glob
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("superNova_2177.logchain")
+
+GENESIS_HASH = "0" * 64
+
+
+class LogChainConfig:
+    SEGMENT_MAX_BYTES = 16 * 1024 * 1024
+    INDEX_INTERVAL = 256
+    FSYNC_BATCH_SIZE = 64
+    FSYNC_INTERVAL_SECONDS = 0.5
+
+
+def _to_epoch(value: Any) -> Optional[float]:
+    """Normalize ISO strings, datetimes and numbers to a UTC epoch float."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime.datetime):
+        dt = value
+    else:
+        dt = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp()
+
+
+def _canonical(event: Dict[str, Any]) -> str:
+    """Serialize ``event`` exactly as it will read back from disk."""
+    return json.dumps(json.loads(json.dumps(event, default=str)), sort_keys=True)
+
+
+def _entry_hash(prev_hash: str, t: float, event_json: str) -> str:
+    data = f"{prev_hash}|{t!r}|{event_json}"
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class LogChain:
+    """Disk-backed, hash-chained event log with snapshot-aware replay."""
+
+    def __init__(
+        self,
+        filename: str,
+        *,
+        segment_max_bytes: int = LogChainConfig.SEGMENT_MAX_BYTES,
+        index_interval: int = LogChainConfig.INDEX_INTERVAL,
+        fsync_batch_size: int = LogChainConfig.FSYNC_BATCH_SIZE,
+        fsync_interval: float = LogChainConfig.FSYNC_INTERVAL_SECONDS,
+    ) -> None:
+        self.filename = filename
+        self.segment_max_bytes = segment_max_bytes
+        self.index_interval = max(1, index_interval)
+        self.fsync_batch_size = max(1, fsync_batch_size)
+        self.fsync_interval = fsync_interval
+        self.lock = threading.RLock()
+        # Sparse index rows: (t, segment, offset, seq, prev_hash)
+        self._index: List[Tuple[float, int, int, int, str]] = []
+        self._index_times: List[float] = []
+        self._count = 0
+        self._last_hash = GENESIS_HASH
+        self._last_t = 0.0
+        self._segment = 0
+        self._fh = None
+        self._pending_sync = 0
+        self._last_sync = time.monotonic()
+        self._open()
+
+    # ------------------------------------------------------------------
+    # File layout helpers
+    def _segment_path(self, segment: int) -> str:
+        return f"{self.filename}.{segment:06d}"
+
+    def _index_path(self) -> str:
+        return f"{self.filename}.idx"
+
+    def _segments(self) -> List[int]:
+        found = []
+        for path in glob.glob(f"{glob.escape(self.filename)}.[0-9]*"):
+            suffix = path.rsplit(".", 1)[-1]
+            if suffix.isdigit():
+                found.append(int(suffix))
+        return sorted(found)
+
+    # ------------------------------------------------------------------
+    # Recovery
+    def _open(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.filename))
+        os.makedirs(directory, exist_ok=True)
+        segments = self._segments()
+        self._load_index(set(segments))
+        if segments:
+            self._segment = segments[-1]
+            self._recover_tail()
+        self._fh = open(self._segment_path(self._segment), "ab")
+        if not self._index or self._index[-1][1] != self._segment:
+            if self._fh.tell() == 0:
+                self._checkpoint(self._last_t, self._segment, 0)
+
+    def _load_index(self, segments: set) -> None:
+        path = self._index_path()
+        if not os.path.exists(path):
+            return
+        rows = []
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    t, seg, off, seq, prev = json.loads(line)
+                except ValueError:
+                    break  # torn trailing write
+                if seg not in segments:
+                    continue
+                rows.append((float(t), int(seg), int(off), int(seq), str(prev)))
+        self._index = rows
+        self._index_times = [r[0] for r in rows]
+
+    def _recover_tail(self) -> None:
+        """Scan from the last checkpoint to find the head hash and count."""
+        tail = [r for r in self._index if r[1] == self._segment]
+        if not tail:
+            # Missing or stale index: rebuild it from the segments once
+            self._index, self._index_times = [], []
+            self._rebuild()
+            return
+        _, _, start_off, seq, prev = tail[-1]
+        path = self._segment_path(self._segment)
+        good_end = start_off
+        with open(path, "rb") as fh:
+            fh.seek(start_off)
+            for raw in fh:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    rec = json.loads(raw)
+                except ValueError:
+                    break
+                prev = rec["hash"]
+                self._last_t = rec["t"]
+                seq += 1
+                good_end += len(raw)
+        if good_end < os.path.getsize(path):
+            logger.warning("Truncating torn tail of %s at offset %d", path, good_end)
+            with open(path, "r+b") as fh:
+                fh.truncate(good_end)
+        self._count = seq
+        self._last_hash = prev
+
+    def _rebuild(self) -> None:
+        """Recreate the sparse index by scanning every segment once."""
+        logger.info("Rebuilding logchain index for %s", self.filename)
+        try:
+            os.remove(self._index_path())
+        except FileNotFoundError:
+            pass
+        seq, prev, last_t = 0, GENESIS_HASH, 0.0
+        for seg in self._segments():
+            offset = 0
+            self._checkpoint(last_t, seg, 0, seq=seq, prev=prev)
+            with open(self._segment_path(seg), "rb") as fh:
+                for raw in fh:
+                    if not raw.endswith(b"\n"):
+                        break
+                    rec = json.loads(raw)
+                    if seq and seq % self.index_interval == 0:
+                        self._checkpoint(rec["t"], seg, offset, seq=seq, prev=prev)
+                    prev, last_t = rec["hash"], rec["t"]
+                    offset += len(raw)
+                    seq += 1
+            if offset < os.path.getsize(self._segment_path(seg)):
+                logger.warning("Truncating torn tail of segment %d at %d", seg, offset)
+                with open(self._segment_path(seg), "r+b") as fh:
+                    fh.truncate(offset)
+            self._segment = seg
+        self._count, self._last_hash, self._last_t = seq, prev, last_t
+
+    def _checkpoint(
+        self,
+        t: float,
+        segment: int,
+        offset: int,
+        *,
+        seq: Optional[int] = None,
+        prev: Optional[str] = None,
+    ) -> None:
+        row = (
+            t,
+            segment,
+            offset,
+            self._count if seq is None else seq,
+            self._last_hash if prev is None else prev,
+        )
+        self._index.append(row)
+        self._index_times.append(t)
+        with open(self._index_path(), "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(list(row)) + "\n")
+
+    # ------------------------------------------------------------------
+    # Writing
+    def add(self, event: Dict[str, Any]) -> str:
+        """Append ``event`` and return its chain hash."""
+        event_json = _canonical(event)
+        with self.lock:
+            # Monotonic append times keep the index bisectable
+            t = max(time.time(), self._last_t)
+            if self._fh.tell() >= self.segment_max_bytes:
+                self._rotate(t)
+            elif self._count and self._count % self.index_interval == 0:
+                self._checkpoint(t, self._segment, self._fh.tell())
+            h = _entry_hash(self._last_hash, t, event_json)
+            line = (
+                json.dumps({"t": t, "prev": self._last_hash, "hash": h}, sort_keys=True)[:-1]
+                + f', "event": {event_json}}}\n'
+            )
+            self._fh.write(line.encode("utf-8"))
+            self._fh.flush()
+            self._last_hash, self._last_t = h, t
+            self._count += 1
+            self._pending_sync += 1
+            if (
+                self._pending_sync >= self.fsync_batch_size
+                or time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync_locked()
+            return h
+
+    def _rotate(self, t: float) -> None:
+        self._sync_locked()
+        self._fh.close()
+        self._segment += 1
+        self._fh = open(self._segment_path(self._segment), "ab")
+        self._checkpoint(t, self._segment, 0)
+
+    def _sync_locked(self) -> None:
+        if self._pending_sync:
+            os.fsync(self._fh.fileno())
+        self._pending_sync = 0
+        self._last_sync = time.monotonic()
+
+    def sync(self) -> None:
+        """Force buffered entries to stable storage."""
+        with self.lock:
+            self._sync_locked()
+
+    def close(self) -> None:
+        with self.lock:
+            if self._fh is not None and not self._fh.closed:
+                self._sync_locked()
+                self._fh.close()
+
+    # ------------------------------------------------------------------
+    # Reading
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def last_hash(self) -> str:
+        return self._last_hash
+
+    @property
+    def position(self) -> Tuple[int, str]:
+        """``(entry count, head hash)``; replay with ``after`` set to the count."""
+        with self.lock:
+            return self._count, self._last_hash
+
+    def _start_position(
+        self, since: Optional[float], after: Optional[int] = None
+    ) -> Tuple[int, int, int, str]:
+        """Return ``(segment, offset, seq, prev_hash)`` to begin a scan."""
+        if (since is None and after is None) or not self._index:
+            if self._index:
+                _, seg, off, seq, prev = self._index[0]
+                return seg, off, seq, prev
+            return self._segment, 0, 0, GENESIS_HASH
+        if after is not None:
+            pos = bisect.bisect_right([row[3] for row in self._index], after) - 1
+        else:
+            pos = bisect.bisect_right(self._index_times, since) - 1
+        _, seg, off, seq, prev = self._index[max(pos, 0)]
+        return seg, off, seq, prev
+
+    def _iter_records(
+        self, since: Optional[float] = None, after: Optional[int] = None
+    ) -> Iterator[Tuple[int, Dict[str, Any], bytes, str]]:
+        with self.lock:
+            self._fh.flush()
+            segment, offset, seq, prev = self._start_position(since, after)
+            last_segment = self._segment
+        for seg in range(segment, last_segment + 1):
+            path = self._segment_path(seg)
+            if not os.path.exists(path):
+                continue
+            with open(path, "rb") as fh:
+                if seg == segment:
+                    fh.seek(offset)
+                for raw in fh:
+                    if not raw.endswith(b"\n"):
+                        return
+                    rec = json.loads(raw)
+                    yield seq, rec, raw, prev
+                    prev = rec["hash"]
+                    seq += 1
+
+    def iter_events(
+        self, since: Any = None, *, after: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield events appended strictly after ``since`` or after the first ``after`` entries."""
+        cutoff = _to_epoch(since)
+        for seq, rec, _, _ in self._iter_records(cutoff, after):
+            if cutoff is not None and rec["t"] <= cutoff:
+                continue
+            if after is not None and seq < after:
+                continue
+            yield rec["event"]
+
+    def replay_events(
+        self,
+        apply: Callable[[Dict[str, Any]], None],
+        since: Any | None = None,
+        *,
+        after: Optional[int] = None,
+    ) -> int:
+        """Apply events recorded after ``since`` (or ``after`` entries) and return how many ran."""
+        count = 0
+        for event in self.iter_events(since, after=after):
+            apply(event)
+            count += 1
+        return count
+
+    @property
+    def entries(self) -> List[Dict[str, Any]]:
+        """Full event history. Reads every segment; prefer :meth:`iter_events`."""
+        return list(self.iter_events())
+
+    def verify(
+        self,
+        since: Any | None = None,
+        *,
+        after: Optional[int] = None,
+        head: Optional[str] = None,
+    ) -> bool:
+        """Recompute the hash chain.
+
+        With ``since`` the scan starts at the checkpoint before that time.
+        With ``after`` only entries past that position are checked, and
+        ``head`` must be the hash of the entry they chain from.
+        """
+        cutoff = _to_epoch(since)
+        if after is not None and after > len(self):
+            logger.error("Logchain is shorter than position %d", after)
+            return False
+        if head is not None and after == len(self) and self.last_hash != head:
+            logger.error("Logchain head does not match %s", head)
+            return False
+        for seq, rec, raw, prev in self._iter_records(cutoff, after):
+            if after is not None and seq < after:
+                continue
+            if head is not None and seq == after and prev != head:
+                logger.error("Logchain does not continue from %s", head)
+                return False
+            if rec.get("prev") != prev:
+                logger.error("Logchain link broken at %s", rec.get("hash"))
+                return False
+            event_json = json.dumps(rec["event"], sort_keys=True)
+            if _entry_hash(prev, rec["t"], event_json) != rec["hash"]:
+                logger.error("Logchain hash mismatch at %s", rec.get("hash"))
+                return False
+        return True
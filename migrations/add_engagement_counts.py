@@ -0,0 +1,34 @@
+"""Add like/follow counter columns and reverse indexes, then backfill counts."""
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Session
+
+import engagement
+from db_models import engine
+
+
+def migrate(bind=None):
+    bind = bind or engine
+    with bind.begin() as conn:
+        inspector = inspect(conn)
+        cols = {c['name'] for c in inspector.get_columns('harmonizers')}
+        for name in ('followers_count', 'following_count'):
+            if name not in cols:
+                conn.execute(text(f'ALTER TABLE harmonizers ADD COLUMN {name} INTEGER DEFAULT 0'))
+        cols = {c['name'] for c in inspector.get_columns('vibenodes')}
+        if 'likes_count' not in cols:
+            conn.execute(text('ALTER TABLE vibenodes ADD COLUMN likes_count INTEGER DEFAULT 0'))
+        conn.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_harmonizer_follows_followed '
+            'ON harmonizer_follows (followed_id, follower_id)'
+        ))
+        conn.execute(text(
+            'CREATE INDEX IF NOT EXISTS ix_vibenode_likes_vibenode '
+            'ON vibenode_likes (vibenode_id, harmonizer_id)'
+        ))
+    with Session(bind=bind) as db:
+        engagement.recount(db)
+        db.commit()
+
+if __name__ == '__main__':
+    migrate()
+    print('Migration complete')
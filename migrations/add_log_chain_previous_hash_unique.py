@@ -0,0 +1,22 @@
+"""Make log_chain.previous_hash unique so concurrent appenders cannot fork the chain."""
+from sqlalchemy import text
+
+from db_models import engine
+
+
+def migrate(bind=None):
+    bind = bind or engine
+    with bind.begin() as conn:
+        forks = conn.execute(text(
+            'SELECT previous_hash FROM log_chain GROUP BY previous_hash HAVING COUNT(*) > 1'
+        )).scalars().all()
+        if forks:
+            raise RuntimeError(f'log_chain already forks after {len(forks)} entries: {forks[:5]}')
+        conn.execute(text(
+            'CREATE UNIQUE INDEX IF NOT EXISTS ix_log_chain_previous_hash '
+            'ON log_chain (previous_hash)'
+        ))
+
+if __name__ == '__main__':
+    migrate()
+    print('Migration complete')
@@ -0,0 +1,247 @@
+"""
+graph_analytics.py — Cached network analytics for ``/network-analysis``
+
+Builds the harmonizer/VibeNode graph (follows, authorship, likes and
+entanglements) from five column-only queries, computes degree centrality and
+a k-source sampled betweenness estimate, and publishes the result as an
+immutable snapshot.  Requests page through the snapshot instead of building
+a graph and running ``O(V*E)`` betweenness per call.
+
+Refreshes run in the background.  A refresh reloads the edge list and only
+recomputes centrality when the graph structure changed; label and score
+attribute changes are applied on their own.
+
+Betweenness is estimated from ``Config.BETWEENNESS_SAMPLES`` source nodes as
+in :func:`networkx.betweenness_centrality` with ``k`` set.  Each sampled
+source contributes a term in ``[0, n / (n - 1)]`` to a node's normalized
+score, so by Hoeffding's inequality the estimate is within
+``n / (n - 1) * sqrt(ln(2 / (1 - confidence)) / (2 * k))`` of the exact
+value with the reported confidence.  When ``k >= n`` the result is exact.
+"""
+
+import datetime
+import logging
+import math
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import networkx as nx
+
+logger = logging.getLogger("superNova_2177.graph_analytics")
+logger.propagate = False
+
+
+class Config:
+    BETWEENNESS_SAMPLES = 256
+    BETWEENNESS_CONFIDENCE = 0.95
+    # Fixed so unchanged graphs keep identical estimates across refreshes
+    SAMPLE_SEED = 2177
+
+
+Edge = Tuple[str, str, Dict[str, Any]]
+
+
+@dataclass(frozen=True)
+class GraphSnapshot:
+    """One computed view of the network, safe to share between requests."""
+
+    harmonizers: List[Dict[str, Any]] = field(default_factory=list)
+    vibenodes: List[Dict[str, Any]] = field(default_factory=list)
+    out_edges: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+    def page(self, skip: int = 0, limit: int = 100) -> Dict[str, Any]:
+        """Return ``limit`` harmonizers and VibeNodes after ``skip`` with their out-edges."""
+        if not self.metrics:
+            return {"nodes": [], "edges": [], "metrics": {}}
+        skip = max(0, skip)
+        end = skip + max(0, limit)
+        nodes = self.harmonizers[skip:end] + self.vibenodes[skip:end]
+        edges = [e for node in nodes for e in self.out_edges.get(node["id"], ())]
+        return {"nodes": nodes, "edges": edges, "metrics": self.metrics}
+
+
+def betweenness_error_bound(n: int, k: int, confidence: float) -> float:
+    """Hoeffding bound on the normalized betweenness error from ``k`` of ``n`` sources."""
+    if n < 3 or k >= n:
+        return 0.0
+    return n / (n - 1) * math.sqrt(math.log(2.0 / (1.0 - confidence)) / (2.0 * k))
+
+
+class GraphAnalytics:
+    """Background-refreshed centrality for the harmonizer/VibeNode graph."""
+
+    def __init__(
+        self,
+        samples: int = Config.BETWEENNESS_SAMPLES,
+        confidence: float = Config.BETWEENNESS_CONFIDENCE,
+        seed: int = Config.SAMPLE_SEED,
+    ) -> None:
+        self.samples = samples
+        self.confidence = confidence
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.snapshot: Optional[GraphSnapshot] = None
+        self._edges: Optional[List[Tuple[str, str]]] = None
+        self._nodes: Optional[frozenset] = None
+        self._centrality: Dict[str, Tuple[float, float]] = {}
+        self._structure_metrics: Dict[str, Any] = {}
+        self.last_recomputed = False
+
+    # ------------------------------------------------------------------
+    # Loading
+    @staticmethod
+    def _load(db: Any) -> Tuple[List[Tuple[str, Dict[str, Any]]], List[Edge]]:
+        """Read nodes and edges with column-only queries, one per relation."""
+        from sqlalchemy import select
+
+        from db_models import (Harmonizer, VibeNode, harmonizer_follows,
+                               vibenode_entanglements, vibenode_likes)
+
+        harmonizers = db.execute(
+            select(Harmonizer.id, Harmonizer.username, Harmonizer.harmony_score).order_by(
+                Harmonizer.id
+            )
+        ).all()
+        follows = db.execute(
+            select(harmonizer_follows.c.follower_id, harmonizer_follows.c.followed_id)
+        ).all()
+        vibenodes = db.execute(
+            select(VibeNode.id, VibeNode.name, VibeNode.echo, VibeNode.author_id).order_by(
+                VibeNode.id
+            )
+        ).all()
+        likes = db.execute(
+            select(vibenode_likes.c.vibenode_id, vibenode_likes.c.harmonizer_id).order_by(
+                vibenode_likes.c.vibenode_id
+            )
+        ).all()
+        entanglements = db.execute(
+            select(
+                vibenode_entanglements.c.source_id,
+                vibenode_entanglements.c.target_id,
+                vibenode_entanglements.c.strength,
+            ).order_by(vibenode_entanglements.c.source_id)
+        ).all()
+
+        nodes: List[Tuple[str, Dict[str, Any]]] = []
+        edges: List[Edge] = []
+        for uid, username, harmony in harmonizers:
+            nodes.append(
+                (
+                    f"h_{uid}",
+                    {"label": username, "type": "harmonizer", "harmony_score": float(harmony)},
+                )
+            )
+        for follower, followed in follows:
+            edges.append((f"h_{follower}", f"h_{followed}", {"type": "follow"}))
+        likes_by_node: Dict[int, List[int]] = {}
+        for vid, uid in likes:
+            likes_by_node.setdefault(vid, []).append(uid)
+        entangled_by_node: Dict[int, List[Tuple[int, float]]] = {}
+        for source, target, strength in entanglements:
+            entangled_by_node.setdefault(source, []).append((target, strength))
+        for vid, name, echo, author_id in vibenodes:
+            node = f"v_{vid}"
+            nodes.append((node, {"label": name, "type": "vibenode", "echo": float(echo)}))
+            edges.append((f"h_{author_id}", node, {"type": "created"}))
+            for uid in likes_by_node.get(vid, ()):
+                edges.append((f"h_{uid}", node, {"type": "liked"}))
+            for target, strength in entangled_by_node.get(vid, ()):
+                edges.append(
+                    (node, f"v_{target}", {"type": "entangled", "strength": strength})
+                )
+        return nodes, edges
+
+    # ------------------------------------------------------------------
+    # Computing
+    def _compute(self, graph: "nx.DiGraph") -> None:
+        n = graph.number_of_nodes()
+        k = min(self.samples, n)
+        degree = nx.degree_centrality(graph)
+        betweenness = nx.betweenness_centrality(
+            graph, k=k if k < n else None, seed=random.Random(self.seed)
+        )
+        self._centrality = {
+            node: (degree.get(node, 0), betweenness.get(node, 0)) for node in graph
+        }
+        self._structure_metrics = {
+            "node_count": n,
+            "edge_count": graph.number_of_edges(),
+            "density": nx.density(graph),
+            "is_strongly_connected": nx.is_strongly_connected(graph) if n else False,
+            "betweenness_sample_size": k,
+            "betweenness_error_bound": betweenness_error_bound(n, k, self.confidence),
+            "betweenness_confidence": self.confidence,
+        }
+
+    def refresh(self, db: Any) -> GraphSnapshot:
+        """Reload the graph from ``db`` and publish a new snapshot.
+
+        Centrality is recomputed only when nodes or edges changed.
+        """
+        nodes, edges = self._load(db)
+        with self.lock:
+            graph = nx.DiGraph()
+            graph.add_nodes_from(nodes)
+            for u, v, attrs in edges:
+                graph.add_edge(u, v, **attrs)
+            structure = list(graph.edges)
+            node_set = frozenset(graph.nodes)
+            self.last_recomputed = structure != self._edges or node_set != self._nodes
+            if self.last_recomputed:
+                self._compute(graph)
+                self._edges, self._nodes = structure, node_set
+
+            harmonizers: List[Dict[str, Any]] = []
+            vibenodes: List[Dict[str, Any]] = []
+            for node, attrs in nodes:
+                degree, betweenness = self._centrality.get(node, (0, 0))
+                entry = {
+                    "id": node,
+                    **attrs,
+                    "degree_centrality": degree,
+                    "betweenness_centrality": betweenness,
+                }
+                (harmonizers if attrs["type"] == "harmonizer" else vibenodes).append(entry)
+            out_edges: Dict[str, List[Dict[str, Any]]] = {}
+            for u, v, attrs in graph.edges(data=True):
+                out_edges.setdefault(u, []).append({"source": u, "target": v, **attrs})
+            metrics = (
+                {
+                    **self._structure_metrics,
+                    "computed_at": datetime.datetime.utcnow().isoformat(),
+                }
+                if graph.number_of_nodes()
+                else {}
+            )
+            self.snapshot = GraphSnapshot(harmonizers, vibenodes, out_edges, metrics)
+        logger.info(
+            "Graph analytics refresh: %d nodes, %d edges, recomputed=%s",
+            len(node_set),
+            len(structure),
+            self.last_recomputed,
+        )
+        return self.snapshot
+
+    def ensure(self, db: Any) -> GraphSnapshot:
+        """Return the current snapshot, computing one on first use."""
+        snapshot = self.snapshot
+        if snapshot is None:
+            snapshot = self.refresh(db)
+        return snapshot
+
+
+_ANALYTICS: Optional[GraphAnalytics] = None
+_ANALYTICS_LOCK = threading.Lock()
+
+
+def get_graph_analytics() -> GraphAnalytics:
+    """Return the process-wide :class:`GraphAnalytics` instance."""
+    global _ANALYTICS
+    with _ANALYTICS_LOCK:
+        if _ANALYTICS is None:
+            _ANALYTICS = GraphAnalytics()
+        return _ANALYTICS
@@ -16,23 +16,42 @@ To avoid issues when running under Streamlit, the detection functions use
 ``ThreadPoolExecutor`` by default instead of spawning new processes. Set the
 ``COORDINATION_USE_PROCESS_POOL`` environment variable to ``1`` to force the
 use of ``ProcessPoolExecutor`` when true concurrency is desirable.
+
+Temporal coordination sweeps one time-ordered event array instead of
+comparing every validator pair: ``searchsorted`` finds where each event's
+window ends and close cross-validator pairs are counted in batches.  Process
+pool workers read the timeline from ``multiprocessing.shared_memory`` rather
+than receiving pickled timestamp lists.
 """
 
 import itertools
 import logging
 import math
 import os
+from bisect import bisect_right
 from collections import defaultdict
 from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
-from datetime import datetime, timedelta
+from datetime import timedelta
 from functools import lru_cache
-from multiprocessing import get_context
+from multiprocessing import get_context, shared_memory
 from statistics import mean
-from typing import Any, Dict, List, Set, Tuple
+from typing import Any, Dict, List, Set, Tuple, Union
+
+try:
+    import numpy as np
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore[assignment]
+
+from embedding_service import get_embedding_service
+from validation_batch import ValidationBatch
 
 logger = logging.getLogger("superNova_2177.coordination")
 logger.propagate = False
 
+_MICROSECOND = timedelta(microseconds=1)
+
+ValidationInput = Union[List[Dict[str, Any]], ValidationBatch]
+
 # Use threads by default because spawning new processes can fail in
 # restricted environments like Streamlit. Set the environment variable
 # ``COORDINATION_USE_PROCESS_POOL=1`` to force ``ProcessPoolExecutor``.
@@ -43,6 +62,8 @@ class Config:
     # Temporal coordination thresholds
     TEMPORAL_WINDOW_MINUTES = 5
     MIN_TEMPORAL_OCCURRENCES = 3
+    # Close event pairs expanded per sweep batch
+    TEMPORAL_PAIR_BATCH = 1_000_000
 
     # Score similarity thresholds
     SCORE_SIMILARITY_THRESHOLD = 0.1
@@ -54,6 +75,8 @@ class Config:
 
     # Semantic similarity (placeholder for future NLP)
     SEMANTIC_SIMILARITY_THRESHOLD = 0.8
+    # Encoder the threshold above was tuned for
+    SEMANTIC_MODEL_NAME = "paraphrase-MiniLM-L6-v2"
     REPEATED_PHRASE_MIN_LENGTH = 10
 
     # Risk scoring parameters
@@ -63,31 +86,25 @@ class Config:
     SEMANTIC_WEIGHT = 0.2
 
 
-@lru_cache(maxsize=1024)
-def _parse_timestamp(ts: str) -> datetime:
-    """Memoized ISO8601 parser used by temporal coordination."""
-    return datetime.fromisoformat(ts.replace("Z", "+00:00"))
-
-
-def build_validation_graph(validations: List[Dict[str, Any]]) -> Dict[str, Any]:
+def build_validation_graph(validations: ValidationInput) -> Dict[str, Any]:
     """
     Build a graph of validator relationships based on co-validation patterns.
 
     Args:
-        validations: List of validation records
+        validations: List of validation records or a parsed ``ValidationBatch``
 
     Returns:
         Dict containing graph structure and metadata
     """
+    batch = ValidationBatch.of(validations)
     hypothesis_validators = defaultdict(list)
-    validator_data = defaultdict(list)
+    validator_data: Dict[str, None] = {}
 
-    for v in validations:
-        validator_id = v.get("validator_id")
-        hypothesis_id = v.get("hypothesis_id")
-        if validator_id and hypothesis_id:
-            hypothesis_validators[hypothesis_id].append(validator_id)
-            validator_data[validator_id].append(v)
+    for validator, hypothesis in zip(batch.validator.tolist(), batch.hypothesis.tolist()):
+        if validator >= 0 and hypothesis >= 0:
+            validator_id = batch.validators[validator]
+            hypothesis_validators[batch.hypotheses[hypothesis]].append(validator_id)
+            validator_data.setdefault(validator_id)
 
     edges = []
     edge_weights = defaultdict(float)
@@ -163,27 +180,116 @@ def detect_graph_communities(
     return communities
 
 
-def _temporal_worker(
-    pairs: List[Tuple[str, str, List[datetime], List[datetime]]],
-    window: timedelta,
-) -> Tuple[List[Dict[str, Any]], List[str]]:
-    clusters: List[Dict[str, Any]] = []
-    flags: List[str] = []
-    for v1, v2, ts1_list, ts2_list in pairs:
-        close_submissions = sum(
-            1 for ts1 in ts1_list for ts2 in ts2_list if abs(ts1 - ts2) <= window
-        )
-        if close_submissions >= Config.MIN_TEMPORAL_OCCURRENCES:
-            coordination_likelihood = min(1.0, close_submissions / 10.0)
-            clusters.append(
-                {
-                    "validators": [v1, v2],
-                    "close_submissions": close_submissions,
-                    "coordination_likelihood": coordination_likelihood,
-                }
+def _sweep_slice(owners: Any, ends: Any, start: int, stop: int, n: int) -> Tuple[Any, Any]:
+    """Count close cross-validator event pairs opened by events ``start:stop``.
+
+    ``ends[i]`` is the first timeline index past event ``i``'s window, so the
+    partners of ``i`` are exactly ``i + 1 .. ends[i] - 1``.  Pairs are keyed
+    ``lo * n + hi`` by validator index and returned as unique keys and counts.
+    """
+    idx = np.arange(start, stop, dtype=np.int64)
+    span = ends[start:stop] - idx - 1
+    total = int(span.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    first = np.repeat(idx, span)
+    offsets = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(span) - span, span)
+    a = owners[first]
+    b = owners[first + 1 + offsets]
+    keep = a != b
+    a, b = a[keep], b[keep]
+    return np.unique(np.minimum(a, b) * n + np.maximum(a, b), return_counts=True)
+
+
+def _temporal_shm_worker(
+    name: str, size: int, start: int, stop: int, n: int
+) -> Tuple[Any, Any]:
+    """Process-pool entry point reading the timeline from shared memory."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        timeline = np.ndarray((2, size), dtype=np.int64, buffer=shm.buf)
+        result = _sweep_slice(timeline[0], timeline[1], start, stop, n)
+        del timeline
+        return result
+    finally:
+        shm.close()
+
+
+def _sweep_ranges(span: Any, batch: int) -> List[Tuple[int, int]]:
+    """Split the timeline so each range expands to about ``batch`` pairs."""
+    cum = np.cumsum(span)
+    ranges: List[Tuple[int, int]] = []
+    start, done, size = 0, 0, len(span)
+    while start < size:
+        stop = int(np.searchsorted(cum, done + batch, side="right"))
+        stop = min(size, max(stop, start + 1))
+        ranges.append((start, stop))
+        done = int(cum[stop - 1])
+        start = stop
+    return ranges
+
+
+def _temporal_pair_counts_numpy(
+    times: List[int], owners: List[int], window: int, n: int
+) -> Dict[Tuple[int, int], int]:
+    t = np.asarray(times, dtype=np.int64)
+    order = np.argsort(t, kind="stable")
+    t = t[order]
+    own = np.asarray(owners, dtype=np.int64)[order]
+    ends = np.searchsorted(t, t + window, side="right").astype(np.int64)
+    span = ends - np.arange(len(t), dtype=np.int64) - 1
+    total = int(span.sum())
+    if total == 0:
+        return {}
+    cpu_count = os.cpu_count() or 1
+    batch = max(1, min(Config.TEMPORAL_PAIR_BATCH, -(-total // cpu_count)))
+    ranges = _sweep_ranges(span, batch)
+
+    if len(ranges) == 1:
+        parts = [_sweep_slice(own, ends, 0, len(t), n)]
+    elif USE_PROCESS_POOL:
+        shm = shared_memory.SharedMemory(create=True, size=2 * len(t) * 8)
+        try:
+            timeline = np.ndarray((2, len(t)), dtype=np.int64, buffer=shm.buf)
+            timeline[0] = own
+            timeline[1] = ends
+            del timeline
+            with ProcessPoolExecutor(mp_context=get_context("spawn")) as executor:
+                futures = [
+                    executor.submit(_temporal_shm_worker, shm.name, len(t), a, b, n)
+                    for a, b in ranges
+                ]
+                parts = [f.result() for f in futures]
+        finally:
+            shm.close()
+            shm.unlink()
+    else:
+        with ThreadPoolExecutor() as executor:
+            parts = list(
+                executor.map(lambda r: _sweep_slice(own, ends, r[0], r[1], n), ranges)
             )
-            flags.append(f"temporal_coordination_{v1}_{v2}")
-    return clusters, flags
+
+    keys = np.concatenate([k for k, _ in parts])
+    counts = np.concatenate([c for _, c in parts])
+    merged, inverse = np.unique(keys, return_inverse=True)
+    totals = np.bincount(inverse, weights=counts).astype(np.int64)
+    return {
+        (int(k) // n, int(k) % n): int(c) for k, c in zip(merged.tolist(), totals.tolist())
+    }
+
+
+def _temporal_pair_counts_python(
+    times: List[int], owners: List[int], window: int, n: int
+) -> Dict[Tuple[int, int], int]:
+    events = sorted(zip(times, owners), key=lambda e: e[0])
+    ts = [e[0] for e in events]
+    counts: Dict[Tuple[int, int], int] = defaultdict(int)
+    for i, (t, a) in enumerate(events):
+        for j in range(i + 1, bisect_right(ts, t + window, i + 1)):
+            b = events[j][1]
+            if a != b:
+                counts[(a, b) if a < b else (b, a)] += 1
+    return counts
 
 
 def _score_worker(
@@ -207,82 +313,73 @@ def _score_worker(
     return clusters, flags
 
 
-def detect_temporal_coordination(validations: List[Dict[str, Any]]) -> Dict[str, Any]:
+def detect_temporal_coordination(validations: ValidationInput) -> Dict[str, Any]:
     """
     Detect validators who consistently submit validations within suspicious time windows.
 
     Args:
-        validations: List of validation records
+        validations: List of validation records or a parsed ``ValidationBatch``
 
     Returns:
         Dict with temporal coordination analysis
     """
-    validator_timestamps = defaultdict(list)
-
-    for v in validations:
-        validator_id = v.get("validator_id")
-        timestamp_str = v.get("timestamp")
-        if not validator_id or not timestamp_str:
-            continue
-        try:
-            timestamp = _parse_timestamp(timestamp_str)
-            validator_timestamps[validator_id].append(timestamp)
-        except Exception as e:
-            logger.warning(f"Invalid timestamp for validator {validator_id}: {e}")
-            continue
+    batch = ValidationBatch.of(validations)
+    groups = batch.group_rows("validator", batch.has_timestamp)
+    validators = [batch.validators[code] for code, _ in groups]
+    times: List[int] = []
+    owners: List[int] = []
+    for index, (_, rows) in enumerate(groups):
+        times.extend(batch.micros[rows].tolist())
+        owners.extend([index] * len(rows))
+    window = timedelta(minutes=Config.TEMPORAL_WINDOW_MINUTES) // _MICROSECOND
+
+    count_pairs = (
+        _temporal_pair_counts_numpy if np is not None else _temporal_pair_counts_python
+    )
+    pair_counts = count_pairs(times, owners, window, len(validators))
 
     temporal_clusters: List[Dict[str, Any]] = []
     flags: List[str] = []
-    validators = list(validator_timestamps.keys())
-    window = timedelta(minutes=Config.TEMPORAL_WINDOW_MINUTES)
-
-    pairs = [
-        (v1, v2, validator_timestamps[v1], validator_timestamps[v2])
-        for v1, v2 in itertools.combinations(validators, 2)
-    ]
-
-    if not pairs:
-        return {"temporal_clusters": [], "flags": []}
-
-    cpu_count = os.cpu_count() or 1
-    chunk_size = max(1, (len(pairs) + cpu_count - 1) // cpu_count)
-    chunks = [
-        pairs[i : i + chunk_size]  # noqa: E203
-        for i in range(0, len(pairs), chunk_size)
-    ]
-
-    executor_cls = ProcessPoolExecutor if USE_PROCESS_POOL else ThreadPoolExecutor
-    ctx = {"mp_context": get_context("spawn")} if USE_PROCESS_POOL else {}
-    with executor_cls(**ctx) as executor:
-        results = executor.map(_temporal_worker, chunks, itertools.repeat(window))
-        for clusters, chunk_flags in results:
-            temporal_clusters.extend(clusters)
-            flags.extend(chunk_flags)
+    # Sorted (lo, hi) validator indices reproduce ``combinations`` order
+    for lo, hi in sorted(pair_counts):
+        close_submissions = pair_counts[(lo, hi)]
+        if close_submissions < Config.MIN_TEMPORAL_OCCURRENCES:
+            continue
+        v1, v2 = validators[lo], validators[hi]
+        temporal_clusters.append(
+            {
+                "validators": [v1, v2],
+                "close_submissions": close_submissions,
+                "coordination_likelihood": min(1.0, close_submissions / 10.0),
+            }
+        )
+        flags.append(f"temporal_coordination_{v1}_{v2}")
 
     return {"temporal_clusters": temporal_clusters, "flags": flags}
 
 
-def detect_score_coordination(validations: List[Dict[str, Any]]) -> Dict[str, Any]:
+def detect_score_coordination(validations: ValidationInput) -> Dict[str, Any]:
     """
     Detect validators who give suspiciously similar scores across multiple hypotheses.
 
     Args:
-        validations: List of validation records
+        validations: List of validation records or a parsed ``ValidationBatch``
 
     Returns:
         Dict with score coordination analysis
     """
+    batch = ValidationBatch.of(validations)
     hypothesis_scores = defaultdict(dict)
 
-    for v in validations:
-        validator_id = v.get("validator_id")
-        hypothesis_id = v.get("hypothesis_id")
-        score = v.get("score")
-        if validator_id and hypothesis_id and score is not None:
-            try:
-                hypothesis_scores[hypothesis_id][validator_id] = float(score)
-            except (ValueError, TypeError):
-                continue
+    scored = (
+        batch.score_ok & batch.score_given & (batch.validator >= 0) & (batch.hypothesis >= 0)
+    ).nonzero()[0]
+    for validator, hypothesis, score in zip(
+        batch.validator[scored].tolist(),
+        batch.hypothesis[scored].tolist(),
+        batch.score[scored].tolist(),
+    ):
+        hypothesis_scores[batch.hypotheses[hypothesis]][batch.validators[validator]] = score
 
     validator_pairs = defaultdict(list)
 
@@ -320,7 +417,7 @@ def detect_score_coordination(validations: List[Dict[str, Any]]) -> Dict[str, An
     return {"score_clusters": score_clusters, "flags": flags}
 
 
-def detect_semantic_coordination(validations: List[Dict[str, Any]]) -> Dict[str, Any]:
+def detect_semantic_coordination(validations: ValidationInput) -> Dict[str, Any]:
     """Detect validators who use suspiciously similar language in their
     validation notes using sentence embeddings.
 
@@ -330,51 +427,43 @@ def detect_semantic_coordination(validations: List[Dict[str, Any]]) -> Dict[str,
     embedding.
 
     Args:
-        validations: List of validation records
+        validations: List of validation records or a parsed ``ValidationBatch``
 
     Returns:
         Dict with semantic coordination analysis
     """
 
+    batch = ValidationBatch.of(validations)
     validator_texts = defaultdict(list)
 
-    for v in validations:
-        validator_id = v.get("validator_id")
-        note = v.get("note", "")
-        if not validator_id or len(note) < Config.REPEATED_PHRASE_MIN_LENGTH:
+    for validator, note in zip(batch.validator.tolist(), batch.notes):
+        if validator < 0 or len(note) < Config.REPEATED_PHRASE_MIN_LENGTH:
             continue
-        validator_texts[validator_id].append(note.lower().strip())
+        validator_texts[batch.validators[validator]].append(note.lower().strip())
 
     if not validator_texts:
         return {"semantic_clusters": [], "flags": []}
 
     all_notes = [text for notes in validator_texts.values() for text in notes]
 
-    @lru_cache(maxsize=128)
-    def _compute_embeddings(texts: Tuple[str, ...]):
-        """Heavy embedding computation cached for reuse."""
+    def _compute_embeddings(texts: List[str]):
+        """Embed notes with the shared, cached encoder or a lexical fallback."""
         try:
-            from sentence_transformers import SentenceTransformer
-
             # Avoid accidental network downloads by forcing offline mode if unset
             os.environ.setdefault("HF_HUB_OFFLINE", "1")
             os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
-            try:
-                model = SentenceTransformer("paraphrase-MiniLM-L6-v2")
-                return model.encode(list(texts))
-            except Exception as st_exc:
-                logger.warning(
-                    f"SentenceTransformer failed: {st_exc}; using TF-IDF fallback"
-                )
-        except Exception as import_exc:  # pragma: no cover - fallback rarely triggered
+            return get_embedding_service(Config.SEMANTIC_MODEL_NAME).encode(texts)
+        except ImportError as import_exc:  # pragma: no cover - fallback rarely triggered
             logger.warning(
                 f"SentenceTransformer unavailable: {import_exc}; using TF-IDF fallback"
             )
+        except Exception as st_exc:
+            logger.warning(f"SentenceTransformer failed: {st_exc}; using TF-IDF fallback")
         try:
             from sklearn.feature_extraction.text import TfidfVectorizer
 
-            vec = TfidfVectorizer().fit(list(texts))
-            return vec.transform(list(texts)).toarray()
+            vec = TfidfVectorizer().fit(texts)
+            return vec.transform(texts).toarray()
         except Exception as tfidf_exc:  # pragma: no cover - minimal fallback
             logger.error(
                 f"TF-IDF fallback unavailable: {tfidf_exc}; using simple counts"
@@ -399,9 +488,9 @@ def detect_semantic_coordination(validations: List[Dict[str, Any]]) -> Dict[str,
 
                 return [to_counts_list(t) for t in texts]
 
-    # Heavy embedding generation can dominate runtime on large datasets.
-    # Profile with ``cProfile`` to verify and consider batching strategies.
-    embeddings = _compute_embeddings(tuple(all_notes))
+    # Notes are embedded once per process and cached on disk by content
+    # hash, so repeated audits only encode notes they have not seen before.
+    embeddings = _compute_embeddings(all_notes)
 
     def _average_vectors(vectors: List[Any]):
         """Compute mean of vectors supporting numpy arrays or lists."""
@@ -515,13 +604,13 @@ def calculate_sophisticated_risk_score(
     return max(0.0, min(1.0, risk_score))
 
 
-def analyze_coordination_patterns(validations: List[Dict[str, Any]]) -> Dict[str, Any]:
+def analyze_coordination_patterns(validations: ValidationInput) -> Dict[str, Any]:
     """
     Comprehensive coordination analysis combining temporal, score, and semantic detection.
     Enhanced with sophisticated risk scoring and community detection.
 
     Args:
-        validations: List of validation records
+        validations: List of validation records or a parsed ``ValidationBatch``
 
     Returns:
         Dict with comprehensive coordination analysis
@@ -536,7 +625,8 @@ def analyze_coordination_patterns(validations: List[Dict[str, Any]]) -> Dict[str
         }
 
     try:
-        # Run all detection methods
+        # Parse once and share the columns across every detector
+        validations = ValidationBatch.of(validations)
         graph = build_validation_graph(validations)
         temporal_result = detect_temporal_coordination(validations)
         score_result = detect_score_coordination(validations)
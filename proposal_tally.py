@@ -0,0 +1,291 @@
+"""Incremental tri-species proposal tallies.
+
+:class:`ProposalTally` keeps a username index of each user's vote weight
+(harmony score times genesis decay), the running total of those weights and
+per-proposal, per-species ``yes``/``no``/``total`` accumulators.  Votes and
+user changes adjust the accumulators in place, so reading a tally costs
+``O(species)`` instead of rescanning every user for every voter.
+
+Genesis decay is evaluated at a shared reference instant (``as_of``) that
+advances whenever :meth:`ProposalTally.rebuild` or
+:meth:`ProposalTally.refresh_decay` runs, e.g. on ``DAILY_DECAY``.
+:meth:`ProposalTally.verify` recomputes a tally from scratch at the same
+instant to check the incremental state.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import threading
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from scientific_utils import calculate_genesis_bonus_decay_many, now_utc
+
+logger = logging.getLogger("superNova_2177.proposal_tally")
+
+ZERO = Decimal("0")
+
+# User fields the index needs, in ``get_user_columns`` order
+USER_FIELDS = ["harmony_score", "is_genesis", "join_time", "species", "consent_given"]
+
+
+class TallyConfig:
+    # Significant digits that must agree between running and recomputed
+    # values; running sums round in the last few places of the 28-digit
+    # Decimal context, so a fresh sum can differ there
+    VERIFY_DIGITS = 20
+
+
+def _to_decimal(value: Any) -> Decimal:
+    try:
+        return Decimal(str(value)) if value is not None else ZERO
+    except (InvalidOperation, ValueError):
+        return ZERO
+
+
+class _UserEntry:
+    __slots__ = ("species", "consent", "weight")
+
+    def __init__(self, species: str, consent: bool, weight: Decimal) -> None:
+        self.species = species
+        self.consent = consent
+        self.weight = weight
+
+
+class ProposalTally:
+    """Username index and running vote accumulators for proposal tallies."""
+
+    def __init__(self, species: Iterable[str], decay_years: int) -> None:
+        self.species = list(species)
+        self.decay_years = decay_years
+        self.lock = threading.RLock()
+        self.as_of: Optional[datetime.datetime] = None
+        self.total_harmony = ZERO
+        self._users: Dict[str, _UserEntry] = {}
+        # Raw user fields, kept so decay can be re-evaluated in bulk
+        self._genesis_join: Dict[str, Tuple[Decimal, Any]] = {}
+        self._votes: Dict[str, Dict[str, str]] = {}
+        self._acc: Dict[str, Dict[str, Dict[str, Decimal]]] = {}
+        self._voted: Dict[str, Decimal] = {}
+        self._user_votes: Dict[str, Set[str]] = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.as_of is not None
+
+    # ------------------------------------------------------------------
+    # User index
+    def _weights(
+        self, names: List[str], cols: Dict[str, List[Any]]
+    ) -> List[Decimal]:
+        harmony = [_to_decimal(h) for h in cols["harmony_score"]]
+        genesis = [i for i, g in enumerate(cols["is_genesis"]) if g]
+        factors = calculate_genesis_bonus_decay_many(
+            [cols["join_time"][i] for i in genesis], self.decay_years, self.as_of
+        )
+        weights = list(harmony)
+        for i, factor in zip(genesis, factors):
+            weights[i] = harmony[i] * factor
+            self._genesis_join[names[i]] = (harmony[i], cols["join_time"][i])
+        return weights
+
+    def rebuild(
+        self,
+        names: List[str],
+        cols: Dict[str, List[Any]],
+        proposals: Iterable[Tuple[str, Dict[str, str]]] = (),
+        as_of: Optional[datetime.datetime] = None,
+    ) -> None:
+        """Reindex all users from columnar data and replay proposal votes."""
+        with self.lock:
+            self.as_of = as_of or now_utc()
+            self._users.clear()
+            self._genesis_join.clear()
+            weights = self._weights(names, cols)
+            total = ZERO
+            for i, name in enumerate(names):
+                consent = cols["consent_given"][i]
+                self._users[name] = _UserEntry(
+                    cols["species"][i] or "human", consent is not False, weights[i]
+                )
+                total += weights[i]
+            self.total_harmony = total
+            self._votes.clear()
+            self._acc.clear()
+            self._voted.clear()
+            self._user_votes.clear()
+            for proposal_id, votes in proposals:
+                self.load_votes(proposal_id, votes)
+
+    def upsert_user(self, name: str, data: Dict[str, Any]) -> None:
+        """Index or re-weight one user and patch any tallies they voted in."""
+        with self.lock:
+            if not self.ready:
+                return
+            cols = {f: [data.get(f)] for f in USER_FIELDS}
+            if cols["join_time"][0] is None:
+                cols["join_time"] = [data.get("created_at")]
+            self._genesis_join.pop(name, None)
+            weight = self._weights([name], cols)[0]
+            consent = data.get("consent_given")
+            entry = _UserEntry(data.get("species") or "human", consent is not False, weight)
+            self._replace_user(name, entry)
+
+    def remove_user(self, name: str) -> None:
+        with self.lock:
+            self._genesis_join.pop(name, None)
+            self._replace_user(name, None)
+
+    def _replace_user(self, name: str, entry: Optional[_UserEntry]) -> None:
+        old = self._users.get(name)
+        voted_in = self._user_votes.get(name, ())
+        for proposal_id in voted_in:
+            self._apply_vote(proposal_id, name, self._votes[proposal_id][name], -1)
+        if old is not None:
+            self.total_harmony -= old.weight
+        if entry is None:
+            self._users.pop(name, None)
+        else:
+            self._users[name] = entry
+            self.total_harmony += entry.weight
+        for proposal_id in voted_in:
+            self._apply_vote(proposal_id, name, self._votes[proposal_id][name], 1)
+
+    def refresh_decay(self) -> None:
+        """Advance ``as_of`` and re-weight genesis users in one batch."""
+        with self.lock:
+            if not self.ready:
+                return
+            self.as_of = now_utc()
+            names = list(self._genesis_join)
+            harmony = [self._genesis_join[n][0] for n in names]
+            factors = calculate_genesis_bonus_decay_many(
+                [self._genesis_join[n][1] for n in names], self.decay_years, self.as_of
+            )
+            for name, h, factor in zip(names, harmony, factors):
+                old = self._users[name]
+                self._replace_user(name, _UserEntry(old.species, old.consent, h * factor))
+
+    # ------------------------------------------------------------------
+    # Votes
+    def _apply_vote(self, proposal_id: str, voter: str, vote: str, sign: int) -> None:
+        entry = self._users.get(voter)
+        if entry is None or not entry.consent:
+            return
+        acc = self._acc[proposal_id].setdefault(
+            entry.species, {"yes": ZERO, "no": ZERO, "total": ZERO, "n": 0}
+        )
+        weight = entry.weight if sign > 0 else -entry.weight
+        acc[vote] = acc.get(vote, ZERO) + weight
+        acc["total"] += weight
+        # Voter counts keep rounding residue from reviving empty species
+        acc["n"] += sign
+        self._voted[proposal_id] += weight
+
+    def load_votes(self, proposal_id: str, votes: Dict[str, str]) -> None:
+        """Seed accumulators for a proposal from its stored ``votes`` map."""
+        with self.lock:
+            self.discard(proposal_id)
+            self._votes[proposal_id] = {}
+            self._acc[proposal_id] = {}
+            self._voted[proposal_id] = ZERO
+            for voter, vote in votes.items():
+                self.record_vote(proposal_id, voter, vote)
+
+    def record_vote(self, proposal_id: str, voter: str, vote: str) -> None:
+        """Add or replace ``voter``'s vote on a tracked proposal."""
+        with self.lock:
+            if proposal_id not in self._votes:
+                return
+            votes = self._votes[proposal_id]
+            if voter in votes:
+                self._apply_vote(proposal_id, voter, votes[voter], -1)
+            votes[voter] = vote
+            self._user_votes.setdefault(voter, set()).add(proposal_id)
+            self._apply_vote(proposal_id, voter, vote, 1)
+
+    def discard(self, proposal_id: str) -> None:
+        """Forget a proposal once it no longer needs tallying."""
+        with self.lock:
+            for voter in self._votes.pop(proposal_id, {}):
+                self._user_votes.get(voter, set()).discard(proposal_id)
+            self._acc.pop(proposal_id, None)
+            self._voted.pop(proposal_id, None)
+
+    def tracks(self, proposal_id: str) -> bool:
+        return proposal_id in self._votes
+
+    # ------------------------------------------------------------------
+    # Reading
+    def _result(
+        self,
+        species_votes: Dict[str, Dict[str, Decimal]],
+        voted: Decimal,
+        total: Decimal,
+    ) -> Dict[str, Decimal]:
+        order = self.species + [s for s in species_votes if s not in self.species]
+        active = [
+            species_votes[s]
+            for s in order
+            if s in species_votes
+            and species_votes[s].get("n", 1) > 0
+            and species_votes[s]["total"] > 0
+        ]
+        if not active:
+            return {"yes": ZERO, "no": ZERO, "quorum": ZERO}
+        species_weight = Decimal("1") / len(active)
+        final_yes = sum((sv["yes"] / sv["total"]) * species_weight for sv in active)
+        final_no = sum((sv["no"] / sv["total"]) * species_weight for sv in active)
+        quorum = voted / total if total > 0 else ZERO
+        return {"yes": final_yes, "no": final_no, "quorum": quorum}
+
+    def tally(self, proposal_id: str) -> Dict[str, Decimal]:
+        """Return ``{'yes', 'no', 'quorum'}`` from the running accumulators."""
+        with self.lock:
+            return self._result(
+                self._acc.get(proposal_id, {}),
+                self._voted.get(proposal_id, ZERO),
+                self.total_harmony,
+            )
+
+    def recompute(self, proposal_id: str) -> Dict[str, Decimal]:
+        """Tally ``proposal_id`` by summing the index from scratch."""
+        with self.lock:
+            total = sum((e.weight for e in self._users.values()), ZERO)
+            species_votes: Dict[str, Dict[str, Decimal]] = {}
+            voted = ZERO
+            for voter, vote in self._votes.get(proposal_id, {}).items():
+                entry = self._users.get(voter)
+                if entry is None or not entry.consent:
+                    continue
+                sv = species_votes.setdefault(
+                    entry.species, {"yes": ZERO, "no": ZERO, "total": ZERO}
+                )
+                sv[vote] = sv.get(vote, ZERO) + entry.weight
+                sv["total"] += entry.weight
+                voted += entry.weight
+            return self._result(species_votes, voted, total)
+
+    def verify(
+        self, proposal_id: str, expected: Optional[Dict[str, Decimal]] = None
+    ) -> bool:
+        """Compare the running tally against ``expected`` or a recomputation."""
+        fast = self.tally(proposal_id)
+        slow = expected if expected is not None else self.recompute(proposal_id)
+        tolerance = Decimal(1).scaleb(-TallyConfig.VERIFY_DIGITS)
+        for key in ("yes", "no", "quorum"):
+            # The values are ratios of sums, so rounding residue is on the
+            # scale of 1 even when a share itself is near zero
+            scale = max(abs(fast[key]), abs(slow[key]), Decimal(1))
+            if abs(fast[key] - slow[key]) > tolerance * scale:
+                logger.error(
+                    "Tally drift on %s: %s running=%s expected=%s",
+                    proposal_id,
+                    key,
+                    fast[key],
+                    slow[key],
+                )
+                return False
+        return True
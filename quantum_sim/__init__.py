@@ -36,6 +36,8 @@ except Exception:  # pragma: no cover - fallback values
 
 from scientific_utils import ScientificModel, VerifiedScientificModel
 
+from .entanglement import EntanglementStore, EntanglementView
+
 
 class QuantumContext:
     """Lightweight quantum-inspired simulation context.
@@ -59,6 +61,11 @@ class QuantumContext:
     Upon initialization the context contains no entangled entity pairs and the
     last measured state is ``None``. Basic initialization parameters are logged
     for traceability.
+
+    Entanglement weights live in an :class:`EntanglementStore`, so a
+    decoherence :meth:`step` does not touch every pair and per-user
+    predictions read a per-node aggregate.  ``entangled_pairs`` is a read-only
+    mapping view of the stored weights.
     """
 
     def __init__(
@@ -71,7 +78,7 @@ class QuantumContext:
         self.fuzzy_enabled = fuzzy_enabled
         self.decoherence_rate = decoherence_rate
         self.simulate = simulate
-        self.entangled_pairs: Dict[tuple, float] = {}
+        self.entanglement = EntanglementStore()
         self._last_state: Optional[list[float]] = None
         logging.info(
             f"QuantumContext initialized with fuzzy_enabled={fuzzy_enabled}, decoherence_rate={decoherence_rate}, simulate={simulate}"
@@ -89,15 +96,15 @@ class QuantumContext:
                 "FUZZINESS_RANGE_LOW must be <= FUZZINESS_RANGE_HIGH"
             )
 
+    @property
+    def entangled_pairs(self) -> EntanglementView:
+        """Current ``{(a, b): weight}`` entanglement links."""
+        return EntanglementView(self.entanglement)
+
     def step(self, dt: float = 1.0) -> None:
         """Apply decoherence decay over ``dt`` time units."""
         decay = math.exp(-self.decoherence_rate * dt)
-        before = len(self.entangled_pairs)
-        for pair in list(self.entangled_pairs):
-            self.entangled_pairs[pair] *= decay
-            if self.entangled_pairs[pair] < 1e-6:
-                del self.entangled_pairs[pair]
-        lost = before - len(self.entangled_pairs)
+        lost = self.entanglement.decay(decay)
         if lost:
             logging.info(f"Decoherence removed {lost} entangled pairs")
 
@@ -161,7 +168,7 @@ class QuantumContext:
             outcome = input_value
 
         # interference from entangled pairs
-        interference = sum(self.entangled_pairs.values()) * Config.INTERFERENCE_FACTOR
+        interference = self.entanglement.total() * Config.INTERFERENCE_FACTOR
         outcome = max(0.0, min(1.0, outcome + interference))
 
         if error_rate:
@@ -262,15 +269,11 @@ class QuantumContext:
         influence_factor = max(0.0, influence_factor)
 
         pair = tuple(sorted((entity1_id, entity2_id)))
-        self.entangled_pairs[pair] = (
-            self.entangled_pairs.get(pair, 0.0) + influence_factor
-        )
+        weight = self.entanglement.add(pair, influence_factor)
         if bidirectional:
-            self.entangled_pairs[(pair[1], pair[0])] = (
-                self.entangled_pairs.get((pair[1], pair[0]), 0.0) + influence_factor
-            )
+            self.entanglement.add((pair[1], pair[0]), influence_factor)
         logging.debug(
-            f"Entities {entity1_id} and {entity2_id} entangled with factor {self.entangled_pairs[pair]:.2f}"
+            f"Entities {entity1_id} and {entity2_id} entangled with factor {weight:.2f}"
         )
 
     @ScientificModel(source="Feedback control", model_type="AdaptiveParameter", approximation="heuristic")
@@ -374,21 +377,14 @@ class QuantumContext:
         """
         predicted: Dict[Any, float] = {}
         influences = []
-        # Aggregate symmetric pairs so each connection counts only once
-        aggregated: Dict[tuple, float] = {}
-        for pair, weight in self.entangled_pairs.items():
-            key = tuple(sorted(pair))
-            aggregated[key] = max(aggregated.get(key, 0.0), weight)
-
         for uid in user_ids:
-            total = sum(
-                w for p, w in aggregated.items() if uid in p
-            )
+            # Symmetric pairs count once, at the stronger direction's weight
+            total = self.entanglement.node_weight(uid)
             prob = min(1.0, total / (ENTANGLEMENT_NORMALIZATION_FACTOR or 1.0))
             predicted[uid] = prob
             influences.append(prob)
 
-        overall_coherence = min(1.0, sum(self.entangled_pairs.values()))
+        overall_coherence = min(1.0, self.entanglement.total())
         mean = sum(influences) / len(influences) if influences else 0.0
         variance = (
             sum((p - mean) ** 2 for p in influences) / len(influences)
@@ -0,0 +1,162 @@
+"""Sparse entanglement store backing :class:`quantum_sim.QuantumContext`.
+
+Entanglement links are ``(a, b)`` keys with a weight.  Rather than touching
+every link on each decoherence tick, weights are stored relative to a global
+decay multiplier:
+
+- ``weight = scaled * scale``; :meth:`EntanglementStore.decay` only updates
+  ``scale`` and pops links that fell below the pruning threshold from a
+  min-heap, so a tick is O(1) amortized plus O(log n) per pruned link;
+- the sum of all weights is kept as a running total;
+- each node keeps an adjacency map and the aggregate of
+  ``max(w[a, b], w[b, a])`` over its links, so per-node lookups are O(1) and
+  neighbour listings O(degree).
+
+``scale`` is folded back into the stored values before it can underflow.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Tuple
+
+PRUNE_THRESHOLD = 1e-6
+_RENORMALIZE_BELOW = 1e-100
+
+Pair = Tuple[Any, Any]
+
+
+class EntanglementStore:
+    """Entanglement weights indexed by link and by node."""
+
+    def __init__(self) -> None:
+        self._scale = 1.0
+        self._scaled: Dict[Pair, float] = {}
+        self._total = 0.0
+        # Unordered pairs (sorted key) -> max of both directions, scaled
+        self._pair_max: Dict[Pair, float] = {}
+        self._node_weight: Dict[Any, float] = {}
+        self._adjacency: Dict[Any, Dict[Any, Pair]] = {}
+        self._heap: List[Tuple[float, int, Pair]] = []
+        self._counter = itertools.count()
+
+    # ------------------------------------------------------------------
+    # Reads
+    def __len__(self) -> int:
+        return len(self._scaled)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._scaled
+
+    def weight(self, key: Pair) -> float:
+        return self._scaled[key] * self._scale
+
+    def keys(self) -> Iterator[Pair]:
+        return iter(self._scaled)
+
+    def total(self) -> float:
+        """Sum of every link weight."""
+        return self._total * self._scale
+
+    def node_weight(self, node: Any) -> float:
+        """Sum over ``node``'s links of the stronger direction's weight."""
+        return self._node_weight.get(node, 0.0) * self._scale
+
+    def neighbors(self, node: Any) -> Dict[Any, float]:
+        """Linked nodes and the stronger direction's weight for each."""
+        links = self._adjacency.get(node, {})
+        return {other: self._pair_max[key] * self._scale for other, key in links.items()}
+
+    # ------------------------------------------------------------------
+    # Writes
+    def add(self, key: Pair, amount: float) -> float:
+        """Add ``amount`` to link ``key`` and return its new weight."""
+        scaled = self._scaled.get(key, 0.0) + amount / self._scale
+        self._scaled[key] = scaled
+        self._total += amount / self._scale
+        heapq.heappush(self._heap, (scaled, next(self._counter), key))
+        self._update_pair(key)
+        if len(self._heap) > 2 * len(self._scaled) + 16:
+            self._rebuild_heap()
+        return scaled * self._scale
+
+    def decay(self, factor: float) -> int:
+        """Multiply every weight by ``factor`` and prune weak links.
+
+        Returns the number of links removed.
+        """
+        self._scale *= factor
+        if self._scale < _RENORMALIZE_BELOW:
+            self._renormalize()
+        removed = 0
+        heap = self._heap
+        while heap and heap[0][0] * self._scale < PRUNE_THRESHOLD:
+            scaled, _, key = heapq.heappop(heap)
+            if self._scaled.get(key) != scaled:
+                continue  # superseded by a later add
+            self._remove(key)
+            removed += 1
+        return removed
+
+    def _remove(self, key: Pair) -> None:
+        self._total -= self._scaled.pop(key)
+        self._update_pair(key)
+        if not self._scaled:
+            self._total = 0.0
+
+    def _update_pair(self, key: Pair) -> None:
+        a, b = pair = tuple(sorted(key))
+        reverse = (b, a)
+        nodes = (a,) if a == b else (a, b)
+        old = self._pair_max.get(pair, 0.0)
+        if pair not in self._scaled and reverse not in self._scaled:
+            self._pair_max.pop(pair, None)
+            for node, other in ((a, b), (b, a))[: len(nodes)]:
+                links = self._adjacency.get(node)
+                if links is not None:
+                    links.pop(other, None)
+                    if not links:
+                        del self._adjacency[node]
+                        self._node_weight.pop(node, None)
+                        continue
+                self._node_weight[node] = self._node_weight.get(node, 0.0) - old
+            return
+        new = max(self._scaled.get(pair, 0.0), self._scaled.get(reverse, 0.0))
+        self._pair_max[pair] = new
+        for node, other in ((a, b), (b, a))[: len(nodes)]:
+            self._adjacency.setdefault(node, {})[other] = pair
+            self._node_weight[node] = self._node_weight.get(node, 0.0) + new - old
+
+    def _renormalize(self) -> None:
+        scale = self._scale
+        self._scaled = {key: value * scale for key, value in self._scaled.items()}
+        self._pair_max = {key: value * scale for key, value in self._pair_max.items()}
+        self._node_weight = {node: value * scale for node, value in self._node_weight.items()}
+        self._total = sum(self._scaled.values())
+        self._scale = 1.0
+        self._rebuild_heap()
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(value, next(self._counter), key) for key, value in self._scaled.items()]
+        heapq.heapify(self._heap)
+
+
+class EntanglementView(Mapping):
+    """Read-only ``{(a, b): weight}`` mapping over an :class:`EntanglementStore`."""
+
+    def __init__(self, store: EntanglementStore) -> None:
+        self._store = store
+
+    def __getitem__(self, key: Pair) -> float:
+        return self._store.weight(key)
+
+    def __iter__(self) -> Iterator[Pair]:
+        return self._store.keys()
+
+    def __len__(self) -> int:
+        return len(self._store)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._store
@@ -8,7 +8,10 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import Dict, Any, Set
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
 
 try:
     import websockets
@@ -17,34 +20,175 @@ except Exception:  # pragma: no cover - optional dependency
     websockets = None
     WebSocketServerProtocol = object  # type: ignore
 
-SUBSCRIBERS: Set[WebSocketServerProtocol] = set()
-POSTS: list[Dict[str, Any]] = []
+class Config:
+    # Posts retained for replay to new and reconnecting subscribers
+    HISTORY_SIZE = 500
+    # Messages queued per subscriber before the overflow policy applies
+    QUEUE_SIZE = 100
+    # ``"drop_oldest"`` discards the oldest queued post; ``"coalesce"``
+    # folds the backlog into a single ``feed_gap`` frame
+    OVERFLOW_POLICY = "drop_oldest"
+
+
+_GAP = None  # sequence slot of a coalesced ``feed_gap`` frame
+
+
+def _gap_frame(first: int, last: int, missed: int) -> Dict[str, Any]:
+    return {"event": "feed_gap", "missed": missed, "from_cursor": first, "to_cursor": last}
+
+
+class _Subscriber:
+    """Bounded per-connection queue drained by that connection's writer."""
+
+    __slots__ = ("loop", "queue", "ready", "maxsize", "policy", "dropped")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, maxsize: int, policy: str) -> None:
+        self.loop = loop
+        self.queue: Deque[Tuple[Optional[int], Any]] = deque()
+        self.ready = asyncio.Event()
+        self.maxsize = max(1, maxsize)
+        self.policy = policy
+        self.dropped = 0
+
+    def push(self, seq: int, msg: str) -> None:
+        """Queue ``msg``; runs on the subscriber's own loop."""
+        queue = self.queue
+        if len(queue) >= self.maxsize:
+            if self.policy == "coalesce":
+                gap = queue[0][1] if queue[0][0] is _GAP else None
+                posts = [s for s, _ in queue if s is not _GAP]
+                self.dropped += len(posts)
+                if posts:
+                    first = gap["from_cursor"] if gap else posts[0]
+                    missed = (gap["missed"] if gap else 0) + len(posts)
+                    gap = _gap_frame(first, posts[-1], missed)
+                queue.clear()
+                queue.append((_GAP, gap))
+            else:
+                queue.popleft()
+                self.dropped += 1
+        queue.append((seq, msg))
+        self.ready.set()
+
+    async def get(self) -> str:
+        while not self.queue:
+            self.ready.clear()
+            await self.ready.wait()
+        seq, msg = self.queue.popleft()
+        return json.dumps(msg) if seq is _GAP else msg
+
+
+class FeedHub:
+    """Fan-out of feed posts through a ring buffer and per-client queues.
+
+    Each post is serialized once with a monotonically increasing
+    ``feed_cursor``.  :meth:`publish` never waits on a socket: it appends to
+    the ring and to every subscriber's bounded queue, so memory stays flat
+    and a slow client only falls behind itself.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._history: Deque[Tuple[int, str]] = deque(maxlen=Config.HISTORY_SIZE)
+        self._subscribers: Set[_Subscriber] = set()
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, post: Dict[str, Any]) -> int:
+        """Record ``post`` and queue it for every subscriber; thread-safe."""
+        with self._lock:
+            self._seq += 1
+            seq = self._seq
+            msg = json.dumps({**post, "feed_cursor": seq}, default=str)
+            self._history.append((seq, msg))
+            subscribers = list(self._subscribers)
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        for sub in subscribers:
+            if sub.loop is current:
+                sub.push(seq, msg)
+                continue
+            try:
+                sub.loop.call_soon_threadsafe(sub.push, seq, msg)
+            except RuntimeError:  # loop closed under a stale subscriber
+                self.unsubscribe(sub)
+        return seq
+
+    def subscribe(self, cursor: Optional[int] = None) -> Tuple[_Subscriber, List[Tuple[Optional[int], Any]]]:
+        """Register a subscriber on the running loop.
+
+        Returns it with the retained posts after ``cursor`` (all of them when
+        ``cursor`` is ``None``), preceded by a ``feed_gap`` frame if some of
+        the requested posts have already left the ring buffer.
+        """
+        sub = _Subscriber(asyncio.get_running_loop(), Config.QUEUE_SIZE, Config.OVERFLOW_POLICY)
+        with self._lock:
+            self._subscribers.add(sub)
+            backlog: List[Tuple[Optional[int], Any]] = [
+                item for item in self._history if cursor is None or item[0] > cursor
+            ]
+            oldest = self._history[0][0] if self._history else self._seq + 1
+        if cursor is not None and cursor + 1 < oldest:
+            backlog.insert(0, (_GAP, _gap_frame(cursor + 1, oldest - 1, oldest - 1 - cursor)))
+        return sub, backlog
+
+    def unsubscribe(self, sub: _Subscriber) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+
+HUB = FeedHub()
+
+
+def _request_cursor(ws: Any) -> Optional[int]:
+    """Read ``?cursor=N`` from the connection's request path."""
+    request = getattr(ws, "request", None)
+    path = getattr(request, "path", None) or getattr(ws, "path", "") or ""
+    values = parse_qs(urlsplit(path).query).get("cursor")
+    try:
+        return int(values[0]) if values else None
+    except ValueError:
+        return None
+
+
+async def _pump(ws: WebSocketServerProtocol, sub: _Subscriber, backlog: List[Tuple[Optional[int], Any]]) -> None:
+    """Send the replay backlog, then live posts, to one client."""
+    try:
+        for seq, msg in backlog:
+            await ws.send(json.dumps(msg) if seq is _GAP else msg)
+        while True:
+            await ws.send(await sub.get())
+    except asyncio.CancelledError:
+        raise
+    except Exception:  # pragma: no cover - connection closed mid-send
+        logging.debug("Feed websocket writer stopped", exc_info=True)
 
 
 async def _handler(ws: WebSocketServerProtocol) -> None:
-    """Handle a feed subscriber connection."""
-    SUBSCRIBERS.add(ws)
+    """Handle a feed subscriber connection.
+
+    Clients may reconnect with ``?cursor=<last feed_cursor seen>`` to resume
+    without replaying posts they already have.
+    """
+    sub, backlog = HUB.subscribe(_request_cursor(ws))
+    writer = asyncio.create_task(_pump(ws, sub, backlog))
     try:
-        for post in POSTS:
-            await ws.send(json.dumps(post))
         async for _ in ws:
             pass  # clients don't send messages
     except Exception:  # pragma: no cover - log and drop connection
         logging.exception("Feed websocket error")
     finally:
-        SUBSCRIBERS.discard(ws)
+        HUB.unsubscribe(sub)
+        writer.cancel()
 
 
 async def broadcast(post: Dict[str, Any]) -> None:
-    """Broadcast ``post`` to all active subscribers."""
-    POSTS.append(post)
-    if not SUBSCRIBERS:
-        return
-    msg = json.dumps(post)
-    await asyncio.gather(
-        *[client.send(msg) for client in list(SUBSCRIBERS)],
-        return_exceptions=True,
-    )
+    """Broadcast ``post`` to all active subscribers without waiting on them."""
+    HUB.publish(post)
 
 
 async def run_server(host: str = "localhost", port: int = 8766) -> None:
@@ -73,8 +217,6 @@ def start_in_background(host: str = "localhost", port: int = 8766) -> None:
         asyncio.set_event_loop(loop)
         loop.run_until_complete(run_server(host, port))
 
-    import threading
-
     _server_thread = threading.Thread(target=_run, daemon=True)
     _server_thread.start()
 
@@ -92,4 +234,4 @@ async def post_update(payload: Dict[str, Any]) -> Dict[str, Any]:
     return {"status": "ok"}
 
 
-__all__ = ["start_in_background", "subscribe_feed", "post_update", "broadcast"]
+__all__ = ["start_in_background", "subscribe_feed", "post_update", "broadcast", "FeedHub", "HUB"]
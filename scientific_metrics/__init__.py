@@ -15,6 +15,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy import select
 from scientific_utils import ScientificModel, VerifiedScientificModel
 from causal_graph import InfluenceGraph, build_causal_graph as _build
+from causal_graph.influence import InfluenceEngine, path_count_confidence
+from causal_graph.service import get_influence_graph
 
 try:
     from config import Config
@@ -275,7 +277,7 @@ def generate_scientific_report(user: Any, db: Session) -> Dict[str, Any]:
     validation_notes: unit test checks field presence
     approximation: aggregation
     """
-    graph = build_causal_graph(db)
+    graph = get_influence_graph(db)
     influence_score = calculate_influence_score(graph.graph, getattr(user, "id", 0))
     entropy = calculate_interaction_entropy(user, db)
     report = {
@@ -313,7 +315,11 @@ def query_influence(
     perturb_iterations : int, optional
         If greater than zero, additional confidence estimation is performed by
         randomly perturbing edge weights and recomputing the path-strength
-        heuristic.
+        heuristic. Perturbed weights are capped at ``1``.
+
+    Strengths come from a Dijkstra search on ``-log(w)`` and the path count
+    behind ``confidence`` is capped (see :mod:`causal_graph.influence`), so the
+    query is polynomial in graph size.
 
     citation_uri: https://en.wikipedia.org/wiki/Graph_theory
     assumptions: path strength proxy for influence
@@ -324,67 +330,35 @@ def query_influence(
         return {"value": 0.0, "unit": "probability", "confidence": None, "method": "path_strength"}
 
     try:
-        if isinstance(graph, InfluenceGraph):
-            prob = graph.query_influence(source_id, target_id)
-        else:
+        is_influence_graph = isinstance(graph, InfluenceGraph)
+        raw = graph.graph if is_influence_graph else graph
+        if not is_influence_graph:
             if nx is None:
                 logging.warning("networkx not installed; influence set to 0")
                 return {"value": 0.0, "unit": "probability", "confidence": None, "method": "path_strength"}
             if not (source_id in graph and target_id in graph):
                 return {"value": 0.0, "unit": "probability", "confidence": None, "method": "path_strength"}
-            if source_id == target_id:
-                prob = 1.0
-            elif not nx.has_path(graph, source_id, target_id):
-                prob = 0.0
-            else:
-                paths = list(nx.all_simple_paths(graph, source_id, target_id))
-                strengths = []
-                for p in paths:
-                    w = 1.0
-                    for u, v in zip(p[:-1], p[1:]):
-                        w *= graph[u][v].get("weight", 1.0)
-                    strengths.append(w)
-                prob = max(strengths) if strengths else 0.0
+        # One engine serves the strength, the path count and perturbations
+        engine = InfluenceEngine(raw)
+        if is_influence_graph:
+            prob = engine.influence(source_id, target_id) if graph.has_path(source_id, target_id) else 0.0
+        else:
+            prob = 1.0 if source_id == target_id else engine.influence(source_id, target_id)
             prob = max(0.0, min(1.0, prob))
 
-        # simple confidence derived from path count
+        # simple confidence derived from a capped path count
         conf = None
-        if isinstance(graph, InfluenceGraph) and graph.graph:
-            path_count = len(list(nx.all_simple_paths(graph.graph, source_id, target_id)))
-            conf = max(0.0, min(1.0, 1.0 - 1.0 / (path_count + 1)))
-        elif not isinstance(graph, InfluenceGraph) and nx is not None:
-            path_count = len(list(nx.all_simple_paths(graph, source_id, target_id))) if nx.has_path(graph, source_id, target_id) else 0
-            conf = max(0.0, min(1.0, 1.0 - 1.0 / (path_count + 1)))
+        path_count = 0
+        if (is_influence_graph and graph.graph) or (not is_influence_graph and nx is not None):
+            path_count, _ = engine.count_paths(source_id, target_id)
+            conf = path_count_confidence(path_count)
 
         # optional perturbation-based confidence refinement
         if perturb_iterations > 0 and nx is not None and path_count > 0:
-            def _p_iter(_):
-                g2 = graph.graph.copy() if isinstance(graph, InfluenceGraph) else graph.copy()
-                for u, v, data in g2.edges(data=True):
-                    data["weight"] = data.get("weight", 1.0) * random.uniform(0.9, 1.1)
-                if isinstance(graph, InfluenceGraph):
-                    s_prob = InfluenceGraph(); s_prob.graph = g2
-                    return s_prob.query_influence(source_id, target_id)
-                if nx.has_path(g2, source_id, target_id):
-                    paths = list(nx.all_simple_paths(g2, source_id, target_id))
-                    st = []
-                    for p in paths:
-                        w = 1.0
-                        for u2, v2 in zip(p[:-1], p[1:]):
-                            w *= g2[u2][v2].get("weight", 1.0)
-                        st.append(w)
-                    return max(st) if st else 0.0
-                return 0.0
-
-            samples = []
-            try:
-                from concurrent.futures import ThreadPoolExecutor
-
-                with ThreadPoolExecutor() as ex:
-                    samples = list(ex.map(_p_iter, range(perturb_iterations)))
-            except Exception:
-                for i in range(perturb_iterations):
-                    samples.append(_p_iter(i))
+            samples = [
+                engine.perturbed(lambda: random.uniform(0.9, 1.1)).influence(source_id, target_id)
+                for _ in range(perturb_iterations)
+            ]
             if len(samples) > 1:
                 std = statistics.stdev(samples)
                 perturb_conf = max(0.0, min(1.0, 1 - BOOTSTRAP_Z_SCORE * std))
@@ -677,7 +651,7 @@ def predict_user_interactions(
     approximation: heuristic
     """
 
-    graph = build_causal_graph(db)
+    graph = get_influence_graph(db)
     influence = calculate_influence_score(graph.graph, user_id)
     from db_models import Harmonizer as HarmonizerModel  # local to avoid circular import
     user = db.query(HarmonizerModel).filter(HarmonizerModel.id == user_id).first()
@@ -789,7 +763,7 @@ def generate_system_predictions(db: Session, timeframe_hours: int) -> Dict[str,
     approximation: heuristic
     """
 
-    graph = build_causal_graph(db)
+    graph = get_influence_graph(db)
     from db_models import Harmonizer as HarmonizerModel
 
     users = db.query(HarmonizerModel).all()
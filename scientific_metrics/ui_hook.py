@@ -7,7 +7,7 @@ from hook_manager import HookManager
 from scientific_metrics import (
     predict_user_interactions,
     calculate_influence_score,
-    build_causal_graph,
+    get_influence_graph,
 )
 
 # Exposed hook manager so observers can listen to events
@@ -42,7 +42,7 @@ async def calculate_influence_ui(
 ) -> Dict[str, Any]:
     """Compute influence score for a user."""
     user_id = payload.get("user_id")
-    graph = build_causal_graph(db)
+    graph = get_influence_graph(db)
     result = calculate_influence_score(graph.graph, user_id)
     minimal = {"user_id": user_id, "influence_score": result.get("value", 0.0)}
     await ui_hook_manager.trigger("influence_score_computed", minimal)
@@ -426,6 +426,65 @@ def calculate_genesis_bonus_decay(
     return Decimal("1") - Decimal(years_passed) / decay_years
 
 
+_SECONDS_PER_YEAR = 365.25 * 24 * 3600
+_EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _epoch_microseconds(value: Any) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        dt = value
+    else:
+        dt = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return (dt - _EPOCH) // datetime.timedelta(microseconds=1)
+
+
+def calculate_genesis_bonus_decay_many(
+    join_times: List[Any],
+    decay_years: int,
+    now: Optional[datetime.datetime] = None,
+) -> List[Decimal]:
+    """Batch form of :func:`calculate_genesis_bonus_decay`.
+
+    ``join_times`` may hold ``datetime`` objects or ISO strings (naive values
+    are taken as UTC). Every entry is measured against the same ``now`` and
+    each identical timestamp is parsed once. Elapsed years are computed as a
+    float64 array with the same operations as the scalar version, so every
+    weight is bit-for-bit equal to a scalar call at that instant.
+    """
+    if not join_times:
+        return []
+    now_us = _epoch_microseconds(now or now_utc())
+    parsed: Dict[Any, Optional[int]] = {}
+    micros = []
+    for value in join_times:
+        key = value if isinstance(value, (str, datetime.datetime)) else repr(value)
+        if key not in parsed:
+            parsed[key] = _epoch_microseconds(value)
+        micros.append(parsed[key])
+
+    known = [i for i, us in enumerate(micros) if us is not None]
+    elapsed = [now_us - micros[i] for i in known]
+    try:
+        np = importlib.import_module("numpy")
+        years = (
+            np.asarray(elapsed, dtype=np.int64) / 1_000_000 / _SECONDS_PER_YEAR
+        ).tolist()
+    except ImportError:  # pragma: no cover - numpy is optional
+        years = [us / 1_000_000 / _SECONDS_PER_YEAR for us in elapsed]
+
+    weights = [Decimal("1")] * len(join_times)
+    for i, years_passed in zip(known, years):
+        if years_passed >= decay_years:
+            weights[i] = Decimal("0")
+        else:
+            weights[i] = Decimal("1") - Decimal(years_passed) / decay_years
+    return weights
+
+
 @VerifiedScientificModel(
     citation_uri="https://en.wikipedia.org/wiki/Exponential_decay",
     assumptions="half-life approximated at 69 days; requires numpy and matplotlib",
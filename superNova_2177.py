@@ -255,7 +255,7 @@ import traceback
 import unittest
 import uuid
 import weakref
-from collections import Counter, defaultdict, deque
+from collections import defaultdict, deque
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import timedelta
@@ -266,9 +266,11 @@ from typing import (
     Awaitable,
     Callable,
     Dict,
+    Iterable,
     List,
     Literal,
     Optional,
+    Tuple,
     TypedDict,
     Union,
     NotRequired,
@@ -375,9 +377,6 @@ def get_settings() -> Settings:
 
 redis_client = None
 
-# Model for creative leap scoring is loaded lazily to conserve resources
-_creative_leap_model = None
-
 
 def create_database() -> None:
     """Initialize database tables using current settings."""
@@ -505,20 +504,23 @@ import structlog
 from prometheus_client import REGISTRY
 
 import db_models
+import engagement
 from causal_graph import InfluenceGraph
+from causal_graph.service import get_influence_graph
 from config import Config
 from db_models import (AIPersona, Base, BranchVote, Coin, Comment,
                        CreativeGuild, Event, Group, GuinnessClaim, Harmonizer,
-                       LogEntry, MarketplaceListing, Message, Notification,
+                       MarketplaceListing, Message, Notification,
                        Proposal, ProposalVote, SessionLocal, SimulationLog,
                        SymbolicToken, SystemState, TokenListing,
                        UniverseBranch, VibeNode, engine, event_attendees,
                        group_members, harmonizer_follows, proposal_votes,
-                       vibenode_entanglements, vibenode_likes)
+                       vibenode_likes)
+from embedding_service import get_embedding_service
 from governance_config import calculate_entropy_divergence, quantum_consensus
 from quantum_sim import QuantumContext
 from scientific_metrics import (analyze_prediction_accuracy,
-                                build_causal_graph, calculate_influence_score,
+                                calculate_influence_score,
                                 calculate_interaction_entropy,
                                 design_validation_experiments,
                                 generate_system_predictions,
@@ -528,23 +530,34 @@ from scientific_utils import (
     ScientificModel,
     VerifiedScientificModel,
     calculate_genesis_bonus_decay,
+    calculate_genesis_bonus_decay_many,
     estimate_uncertainty,
     generate_hypotheses,
     refine_hypotheses_from_evidence,
     safe_decimal,
     acquire_multiple_locks,
 )
+from system_state_utils.service import (SystemStateService, get_config_override,
+                                       get_state_cache)
+from tag_histogram import get_tag_histogram
 
 # Database engine URL resolved at runtime
 DB_ENGINE_URL = None
 from hook_manager import HookManager
+from log_chain_appender import get_log_chain_appender
+from logchain import LogChain
+from network.centrality_engine import get_centrality_engine
+from network.graph_analytics import get_graph_analytics
 from prediction_manager import PredictionManager
 from resonance_music import generate_midi_from_metrics
+from username_index import Config as UsernameIndexConfig
+from username_index import get_username_index
 
 try:  # pragma: no cover - optional dependency may not be available
     from hooks import events
 except Exception:  # pragma: no cover - graceful fallback
     events = None  # type: ignore[assignment]
+from hooks.bus import publish as publish_event
 
 # Import system configuration early so metrics can be started with the proper
 # port value. Other modules follow the same pattern by exposing a ``CONFIG``
@@ -663,6 +676,8 @@ class HarmonizerOut(BaseModel):
     harmony_score: str
     creative_spark: str
     network_centrality: float
+    followers_count: int = 0
+    following_count: int = 0
 
     class Config:
         from_attributes = True
@@ -978,24 +993,6 @@ class TokenData(BaseModel):
 
 
 # --- MODULE: services.py ---
-class SystemStateService:
-    def __init__(self, db: Session):
-        self.db = db
-
-    def get_state(self, key: str, default: str) -> str:
-        state = self.db.query(SystemState).filter(SystemState.key == key).first()
-        return state.value if state else default
-
-    def set_state(self, key: str, value: str):
-        state = self.db.query(SystemState).filter(SystemState.key == key).first()
-        if state:
-            state.value = value
-        else:
-            state = SystemState(key=key, value=value)
-            self.db.add(state)
-        self.db.commit()
-
-
 class GenerativeAIService:
     """Unified service for AI-generated content (text, images, music, etc.)."""
 
@@ -1178,30 +1175,6 @@ def detailed_error_log(exc: Exception) -> str:
     return "".join(traceback.format_exception(type(exc), exc, exc.__traceback__))
 
 
-# Minimal logchain implementation used during tests. The real system may
-# provide a more robust version, but unit tests only rely on a handful of
-# methods.  Keeping it lightweight avoids optional dependencies and complex
-# state management.
-class LogChain:
-    """Simple in-memory event log used for testing."""
-
-    def __init__(self, filename: str) -> None:
-        self.filename = filename
-        self.entries: list[Dict[str, Any]] = []
-
-    def add(self, event: Dict[str, Any]) -> None:
-        self.entries.append(event)
-
-    def replay_events(
-        self, apply: Callable[[Dict[str, Any]], None], since: Any | None = None
-    ) -> None:
-        for event in self.entries:
-            apply(event)
-
-    def verify(self) -> bool:  # pragma: no cover - simple always-true stub
-        return True
-
-
 async def async_add_event(logchain: "LogChain", event: Dict[str, Any]) -> None:
     loop = asyncio.get_running_loop()
     await loop.run_in_executor(None, logchain.add, event)
@@ -1286,18 +1259,15 @@ def calculate_creative_leap_score(
     assumptions: embedding similarity approximates novelty
     validation_notes: bootstrap sampling for confidence
     """
-    global _creative_leap_model
     if not new_content:
         return (
             {"value": 0.0, "unit": "probability", "confidence": None, "method": "KL"}
             if structured
             else 0.0
         )
+    embeddings = get_embedding_service()
     try:
-        from sentence_transformers import SentenceTransformer, util
-
-        if _creative_leap_model is None:
-            _creative_leap_model = SentenceTransformer("all-MiniLM-L6-v2")
+        embeddings.model()
     except ImportError:
         logging.warning("sentence-transformers not installed. Returning default score.")
         return (
@@ -1314,8 +1284,9 @@ def calculate_creative_leap_score(
             else 0.0
         )
 
-    vec1 = _creative_leap_model.encode(new_content, convert_to_numpy=True)
-    vec2 = _creative_leap_model.encode(parent_node.description, convert_to_numpy=True)
+    # The parent description is served from the embedding cache after its
+    # first use, so a remix costs a single encode.
+    vec1, vec2 = embeddings.encode([new_content, parent_node.description])
     p = np.exp(vec1) / np.sum(np.exp(vec1))
     q = np.exp(vec2) / np.sum(np.exp(vec2))
     kl_div = float(np.sum(p * np.log((p + 1e-12) / (q + 1e-12))))
@@ -1357,6 +1328,10 @@ def validate_event_payload(event: Dict[str, Any], payload_type: type) -> bool:
     return all(k in event for k in required_keys)
 
 
+def _tag_histogram():
+    return get_tag_histogram(Config.CONTENT_ENTROPY_WINDOW_HOURS, Config.NEGENTROPY_SAMPLE_LIMIT)
+
+
 @VerifiedScientificModel(
     citation_uri="https://en.wikipedia.org/wiki/Entropy_(information_theory)",
     assumptions="tags independent",
@@ -1373,31 +1348,13 @@ def calculate_content_entropy(db: Session) -> float:
     citation_uri: https://en.wikipedia.org/wiki/Entropy_(information_theory)
     assumptions: tags independent
     validation_notes: counts within Config.CONTENT_ENTROPY_WINDOW_HOURS-hour window
+
+    Counts come from the process-wide :class:`tag_histogram.TagHistogram`,
+    so the window is resolved to ``BUCKET_SECONDS`` buckets.
     """
     if db is None:
         return 0.0
-
-    time_threshold = datetime.datetime.utcnow() - datetime.timedelta(
-        hours=Config.CONTENT_ENTROPY_WINDOW_HOURS
-    )
-    results = db.query(VibeNode).filter(VibeNode.created_at >= time_threshold).all()
-    if results is None:
-        return 0.0
-
-    tag_counter: Counter[str] = Counter()
-    for node in results:
-        if node.tags:
-            tag_counter.update(node.tags)
-
-    total_tags = sum(tag_counter.values())
-    if total_tags == 0:
-        return 0.0
-
-    entropy = 0.0
-    for count in tag_counter.values():
-        p = count / total_tags
-        entropy -= p * math.log2(p)
-    return float(entropy)
+    return _tag_histogram().content_entropy(db)
 
 
 @VerifiedScientificModel(
@@ -1419,26 +1376,7 @@ def calculate_negentropy_from_tags(db: Session) -> float:
     assumptions: finite recent window
     validation_notes: simple tag histogram
     """
-    nodes = (
-        db.query(VibeNode)
-        .order_by(VibeNode.created_at.desc())
-        .limit(Config.NEGENTROPY_SAMPLE_LIMIT)
-        .all()
-    )
-    tag_counts: Dict[str, int] = defaultdict(int)
-    total_tags = 0
-    for node in nodes:
-        for tag in node.tags or []:
-            tag_counts[tag] += 1
-            total_tags += 1
-    if not total_tags or not tag_counts:
-        return 0.0
-
-    probs = np.array(list(tag_counts.values())) / total_tags
-    S = -np.sum(probs * np.log2(probs))
-    S_max = np.log2(len(tag_counts))
-    negentropy = S_max - S
-    return float(negentropy)
+    return _tag_histogram().negentropy(db)
 
 
 def simulate_social_entanglement(
@@ -1452,7 +1390,7 @@ def simulate_social_entanglement(
     denote influence probability. The influence value is derived via a path
     probability computation similar to methods used in causal inference.
     """
-    graph = build_causal_graph(db)
+    graph = get_influence_graph(db)
     influence = query_influence(graph, user1_id, user2_id)
     return {
         "source": user1_id,
@@ -1734,11 +1672,14 @@ class Config:
 
     # --- Background task tuning ---
     PASSIVE_AURA_UPDATE_INTERVAL_SECONDS: int = 3600
+    # Harmonizers credited per passive aura UPDATE batch
+    PASSIVE_AURA_BATCH_SIZE: int = 1000
     PROPOSAL_LIFECYCLE_INTERVAL_SECONDS: int = 300
     NONCE_CLEANUP_INTERVAL_SECONDS: int = 3600
     NONCE_EXPIRATION_SECONDS: int = 86400
     CONTENT_ENTROPY_UPDATE_INTERVAL_SECONDS: int = 600
     NETWORK_CENTRALITY_UPDATE_INTERVAL_SECONDS: int = 3600
+    GRAPH_ANALYTICS_UPDATE_INTERVAL_SECONDS: int = 300
     PROACTIVE_INTERVENTION_INTERVAL_SECONDS: int = 3600
     AI_PERSONA_EVOLUTION_INTERVAL_SECONDS: int = 86400
     GUINNESS_PURSUIT_INTERVAL_SECONDS: int = 86400 * 3
@@ -1746,6 +1687,9 @@ class Config:
     ADAPTIVE_OPTIMIZATION_INTERVAL_SECONDS: int = 3600
     ANNUAL_AUDIT_INTERVAL_SECONDS: int = 86400 * 365
     METRICS_PORT: int = int(os.environ.get("METRICS_PORT", "8001"))
+    # Directory holding the event log segments and state snapshots; relative
+    # log and snapshot names are resolved against it
+    DATA_DIR: str = os.environ.get("SUPERNOVA_DATA_DIR", "data")
 
     # Cooldown to prevent excessive universe forking
     FORK_COOLDOWN_SECONDS: int = 3600
@@ -1770,6 +1714,8 @@ class Config:
         default_factory=lambda: ["DAILY_DECAY", "KARMA_MINT_THRESHOLD"]
     )
     SPECIES: List[str] = field(default_factory=lambda: ["human", "ai", "company"])
+    # Cross-check incremental proposal tallies against a full storage rescan
+    TALLY_VERIFY: bool = False
 
     # --- Meta-evaluation tuning ---
     # Minimum number of records required before bias analysis is considered
@@ -1781,6 +1727,12 @@ class Config:
     # Days before unresolved hypotheses are considered stale in meta analyses
     UNRESOLVED_HYPOTHESIS_THRESHOLD_DAYS: int = 60
 
+    # --- Hypothesis reasoning ---
+    # Days without a score or status change before an open hypothesis is stale
+    HYPOTHESIS_STALENESS_THRESHOLD_DAYS: int = 30
+    # Normalized Levenshtein similarity for conflict and redundancy checks
+    TEXT_SIMILARITY_THRESHOLD: float = 0.7
+
 
 USE_IN_MEMORY_STORAGE = False
 
@@ -1940,19 +1892,89 @@ class Coin:
 
 
 # --- MODULE: harmony_scanner.py ---
+class _FuzzyKeywordIndex:
+    """Deletion-neighbourhood index over keywords for bounded edit distance.
+
+    Two strings within Levenshtein distance ``k`` always share a string
+    reachable by at most ``k`` single-character deletions from each, so a
+    word only needs its own deletion variants looked up. Candidates are then
+    confirmed with :func:`levenshtein_distance`, keeping results exact.
+    """
+
+    # Above this bound the neighbourhoods grow too fast; scan linearly instead
+    MAX_INDEXED_DISTANCE = 3
+
+    def __init__(self, keywords: List[str], max_distance: int) -> None:
+        self.keywords = keywords
+        self.max_distance = max_distance
+        self._lengths = {len(k) for k in keywords}
+        self._index: Optional[Dict[str, set]] = None
+        if keywords and 0 <= max_distance <= self.MAX_INDEXED_DISTANCE:
+            self._index = defaultdict(set)
+            for pos, keyword in enumerate(keywords):
+                for variant in self._deletions(keyword):
+                    self._index[variant].add(pos)
+
+    def _deletions(self, word: str) -> set:
+        variants = {word}
+        frontier = {word}
+        for _ in range(self.max_distance):
+            frontier = {
+                w[:i] + w[i + 1 :] for w in frontier for i in range(len(w))
+            } - variants
+            if not frontier:
+                break
+            variants |= frontier
+        return variants
+
+    def first_match(self, word: str) -> Optional[str]:
+        """Return the earliest keyword within ``max_distance`` of ``word``."""
+        if not self.keywords:
+            return None
+        if self._index is None:
+            candidates: Iterable[int] = range(len(self.keywords))
+        else:
+            k = self.max_distance
+            if not any(abs(len(word) - n) <= k for n in self._lengths):
+                return None
+            found: set = set()
+            for variant in self._deletions(word):
+                found.update(self._index.get(variant, ()))
+            candidates = sorted(found)
+        for pos in candidates:
+            keyword = self.keywords[pos]
+            if levenshtein_distance(word, keyword) <= self.max_distance:
+                return keyword
+        return None
+
+
 class HarmonyScanner:
-    """Scans content for harmony, using regex and ML-based fuzzy matching."""
+    """Scans content for harmony, using regex and ML-based fuzzy matching.
+
+    Block patterns are merged into one alternation so clean text is searched
+    once, and fuzzy keywords are looked up through a
+    :class:`_FuzzyKeywordIndex`. Scanning takes no lock; only block logging
+    is serialized.
+    """
+
+    FUZZY_CACHE_SIZE = 65536
+    _BACKREFERENCE = re.compile(r"\\[1-9]|\(\?P=")
 
     def __init__(self, config: Config):
         self.config = config
         self.lock = threading.RLock()
         self.block_counts = defaultdict(int)
-        self.compiled_patterns = [
-            re.compile(p, re.IGNORECASE) for p in config.VAX_PATTERNS.get("block", [])
-        ]
-        self.fuzzy_keywords = [
-            p.strip(r"\b") for p in config.VAX_PATTERNS.get("block", []) if r"\b" in p
-        ]
+        block_patterns = config.VAX_PATTERNS.get("block", [])
+        self.compiled_patterns = [re.compile(p, re.IGNORECASE) for p in block_patterns]
+        self.combined_pattern = self._combine(block_patterns)
+        self.fuzzy_keywords = [p.strip(r"\b") for p in block_patterns if r"\b" in p]
+        self.fuzzy_index = _FuzzyKeywordIndex(
+            self.fuzzy_keywords, self.config.VAX_FUZZY_THRESHOLD
+        )
+        # Thread-safe memo: repeated words skip the index entirely
+        self._fuzzy_match = lru_cache(maxsize=self.FUZZY_CACHE_SIZE)(
+            self.fuzzy_index.first_match
+        )
         self._block_queue = queue.Queue()
         self._block_writer_thread = threading.Thread(
             target=self._block_writer_loop, daemon=True
@@ -1968,34 +1990,57 @@ class HarmonyScanner:
         else:
             self.embedding_model = None
 
-    def scan(self, text: str) -> bool:
-        """Scan text for dissonant content."""
+    @classmethod
+    def _combine(cls, patterns: List[str]) -> Optional[re.Pattern]:
+        """Merge ``patterns`` into one alternation, or ``None`` if unsafe."""
+        if len(patterns) < 2 or any(cls._BACKREFERENCE.search(p) for p in patterns):
+            return None
+        try:
+            return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+        except re.error:
+            return None
+
+    def _check(self, text: str) -> None:
         lower_text = text.lower()
-        with self.lock:
+        if self.combined_pattern is None or self.combined_pattern.search(lower_text):
+            # Report the first pattern in configured order, as before
             for pat in self.compiled_patterns:
                 if pat.search(lower_text):
                     self._log_block("block", pat.pattern, text)
                     raise DissonantContentError(
                         f"Content blocked: matches '{pat.pattern}'."
                     )
-            # Fuzzy with Levenshtein
-            words = set(re.split(r"\W+", lower_text))
-            for word in words:
-                if len(word) > 2:
-                    for keyword in self.fuzzy_keywords:
-                        if (
-                            levenshtein_distance(word, keyword)
-                            <= self.config.VAX_FUZZY_THRESHOLD
-                        ):
-                            self._log_block("fuzzy", keyword, text)
-                            raise DissonantContentError(
-                                f"Fuzzy match: '{word}' close to '{keyword}'."
-                            )
-            # ML enhancement: embed and compare cosine similarity
-            if self._ml_detect_dissonance(text):
-                raise DissonantContentError("ML detected dissonance.")
+        # Fuzzy with Levenshtein
+        words = set(re.split(r"\W+", lower_text))
+        for word in words:
+            if len(word) > 2:
+                keyword = self._fuzzy_match(word)
+                if keyword is not None:
+                    self._log_block("fuzzy", keyword, text)
+                    raise DissonantContentError(
+                        f"Fuzzy match: '{word}' close to '{keyword}'."
+                    )
+        # ML enhancement: embed and compare cosine similarity
+        if self._ml_detect_dissonance(text):
+            raise DissonantContentError("ML detected dissonance.")
+
+    def scan(self, text: str) -> bool:
+        """Scan text for dissonant content."""
+        self._check(text)
         return True
 
+    def scan_many(self, texts: Iterable[str]) -> List[bool]:
+        """Scan a batch; ``False`` marks texts :meth:`scan` would reject."""
+        results = []
+        for text in texts:
+            try:
+                self._check(text)
+            except DissonantContentError:
+                results.append(False)
+            else:
+                results.append(True)
+        return results
+
     def _ml_detect_dissonance(self, text: str) -> bool:
         """Use torch for embedding-based detection."""
         torch_mod = globals().get("torch")
@@ -2011,7 +2056,8 @@ class HarmonyScanner:
 
     def _log_block(self, level: str, pattern: str, text: str):
         """Log blocked content."""
-        self.block_counts[level] += 1
+        with self.lock:
+            self.block_counts[level] += 1
         snippet = text[:100]
         log_entry = (
             json.dumps(
@@ -2107,8 +2153,11 @@ class CosmicNexus:
                 db.add(vibenode)
                 db.commit()
                 # Reduce entropy
-                new_entropy = system_entropy - Config.ENTROPY_INTERVENTION_STEP
-                self.state_service.set_state("system_entropy", str(new_entropy))
+                self.state_service.increment(
+                    "system_entropy",
+                    -Decimal(str(Config.ENTROPY_INTERVENTION_STEP)),
+                    default=str(Config.SYSTEM_ENTROPY_BASE),
+                )
         finally:
             db.close()
 
@@ -2183,77 +2232,80 @@ class CosmicNexus:
             logging.warning(f"Source universe {source_universe} not found")
             return
 
-        user_data = source_agent.storage.get_user(user)
-        if not user_data:
-            logging.warning(f"User {user} not found in {source_universe}")
-            return
-        user_obj = User.from_dict(user_data, source_agent.config)
-        root_coin_data = source_agent.storage.get_coin(user_obj.root_coin_id)
-        if not root_coin_data:
-            logging.warning(f"Root coin for {user} missing in {source_universe}")
-            return
-        root_coin = Coin.from_dict(root_coin_data, source_agent.config)
-
-        ref_coin_data = target_agent.storage.get_coin(reference_coin)
-        if not ref_coin_data:
-            logging.warning(
-                f"Reference coin {reference_coin} missing in {reference_universe}"
-            )
-            return
-        ref_coin = Coin.from_dict(ref_coin_data, target_agent.config)
-
-        creator_data = target_agent.storage.get_user(ref_coin.creator)
-        if not creator_data:
-            logging.warning(
-                f"Creator {ref_coin.creator} missing in {reference_universe}"
-            )
-            return
-        creator_obj = User.from_dict(creator_data, target_agent.config)
-        creator_root_data = target_agent.storage.get_coin(creator_obj.root_coin_id)
-        if not creator_root_data:
-            logging.warning(f"Creator root coin missing in {reference_universe}")
-            return
-        creator_root = Coin.from_dict(creator_root_data, target_agent.config)
+        # One bound session per universe: reads hit the identity map and all
+        # coin/user writes are flushed together when both blocks exit.
+        with source_agent.storage.transaction(), target_agent.storage.transaction():
+            user_data = source_agent.storage.get_user(user)
+            if not user_data:
+                logging.warning(f"User {user} not found in {source_universe}")
+                return
+            user_obj = User.from_dict(user_data, source_agent.config)
+            root_coin_data = source_agent.storage.get_coin(user_obj.root_coin_id)
+            if not root_coin_data:
+                logging.warning(f"Root coin for {user} missing in {source_universe}")
+                return
+            root_coin = Coin.from_dict(root_coin_data, source_agent.config)
 
-        locks = [user_obj.lock, root_coin.lock, creator_root.lock]
-        with acquire_multiple_locks(locks):
-            if not user_obj.consent_given or root_coin.value < value:
-                logging.warning(f"Cross remix denied for {user}")
+            ref_coin_data = target_agent.storage.get_coin(reference_coin)
+            if not ref_coin_data:
+                logging.warning(
+                    f"Reference coin {reference_coin} missing in {reference_universe}"
+                )
                 return
+            ref_coin = Coin.from_dict(ref_coin_data, target_agent.config)
 
-            root_coin.value -= value
-            creator_share = value * Config.CROSS_REMIX_CREATOR_SHARE
-            treasury_share = value * Config.CROSS_REMIX_TREASURY_SHARE
-            remix_share = value - creator_share - treasury_share
-
-            creator_root.value += creator_share
-            source_agent.treasury += treasury_share
-
-            new_coin = Coin(
-                data["coin_id"],
-                user,
-                user,
-                remix_share,
-                source_agent.config,
-                is_root=False,
-                universe_id=source_universe,
-                is_remix=True,
-                references=[
-                    {"coin_id": reference_coin, "universe": reference_universe}
-                ],
-                improvement=data.get("improvement", ""),
-            )
-            # NOTE: 34/33/33 split preserves symbolic completeness. Creator receives primacy bonus.
+            creator_data = target_agent.storage.get_user(ref_coin.creator)
+            if not creator_data:
+                logging.warning(
+                    f"Creator {ref_coin.creator} missing in {reference_universe}"
+                )
+                return
+            creator_obj = User.from_dict(creator_data, target_agent.config)
+            creator_root_data = target_agent.storage.get_coin(creator_obj.root_coin_id)
+            if not creator_root_data:
+                logging.warning(f"Creator root coin missing in {reference_universe}")
+                return
+            creator_root = Coin.from_dict(creator_root_data, target_agent.config)
+
+            locks = [user_obj.lock, root_coin.lock, creator_root.lock]
+            with acquire_multiple_locks(locks):
+                if not user_obj.consent_given or root_coin.value < value:
+                    logging.warning(f"Cross remix denied for {user}")
+                    return
+
+                root_coin.value -= value
+                creator_share = value * Config.CROSS_REMIX_CREATOR_SHARE
+                treasury_share = value * Config.CROSS_REMIX_TREASURY_SHARE
+                remix_share = value - creator_share - treasury_share
+
+                creator_root.value += creator_share
+                source_agent.treasury += treasury_share
+
+                new_coin = Coin(
+                    data["coin_id"],
+                    user,
+                    user,
+                    remix_share,
+                    source_agent.config,
+                    is_root=False,
+                    universe_id=source_universe,
+                    is_remix=True,
+                    references=[
+                        {"coin_id": reference_coin, "universe": reference_universe}
+                    ],
+                    improvement=data.get("improvement", ""),
+                )
+                # NOTE: 34/33/33 split preserves symbolic completeness. Creator receives primacy bonus.
 
-            source_agent.storage.set_coin(new_coin.coin_id, new_coin.to_dict())
-            source_agent.storage.set_coin(root_coin.coin_id, root_coin.to_dict())
-            target_agent.storage.set_coin(creator_root.coin_id, creator_root.to_dict())
-            source_agent.storage.set_user(user, user_obj.to_dict())
-            target_agent.storage.set_user(creator_obj.username, creator_obj.to_dict())
+                source_agent.storage.set_coin(new_coin.coin_id, new_coin.to_dict())
+                source_agent.storage.set_coin(root_coin.coin_id, root_coin.to_dict())
+                target_agent.storage.set_coin(creator_root.coin_id, creator_root.to_dict())
+                source_agent.storage.set_user(user, user_obj.to_dict())
+                target_agent.storage.set_user(creator_obj.username, creator_obj.to_dict())
 
-            logging.info(
-                f"Cross remix {new_coin.coin_id} minted in {source_universe} referencing {reference_universe}:{reference_coin}"
-            )
+                logging.info(
+                    f"Cross remix {new_coin.coin_id} minted in {source_universe} referencing {reference_universe}:{reference_coin}"
+                )
 
     def quantum_audit(self) -> None:
         """Post an annual audit proposal to the governance system."""
@@ -2424,24 +2476,6 @@ def get_db():
         db.close()
 
 
-class SystemStateService:
-    def __init__(self, db: Session):
-        self.db = db
-
-    def get_state(self, key: str, default: str) -> str:
-        state = self.db.query(SystemState).filter(SystemState.key == key).first()
-        return state.value if state else default
-
-    def set_state(self, key: str, value: str):
-        state = self.db.query(SystemState).filter(SystemState.key == key).first()
-        if state:
-            state.value = value
-        else:
-            state = SystemState(key=key, value=value)
-            self.db.add(state)
-        self.db.commit()
-
-
 class MusicGeneratorService:
     def __init__(self, db: Session, user: Harmonizer):
         self.db = db
@@ -2479,13 +2513,12 @@ def get_system_state_service(db: Session = Depends(get_db)):
 
 def get_config_value(db: Session, key: str, default: Any) -> Any:
     """Return config value, applying any runtime overrides stored in SystemState."""
-    override_key = f"config_override:{key}"
-    state = db.query(SystemState).filter(SystemState.key == override_key).first()
-    if state:
+    value = get_config_override(db, key)
+    if value is not None:
         try:
-            return json.loads(state.value)
+            return json.loads(value)
         except Exception:
-            return state.value
+            return value
     return default
 
 
@@ -2534,6 +2567,7 @@ def register_harmonizer(user: HarmonizerCreate, db: Session = Depends(get_db)):
     db.add(new_user)
     db.commit()
     db.refresh(new_user)
+    get_username_index().add(db, new_user.id, new_user.username)
     return new_user
 
 
@@ -2564,7 +2598,7 @@ def get_user_influence_score(
     db: Session = Depends(get_db),
     current_user: Harmonizer = Depends(get_current_active_user),
 ):
-    graph = build_causal_graph(db)
+    graph = get_influence_graph(db)
     score = calculate_influence_score(graph.graph, current_user.id)
     current_user.network_centrality = float(score)
     db.commit()
@@ -2602,13 +2636,20 @@ def follow_unfollow_user(
         raise HTTPException(status_code=404, detail="Harmonizer not found")
     if user_to_follow.id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot follow yourself")
-    if user_to_follow in current_user.following:
-        current_user.following.remove(user_to_follow)
-        message = "Unfollowed"
-    else:
-        current_user.following.append(user_to_follow)
-        message = "Followed"
+    following, changed = engagement.toggle_follow(db, current_user.id, user_to_follow.id)
+    message = "Followed" if following else "Unfollowed"
     db.commit()
+    if not changed:
+        # A concurrent request made the same change and ran its side effects
+        return {"message": message}
+    centrality = get_centrality_engine()
+    edge = {"follower_id": current_user.id, "followed_id": user_to_follow.id}
+    if message == "Followed":
+        centrality.record_follow(current_user.id, user_to_follow.id)
+        publish_event(events.USER_FOLLOWED, edge)
+    else:
+        centrality.record_unfollow(current_user.id, user_to_follow.id)
+        publish_event(events.USER_UNFOLLOWED, edge)
     return {"message": message}
 
 
@@ -2624,32 +2665,48 @@ def get_user_by_username(username: str, db: Session = Depends(get_db)):
 
 
 @app.get("/users/{username}/followers", tags=["Harmonizers"])
-def get_user_followers(username: str, db: Session = Depends(get_db)):
+def get_user_followers(
+    username: str,
+    db: Session = Depends(get_db),
+    limit: int = engagement.Config.DEFAULT_PAGE_SIZE,
+    after: Optional[int] = None,
+):
+    """Followers in user id order; pass ``next_cursor`` as ``after`` for more."""
     user = db.query(Harmonizer).filter(Harmonizer.username == username).first()
     if not user:
         raise HTTPException(status_code=404, detail="Harmonizer not found")
-    followers = [u.username for u in user.followers]
-    return {"count": len(followers), "followers": followers}
+    followers, next_cursor = engagement.list_followers(db, user.id, limit, after)
+    return {
+        "count": user.followers_count or 0,
+        "followers": followers,
+        "next_cursor": next_cursor,
+    }
 
 
 @app.get("/users/{username}/following", tags=["Harmonizers"])
-def get_user_following(username: str, db: Session = Depends(get_db)):
+def get_user_following(
+    username: str,
+    db: Session = Depends(get_db),
+    limit: int = engagement.Config.DEFAULT_PAGE_SIZE,
+    after: Optional[int] = None,
+):
+    """Followed users in user id order; pass ``next_cursor`` as ``after`` for more."""
     user = db.query(Harmonizer).filter(Harmonizer.username == username).first()
     if not user:
         raise HTTPException(status_code=404, detail="Harmonizer not found")
-    following = [u.username for u in user.following]
-    return {"count": len(following), "following": following}
+    following, next_cursor = engagement.list_following(db, user.id, limit, after)
+    return {
+        "count": user.following_count or 0,
+        "following": following,
+        "next_cursor": next_cursor,
+    }
 
 
 @app.get("/users/search", tags=["Harmonizers"])
-def search_users(q: str, db: Session = Depends(get_db)):
-    users = (
-        db.query(Harmonizer)
-        .filter(Harmonizer.username.ilike(f"%{q}%"))
-        .limit(5)
-        .all()
-    )
-    return [{"id": u.id, "username": u.username} for u in users]
+def search_users(q: str, db: Session = Depends(get_db), limit: int = 5):
+    """Rank usernames by prefix, substring and trigram similarity to ``q``."""
+    matches = get_username_index().search(db, q, limit)
+    return [{"id": user_id, "username": username} for user_id, username in matches]
 
 
 @app.post(
@@ -2690,22 +2747,29 @@ def remix_vibenode(
     db.commit()
     db.refresh(clone)
 
-    last_entry = db.query(LogEntry).order_by(LogEntry.id.desc()).first()
-    prev_hash = last_entry.current_hash if last_entry else ""
-    payload = json.dumps({"parent_id": parent.id, "child_id": clone.id})
-    log = LogEntry(
-        timestamp=datetime.datetime.utcnow(),
-        event_type="vibenode_remix",
-        payload=payload,
-        previous_hash=prev_hash,
-        current_hash="",
+    get_log_chain_appender(db.get_bind()).append(
+        "vibenode_remix", json.dumps({"parent_id": parent.id, "child_id": clone.id})
+    )
+    publish_event(
+        events.VIBENODE_CREATED,
+        {
+            "vibenode_id": clone.id,
+            "author_id": current_user.id,
+            "tags": clone.tags,
+            "created_at": clone.created_at,
+        },
+    )
+    publish_event(
+        events.VIBENODE_REMIXED,
+        {
+            "author_id": current_user.id,
+            "parent_author_id": parent.author_id,
+            "vibenode_id": clone.id,
+        },
     )
-    log.current_hash = log.compute_hash()
-    db.add(log)
-    db.commit()
     out = VibeNodeOut.model_validate(clone)
     data = out.model_dump()
-    data.update(likes_count=0, comments_count=0, entangled_count=0)
+    data.update(comments_count=0, entangled_count=0)
     return VibeNodeOut(**data)
 
 
@@ -2796,62 +2860,13 @@ def get_network_analysis(
     db: Session = Depends(get_db),
     current_user: Harmonizer = Depends(get_current_active_user),
 ):
-    G = nx.DiGraph()
-    harmonizers = db.query(Harmonizer).offset(skip).limit(limit).all()
-    for h in harmonizers:
-        G.add_node(
-            f"h_{h.id}",
-            label=h.username,
-            type="harmonizer",
-            harmony_score=float(h.harmony_score),
-        )
-        for followed in h.following:
-            G.add_edge(f"h_{h.id}", f"h_{followed.id}", type="follow")
-    vibenodes = db.query(VibeNode).offset(skip).limit(limit).all()
-    for v in vibenodes:
-        G.add_node(f"v_{v.id}", label=v.name, type="vibenode", echo=float(v.echo))
-        G.add_edge(f"h_{v.author_id}", f"v_{v.id}", type="created")
-        for liker in v.likes:
-            G.add_edge(f"h_{liker.id}", f"v_{v.id}", type="liked")
-        entanglements = (
-            db.query(vibenode_entanglements)
-            .filter(vibenode_entanglements.c.source_id == v.id)
-            .all()
-        )
-        for entangled in entanglements:
-            G.add_edge(
-                f"v_{v.id}",
-                f"v_{entangled.target_id}",
-                type="entangled",
-                strength=entangled.strength,
-            )
-    if not G.nodes:
-        return {"nodes": [], "edges": [], "metrics": {}}
-    degree_centrality = nx.degree_centrality(G)
-    betweenness_centrality = nx.betweenness_centrality(G)
-    nodes_data = [
-        {
-            "id": n,
-            **G.nodes[n],
-            "degree_centrality": degree_centrality.get(n, 0),
-            "betweenness_centrality": betweenness_centrality.get(n, 0),
-        }
-        for n in G.nodes
-    ]
-    edges_data = [{"source": u, "target": v, **G.edges[u, v]} for u, v in G.edges]
+    """Return a page of nodes and edges with centrality from the cached analytics.
 
-    return {
-        "nodes": nodes_data,
-        "edges": edges_data,
-        "metrics": {
-            "node_count": G.number_of_nodes(),
-            "edge_count": G.number_of_edges(),
-            "density": nx.density(G),
-            "is_strongly_connected": (
-                nx.is_strongly_connected(G) if G.number_of_nodes() > 0 else False
-            ),
-        },
-    }
+    Centrality covers the whole network and is refreshed in the background by
+    :func:`update_graph_analytics_task`; betweenness is a sampled estimate
+    whose error bound is reported in ``metrics``.
+    """
+    return get_graph_analytics().ensure(db).page(skip, limit)
 
 
 def run_validation_cycle() -> None:
@@ -2907,7 +2922,7 @@ def epistemic_audit():
 @app.get("/api/global-epistemic-state", tags=["System"])
 def global_epistemic_state(db: Session = Depends(get_db)):
     """Return a summary of the agent's epistemic state."""
-    graph = build_causal_graph(db)
+    graph = get_influence_graph(db)
     users = db.query(Harmonizer).limit(5).all()
     scores = [calculate_influence_score(graph.graph, u.id)["value"] for u in users]
     uncertainty = estimate_uncertainty({"value": sum(scores)}, scores)
@@ -2985,14 +3000,12 @@ def resonance_summary(db: Session = Depends(get_db)):
 @app.get("/api/adaptive-config-status", tags=["System"])
 def adaptive_config_status(db: Session = Depends(get_db)):
     """Return current configuration overrides applied by the optimizer."""
-    rows = db.query(SystemState).filter(SystemState.key.like("config_override:%")).all()
     overrides = {}
-    for r in rows:
-        key = r.key.split("config_override:", 1)[1]
+    for key, value in get_state_cache().overrides(db).items():
         try:
-            overrides[key] = json.loads(r.value)
+            overrides[key] = json.loads(value)
         except Exception:
-            overrides[key] = r.value
+            overrides[key] = value
     return {"overrides": overrides}
 
 
@@ -3142,10 +3155,8 @@ def create_vibenode(
     current_user.creative_spark = str(
         Decimal(current_user.creative_spark) + creator_share
     )
-    current_wellspring = Decimal(state_service.get_state("community_wellspring", "0.0"))
-    state_service.set_state(
-        "community_wellspring", str(current_wellspring + treasury_share)
-    )
+    state_service.increment("community_wellspring", treasury_share, default="0.0")
+    parent = None
     parent_depth = 0
     if vibenode.parent_vibenode_id:
         parent = (
@@ -3180,12 +3191,33 @@ def create_vibenode(
     db.add(db_vibenode)
     db.commit()
     db.refresh(db_vibenode)
+    publish_event(
+        events.VIBENODE_CREATED,
+        {
+            "vibenode_id": db_vibenode.id,
+            "author_id": current_user.id,
+            "tags": db_vibenode.tags,
+            "created_at": db_vibenode.created_at,
+        },
+    )
+    if parent is not None:
+        publish_event(
+            events.VIBENODE_REMIXED,
+            {
+                "author_id": current_user.id,
+                "parent_author_id": parent.author_id,
+                "vibenode_id": db_vibenode.id,
+            },
+        )
     # Reduce system entropy by injecting negentropy
-    new_entropy = Decimal(system_entropy) - Decimal(str(Config.ENTROPY_REDUCTION_STEP))
-    state_service.set_state("system_entropy", str(new_entropy))
+    state_service.increment(
+        "system_entropy",
+        -Decimal(str(Config.ENTROPY_REDUCTION_STEP)),
+        default=str(Config.SYSTEM_ENTROPY_BASE),
+    )
     out = VibeNodeOut.model_validate(db_vibenode)
     data = out.model_dump()
-    data.update(likes_count=0, comments_count=0, entangled_count=0)
+    data.update(comments_count=0, entangled_count=0)
     return VibeNodeOut(**data)
 
 
@@ -3203,11 +3235,14 @@ def like_vibenode(
     if not vibenode:
         raise HTTPException(status_code=404, detail="VibeNode not found")
     bonus_factor = Decimal("1.0")
-    if current_user in vibenode.likes:
-        vibenode.likes.remove(current_user)
+    liked, changed = engagement.toggle_like(db, current_user.id, vibenode.id)
+    if not changed:
+        # A concurrent request made the same change and ran its side effects
+        db.commit()
+        return {"message": "Liked" if liked else "Unliked"}
+    if not liked:
         message = "Unliked"
     else:
-        vibenode.likes.append(current_user)
         message = "Liked"
         base_echo_gain = Decimal("1.0")
         base_catalyst = Decimal("1.0")
@@ -3241,6 +3276,14 @@ def like_vibenode(
         )
         agent.quantum_ctx.step()
     db.commit()
+    publish_event(
+        events.VIBENODE_LIKED if message == "Liked" else events.VIBENODE_UNLIKED,
+        {
+            "user_id": current_user.id,
+            "author_id": vibenode.author_id,
+            "vibenode_id": vibenode.id,
+        },
+    )
     return {"message": message}
 
 
@@ -3302,31 +3345,124 @@ def ai_assist(
 
 
 # Background tasks
+PASSIVE_AURA_CURSOR_KEY = "passive_aura_cursor"
+
+
+def accrue_passive_aura(
+    db: Session,
+    now: Optional[datetime.datetime] = None,
+    batch_size: Optional[int] = None,
+) -> int:
+    """Credit passive aura to influential harmonizers in bounded batches.
+
+    Reads ``(id, network_centrality, last_passive_aura_timestamp,
+    creative_spark)`` columns in id order and writes each batch with one
+    executemany UPDATE, committing per batch so row locks stay short.
+
+    Every UPDATE is guarded on the row's previous timestamp, so a row
+    credited concurrently is never credited twice.  The cycle's ``now``
+    and the last processed id are committed with each batch under
+    ``PASSIVE_AURA_CURSOR_KEY``.  A cycle that crashes resumes from that
+    cursor at the same instant instead of starting over.  Rows that were
+    never stamped start accruing from the cycle's ``now``.  Returns the
+    number of rows credited.
+    """
+    from sqlalchemy import bindparam, select, update
+
+    batch_size = batch_size or Config.PASSIVE_AURA_BATCH_SIZE
+    table = Harmonizer.__table__
+    cursor_row = (
+        db.query(SystemState).filter(SystemState.key == PASSIVE_AURA_CURSOR_KEY).first()
+    )
+    cursor = json.loads(cursor_row.value) if cursor_row and cursor_row.value else None
+    if cursor:
+        now = datetime.datetime.fromisoformat(cursor["cycle"])
+        last_id = int(cursor["last_id"])
+        logging.info("Resuming passive aura cycle %s after id %s", cursor["cycle"], last_id)
+    else:
+        now = now or datetime.datetime.utcnow()
+        last_id = 0
+        if cursor_row is None:
+            cursor_row = SystemState(key=PASSIVE_AURA_CURSOR_KEY, value="")
+            db.add(cursor_row)
+
+    stmt = (
+        update(table)
+        .where(
+            table.c.id == bindparam("b_id"),
+            table.c.last_passive_aura_timestamp == bindparam("b_old_ts"),
+        )
+        .values(
+            creative_spark=bindparam("b_spark"),
+            last_passive_aura_timestamp=bindparam("b_ts"),
+        )
+    )
+    stamp = (
+        update(table)
+        .where(
+            table.c.id == bindparam("b_id"),
+            table.c.last_passive_aura_timestamp.is_(None),
+        )
+        .values(last_passive_aura_timestamp=bindparam("b_ts"))
+    )
+    credited = 0
+    while True:
+        rows = db.execute(
+            select(
+                table.c.id,
+                table.c.network_centrality,
+                table.c.last_passive_aura_timestamp,
+                table.c.creative_spark,
+            )
+            .where(
+                table.c.network_centrality > Config.INFLUENCE_THRESHOLD_FOR_AURA_GAIN,
+                table.c.id > last_id,
+            )
+            .order_by(table.c.id)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        params = []
+        unstamped = []
+        for user_id, centrality, last_ts, spark in rows:
+            if last_ts is None:
+                unstamped.append({"b_id": user_id, "b_ts": now})
+                continue
+            if last_ts >= now:
+                continue
+            elapsed = (now - last_ts).total_seconds()
+            gain = (
+                Decimal(centrality)
+                * Decimal(elapsed / 3600)
+                * Config.PASSIVE_AURA_GAIN_MULTIPLIER
+            )
+            params.append(
+                {
+                    "b_id": user_id,
+                    "b_old_ts": last_ts,
+                    "b_spark": str(safe_decimal(spark) + gain),
+                    "b_ts": now,
+                }
+            )
+        if params:
+            credited += db.execute(stmt, params).rowcount or 0
+        if unstamped:
+            db.execute(stamp, unstamped)
+        last_id = rows[-1][0]
+        cursor_row.value = json.dumps({"cycle": now.isoformat(), "last_id": last_id})
+        db.commit()
+    cursor_row.value = ""
+    db.commit()
+    return credited
+
+
 async def passive_aura_resonance_task(db_session_factory):
     while True:
         await asyncio.sleep(Config.PASSIVE_AURA_UPDATE_INTERVAL_SECONDS)
         db = db_session_factory()
         try:
-            influential = (
-                db.query(Harmonizer)
-                .filter(
-                    Harmonizer.network_centrality
-                    > Config.INFLUENCE_THRESHOLD_FOR_AURA_GAIN
-                )
-                .all()
-            )
-            for u in influential:
-                elapsed = (
-                    datetime.datetime.utcnow() - u.last_passive_aura_timestamp
-                ).total_seconds()
-                gain = (
-                    Decimal(u.network_centrality)
-                    * Decimal(elapsed / 3600)
-                    * Config.PASSIVE_AURA_GAIN_MULTIPLIER
-                )
-                u.creative_spark = str(Decimal(u.creative_spark) + gain)
-                u.last_passive_aura_timestamp = datetime.datetime.utcnow()
-            db.commit()
+            accrue_passive_aura(db)
         finally:
             db.close()
 
@@ -3441,29 +3577,55 @@ async def update_content_entropy_task(db_session_factory):
 
 
 async def update_network_centrality_task(db_session_factory):
-    """Recalculate user network centrality based on follow graph."""
+    """Recalculate user network centrality based on follow graph.
+
+    Uses the process-wide :class:`CentralityEngine`, which syncs follow deltas
+    from the database, warm-starts PageRank from the previous vector and
+    writes all scores back with batched UPDATEs.
+    """
+    centrality = get_centrality_engine()
     while True:
         db = db_session_factory()
         try:
-            G = nx.DiGraph()
-            users = db.query(Harmonizer).all()
-            for user in users:
-                G.add_node(user.id)
-            for user in users:
-                for followed in user.following:
-                    G.add_edge(user.id, followed.id)
-            for uid in G.nodes:
-                u = db.query(Harmonizer).filter(Harmonizer.id == uid).first()
-                if u:
-                    score = calculate_influence_score(G, uid)
-                    u.network_centrality = float(score)
-                    u.harmony_score = str(calculate_interaction_entropy(u, db))
-            db.commit()
+            centrality.refresh(db)
+        except Exception as exc:  # pragma: no cover - safety
+            logger.error("network centrality refresh failed", error=str(exc))
+            db.rollback()
         finally:
             db.close()
         await asyncio.sleep(Config.NETWORK_CENTRALITY_UPDATE_INTERVAL_SECONDS)
 
 
+async def update_graph_analytics_task(db_session_factory):
+    """Refresh the cached ``/network-analysis`` graph and centrality estimates."""
+    analytics = get_graph_analytics()
+    while True:
+        db = db_session_factory()
+        try:
+            await asyncio.to_thread(analytics.refresh, db)
+        except Exception as exc:  # pragma: no cover - safety
+            logger.error("graph analytics refresh failed", error=str(exc))
+            db.rollback()
+        finally:
+            db.close()
+        await asyncio.sleep(Config.GRAPH_ANALYTICS_UPDATE_INTERVAL_SECONDS)
+
+
+async def rebuild_username_index_task(db_session_factory):
+    """Rebuild the ``/users/search`` index so deletions elsewhere drop out."""
+    index = get_username_index()
+    while True:
+        await asyncio.sleep(UsernameIndexConfig.REBUILD_INTERVAL_SECONDS)
+        db = db_session_factory()
+        try:
+            await asyncio.to_thread(index.rebuild, db)
+        except Exception as exc:  # pragma: no cover - safety
+            logger.error("username index rebuild failed", error=str(exc))
+            db.rollback()
+        finally:
+            db.close()
+
+
 async def system_prediction_task(db_session_factory):
     """Generate system-level predictions and experiments periodically."""
     while True:
@@ -3608,6 +3770,8 @@ async def startup_event():
     loop.create_task(annual_audit_task(cosmic_nexus))
     loop.create_task(update_content_entropy_task(SessionLocal))
     loop.create_task(update_network_centrality_task(SessionLocal))
+    loop.create_task(update_graph_analytics_task(SessionLocal))
+    loop.create_task(rebuild_username_index_task(SessionLocal))
     loop.create_task(system_prediction_task(SessionLocal))
     loop.create_task(scientific_reasoning_cycle_task(SessionLocal))
     loop.create_task(adaptive_optimization_task(SessionLocal))
@@ -3708,9 +3872,42 @@ class AbstractStorage:
     def get_all_users(self) -> List[Dict[str, Any]]:
         raise NotImplementedError
 
+    def get_users_many(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return stored users for ``names``; missing names are omitted."""
+        found = {}
+        for name in names:
+            data = self.get_user(name)
+            if data is not None:
+                found[name] = data
+        return found
+
+    def get_user_columns(
+        self, fields: List[str]
+    ) -> Tuple[List[str], Dict[str, List[Any]]]:
+        """Return ``(usernames, {field: values})`` for every stored user."""
+        users = self.get_all_users()
+        names = [u.get("username") for u in users]
+        return names, {f: [u.get(f) for u in users] for f in fields}
+
+    def update_user_fields(self, field: str, values: Dict[str, Any]) -> None:
+        """Set ``field`` to ``values[name]`` for each listed user in one batch."""
+        for name, value in values.items():
+            data = self.get_user(name)
+            if data is not None:
+                self.set_user(name, {**data, field: value})
+
     def get_coin(self, coin_id: str) -> Optional[Dict[str, Any]]:
         raise NotImplementedError
 
+    def get_coins_many(self, coin_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Return stored coins for ``coin_ids``; missing ids are omitted."""
+        found = {}
+        for coin_id in coin_ids:
+            data = self.get_coin(coin_id)
+            if data is not None:
+                found[coin_id] = data
+        return found
+
     def set_coin(self, coin_id: str, data: Dict[str, Any]):
         raise NotImplementedError
 
@@ -3741,29 +3938,184 @@ class AbstractStorage:
         raise NotImplementedError
 
 
+class _StorageUnitOfWork:
+    """Session-bound identity map and write-behind buffer for one transaction."""
+
+    def __init__(self, session: Session) -> None:
+        self.session = session
+        self.depth = 1
+        # ``None`` marks keys known to be absent from the database
+        self.users: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.coins: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.dirty_users: Dict[str, Dict[str, Any]] = {}
+        self.dirty_coins: Dict[str, Dict[str, Any]] = {}
+        self.existing_users: set = set()
+        self.existing_coins: set = set()
+        # Usernames to drop from the search index once the commit lands
+        self.deleted_users: set = set()
+
+
 class SQLAlchemyStorage(AbstractStorage):
+    # Legacy ``Coin`` dict keys mapped onto ``SymbolicToken`` columns
+    COIN_COLUMN_ALIASES = {
+        "coin_id": "token_id",
+        "value": "symbolic_value",
+        "reactor_escrow": "reaction_reserve",
+    }
+    # Agent-level user fields stored under a different ``Harmonizer`` column
+    USER_FIELD_COLUMNS = {"karma": "karma_score", "join_time": "created_at"}
+    IN_QUERY_CHUNK = 500
+
     def __init__(self, session_factory: Callable[[], Session]):
         self.session_factory = session_factory
+        self._local = threading.local()
 
     def _get_session(self) -> Session:
         return self.session_factory()
 
+    def _uow(self) -> Optional[_StorageUnitOfWork]:
+        return getattr(self._local, "uow", None)
+
     @contextmanager
     def transaction(self):
+        """Bind one session for the block and flush buffered writes on exit.
+
+        Inside the block ``get_*`` calls are served from an identity map
+        backed by the bound session and ``set_user``/``set_coin`` calls are
+        buffered, then written as bulk executemany UPDATE/INSERT statements
+        in a single commit. Nested blocks join the outermost transaction.
+        """
+        uow = self._uow()
+        if uow is not None:
+            uow.depth += 1
+            try:
+                yield uow.session
+            finally:
+                uow.depth -= 1
+            return
         db = self._get_session()
+        uow = _StorageUnitOfWork(db)
+        self._local.uow = uow
         try:
             logging.info("Starting DB transaction")
             yield db
+            self._flush(uow)
             db.commit()
             logging.info("Transaction committed")
+            for name in uow.deleted_users:
+                get_username_index().discard(db, name)
         except Exception:
             db.rollback()
             logging.error("Transaction rolled back due to failure")
             raise
         finally:
+            self._local.uow = None
             db.close()
+            self._invalidate_cache(uow)
+
+    @staticmethod
+    def _row_to_dict(row: Any) -> Dict[str, Any]:
+        data = row.__dict__.copy()
+        data.pop("_sa_instance_state", None)
+        return data
+
+    @classmethod
+    def _coin_to_dict(cls, row: Any) -> Dict[str, Any]:
+        data = cls._row_to_dict(row)
+        for legacy, column in cls.COIN_COLUMN_ALIASES.items():
+            data[legacy] = data.pop(column, None)
+        return data
+
+    def _select_in(
+        self, db: Session, model: Any, column: Any, keys: List[str]
+    ) -> List[Any]:
+        rows: List[Any] = []
+        for start in range(0, len(keys), self.IN_QUERY_CHUNK):
+            chunk = keys[start : start + self.IN_QUERY_CHUNK]
+            rows.extend(db.query(model).filter(column.in_(chunk)).all())
+        return rows
+
+    def _invalidate_cache(self, uow: _StorageUnitOfWork) -> None:
+        try:
+            for name in uow.dirty_users:
+                redis_client.delete(f"user:{name}")
+            for coin_id in uow.dirty_coins:
+                redis_client.delete(f"coin:{coin_id}")
+        except Exception:
+            pass
+
+    def _bulk_upsert(
+        self,
+        db: Session,
+        table: Any,
+        key_column: str,
+        pending: Dict[str, Dict[str, Any]],
+        existing: set,
+        aliases: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Write ``pending`` rows as grouped executemany UPDATEs and INSERTs."""
+        from sqlalchemy import bindparam, insert, select, update
+
+        if not pending:
+            return
+        unknown = [k for k in pending if k not in existing]
+        key_col = table.c[key_column]
+        for start in range(0, len(unknown), self.IN_QUERY_CHUNK):
+            chunk = unknown[start : start + self.IN_QUERY_CHUNK]
+            existing.update(
+                db.execute(select(key_col).where(key_col.in_(chunk))).scalars().all()
+            )
+        pk_names = {c.name for c in table.primary_key.columns} - {key_column}
+        updates: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+        inserts: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+        for key, data in pending.items():
+            row: Dict[str, Any] = {}
+            for k, v in data.items():
+                col = (aliases or {}).get(k, k)
+                if col not in table.c or col == key_column:
+                    continue
+                row[col] = str(v) if isinstance(v, Decimal) else v
+            if key in existing:
+                for pk in pk_names:
+                    row.pop(pk, None)
+                if row:
+                    updates[tuple(sorted(row))].append({"_key": key, **row})
+            else:
+                row[key_column] = key
+                inserts[tuple(sorted(row))].append(row)
+        for cols, rows in updates.items():
+            stmt = (
+                update(table)
+                .where(key_col == bindparam("_key"))
+                .values({c: bindparam(c) for c in cols})
+            )
+            db.execute(stmt, rows)
+        for rows in inserts.values():
+            db.execute(insert(table), rows)
+
+    def _flush(self, uow: _StorageUnitOfWork) -> None:
+        self._bulk_upsert(
+            uow.session,
+            Harmonizer.__table__,
+            "username",
+            uow.dirty_users,
+            uow.existing_users,
+        )
+        self._bulk_upsert(
+            uow.session,
+            SymbolicToken.__table__,
+            "token_id",
+            uow.dirty_coins,
+            uow.existing_coins,
+            aliases=self.COIN_COLUMN_ALIASES,
+        )
 
     def get_user(self, name: str) -> Optional[Dict]:
+        uow = self._uow()
+        if uow is not None:
+            if name not in uow.users:
+                self._load_users(uow, [name])
+            return uow.users[name]
         try:
             cached = redis_client.get(f"user:{name}")
         except Exception:  # redis unavailable
@@ -3774,8 +4126,7 @@ class SQLAlchemyStorage(AbstractStorage):
         try:
             user = db.query(Harmonizer).filter(Harmonizer.username == name).first()
             if user:
-                data = user.__dict__.copy()
-                data.pop("_sa_instance_state", None)
+                data = self._row_to_dict(user)
                 try:
                     redis_client.setex(f"user:{name}", 300, json.dumps(data))
                 except Exception:
@@ -3785,32 +4136,143 @@ class SQLAlchemyStorage(AbstractStorage):
         finally:
             db.close()
 
-    def set_user(self, name: str, data: Dict):
-        try:
-            redis_client.delete(f"user:{name}")
-        except Exception:
-            pass
+    def _load_users(self, uow: _StorageUnitOfWork, names: List[str]) -> None:
+        rows = self._select_in(uow.session, Harmonizer, Harmonizer.username, names)
+        for name in names:
+            uow.users.setdefault(name, None)
+        for row in rows:
+            uow.users[row.username] = self._row_to_dict(row)
+            uow.existing_users.add(row.username)
+
+    def get_users_many(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch many users with chunked ``IN`` queries."""
+        names = list(dict.fromkeys(names))
+        uow = self._uow()
+        if uow is not None:
+            missing = [n for n in names if n not in uow.users]
+            if missing:
+                self._load_users(uow, missing)
+            return {n: uow.users[n] for n in names if uow.users[n] is not None}
         db = self._get_session()
         try:
-            user = db.query(Harmonizer).filter(Harmonizer.username == name).first()
-            if user:
-                for k, v in data.items():
-                    setattr(user, k, v)
-            else:
-                user = Harmonizer(username=name, **data)
-                db.add(user)
-            db.commit()
+            rows = self._select_in(db, Harmonizer, Harmonizer.username, names)
+            return {row.username: self._row_to_dict(row) for row in rows}
         finally:
             db.close()
 
+    def set_user(self, name: str, data: Dict):
+        uow = self._uow()
+        if uow is None:
+            with self.transaction():
+                self.set_user(name, data)
+            return
+        uow.users[name] = data
+        uow.dirty_users[name] = data
+
     def get_all_users(self) -> List[Dict]:
+        uow = self._uow()
+        if uow is not None:
+            rows = uow.session.query(Harmonizer).all()
+            for row in rows:
+                if row.username not in uow.users:
+                    uow.users[row.username] = self._row_to_dict(row)
+                uow.existing_users.add(row.username)
+            return [d for d in uow.users.values() if d is not None]
         db = self._get_session()
         try:
             return [u.__dict__ for u in db.query(Harmonizer).all()]
         finally:
             db.close()
 
+    def _user_column(self, field: str) -> Any:
+        return Harmonizer.__table__.c[self.USER_FIELD_COLUMNS.get(field, field)]
+
+    def get_user_columns(
+        self, fields: List[str]
+    ) -> Tuple[List[str], Dict[str, List[Any]]]:
+        """Select only ``fields`` for all users instead of hydrating ORM rows."""
+        from sqlalchemy import select
+
+        table = Harmonizer.__table__
+        cols = [self._user_column(f) for f in fields]
+        uow = self._uow()
+        db = uow.session if uow is not None else self._get_session()
+        try:
+            rows = db.execute(select(table.c.username, *cols)).all()
+        finally:
+            if uow is None:
+                db.close()
+        names = [r[0] for r in rows]
+        columns = {f: [r[i + 1] for r in rows] for i, f in enumerate(fields)}
+        if uow is not None:
+            # Overlay values buffered in this transaction
+            pos = {name: i for i, name in enumerate(names)}
+            for name, data in uow.users.items():
+                if data is None:
+                    continue
+                values = [
+                    data.get(f, data.get(self.USER_FIELD_COLUMNS.get(f, f)))
+                    for f in fields
+                ]
+                i = pos.get(name)
+                if i is None:
+                    names.append(name)
+                    for f, v in zip(fields, values):
+                        columns[f].append(v)
+                else:
+                    for f, v in zip(fields, values):
+                        columns[f][i] = v
+        return names, columns
+
+    def update_user_fields(self, field: str, values: Dict[str, Any]) -> None:
+        """Write one column for many users as a single executemany UPDATE."""
+        from sqlalchemy import bindparam, update
+
+        if not values:
+            return
+        table = Harmonizer.__table__
+        col = self._user_column(field)
+        as_float = isinstance(col.type, Float)
+        rows = [
+            {"_key": name, "_value": float(v) if as_float else v}
+            for name, v in values.items()
+        ]
+        stmt = (
+            update(table)
+            .where(table.c.username == bindparam("_key"))
+            .values({col.name: bindparam("_value")})
+        )
+        uow = self._uow()
+        if uow is not None:
+            for row in rows:
+                cached = uow.users.get(row["_key"])
+                if cached is not None:
+                    cached[field] = values[row["_key"]]
+                    if col.name != field:
+                        cached[col.name] = row["_value"]
+            uow.session.execute(stmt, rows)
+        else:
+            db = self._get_session()
+            try:
+                db.execute(stmt, rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+        try:
+            for name in values:
+                redis_client.delete(f"user:{name}")
+        except Exception:
+            pass
+
     def get_coin(self, coin_id: str) -> Optional[Dict[str, Any]]:
+        uow = self._uow()
+        if uow is not None:
+            if coin_id not in uow.coins:
+                self._load_coins(uow, [coin_id])
+            return uow.coins[coin_id]
         try:
             cached = redis_client.get(f"coin:{coin_id}")
         except Exception:
@@ -3819,10 +4281,13 @@ class SQLAlchemyStorage(AbstractStorage):
             return json.loads(cached)
         db = self._get_session()
         try:
-            coin = db.query(Coin).filter(Coin.coin_id == coin_id).first()
+            coin = (
+                db.query(SymbolicToken)
+                .filter(SymbolicToken.token_id == coin_id)
+                .first()
+            )
             if coin:
-                data = coin.__dict__.copy()
-                data.pop("_sa_instance_state", None)
+                data = self._coin_to_dict(coin)
                 try:
                     redis_client.setex(f"coin:{coin_id}", 300, json.dumps(data))
                 except Exception:
@@ -3832,38 +4297,79 @@ class SQLAlchemyStorage(AbstractStorage):
         finally:
             db.close()
 
-    def set_coin(self, coin_id: str, data: Dict[str, Any]):
-        try:
-            redis_client.delete(f"coin:{coin_id}")
-        except Exception:
-            pass
+    def _load_coins(self, uow: _StorageUnitOfWork, coin_ids: List[str]) -> None:
+        rows = self._select_in(
+            uow.session, SymbolicToken, SymbolicToken.token_id, coin_ids
+        )
+        for coin_id in coin_ids:
+            uow.coins.setdefault(coin_id, None)
+        for row in rows:
+            uow.coins[row.token_id] = self._coin_to_dict(row)
+            uow.existing_coins.add(row.token_id)
+
+    def get_coins_many(self, coin_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch many coins with chunked ``IN`` queries."""
+        coin_ids = list(dict.fromkeys(coin_ids))
+        uow = self._uow()
+        if uow is not None:
+            missing = [c for c in coin_ids if c not in uow.coins]
+            if missing:
+                self._load_coins(uow, missing)
+            return {c: uow.coins[c] for c in coin_ids if uow.coins[c] is not None}
         db = self._get_session()
         try:
-            coin = db.query(Coin).filter(Coin.coin_id == coin_id).first()
-            if coin:
-                for k, v in data.items():
-                    setattr(coin, k, v)
-            else:
-                coin = Coin(coin_id=coin_id, **data)
-                db.add(coin)
-            db.commit()
+            rows = self._select_in(
+                db, SymbolicToken, SymbolicToken.token_id, coin_ids
+            )
+            return {row.token_id: self._coin_to_dict(row) for row in rows}
         finally:
             db.close()
 
+    def set_coin(self, coin_id: str, data: Dict[str, Any]):
+        uow = self._uow()
+        if uow is None:
+            with self.transaction():
+                self.set_coin(coin_id, data)
+            return
+        uow.coins[coin_id] = data
+        uow.dirty_coins[coin_id] = data
+
     def delete_user(self, name: str):
+        uow = self._uow()
+        if uow is not None:
+            uow.dirty_users.pop(name, None)
+            uow.users[name] = None
+            uow.existing_users.discard(name)
+            if uow.session.query(Harmonizer).filter(Harmonizer.username == name).delete():
+                uow.deleted_users.add(name)
+            return
         db = self._get_session()
         try:
             user = db.query(Harmonizer).filter(Harmonizer.username == name).first()
             if user:
                 db.delete(user)
                 db.commit()
+                get_username_index().discard(db, name)
         finally:
             db.close()
 
     def delete_coin(self, coin_id: str):
+        uow = self._uow()
+        if uow is not None:
+            uow.dirty_coins.pop(coin_id, None)
+            uow.coins[coin_id] = None
+            uow.existing_coins.discard(coin_id)
+            uow.session.query(SymbolicToken).filter(
+                SymbolicToken.token_id == coin_id
+            ).delete()
+            return
         db = self._get_session()
         try:
-            coin = db.query(Coin).filter(Coin.coin_id == coin_id).first()
+            coin = (
+                db.query(SymbolicToken)
+                .filter(SymbolicToken.token_id == coin_id)
+                .first()
+            )
             if coin:
                 db.delete(coin)
                 db.commit()
@@ -3955,45 +4461,111 @@ class SQLAlchemyStorage(AbstractStorage):
 
 
 class InMemoryStorage(AbstractStorage):
+    _MISSING = object()
+
     def __init__(self):
         self.users = {}
         self.coins = {}
         self.proposals = {}
         self.marketplace_listings = {}
+        # Undo logs are per thread so concurrent transactions stay separate
+        self._local = threading.local()
+
+    def _undo(self) -> Optional[Dict[tuple, Any]]:
+        return getattr(self._local, "undo", None)
 
     @contextmanager
     def transaction(self):
-        backup_users = copy.deepcopy(self.users)
-        backup_coins = copy.deepcopy(self.coins)
+        """Record first-touch originals so rollback only restores what changed.
+
+        Nested blocks on the same thread join the outermost transaction.
+        """
+        if self._undo() is not None:
+            yield
+            return
+        undo: Dict[tuple, Any] = {}
+        self._local.undo = undo
         try:
             logging.info("Starting in-memory transaction")
             yield
             logging.info("In-memory commit succeeded")
         except Exception:
-            self.users = backup_users
-            self.coins = backup_coins
+            for (store, key), old in undo.items():
+                target = self.users if store == "users" else self.coins
+                if old is self._MISSING:
+                    target.pop(key, None)
+                else:
+                    target[key] = old
             logging.error("In-memory rollback executed")
             raise
+        finally:
+            self._local.undo = None
+
+    def _remember(self, store: str, key: str) -> None:
+        undo = self._undo()
+        if undo is not None and (store, key) not in undo:
+            target = self.users if store == "users" else self.coins
+            old = target.get(key, self._MISSING)
+            undo[(store, key)] = (
+                old if old is self._MISSING else copy.deepcopy(old)
+            )
 
     def get_user(self, name: str) -> Optional[Dict[str, Any]]:
+        # Callers mutate returned dicts in place, so snapshot on first read
+        self._remember("users", name)
         return self.users.get(name)
 
     def set_user(self, name: str, data: Dict[str, Any]):
+        self._remember("users", name)
         self.users[name] = data
 
     def get_all_users(self) -> List[Dict[str, Any]]:
+        for name in self.users:
+            self._remember("users", name)
         return list(self.users.values())
 
+    def get_users_many(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        for name in names:
+            self._remember("users", name)
+        return {n: self.users[n] for n in names if n in self.users}
+
+    def get_user_columns(
+        self, fields: List[str]
+    ) -> Tuple[List[str], Dict[str, List[Any]]]:
+        # Read-only, so no undo snapshot is taken
+        users = self.users
+        return list(users), {f: [u.get(f) for u in users.values()] for f in fields}
+
+    def update_user_fields(self, field: str, values: Dict[str, Any]) -> None:
+        # Swap in fresh dicts so the untouched originals double as undo entries
+        undo = self._undo()
+        for name, value in values.items():
+            old = self.users.get(name)
+            if old is None:
+                continue
+            if undo is not None and ("users", name) not in undo:
+                undo[("users", name)] = old
+            self.users[name] = {**old, field: value}
+
     def get_coin(self, coin_id: str) -> Optional[Dict[str, Any]]:
+        self._remember("coins", coin_id)
         return self.coins.get(coin_id)
 
+    def get_coins_many(self, coin_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        for coin_id in coin_ids:
+            self._remember("coins", coin_id)
+        return {c: self.coins[c] for c in coin_ids if c in self.coins}
+
     def set_coin(self, coin_id: str, data: Dict[str, Any]):
+        self._remember("coins", coin_id)
         self.coins[coin_id] = data
 
     def delete_user(self, name: str):
+        self._remember("users", name)
         self.users.pop(name, None)
 
     def delete_coin(self, coin_id: str):
+        self._remember("coins", coin_id)
         self.coins.pop(coin_id, None)
 
     def get_proposal(self, proposal_id: str) -> Optional[Dict[str, Any]]:
@@ -9,7 +9,9 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 from db_models import SystemState
 
-__all__ = ["log_event"]
+from .service import SystemStateService, get_state_cache
+
+__all__ = ["log_event", "SystemStateService"]
 
 
 def log_event(db: Session, category: str, payload: Dict[str, Any]) -> None:
@@ -30,3 +32,4 @@ def log_event(db: Session, category: str, payload: Dict[str, Any]) -> None:
     else:
         db.add(SystemState(key=key, value=json.dumps(events)))
     db.commit()
+    get_state_cache().invalidate(key)
@@ -0,0 +1,245 @@
+"""Read-through cached access to ``SystemState`` key/value rows.
+
+Global state such as ``system_entropy`` is read on most requests and
+written on some.  :class:`SystemStateService` keeps those reads in memory:
+
+- values (and absent keys) are cached per process for
+  ``Config.TTL_SECONDS``; each key carries a version that every local write
+  bumps, so a read that raced a write never stores the older value;
+- ``config_override:*`` keys are served from one snapshot of every override,
+  reloaded every ``Config.OVERRIDE_TTL_SECONDS`` and updated on writes;
+- :meth:`SystemStateService.increment` applies a numeric delta with a
+  conditional ``UPDATE ... WHERE value = <expected>``, retrying against a
+  fresh read when another writer got there first, so concurrent updates are
+  never lost.
+
+Writes from other processes become visible once the cached entry expires.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from db_models import SystemState
+
+logger = logging.getLogger("superNova_2177.system_state")
+
+OVERRIDE_PREFIX = "config_override:"
+
+
+class Config:
+    # Seconds a cached value is served before it is read again
+    TTL_SECONDS = 5.0
+    # Seconds the config override snapshot is served before it is reloaded
+    OVERRIDE_TTL_SECONDS = 30.0
+    # Conditional updates tried before an increment gives up
+    INCREMENT_RETRIES = 8
+
+
+_MISSING = object()
+
+
+class StateCache:
+    """Process-wide cache of ``SystemState`` values for one database."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self._bind: Any = None
+        self._entries: Dict[str, Tuple[Any, float]] = {}
+        self._versions: Dict[str, int] = {}
+        self._overrides: Optional[Dict[str, str]] = None
+        self._overrides_expire = 0.0
+        self._overrides_version = 0
+
+    def _bind_to(self, db: Session) -> None:
+        # Caller holds ``self.lock``
+        bind = db.get_bind()
+        if bind is not self._bind:
+            self._clear()
+            self._bind = bind
+
+    def _clear(self) -> None:
+        self._entries.clear()
+        self._overrides = None
+        for key in self._versions:
+            self._versions[key] += 1
+        self._overrides_version += 1
+
+    def _bump(self, key: str) -> None:
+        self._versions[key] = self._versions.get(key, 0) + 1
+        if key.startswith(OVERRIDE_PREFIX):
+            self._overrides_version += 1
+
+    # ------------------------------------------------------------------
+    # Reads
+    def get(self, db: Session, key: str) -> Optional[str]:
+        """Return the value stored under ``key`` or ``None`` if absent."""
+        if key.startswith(OVERRIDE_PREFIX):
+            return self.overrides(db).get(key[len(OVERRIDE_PREFIX):])
+        now = time.monotonic()
+        with self.lock:
+            self._bind_to(db)
+            cached = self._entries.get(key)
+            if cached is not None and cached[1] > now:
+                return None if cached[0] is _MISSING else cached[0]
+            version = self._versions.get(key, 0)
+        value = db.execute(
+            select(SystemState.value).where(SystemState.key == key)
+        ).scalar_one_or_none()
+        with self.lock:
+            if self._versions.get(key, 0) == version:
+                self._entries[key] = (
+                    _MISSING if value is None else value,
+                    now + Config.TTL_SECONDS,
+                )
+        return value
+
+    def peek(self, db: Session, key: str) -> Optional[str]:
+        """Return a live cached value for ``key`` without touching the database."""
+        with self.lock:
+            self._bind_to(db)
+            cached = self._entries.get(key)
+            if cached is None or cached[1] <= time.monotonic() or cached[0] is _MISSING:
+                return None
+            return cached[0]
+
+    def overrides(self, db: Session) -> Dict[str, str]:
+        """Return every ``config_override:*`` value keyed by parameter name."""
+        now = time.monotonic()
+        with self.lock:
+            self._bind_to(db)
+            if self._overrides is not None and self._overrides_expire > now:
+                return self._overrides
+            version = self._overrides_version
+        rows = db.execute(
+            select(SystemState.key, SystemState.value).where(
+                SystemState.key.like(f"{OVERRIDE_PREFIX}%")
+            )
+        ).all()
+        snapshot = {key[len(OVERRIDE_PREFIX):]: value for key, value in rows}
+        with self.lock:
+            if self._overrides_version == version:
+                self._overrides = snapshot
+                self._overrides_expire = now + Config.OVERRIDE_TTL_SECONDS
+        return snapshot
+
+    # ------------------------------------------------------------------
+    # Writes
+    def put(self, db: Session, key: str, value: str) -> None:
+        """Record a committed write of ``value`` under ``key``."""
+        with self.lock:
+            self._bind_to(db)
+            self._bump(key)
+            if key.startswith(OVERRIDE_PREFIX):
+                if self._overrides is not None:
+                    self._overrides = {**self._overrides, key[len(OVERRIDE_PREFIX):]: value}
+                return
+            self._entries[key] = (value, time.monotonic() + Config.TTL_SECONDS)
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop ``key`` (or everything) so the next read goes to the database."""
+        with self.lock:
+            if key is None:
+                self._clear()
+                return
+            self._bump(key)
+            self._entries.pop(key, None)
+            if key.startswith(OVERRIDE_PREFIX):
+                self._overrides = None
+
+
+_CACHE: Optional[StateCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_state_cache() -> StateCache:
+    """Return the process-wide :class:`StateCache` instance."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = StateCache()
+        return _CACHE
+
+
+def _to_decimal(key: str, value: Any) -> Decimal:
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError(f"SystemState '{key}' is not numeric: {value!r}") from None
+
+
+class SystemStateService:
+    """Cached reads and atomic updates of ``SystemState`` rows."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.cache = get_state_cache()
+
+    def get_state(self, key: str, default: str) -> str:
+        value = self.cache.get(self.db, key)
+        return default if value is None else value
+
+    def set_state(self, key: str, value: str):
+        state = self.db.query(SystemState).filter(SystemState.key == key).first()
+        if state:
+            state.value = value
+        else:
+            state = SystemState(key=key, value=value)
+            self.db.add(state)
+        try:
+            self.db.commit()
+        except Exception:
+            self.cache.invalidate(key)
+            raise
+        self.cache.put(self.db, key, value)
+
+    def increment(self, key: str, delta: Any, default: str = "0") -> str:
+        """Atomically add ``delta`` to the numeric value under ``key``.
+
+        A missing key starts from ``default``.  Returns the new value.
+        """
+        delta = _to_decimal(key, delta)
+        expected = self.cache.peek(self.db, key)
+        for _ in range(Config.INCREMENT_RETRIES):
+            if expected is None:
+                expected = self.db.execute(
+                    select(SystemState.value).where(SystemState.key == key)
+                ).scalar_one_or_none()
+                if expected is None:
+                    new_value = str(_to_decimal(key, default) + delta)
+                    try:
+                        with self.db.begin_nested():
+                            self.db.add(SystemState(key=key, value=new_value))
+                    except IntegrityError:
+                        # Another writer created the row first
+                        continue
+                    self.db.commit()
+                    self.cache.put(self.db, key, new_value)
+                    return new_value
+            new_value = str(_to_decimal(key, expected) + delta)
+            result = self.db.execute(
+                update(SystemState)
+                .where(SystemState.key == key, SystemState.value == expected)
+                .values(value=new_value)
+            )
+            if result.rowcount == 1:
+                self.db.commit()
+                self.cache.put(self.db, key, new_value)
+                return new_value
+            logger.debug("SystemState '%s' changed concurrently; retrying", key)
+            expected = None
+        self.cache.invalidate(key)
+        raise RuntimeError(f"SystemState '{key}' is too contended to increment")
+
+
+def get_config_override(db: Session, key: str) -> Optional[str]:
+    """Return the raw ``config_override:<key>`` value, if one is set."""
+    return get_state_cache().overrides(db).get(key)
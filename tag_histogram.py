@@ -0,0 +1,321 @@
+"""Streaming tag histograms for content entropy and negentropy.
+
+:class:`TagHistogram` keeps two running tag counters fed by
+``VIBENODE_CREATED`` notifications on :data:`hooks.bus.content_hooks`:
+
+- a ring buffer of ``BUCKET_SECONDS`` buckets spanning the app's
+  ``CONTENT_ENTROPY_WINDOW_HOURS``; buckets that slide out of the window are
+  subtracted from the running totals, and
+- the tags of the app's latest ``NEGENTROPY_SAMPLE_LIMIT`` nodes.
+
+Entropy, ``S_max`` and negentropy are then computed from the running totals
+in ``O(distinct tags)``.  A cold start backfills both from narrow,
+chunk-streamed column selects, and every read picks up rows written without
+a notification by selecting ids above the watermark.  Only those database
+scans advance the watermark; notified ids above it are remembered so the
+next scan does not count them twice, and a notification for a high id never
+hides an unannounced row with a lower one.
+Queries run without :attr:`TagHistogram.lock`; only applying their rows
+takes it, so notifications and reads are never blocked on the database.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+import math
+import threading
+from collections import Counter, deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+
+from hook_manager import HookManager
+from hooks import events
+from hooks.bus import content_hooks
+
+logger = logging.getLogger("superNova_2177.tag_histogram")
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+
+class Config:
+    # Width of one ring-buffer bucket; the window edge is this coarse
+    BUCKET_SECONDS = 60
+    # Rows fetched per round trip while backfilling
+    BACKFILL_CHUNK = 5000
+
+
+def _naive_utc(ts: Any) -> Optional[datetime.datetime]:
+    if isinstance(ts, str):
+        ts = datetime.datetime.fromisoformat(ts.replace("Z", "+00:00"))
+    if not isinstance(ts, datetime.datetime):
+        return None
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return ts
+
+
+def entropy_bits(counts: Iterable[int]) -> float:
+    """Shannon entropy ``-sum p log2 p`` of a histogram, in bits."""
+    counts = [c for c in counts if c > 0]
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    return -sum((c / total) * math.log2(c / total) for c in counts)
+
+
+class _Bucket:
+    __slots__ = ("index", "tags", "ids")
+
+    def __init__(self, index: int) -> None:
+        self.index = index
+        self.tags: Counter = Counter()
+        self.ids: Set[int] = set()
+
+
+class TagWindow:
+    """Time-bucketed tag counts over a sliding window."""
+
+    def __init__(self, window_hours: float, bucket_seconds: int) -> None:
+        self.bucket_seconds = bucket_seconds
+        self.span = int(math.ceil(window_hours * 3600 / bucket_seconds))
+        # One extra slot holds the bucket straddling the window edge
+        self._ring: List[Optional[_Bucket]] = [None] * (self.span + 1)
+        self.totals: Counter = Counter()
+        self.ids: Set[int] = set()
+        self.head = 0
+
+    def _index(self, ts: datetime.datetime) -> int:
+        return int((ts - _EPOCH).total_seconds() // self.bucket_seconds)
+
+    def _drop(self, slot: int) -> None:
+        bucket = self._ring[slot]
+        if bucket is None:
+            return
+        self.totals.subtract(bucket.tags)
+        for tag, count in bucket.tags.items():
+            if self.totals[tag] <= 0:
+                del self.totals[tag]
+        self.ids.difference_update(bucket.ids)
+        self._ring[slot] = None
+
+    def advance(self, now: datetime.datetime) -> None:
+        """Expire buckets that have slid out of the window ending at ``now``."""
+        head = self._index(now)
+        if head <= self.head:
+            return
+        size = len(self._ring)
+        if head - self.head >= size:
+            for slot in range(size):
+                self._drop(slot)
+        else:
+            for index in range(self.head + 1, head + 1):
+                self._drop(index % size)
+        self.head = head
+
+    def add(self, node_id: int, ts: datetime.datetime, tags: List[str]) -> None:
+        index = self._index(ts)
+        if index > self.head:
+            self.advance(ts)
+        if index < self.head - self.span or node_id in self.ids:
+            return
+        slot = index % len(self._ring)
+        bucket = self._ring[slot]
+        if bucket is None or bucket.index != index:
+            self._drop(slot)
+            bucket = self._ring[slot] = _Bucket(index)
+        bucket.ids.add(node_id)
+        self.ids.add(node_id)
+        bucket.tags.update(tags)
+        self.totals.update(tags)
+
+    def threshold(self) -> datetime.datetime:
+        """Start of the oldest bucket still inside the window."""
+        return _EPOCH + datetime.timedelta(
+            seconds=(self.head - self.span) * self.bucket_seconds
+        )
+
+
+class RecentTags:
+    """Tag counts over the latest ``limit`` nodes."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self._nodes: Deque[Tuple[int, List[str]]] = deque()
+        self.ids: Set[int] = set()
+        self.totals: Counter = Counter()
+
+    def add(self, node_id: int, tags: List[str]) -> None:
+        if node_id in self.ids:
+            return
+        self._nodes.append((node_id, tags))
+        self.ids.add(node_id)
+        self.totals.update(tags)
+        while len(self._nodes) > self.limit:
+            old_id, old_tags = self._nodes.popleft()
+            self.ids.discard(old_id)
+            self.totals.subtract(old_tags)
+            for tag in old_tags:
+                if self.totals[tag] <= 0:
+                    del self.totals[tag]
+
+
+class TagHistogram:
+    """Process-wide tag histograms kept current from ``VIBENODE_CREATED``."""
+
+    def __init__(
+        self,
+        window_hours: float,
+        sample_limit: int,
+        bucket_seconds: int = Config.BUCKET_SECONDS,
+        hooks: Optional[HookManager] = None,
+    ) -> None:
+        self.window_hours = window_hours
+        self.sample_limit = sample_limit
+        self.bucket_seconds = bucket_seconds
+        self.lock = threading.RLock()
+        self.window = TagWindow(window_hours, bucket_seconds)
+        self.recent = RecentTags(sample_limit)
+        # Highest id seen by a database scan; ids notified above it are
+        # kept in ``_notified`` until a scan passes them
+        self.watermark = 0
+        self._notified: Set[int] = set()
+        self._url: Optional[str] = None
+        (hooks if hooks is not None else content_hooks).register_hook(
+            events.VIBENODE_CREATED, self.on_created
+        )
+
+    def configure(self, window_hours: float, sample_limit: int) -> None:
+        """Adopt new window and sample sizes; the next read backfills."""
+        with self.lock:
+            if (window_hours, sample_limit) == (self.window_hours, self.sample_limit):
+                return
+            self.window_hours, self.sample_limit = window_hours, sample_limit
+            self._url = None
+
+    def _record(self, node_id: int, ts: Any, tags: Optional[List[str]]) -> None:
+        if node_id in self._notified:
+            return
+        tags = list(tags or [])
+        ts = _naive_utc(ts)
+        if ts is not None:
+            self.window.add(node_id, ts, tags)
+        self.recent.add(node_id, tags)
+
+    def on_created(self, payload: Dict[str, Any]) -> None:
+        with self.lock:
+            if self._url is None:
+                return
+            node_id = payload["vibenode_id"]
+            self._record(node_id, payload.get("created_at"), payload.get("tags"))
+            if node_id > self.watermark:
+                self._notified.add(node_id)
+
+    # ------------------------------------------------------------------
+    # Database sync
+    def _stream(self, db: Any, stmt: Any) -> Iterable[Any]:
+        result = db.execute(stmt.execution_options(yield_per=Config.BACKFILL_CHUNK))
+        for chunk in result.partitions():
+            yield from chunk
+
+    def backfill(self, db: Any, now: Optional[datetime.datetime] = None) -> None:
+        """Rebuild both histograms from narrow column selects.
+
+        The new histograms are built aside and swapped in; rows committed
+        after the watermark is read are picked up by the next :meth:`sync`.
+        """
+        from db_models import VibeNode
+
+        now = now or datetime.datetime.utcnow()
+        with self.lock:
+            sizes = (self.window_hours, self.sample_limit)
+        window = TagWindow(sizes[0], self.bucket_seconds)
+        recent = RecentTags(sizes[1])
+        window.advance(now)
+        watermark = db.execute(select(func.max(VibeNode.id))).scalar() or 0
+        latest = db.execute(
+            select(VibeNode.id, VibeNode.tags)
+            .order_by(VibeNode.created_at.desc())
+            .limit(sizes[1])
+        ).all()
+        for node_id, tags in reversed(latest):
+            recent.add(node_id, list(tags or []))
+        rows = self._stream(
+            db,
+            select(VibeNode.id, VibeNode.created_at, VibeNode.tags).where(
+                VibeNode.created_at >= window.threshold(),
+                VibeNode.id <= watermark,
+            ),
+        )
+        for node_id, created_at, tags in rows:
+            if created_at is not None:
+                window.add(node_id, created_at, list(tags or []))
+        url = str(getattr(db.get_bind(), "url", ""))
+        with self.lock:
+            if sizes != (self.window_hours, self.sample_limit):
+                return  # reconfigured meanwhile; the next read backfills again
+            self.window, self.recent, self.watermark = window, recent, watermark
+            self._notified = set()
+            self._url = url
+
+    def sync(self, db: Any, now: Optional[datetime.datetime] = None) -> None:
+        """Backfill on first use, then count rows added without a notification."""
+        from db_models import VibeNode
+
+        url = str(getattr(db.get_bind(), "url", ""))
+        with self.lock:
+            cold = url != self._url
+            watermark = self.watermark
+        if cold:
+            self.backfill(db, now)
+            return
+        rows = list(
+            self._stream(
+                db,
+                select(VibeNode.id, VibeNode.created_at, VibeNode.tags)
+                .where(VibeNode.id > watermark)
+                .order_by(VibeNode.created_at, VibeNode.id),
+            )
+        )
+        with self.lock:
+            if url != self._url:
+                return  # rebuilt for another database meanwhile
+            # Ids already counted from a notification are skipped by _record
+            for node_id, created_at, tags in rows:
+                self._record(node_id, created_at, tags)
+                self.watermark = max(self.watermark, node_id)
+            self._notified = {i for i in self._notified if i > self.watermark}
+            self.window.advance(now or datetime.datetime.utcnow())
+
+    # ------------------------------------------------------------------
+    # Reading
+    def content_entropy(self, db: Any, now: Optional[datetime.datetime] = None) -> float:
+        """Shannon entropy of tags in the sliding window, in bits."""
+        self.sync(db, now)
+        with self.lock:
+            return float(entropy_bits(self.window.totals.values()))
+
+    def negentropy(self, db: Any) -> float:
+        """``S_max - S`` over the tags of the latest sampled nodes."""
+        self.sync(db)
+        with self.lock:
+            counts = self.recent.totals
+            if not counts:
+                return 0.0
+            return float(math.log2(len(counts)) - entropy_bits(counts.values()))
+
+
+_HISTOGRAM: Optional[TagHistogram] = None
+_HISTOGRAM_LOCK = threading.Lock()
+
+
+def get_tag_histogram(window_hours: float, sample_limit: int) -> TagHistogram:
+    """Return the process-wide :class:`TagHistogram` sized from the app's Config."""
+    global _HISTOGRAM
+    with _HISTOGRAM_LOCK:
+        if _HISTOGRAM is None:
+            _HISTOGRAM = TagHistogram(window_hours, sample_limit)
+        else:
+            _HISTOGRAM.configure(window_hours, sample_limit)
+        return _HISTOGRAM
@@ -9,17 +9,18 @@ Used to increase robustness of scientific hypothesis auditing in superNova_2177.
 """
 
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from typing import List, Dict, Any, Optional, Union
 from statistics import mean, stdev
-try:
-    from dateutil import parser
-except Exception:  # pragma: no cover - optional dependency may be missing
-    parser = None  # type: ignore[assignment]
+
+import numpy as np
+
+from validation_batch import ValidationBatch
 
 logger = logging.getLogger("superNova_2177.temporal")
 logger.propagate = False
 
+_US_PER_SECOND = 1_000_000
+
 class Config:
     MAX_VALIDATION_GAP_HOURS = 96       # Warn if large time gaps appear
     MIN_VALIDATION_SPREAD_HOURS = 1.5   # Expect some temporal distribution
@@ -35,22 +36,12 @@ class Config:
     MAX_OUT_OF_ORDER_TOLERANCE = 0.1   # 10% of validations can be out of order
 
 
-def _safe_parse_timestamp(value: str) -> Optional[datetime]:
-    """Parse an ISO timestamp string to ``datetime`` safely."""
-    if not value or len(value) > 40:
-        return None
-    try:
-        if parser is not None:
-            return parser.isoparse(value)
-        return datetime.fromisoformat(value.replace("Z", "+00:00"))
-    except (ValueError, OverflowError, TypeError):
-        return None
-
 def analyze_temporal_consistency(
-    validations: List[Dict[str, Any]], 
+    validations: Union[List[Dict[str, Any]], ValidationBatch],
     reputations: Optional[Dict[str, float]] = None
 ) -> Dict[str, Any]:
-    if not validations:
+    batch = ValidationBatch.of(validations)
+    if not batch.size:
         return {
             "avg_delay_hours": 0.0,
             "consensus_volatility": 0.0,
@@ -60,38 +51,13 @@ def analyze_temporal_consistency(
             "business_hours_ratio": 0.0
         }
 
-    parsed_validations = []
-    business_hours_count = 0
-    out_of_order_count = 0
-    
-    for i, v in enumerate(validations):
-        ts_raw = v.get("timestamp")
-        ts = _safe_parse_timestamp(ts_raw)
-        if ts is None:
-            logger.warning(f"Invalid timestamp in validation {i}: {ts_raw}")
-            continue
-        try:
-            score = float(v.get("score", 0.5))
-            validator_id = v.get("validator_id", f"unknown_{i}")
-            
-            parsed_validations.append({
-                "timestamp": ts,
-                "score": score,
-                "validator_id": validator_id,
-                "note": str(v.get("note", "")).lower(),
-                "original_index": i
-            })
-            
-            if Config.BUSINESS_START_HOUR <= ts.hour <= Config.BUSINESS_END_HOUR:
-                business_hours_count += 1
-                
-        except (ValueError, TypeError) as e:
-            logger.warning(
-                f"Invalid validation data in entry {i}: {ts_raw} - {e}"
-            )
-            continue
-
-    if len(parsed_validations) < 2:
+    usable = batch.has_timestamp & batch.score_ok
+    skipped = batch.size - int(usable.sum())
+    if skipped:
+        logger.warning(f"Skipped {skipped} validations without a valid timestamp or score")
+    rows = np.flatnonzero(usable)
+
+    if len(rows) < 2:
         return {
             "avg_delay_hours": 0.0,
             "consensus_volatility": 0.0,
@@ -101,24 +67,31 @@ def analyze_temporal_consistency(
             "business_hours_ratio": 0.0
         }
 
-    sorted_validations = sorted(parsed_validations, key=lambda x: x["timestamp"])
-    
-    for i, val in enumerate(sorted_validations):
-        if val["original_index"] != i:
-            out_of_order_count += 1
-    
-    out_of_order_ratio = out_of_order_count / len(parsed_validations)
-    business_hours_ratio = business_hours_count / len(parsed_validations)
-    
-    timestamps = [v["timestamp"] for v in sorted_validations]
-    scores = [v["score"] for v in sorted_validations]
-    timeline = [(v["timestamp"].isoformat(), v["score"], v["validator_id"]) 
-                for v in sorted_validations]
+    hours = batch.hours()[rows]
+    business_hours_count = int(
+        ((hours >= Config.BUSINESS_START_HOUR) & (hours <= Config.BUSINESS_END_HOUR)).sum()
+    )
+
+    # Stable sort keeps submission order among equal timestamps
+    sorted_rows = rows[np.argsort(batch.micros[rows], kind="stable")]
+    out_of_order_count = int((sorted_rows != np.arange(len(sorted_rows))).sum())
+
+    out_of_order_ratio = out_of_order_count / len(rows)
+    business_hours_ratio = business_hours_count / len(rows)
+
+    micros = batch.micros[sorted_rows].tolist()
+    scores = batch.score[sorted_rows].tolist()
+    validator_ids = [batch.validator_id(row, f"unknown_{row}") for row in sorted_rows.tolist()]
+    notes = batch.notes_lower
+    timeline = [
+        (batch.timestamp(row).isoformat(), score, validator_id)
+        for row, score, validator_id in zip(sorted_rows.tolist(), scores, validator_ids)
+    ]
     
     flags = []
     
-    total_span = (timestamps[-1] - timestamps[0]).total_seconds() / 3600.0
-    avg_gap = total_span / (len(timestamps) - 1) if len(timestamps) > 1 else 0.0
+    total_span = (micros[-1] - micros[0]) / _US_PER_SECOND / 3600.0
+    avg_gap = total_span / (len(micros) - 1) if len(micros) > 1 else 0.0
 
     if avg_gap > Config.MAX_VALIDATION_GAP_HOURS:
         flags.append("large_time_gap")
@@ -130,15 +103,15 @@ def analyze_temporal_consistency(
         flags.append("suspicious_business_hours_concentration")
 
     contradiction_indices = []
-    for i, v in enumerate(sorted_validations):
-        if any(k in v["note"] for k in ["contradict", "refute", "oppose", "disagree"]):
+    for i, row in enumerate(sorted_rows.tolist()):
+        if any(k in notes[row] for k in ["contradict", "refute", "oppose", "disagree"]):
             contradiction_indices.append(i)
 
     if len(contradiction_indices) > 1:
         for i in range(len(contradiction_indices) - 1):
-            t1 = timestamps[contradiction_indices[i]]
-            t2 = timestamps[contradiction_indices[i+1]]
-            gap = abs((t2 - t1).total_seconds()) / 3600.0
+            t1 = micros[contradiction_indices[i]]
+            t2 = micros[contradiction_indices[i+1]]
+            gap = abs(t2 - t1) / _US_PER_SECOND / 3600.0
             if gap <= Config.CONTRADICTION_WINDOW_HOURS:
                 flags.append("contradiction_near_simultaneous")
 
@@ -149,10 +122,9 @@ def analyze_temporal_consistency(
         weighted_scores = []
         total_weight = 0.0
         
-        for v in sorted_validations:
-            validator_id = v["validator_id"]
+        for validator_id, score in zip(validator_ids, scores):
             reputation = reputations.get(validator_id, 0.5)
-            weighted_scores.append(v["score"] * reputation)
+            weighted_scores.append(score * reputation)
             total_weight += reputation
         
         if total_weight > 0:
@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from network.centrality_engine import CentralityEngine
+
+nx = pytest.importorskip("networkx")
+
+
+def _graph():
+    edges = [(1, 2), (2, 3), (3, 1), (4, 1), (4, 3), (5, 4)]
+    return [1, 2, 3, 4, 5, 6], edges
+
+
+def test_matches_networkx_pagerank():
+    nodes, edges = _graph()
+    engine = CentralityEngine()
+    engine.sync_edges(nodes, edges)
+    scores = engine.compute()
+
+    G = nx.DiGraph()
+    G.add_nodes_from(nodes)
+    G.add_edges_from(edges)
+    expected = nx.pagerank(G)
+    for node in nodes:
+        assert scores[node] == pytest.approx(expected[node], abs=1e-5)
+
+
+def test_incremental_delta_warm_starts():
+    nodes, edges = _graph()
+    engine = CentralityEngine()
+    engine.sync_edges(nodes, edges)
+    engine.compute()
+    cold = engine.last_iterations
+
+    engine.record_follow(6, 2)
+    engine.record_unfollow(5, 4)
+    scores = engine.compute()
+    assert engine.last_iterations <= cold
+
+    G = nx.DiGraph()
+    G.add_nodes_from(nodes)
+    G.add_edges_from([e for e in edges if e != (5, 4)] + [(6, 2)])
+    expected = nx.pagerank(G)
+    for node in nodes:
+        assert scores[node] == pytest.approx(expected[node], abs=1e-5)
+
+
+def test_sync_edges_reports_delta():
+    nodes, edges = _graph()
+    engine = CentralityEngine()
+    assert engine.sync_edges(nodes, edges) == (len(edges), 0)
+    engine.compute()
+    assert engine.sync_edges(nodes, edges[1:] + [(6, 1)]) == (1, 1)
@@ -0,0 +1,71 @@
+import datetime
+import sys
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("streamlit")
+pytestmark = pytest.mark.requires_streamlit
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+import agent_core
+import scientific_utils
+import superNova_2177 as sn
+
+NOW = datetime.datetime(2026, 6, 1, 12, 0, tzinfo=datetime.timezone.utc)
+
+
+def test_batch_genesis_decay_matches_scalar(monkeypatch):
+    monkeypatch.setattr(scientific_utils, "now_utc", lambda: NOW)
+    join_times = [
+        "2025-01-01T00:00:00Z",
+        "2024-02-29T13:14:15.123456+00:00",
+        datetime.datetime(2026, 5, 31, 23, 59, 59, 999999, tzinfo=datetime.timezone.utc),
+        "2020-01-01T00:00:00Z",
+        None,
+    ]
+    batch = scientific_utils.calculate_genesis_bonus_decay_many(join_times, 4)
+    for value, weight in zip(join_times, batch):
+        if isinstance(value, str):
+            value = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+        assert weight == scientific_utils.calculate_genesis_bonus_decay(value, 4)
+
+
+def _reference(user, config):
+    karma = Decimal(str(user["karma"])) * config.DAILY_DECAY
+    if user["is_genesis"]:
+        join = datetime.datetime.fromisoformat(user["join_time"].replace("Z", "+00:00"))
+        karma *= scientific_utils.calculate_genesis_bonus_decay(
+            join, config.GENESIS_BONUS_DECAY_YEARS
+        )
+    return str(karma)
+
+
+def test_daily_decay_is_decimal_exact(monkeypatch):
+    monkeypatch.setattr(scientific_utils, "now_utc", lambda: NOW)
+    agent_core._load_globals()
+    config = sn.Config()
+    storage = sn.InMemoryStorage()
+    for i in range(20):
+        storage.set_user(
+            f"u{i}",
+            {
+                "username": f"u{i}",
+                "karma": str(Decimal("1234.5678") / (i + 3)),
+                "is_genesis": i % 3 == 0,
+                "join_time": f"2024-0{i % 9 + 1}-15T08:30:00Z",
+            },
+        )
+    expected = {n: _reference(u, config) for n, u in storage.users.items()}
+
+    tally = SimpleNamespace(refresh_decay=lambda: None)
+    agent = SimpleNamespace(storage=storage, config=config, tally=tally)
+    agent_core.RemixAgent._apply_DAILY_DECAY(agent, {"event": "DAILY_DECAY"})
+
+    assert {n: u["karma"] for n, u in storage.users.items()} == expected
+    assert storage.users["u0"]["join_time"] == "2024-01-15T08:30:00Z"
@@ -0,0 +1,118 @@
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+import embedding_service
+from embedding_service import EmbeddingService, EmbeddingStore, text_key
+
+
+class FakeModel:
+    def __init__(self):
+        self.batches = []
+
+    def encode(self, texts, convert_to_numpy=True):
+        self.batches.append(list(texts))
+        return np.array(
+            [[len(t), sum(map(ord, t)) % 97, 1.5] for t in texts], dtype=np.float32
+        )
+
+
+def _service(tmp_path, model):
+    return EmbeddingService("fake-model", str(tmp_path), loader=lambda name: model)
+
+
+def test_cached_texts_are_not_reencoded_across_restarts(tmp_path):
+    model = FakeModel()
+    service = _service(tmp_path, model)
+    first = service.encode(["parent text", "child one"])
+    service.encode(["child two", "parent text"])
+    assert model.batches == [["parent text", "child one"], ["child two"]]
+
+    def no_model(name):
+        raise AssertionError("model should not load")
+
+    restarted = EmbeddingService("fake-model", str(tmp_path), loader=no_model)
+    again = restarted.encode(["child one", "parent text"])
+    assert again.dtype == np.float32
+    assert np.array_equal(again, first[::-1])
+
+
+def test_concurrent_requests_share_a_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_service.Config, "BATCH_WINDOW_SECONDS", 0.2)
+    model = FakeModel()
+    service = _service(tmp_path, model)
+    results = {}
+
+    def worker(i):
+        results[i] = service.encode([f"note {i}", "shared note"])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    encoded = [text for batch in model.batches for text in batch]
+    assert len(model.batches) < 8
+    assert sorted(encoded) == sorted({f"note {i}" for i in range(8)} | {"shared note"})
+    assert all(np.array_equal(results[i][1], results[0][1]) for i in results)
+
+
+def test_torn_append_is_discarded(tmp_path):
+    store = EmbeddingStore(str(tmp_path))
+    store.put_many([(text_key("a"), [1.0, 2.0]), (text_key("b"), [3.0, 4.0])])
+    with open(tmp_path / "vectors.f32", "r+b") as fh:
+        fh.truncate(12)
+
+    reopened = EmbeddingStore(str(tmp_path))
+    assert len(reopened) == 1
+    reopened.put_many([(text_key("c"), [5.0, 6.0])])
+    again = EmbeddingStore(str(tmp_path))
+    vectors = again.get_many([text_key("a"), text_key("c")])
+    assert vectors[text_key("c")].tolist() == [5.0, 6.0]
+    assert vectors[text_key("a")].tolist() == [1.0, 2.0]
+
+
+def test_load_failure_is_raised_once_then_cached(tmp_path):
+    calls = []
+
+    def loader(name):
+        calls.append(name)
+        raise ImportError("sentence-transformers missing")
+
+    service = EmbeddingService("fake-model", str(tmp_path), loader=loader)
+    for _ in range(2):
+        with pytest.raises(ImportError):
+            service.encode(["text"])
+    assert calls == ["fake-model"]
+
+
+def test_stores_sharing_a_directory_stay_aligned(tmp_path):
+    # Separate instances behave like separate worker processes
+    stores = [EmbeddingStore(str(tmp_path)) for _ in range(2)]
+    stores[0].put_many([(text_key("seed"), [0.0, 0.0])])
+
+    def worker(n):
+        for i in range(20):
+            stores[n].put_many([(text_key(f"{n}-{i}"), [float(n), float(i)])])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    reopened = EmbeddingStore(str(tmp_path))
+    assert len(reopened) == 41
+    for n in range(2):
+        keys = [text_key(f"{n}-{i}") for i in range(20)]
+        vectors = reopened.get_many(keys)
+        assert [vectors[k].tolist() for k in keys] == [[float(n), float(i)] for i in range(20)]
+    # Rows written by the other instance are visible without reopening
+    assert stores[0].get_many([text_key("1-19")])[text_key("1-19")].tolist() == [1.0, 19.0]
@@ -0,0 +1,116 @@
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from sqlalchemy import create_engine, event, update
+from sqlalchemy.orm import sessionmaker
+
+import engagement
+from db_models import Base, Harmonizer, VibeNode
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        for i in range(12):
+            db.add(Harmonizer(username=f"u{i:02d}", email=f"u{i}@x", hashed_password="x"))
+        db.flush()
+        db.add(VibeNode(name="node", description="", author_id=1))
+        db.commit()
+    yield engine
+    engine.dispose()
+
+
+def test_toggles_keep_counters_and_rows_in_step(engine):
+    with sessionmaker(bind=engine)() as db:
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        for uid in range(2, 12):
+            assert engagement.toggle_like(db, uid, 1) == (True, True)
+            assert engagement.toggle_follow(db, uid, 1) == (True, True)
+        # Membership never loads the association collections
+        assert not any("FROM harmonizers" in s for s in statements)
+        assert engagement.toggle_like(db, 5, 1) == (False, True)
+        assert engagement.toggle_follow(db, 5, 1) == (False, True)
+        engagement.toggle_follow(db, 1, 2)
+        db.commit()
+
+        node = db.get(VibeNode, 1)
+        assert node.likes_count == 9 == len(node.likes)
+        assert not engagement.has_liked(db, 5, 1) and engagement.has_liked(db, 6, 1)
+        user = db.get(Harmonizer, 1)
+        assert user.followers_count == 9 == len(user.followers)
+        assert user.following_count == 1
+        assert db.get(Harmonizer, 2).followers_count == 1
+        assert engagement.is_following(db, 1, 2) and not engagement.is_following(db, 1, 3)
+
+
+def test_keyset_pages_cover_every_follower(engine):
+    with sessionmaker(bind=engine)() as db:
+        for uid in range(2, 12):
+            engagement.toggle_follow(db, uid, 1)
+            engagement.toggle_like(db, uid, 1)
+        db.commit()
+
+        names, after = [], None
+        while True:
+            page, after = engagement.list_followers(db, 1, limit=4, after=after)
+            names += page
+            if after is None:
+                break
+        assert names == [f"u{i:02d}" for i in range(1, 11)]
+        assert engagement.list_likers(db, 1, limit=3) == (["u01", "u02", "u03"], 4)
+        assert engagement.list_following(db, 3) == (["u00"], None)
+
+
+def test_migration_backfills_counters(engine):
+    spec = importlib.util.spec_from_file_location(
+        "add_engagement_counts", root / "migrations" / "add_engagement_counts.py"
+    )
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        for uid in range(2, 6):
+            engagement.toggle_follow(db, uid, 1)
+            engagement.toggle_like(db, uid, 1)
+        db.execute(update(Harmonizer).values(followers_count=0, following_count=0))
+        db.execute(update(VibeNode).values(likes_count=None))
+        db.commit()
+
+    migration.migrate(engine)
+    with Session() as db:
+        assert db.get(VibeNode, 1).likes_count == 4
+        assert db.get(Harmonizer, 1).followers_count == 4
+        assert db.get(Harmonizer, 3).following_count == 1
+
+
+def test_losing_a_toggle_race_reports_no_change(engine, monkeypatch):
+    with sessionmaker(bind=engine)() as db:
+        assert engagement.toggle_like(db, 2, 1) == (True, True)
+        assert engagement.toggle_follow(db, 2, 1) == (True, True)
+        db.commit()
+
+        # Another request inserted the rows between our probe and insert
+        monkeypatch.setattr(engagement, "_exists", lambda *args, **keys: False)
+        assert engagement.toggle_like(db, 2, 1) == (True, False)
+        assert engagement.toggle_follow(db, 2, 1) == (True, False)
+        # ... or deleted them between our probe and delete
+        monkeypatch.setattr(engagement, "_exists", lambda *args, **keys: True)
+        assert engagement.toggle_like(db, 3, 1) == (False, False)
+        assert engagement.toggle_follow(db, 3, 1) == (False, False)
+        db.commit()
+
+        assert db.get(VibeNode, 1).likes_count == 1
+        assert db.get(Harmonizer, 1).followers_count == 1
+        assert db.get(Harmonizer, 2).following_count == 1
+        assert db.get(Harmonizer, 3).following_count == 0
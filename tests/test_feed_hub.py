@@ -0,0 +1,77 @@
+import asyncio
+import json
+import sys
+import threading
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from realtime_comm import feed_ws
+from realtime_comm.feed_ws import FeedHub
+
+
+def test_ring_buffer_and_resume_from_cursor(monkeypatch):
+    monkeypatch.setattr(feed_ws.Config, "HISTORY_SIZE", 5)
+    hub = FeedHub()
+    for i in range(8):
+        hub.publish({"text": f"p{i}"})
+
+    async def main():
+        _, everything = hub.subscribe()
+        _, resumed = hub.subscribe(cursor=6)
+        _, stale = hub.subscribe(cursor=1)
+        return everything, resumed, stale
+
+    everything, resumed, stale = asyncio.run(main())
+    assert [json.loads(m)["feed_cursor"] for _, m in everything] == [4, 5, 6, 7, 8]
+    assert [json.loads(m)["text"] for _, m in resumed] == ["p6", "p7"]
+    assert stale[0][1] == {"event": "feed_gap", "missed": 2, "from_cursor": 2, "to_cursor": 3}
+    assert len(stale) == 6
+
+
+def test_slow_subscribers_are_bounded_and_isolated(monkeypatch):
+    monkeypatch.setattr(feed_ws.Config, "QUEUE_SIZE", 3)
+
+    async def main():
+        hub = FeedHub()
+        monkeypatch.setattr(feed_ws.Config, "OVERFLOW_POLICY", "drop_oldest")
+        dropping, _ = hub.subscribe()
+        monkeypatch.setattr(feed_ws.Config, "OVERFLOW_POLICY", "coalesce")
+        coalescing, _ = hub.subscribe()
+        fast, _ = hub.subscribe()
+
+        received = []
+        for i in range(10):
+            hub.publish({"text": f"p{i}"})
+            received.append(json.loads(await fast.get()))
+        # Every subscriber shares the single serialized message
+        assert dropping.queue[-1][1] is coalescing.queue[-1][1]
+
+        dropped = [json.loads(await dropping.get()) for _ in range(3)]
+        coalesced = [json.loads(await coalescing.get()) for _ in range(len(coalescing.queue))]
+        return received, dropped, dropping, coalesced
+
+    received, dropped, dropping, coalesced = asyncio.run(main())
+    assert [m["text"] for m in received] == [f"p{i}" for i in range(10)]
+    assert [m["text"] for m in dropped] == ["p7", "p8", "p9"]
+    assert dropping.dropped == 7
+    assert coalesced[0] == {"event": "feed_gap", "missed": 9, "from_cursor": 1, "to_cursor": 9}
+    assert [m["text"] for m in coalesced[1:]] == ["p9"]
+
+
+def test_publish_from_another_thread():
+    hub = FeedHub()
+
+    async def main():
+        sub, _ = hub.subscribe()
+        thread = threading.Thread(target=hub.publish, args=({"text": "hi"},))
+        thread.start()
+        msg = await asyncio.wait_for(sub.get(), timeout=2)
+        thread.join()
+        hub.unsubscribe(sub)
+        return json.loads(msg)
+
+    assert asyncio.run(main()) == {"text": "hi", "feed_cursor": 1}
+    assert len(hub) == 0
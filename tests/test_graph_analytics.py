@@ -0,0 +1,110 @@
+import sys
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+
+from db_models import (Base, Harmonizer, VibeNode, harmonizer_follows,
+                       vibenode_entanglements, vibenode_likes)
+from network.graph_analytics import GraphAnalytics, betweenness_error_bound
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        for i in range(1, 9):
+            db.add(Harmonizer(username=f"u{i}", email=f"u{i}@x", hashed_password="x"))
+        db.flush()
+        for i in range(1, 7):
+            db.add(VibeNode(name=f"n{i}", description="", author_id=i))
+        db.flush()
+        db.execute(
+            insert(harmonizer_follows),
+            [{"follower_id": i, "followed_id": i % 8 + 1} for i in range(1, 9)],
+        )
+        db.execute(
+            insert(vibenode_likes),
+            [{"harmonizer_id": i, "vibenode_id": i % 6 + 1} for i in range(1, 9)],
+        )
+        db.execute(
+            insert(vibenode_entanglements),
+            [{"source_id": i, "target_id": i + 1, "strength": 0.5} for i in range(1, 6)],
+        )
+        db.commit()
+        db.engine = engine
+        yield db
+    engine.dispose()
+
+
+def _reference(db):
+    g = nx.DiGraph()
+    for h in db.query(Harmonizer).all():
+        for followed in h.following:
+            g.add_edge(f"h_{h.id}", f"h_{followed.id}")
+    for v in db.query(VibeNode).all():
+        g.add_edge(f"h_{v.author_id}", f"v_{v.id}")
+        for liker in v.likes:
+            g.add_edge(f"h_{liker.id}", f"v_{v.id}")
+        for target in v.entangled_with:
+            g.add_edge(f"v_{v.id}", f"v_{target.id}")
+    return g
+
+
+def test_small_graph_matches_exact_centrality(session):
+    statements = []
+    event.listen(session.engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+    snapshot = GraphAnalytics().refresh(session)
+    assert len(statements) == 5
+
+    reference = _reference(session)
+    degree = nx.degree_centrality(reference)
+    betweenness = nx.betweenness_centrality(reference)
+    page = snapshot.page(0, 100)
+    assert len(page["nodes"]) == 14
+    for node in page["nodes"]:
+        assert node["degree_centrality"] == pytest.approx(degree[node["id"]])
+        assert node["betweenness_centrality"] == pytest.approx(betweenness[node["id"]])
+    assert {(e["source"], e["target"]) for e in page["edges"]} == set(reference.edges)
+    metrics = page["metrics"]
+    assert metrics["edge_count"] == reference.number_of_edges()
+    assert metrics["betweenness_error_bound"] == 0.0
+
+
+def test_pages_slice_cached_snapshot_and_skip_unchanged_recompute(session):
+    analytics = GraphAnalytics(samples=4)
+    page = analytics.ensure(session).page(skip=2, limit=2)
+    assert [n["id"] for n in page["nodes"]] == ["h_3", "h_4", "v_3", "v_4"]
+    assert {e["source"] for e in page["edges"]} <= {"h_3", "h_4", "v_3", "v_4"}
+    assert page["metrics"]["node_count"] == 14
+    assert page["metrics"]["betweenness_sample_size"] == 4
+    assert page["metrics"]["betweenness_error_bound"] == pytest.approx(
+        betweenness_error_bound(14, 4, 0.95)
+    )
+
+    session.get(Harmonizer, 3).username = "renamed"
+    session.commit()
+    analytics.refresh(session)
+    assert analytics.last_recomputed is False
+    assert analytics.snapshot.page(2, 1)["nodes"][0]["label"] == "renamed"
+
+    session.execute(insert(harmonizer_follows).values(follower_id=1, followed_id=5))
+    session.commit()
+    analytics.refresh(session)
+    assert analytics.last_recomputed is True
+    assert analytics.snapshot.metrics["edge_count"] == page["metrics"]["edge_count"] + 1
+
+
+def test_empty_graph_returns_empty_payload():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        assert GraphAnalytics().refresh(db).page() == {"nodes": [], "edges": [], "metrics": {}}
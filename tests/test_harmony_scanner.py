@@ -0,0 +1,67 @@
+import random
+import re
+import string
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+pytestmark = pytest.mark.requires_streamlit
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+import superNova_2177 as sn
+
+
+def _legacy_blocked(config, text):
+    """Decision made by the original sequential scanner."""
+    lower_text = text.lower()
+    patterns = config.VAX_PATTERNS.get("block", [])
+    if any(re.compile(p, re.IGNORECASE).search(lower_text) for p in patterns):
+        return True
+    keywords = [p.strip(r"\b") for p in patterns if r"\b" in p]
+    for word in set(re.split(r"\W+", lower_text)):
+        if len(word) > 2 and any(
+            sn.levenshtein_distance(word, k) <= config.VAX_FUZZY_THRESHOLD
+            for k in keywords
+        ):
+            return True
+    return False
+
+
+@pytest.fixture
+def config():
+    cfg = sn.Config()
+    cfg.VAX_PATTERNS = {
+        "block": [r"\b(blocked_word)\b", r"\bspam\b", r"free\s+money", r"\bscam\b"]
+    }
+    return cfg
+
+
+def test_decisions_match_sequential_scan(config, monkeypatch):
+    scanner = sn.HarmonyScanner(config)
+    monkeypatch.setattr(scanner, "_log_block", lambda *a: None)
+    rng = random.Random(2177)
+    vocab = ["hello", "world", "spam", "spom", "sc4m", "blocked_wrd", "freemoney",
+             "free money", "harmony", "scum", "xxspamxx", "blockedword"]
+    texts = [" ".join(rng.choice(vocab) for _ in range(rng.randint(1, 6))) for _ in range(300)]
+    texts += ["".join(rng.choice(string.ascii_lowercase + " ") for _ in range(40)) for _ in range(300)]
+
+    expected = [not _legacy_blocked(config, t) for t in texts]
+    assert scanner.scan_many(texts) == expected
+    for text, ok in zip(texts, expected):
+        if ok:
+            assert scanner.scan(text)
+        else:
+            with pytest.raises(sn.DissonantContentError):
+                scanner.scan(text)
+
+
+def test_reports_first_configured_pattern(config, monkeypatch):
+    scanner = sn.HarmonyScanner(config)
+    monkeypatch.setattr(scanner, "_log_block", lambda *a: None)
+    with pytest.raises(sn.DissonantContentError, match="spam"):
+        scanner.scan("a scam about free money and spam")
@@ -0,0 +1,87 @@
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from hook_manager import HookManager
+
+
+def test_trigger_is_concurrent_and_bounded():
+    hooks = HookManager(timeout=0.5)
+    threads = []
+
+    async def slow_async(x):
+        await asyncio.sleep(0.3)
+        return x + 1
+
+    def slow_sync(x):
+        threads.append(threading.get_ident())
+        time.sleep(0.3)
+        return x * 2
+
+    async def stuck(x):
+        await asyncio.sleep(5)
+
+    def broken(x):
+        raise ValueError("boom")
+
+    async def short_leash(x):
+        await asyncio.sleep(0.3)
+
+    for func in (slow_async, slow_sync, stuck, broken):
+        hooks.register_hook("evt", func)
+    hooks.register_hook("evt", short_leash, timeout=0.1)
+
+    start = time.perf_counter()
+    results = asyncio.run(hooks.trigger("evt", 3))
+    elapsed = time.perf_counter() - start
+
+    assert results == [4, 6, None, None, None]
+    assert elapsed < 0.9
+    # Sync callbacks run off the event loop thread
+    assert threads and threads[0] != threading.get_ident()
+
+    stats = {row["callback"]: row for row in hooks.dump_hooks(with_stats=True)["evt"]}
+    assert stats["stuck"]["timeouts"] == 1
+    assert stats["short_leash"]["timeouts"] == 1 and stats["short_leash"]["max_ms"] < 250
+    assert stats["broken"]["errors"] == 1
+    assert stats["slow_sync"]["calls"] == 1 and stats["slow_sync"]["max_ms"] >= 250
+    assert hooks.dump_hooks() == {
+        "evt": ["slow_async", "slow_sync", "stuck", "broken", "short_leash"]
+    }
+
+
+def test_fire_hooks_without_loop_runs_inline():
+    hooks = HookManager()
+    seen = []
+    hooks.register_hook("evt", lambda payload: seen.append((payload, threading.get_ident())))
+    assert hooks.fire_hooks("evt", "p") == [None]
+    assert seen == [("p", threading.get_ident())]
+    assert hooks.fire_hooks("unbound") == []
+
+
+def test_fire_hooks_and_submit_inside_running_loop():
+    hooks = HookManager()
+    seen = []
+
+    async def handler(payload):
+        seen.append(payload)
+        return payload
+
+    hooks.register_hook("evt", handler)
+
+    async def main():
+        hooks.bind_loop()
+        # Used to call run_until_complete on the running loop and raise
+        assert hooks.fire_hooks("evt", "from-loop") == []
+        future = await asyncio.to_thread(hooks.submit, "evt", "from-thread")
+        assert await asyncio.wrap_future(future) == ["from-thread"]
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+    assert sorted(seen) == ["from-loop", "from-thread"]
@@ -0,0 +1,111 @@
+import itertools
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import hypothesis_index
+import hypothesis_repository
+import hypothesis_reasoner as hr
+from db_models import Base, HypothesisRecord, SystemState
+from hypothesis_index import HypothesisIndex
+
+WORDS = ["entropy", "karma", "resonance", "node", "harmony", "flux", "spark", "vibe"]
+
+
+def _texts(seed, count):
+    rng = random.Random(seed)
+    base = [" ".join(rng.choices(WORDS, k=rng.randint(1, 5))) for _ in range(count // 2)]
+    texts = list(base)
+    while len(texts) < count:
+        text = list(rng.choice(base))
+        for _ in range(rng.randint(0, 4)):
+            pos = rng.randrange(len(text) + 1)
+            op = rng.choice("ids")
+            if op == "i":
+                text.insert(pos, rng.choice("abcxyz!"))
+            elif text and pos < len(text):
+                if op == "d":
+                    del text[pos]
+                else:
+                    text[pos] = rng.choice("abcxyz")
+        texts.append("".join(text))
+    return texts + ["", "!!", "ab", "Ab?"]
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.7, 0.9])
+def test_candidates_cover_every_similar_pair(threshold):
+    texts = _texts(13, 80)
+    index = HypothesisIndex()
+    for i, text in enumerate(texts):
+        index.add(f"H{i}", text)
+    for i, j in itertools.combinations(range(len(texts)), 2):
+        if hr._levenshtein_distance_normalized(texts[i], texts[j]) >= threshold:
+            assert f"H{j}" in index.candidates(f"H{i}", threshold)
+            assert f"H{i}" in index.candidates(f"H{j}", threshold)
+    # The filter has to prune something to be worth keeping
+    pairs = sum(len(index.candidates(f"H{i}", 0.7)) for i in range(len(texts)))
+    assert pairs < len(texts) * (len(texts) - 1) / 2
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(hypothesis_index, "_INDEX", None)
+    monkeypatch.setattr(hypothesis_repository, "_REPOSITORY", None)
+    engine = create_engine(f"sqlite:///{tmp_path / 'hyp.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    rng = random.Random(7)
+    with Session() as s:
+        for i, text in enumerate(_texts(5, 40)):
+            record = {
+                "hypothesis_id": f"HYP_{i:03d}",
+                "text": text,
+                "status": rng.choice(["open", "open", "validated"]),
+                "score": rng.random(),
+                "supporting_nodes": rng.sample(range(6), rng.randint(0, 3)),
+            }
+            s.add(SystemState(key=f"hypothesis_HYP_{i:03d}", value=json.dumps(record)))
+        s.commit()
+    with Session() as s:
+        yield s
+    engine.dispose()
+
+
+def _brute_force_conflicts(hypotheses):
+    threshold = hr.CONFIG.TEXT_SIMILARITY_THRESHOLD
+    pairs = []
+    open_hyps = [h for h in hypotheses if h["status"] == "open"]
+    for h1, h2 in itertools.combinations(open_hyps, 2):
+        sim = hr._levenshtein_distance_normalized(h1["text"], h2["text"])
+        if sim < threshold:
+            continue
+        n1, n2 = set(h1["supporting_nodes"]), set(h2["supporting_nodes"])
+        if abs(h1["score"] - h2["score"]) > 0.3 or (
+            sim > 0.8 and len(n1 & n2) / max(len(n1), len(n2), 1) < 0.2
+        ):
+            pairs.append((h1["hypothesis_id"], h2["hypothesis_id"]))
+    return pairs
+
+
+def test_conflicts_match_all_pairs_scan(db):
+    expected = _brute_force_conflicts(hr._get_all_hypotheses(db))
+    assert expected
+    assert hr.detect_conflicting_hypotheses(db) == expected
+
+    # Records edited behind the index's back are re-indexed on the next pass
+    row = db.get(HypothesisRecord, "HYP_000")
+    row.status, row.description = "open", "completely unrelated words here"
+    db.commit()
+    assert hr.detect_conflicting_hypotheses(db) == _brute_force_conflicts(
+        hr._get_all_hypotheses(db)
+    )
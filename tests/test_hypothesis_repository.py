@@ -0,0 +1,120 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import hypothesis_index
+import hypothesis_meta_evaluator as hme
+import hypothesis_reasoner as hr
+import hypothesis_repository
+import hypothesis_tracker as ht
+from db_models import Base, HypothesisRecord, SystemState
+from hypothesis_repository import HypothesisRepository
+
+LEGACY = [
+    {
+        "hypothesis_id": "HYP_1_a",
+        "text": "Karma flows toward resonant nodes",
+        "status": "validated",
+        "score": 0.9,
+        "supporting_nodes": ["n1", "n2"],
+        "notes": ["Initial registration.", "Validated."],
+        "history": [{"t": "2026-01-01T00:00:00", "score": 0.9, "status": "validated"}],
+        "created_at": "2026-01-01T00:00:00",
+        "metadata": {"source_module": "audit"},
+    },
+    {
+        "hypothesis_id": "HYP_2_b",
+        "text": "Entropy rises after remixes",
+        "status": "open",
+        "score": 0.2,
+        "created_at": "2026-01-02T00:00:00",
+    },
+]
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(hypothesis_index, "_INDEX", None)
+    monkeypatch.setattr(hypothesis_repository, "_REPOSITORY", None)
+    engine = create_engine(f"sqlite:///{tmp_path / 'hyp.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as s:
+        for data in LEGACY:
+            s.add(SystemState(key=f"hypothesis_{data['hypothesis_id']}", value=json.dumps(data)))
+        s.add(SystemState(key="hypothesis_HYP_3_c", value="{not json"))
+        s.commit()
+    with Session() as s:
+        yield s
+    engine.dispose()
+
+
+def test_migration_copies_blobs_once(db):
+    repo = HypothesisRepository()
+    assert repo.migrate(db) == 2
+    assert repo.migrate(db) == 0
+
+    migrated = {h["hypothesis_id"]: h for h in repo.list(db)}
+    assert set(migrated) == {"HYP_1_a", "HYP_2_b"}
+    first = migrated["HYP_1_a"]
+    assert first["supporting_nodes"] == ["n1", "n2"]
+    assert first["notes"] == ["Initial registration.", "Validated."]
+    assert first["metadata"]["source_module"] == "audit"
+    assert first["created_at"] == "2026-01-01T00:00:00"
+    assert [h["hypothesis_id"] for h in repo.list(db, ["open"])] == ["HYP_2_b"]
+    assert hme._get_all_hypotheses_with_parsed_metadata(db)[1]["metadata"] == {}
+
+
+def test_reads_refetch_only_changed_partitions(db):
+    repo = HypothesisRepository()
+    repo.list(db)
+    new_id = ht.register_hypothesis("Harmony predicts engagement", db)
+
+    statements = []
+    event.listen(
+        db.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cur, stmt, params, ctx, many: statements.append(stmt),
+    )
+    version = repo.version
+    assert {h["hypothesis_id"] for h in repo.list(db, ["open"])} == {"HYP_2_b", new_id}
+    assert repo.version == version + 1
+    # One stamp query plus a delta fetch bounded by the previous stamp
+    assert len(statements) == 2
+    assert "updated_at >=" in statements[1]
+
+    statements.clear()
+    repo.list(db)
+    assert len(statements) == 1
+    assert repo.version == version + 1
+
+    # A status change moves the record between partitions
+    ht.update_hypothesis_score(db, new_id, 0.95, status="validated")
+    by_status = {s: {h["hypothesis_id"] for h in repo.list(db, [s])} for s in ("open", "validated")}
+    assert by_status == {"open": {"HYP_2_b"}, "validated": {"HYP_1_a", new_id}}
+    assert {h["hypothesis_id"] for h in repo.list(db)} == {"HYP_1_a", "HYP_2_b", new_id}
+
+
+def test_stale_and_redundant_flags_are_persisted(db):
+    duplicate = ht.register_hypothesis("Karma flows towards resonant nodes!", db)
+    fresh = ht.register_hypothesis("Something else entirely", db)
+    hypothesis_repository.get_hypothesis_repository().migrate(db)
+    stale = db.get(HypothesisRecord, "HYP_2_b")
+    stale.history = [{"t": "2020-01-01T00:00:00", "score": 0.2, "status": "open"}]
+    db.commit()
+
+    assert sorted(hr.auto_flag_stale_or_redundant(db)) == sorted(["HYP_2_b", duplicate])
+    statuses = {h["hypothesis_id"]: h for h in hr._get_all_hypotheses(db)}
+    assert statuses["HYP_2_b"]["status"] == "inconclusive"
+    assert statuses[duplicate]["status"] == "redundant"
+    assert "Flagged as redundant" in statuses[duplicate]["notes"][-1]
+    assert statuses[fresh]["status"] == "open"
@@ -0,0 +1,85 @@
+import random
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+nx = pytest.importorskip("networkx")
+
+from causal_graph import InfluenceGraph
+from causal_graph.influence import InfluenceEngine
+
+
+def _brute_force(g, s, t):
+    best = 0.0
+    for p in nx.all_simple_paths(g, s, t):
+        w = 1.0
+        for u, v in zip(p[:-1], p[1:]):
+            w *= g[u][v]["weight"]
+        best = max(best, w)
+    return best
+
+
+def _random_graph(seed, n=9, p=0.35):
+    rng = random.Random(seed)
+    g = nx.gnp_random_graph(n, p, seed=seed, directed=True)
+    for u, v in g.edges:
+        g[u][v]["weight"] = rng.choice([0.0, 0.25, 0.5, 0.9, 1.0, rng.random()])
+    return g
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_matches_simple_path_enumeration(seed):
+    g = _random_graph(seed)
+    engine = InfluenceEngine(g)
+    for s in g.nodes:
+        everything = engine.influence_from(s)
+        for t in g.nodes:
+            if s == t:
+                continue
+            expected = _brute_force(g, s, t)
+            assert engine.influence(s, t) == pytest.approx(expected, rel=1e-12)
+            assert everything.get(t, 0.0) == pytest.approx(expected, rel=1e-12)
+        ranked = engine.top_k(s, 3)
+        top = sorted((v for v in everything.values()), reverse=True)[:3]
+        assert [p for _, p in ranked] == pytest.approx(top)
+
+
+def test_negative_weights_fall_back_to_enumeration():
+    g = nx.DiGraph()
+    g.add_edge("a", "b", weight=-0.5)
+    g.add_edge("b", "c", weight=-0.8)
+    g.add_edge("a", "c", weight=0.1)
+    engine = InfluenceEngine(g)
+    assert not engine.monotone
+    assert engine.influence("a", "c") == pytest.approx(0.4)
+
+
+def test_path_count_is_capped():
+    g = nx.complete_graph(12, create_using=nx.DiGraph)
+    engine = InfluenceEngine(g)
+    count, exact = engine.count_paths(0, 1, cap=100)
+    assert count == 100 and not exact
+    small = nx.DiGraph([(0, 1), (1, 2), (0, 2)])
+    assert InfluenceEngine(small).count_paths(0, 2) == (2, True)
+
+
+def test_dense_query_is_fast():
+    from scientific_metrics import query_influence
+
+    ig = InfluenceGraph()
+    rng = random.Random(7)
+    for u in range(300):
+        for v in rng.sample(range(300), 40):
+            if u != v:
+                ig.add_interaction(u, v, weight=rng.uniform(0.2, 1.0))
+    start = time.perf_counter()
+    result = query_influence(ig, 0, 299, perturb_iterations=3)
+    assert time.perf_counter() - start < 10
+    assert 0.0 < result["value"] <= 1.0
+    assert result["confidence"] is not None
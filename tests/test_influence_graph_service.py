@@ -0,0 +1,155 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from causal_graph import build_causal_graph
+from causal_graph.service import Config, InfluenceGraphService
+from db_models import (Base, Harmonizer, SystemState, VibeNode,
+                       harmonizer_follows, vibenode_likes)
+from hook_manager import HookManager
+from hooks import events
+
+
+def _edges(graph):
+    return {(u, v): d["edge_type"] for u, v, d in graph.graph.edges(data=True)}
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'graph.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as s:
+        users = [
+            Harmonizer(username=f"u{i}", email=f"u{i}@x", hashed_password="x")
+            for i in range(4)
+        ]
+        s.add_all(users)
+        s.flush()
+        root_node = VibeNode(name="root", author_id=users[0].id)
+        s.add(root_node)
+        s.flush()
+        s.add(VibeNode(name="remix", author_id=users[1].id, parent_vibenode_id=root_node.id))
+        s.execute(
+            insert(harmonizer_follows),
+            [
+                {"follower_id": users[1].id, "followed_id": users[0].id},
+                {"follower_id": users[2].id, "followed_id": users[1].id},
+            ],
+        )
+        s.execute(
+            insert(vibenode_likes),
+            [{"harmonizer_id": users[2].id, "vibenode_id": root_node.id}],
+        )
+        s.commit()
+    with Session() as s:
+        yield s
+    engine.dispose()
+
+
+def test_build_matches_full_graph(db):
+    service = InfluenceGraphService(HookManager())
+    graph = service.graph(db)
+    full = build_causal_graph(db)
+    assert set(graph.graph.nodes) == set(full.graph.nodes)
+    assert _edges(graph) == _edges(full)
+
+
+def test_events_update_graph_and_version(db):
+    hooks = HookManager()
+    service = InfluenceGraphService(hooks)
+    before = service.graph(db)
+    version = service.version
+
+    db.execute(insert(harmonizer_follows).values(follower_id=4, followed_id=1))
+    db.add(VibeNode(name="remix2", author_id=3, parent_vibenode_id=1))
+    db.commit()
+    hooks.fire_hooks(events.USER_FOLLOWED, {"follower_id": 4, "followed_id": 1})
+    hooks.fire_hooks(
+        events.VIBENODE_REMIXED, {"author_id": 3, "parent_author_id": 1, "vibenode_id": 3}
+    )
+    after = service.graph(db)
+    assert service.version == version + 2
+    assert service.rebuilds == 1
+    assert after.get_edge_data(4, 1)["edge_type"] == "follow"
+    # Remix wins over the existing like edge, as in a full build
+    assert after.get_edge_data(3, 1)["edge_type"] == "remix"
+    # Snapshots taken before the events are left untouched
+    assert not before.graph.has_edge(4, 1)
+    assert service.graph(db) is after
+
+    hooks.fire_hooks(
+        events.VIBENODE_REMIXED, {"author_id": 3, "parent_author_id": 1, "vibenode_id": 9}
+    )
+    hooks.fire_hooks(events.VIBENODE_UNLIKED, {"user_id": 3, "author_id": 1, "vibenode_id": 1})
+    assert service.snapshot().get_edge_data(3, 1)["edge_type"] == "remix"
+    hooks.fire_hooks(events.USER_UNFOLLOWED, {"follower_id": 4, "followed_id": 1})
+    assert not service.snapshot().graph.has_edge(4, 1)
+
+
+def test_unannounced_writes_are_detected(db, monkeypatch):
+    monkeypatch.setattr(Config, "REVALIDATE_SECONDS", 0.0)
+    service = InfluenceGraphService(HookManager())
+    service.graph(db)
+    db.add(Harmonizer(username="u4", email="u4@x", hashed_password="x"))
+    db.commit()
+    graph = service.graph(db)
+    assert 5 in graph.graph.nodes
+    assert service.rebuilds == 1
+
+    db.execute(insert(harmonizer_follows).values(follower_id=5, followed_id=1))
+    db.commit()
+    assert service.graph(db).graph.has_edge(5, 1)
+    assert service.rebuilds == 2
+
+
+def test_restart_restores_checkpoint_without_rebuild(db, monkeypatch):
+    monkeypatch.setattr(Config, "CHECKPOINT_EVERY", 1)
+    hooks = HookManager()
+    service = InfluenceGraphService(hooks)
+    service.graph(db)
+    hooks.fire_hooks(events.VIBENODE_LIKED, {"user_id": 4, "author_id": 2, "vibenode_id": 2})
+    db.execute(insert(vibenode_likes).values(harmonizer_id=4, vibenode_id=2))
+    db.commit()
+    service.join_checkpoint(5)
+    expected = _edges(service.snapshot())
+    checkpoints = db.query(SystemState).filter(
+        SystemState.key.like(f"{Config.CHECKPOINT_PREFIX}_%")
+    )
+    assert checkpoints.count() <= Config.CHECKPOINT_KEEP
+
+    restarted = InfluenceGraphService(HookManager())
+    graph = restarted.graph(db)
+    assert restarted.rebuilds == 0
+    assert _edges(graph) == expected == _edges(build_causal_graph(db))
+
+
+def test_events_for_rows_a_rebuild_already_saw_are_ignored(db, monkeypatch):
+    monkeypatch.setattr(Config, "REVALIDATE_SECONDS", 0.0)
+    hooks = HookManager()
+    service = InfluenceGraphService(hooks)
+    service.graph(db)
+
+    # A read between the commit and the event rebuilds with the new row
+    db.execute(insert(harmonizer_follows).values(follower_id=4, followed_id=1))
+    db.commit()
+    assert service.graph(db).graph.has_edge(4, 1)
+    version = service.version
+    hooks.fire_hooks(events.USER_FOLLOWED, {"follower_id": 4, "followed_id": 1})
+    assert service.version == version
+
+    db.execute(
+        harmonizer_follows.delete().where(harmonizer_follows.c.follower_id == 4)
+    )
+    db.commit()
+    hooks.fire_hooks(events.USER_UNFOLLOWED, {"follower_id": 4, "followed_id": 1})
+    assert not service.graph(db).graph.has_edge(4, 1)
+    assert service.rebuilds == 2
@@ -0,0 +1,128 @@
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import log_chain_appender
+from db_models import Base, LogEntry
+from log_chain_appender import LogChainAppender
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'chain.db'}", connect_args={"timeout": 30}
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+def _chain(engine):
+    with sessionmaker(bind=engine)() as db:
+        return db.query(LogEntry).order_by(LogEntry.id).all()
+
+
+def test_concurrent_appends_form_one_chain(engine, monkeypatch):
+    monkeypatch.setattr(log_chain_appender.Config, "FLUSH_BATCH_SIZE", 32)
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(1))
+    appender = LogChainAppender(engine)
+    futures = []
+    lock = threading.Lock()
+
+    def worker(n):
+        for i in range(25):
+            future = appender.append("vibenode_remix", json.dumps({"n": n, "i": i}))
+            with lock:
+                futures.append(future)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    appender.close()
+
+    entries = _chain(engine)
+    assert len(entries) == 200
+    prev = ""
+    for entry in entries:
+        assert entry.previous_hash == prev
+        assert entry.current_hash == entry.compute_hash()
+        prev = entry.current_hash
+    assert appender.head == prev
+    assert {f.result(timeout=5) for f in futures} == {e.current_hash for e in entries}
+    assert len(commits) < 200
+
+
+def test_appends_chain_onto_rows_written_elsewhere(engine):
+    appender = LogChainAppender(engine)
+    appender.append("a", "{}")
+    appender.flush()
+    with sessionmaker(bind=engine)() as db:
+        head = _chain(engine)[-1].current_hash
+        outside = LogEntry(event_type="b", payload="{}", previous_hash=head, current_hash="x")
+        db.add(outside)
+        db.commit()
+    appender.append("c", "{}").result(timeout=5)
+    appender.close()
+    assert _chain(engine)[-1].previous_hash == "x"
+
+
+def test_chain_of_remix_uses_one_query(engine):
+    appender = LogChainAppender(engine)
+    for i in range(30):
+        appender.append("vibenode_remix", json.dumps({"i": i}))
+    appender.close()
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with sessionmaker(bind=engine)() as db:
+        last = db.query(LogEntry).order_by(LogEntry.id.desc()).first()
+        del statements[:]
+        lineage = last.chain_of_remix(db)
+        assert len(statements) == 1
+        expected = [e.current_hash for e in reversed(_chain(engine)[:-1])]
+        assert lineage == expected
+
+        db.query(LogEntry).filter(LogEntry.current_hash == expected[10]).delete()
+        db.commit()
+        with pytest.raises(ValueError, match=expected[10]):
+            last.chain_of_remix(db)
+
+
+def test_losing_the_head_to_another_writer_retries_instead_of_forking(engine):
+    ours, theirs = LogChainAppender(engine), LogChainAppender(engine)
+    ours.append("a", "{}")
+    ours.flush()
+    raced = []
+
+    def race(conn, cursor, statement, *args):
+        # Another process commits onto the head between our read and insert
+        if statement.startswith("INSERT INTO log_chain") and not raced:
+            raced.append(1)
+            theirs.append("b", "{}")
+            theirs.flush()
+
+    event.listen(engine, "before_cursor_execute", race)
+    ours.append("c", "{}").result(timeout=5)
+    ours.close()
+    theirs.close()
+
+    entries = _chain(engine)
+    assert [e.event_type for e in entries] == ["a", "b", "c"]
+    prev = ""
+    for entry in entries:
+        assert entry.previous_hash == prev
+        prev = entry.current_hash
+    assert ours.head == prev
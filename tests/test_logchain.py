@@ -0,0 +1,94 @@
+import json
+import sys
+import time
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+import logchain
+from logchain import LogChain
+
+
+def _chain(tmp_path, **kw):
+    return LogChain(str(tmp_path / "events.log"), **kw)
+
+
+def test_append_verify_and_reopen(tmp_path):
+    chain = _chain(tmp_path, segment_max_bytes=256, index_interval=4)
+    for i in range(25):
+        chain.add({"event": "PING", "n": i})
+    chain.close()
+    assert len(list(tmp_path.glob("events.log.0*"))) > 1
+
+    reopened = _chain(tmp_path, segment_max_bytes=256, index_interval=4)
+    assert len(reopened) == 25
+    assert reopened.verify()
+    assert [e["n"] for e in reopened.iter_events()] == list(range(25))
+    reopened.add({"event": "PING", "n": 25})
+    assert reopened.verify()
+
+
+def test_replay_since_only_applies_tail(tmp_path):
+    chain = _chain(tmp_path, index_interval=8)
+    for i in range(50):
+        chain.add({"event": "PING", "n": i})
+    cutoff = time.time()
+    time.sleep(0.01)
+    for i in range(50, 53):
+        chain.add({"event": "PING", "n": i})
+
+    seen = []
+    assert chain.replay_events(lambda e: seen.append(e["n"]), since=cutoff) == 3
+    assert seen == [50, 51, 52]
+    assert chain.verify(since=cutoff)
+
+
+def test_tampering_breaks_chain(tmp_path):
+    chain = _chain(tmp_path)
+    for i in range(3):
+        chain.add({"event": "PING", "n": i})
+    chain.close()
+    seg = tmp_path / "events.log.000000"
+    lines = seg.read_text().splitlines()
+    rec = json.loads(lines[1])
+    rec["event"]["n"] = 99
+    lines[1] = json.dumps(rec)
+    seg.write_text("\n".join(lines) + "\n")
+    assert not _chain(tmp_path).verify()
+
+
+def test_torn_tail_is_truncated(tmp_path):
+    chain = _chain(tmp_path)
+    chain.add({"event": "PING", "n": 0})
+    chain.close()
+    with open(tmp_path / "events.log.000000", "ab") as fh:
+        fh.write(b'{"t": 1, "prev"')
+    reopened = _chain(tmp_path)
+    assert len(reopened) == 1
+    reopened.add({"event": "PING", "n": 1})
+    assert reopened.verify()
+
+
+def test_replay_after_position_survives_clock_step_back(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(logchain.time, "time", lambda: clock[0])
+    chain = _chain(tmp_path, index_interval=4)
+    for i in range(10):
+        chain.add({"event": "PING", "n": i})
+    seq, head = chain.position
+    # Snapshot taken, then the wall clock steps back before more appends
+    clock[0] = 500.0
+    for i in range(10, 13):
+        chain.add({"event": "PING", "n": i})
+    chain.close()
+
+    reopened = _chain(tmp_path, index_interval=4)
+    seen = []
+    assert reopened.replay_events(lambda e: seen.append(e["n"]), after=seq) == 3
+    assert seen == [10, 11, 12]
+    assert reopened.verify(after=seq, head=head)
+    assert reopened.verify(after=len(reopened), head=reopened.last_hash)
+    assert not reopened.verify(after=seq, head="f" * 64)
+    assert not reopened.verify(after=len(reopened) + 1)
@@ -0,0 +1,119 @@
+import datetime
+import json
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+pytestmark = pytest.mark.requires_streamlit
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import superNova_2177 as sn
+
+START = datetime.datetime(2026, 1, 1, 0, 0, 0)
+NOW = START + datetime.timedelta(hours=5, minutes=17, seconds=3)
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    sn.Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as s:
+        for i, centrality in enumerate([0.5, 0.05, 0.31, 0.9, 0.2, 0.1]):
+            s.add(
+                sn.Harmonizer(
+                    username=f"u{i}",
+                    email=f"u{i}@x",
+                    hashed_password="x",
+                    creative_spark=str(Decimal("1000.25") * (i + 1)),
+                    network_centrality=centrality,
+                    last_passive_aura_timestamp=START + datetime.timedelta(minutes=i),
+                )
+            )
+        s.commit()
+    with Session() as s:
+        yield s
+    engine.dispose()
+
+
+def _expected(db):
+    out = {}
+    for u in db.query(sn.Harmonizer).all():
+        if u.network_centrality > sn.Config.INFLUENCE_THRESHOLD_FOR_AURA_GAIN:
+            elapsed = (NOW - u.last_passive_aura_timestamp).total_seconds()
+            gain = (
+                Decimal(u.network_centrality)
+                * Decimal(elapsed / 3600)
+                * sn.Config.PASSIVE_AURA_GAIN_MULTIPLIER
+            )
+            out[u.id] = (str(Decimal(u.creative_spark) + gain), NOW)
+        else:
+            out[u.id] = (u.creative_spark, u.last_passive_aura_timestamp)
+    return out
+
+
+def _state(db):
+    db.expire_all()
+    return {
+        u.id: (u.creative_spark, u.last_passive_aura_timestamp)
+        for u in db.query(sn.Harmonizer).all()
+    }
+
+
+def test_accrual_matches_per_row_formula_in_batches(db):
+    expected = _expected(db)
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(1))
+
+    assert sn.accrue_passive_aura(db, now=NOW, batch_size=2) == 4
+    assert _state(db) == expected
+    # Two batches of influential users plus the cursor reset
+    assert len(commits) == 3
+    cursor = db.query(sn.SystemState).filter_by(key=sn.PASSIVE_AURA_CURSOR_KEY).one()
+    assert cursor.value == ""
+
+    # A second pass at the same instant credits nothing
+    assert sn.accrue_passive_aura(db, now=NOW, batch_size=2) == 0
+    assert _state(db) == expected
+
+
+def test_crashed_cycle_resumes_without_double_credit(db):
+    expected = _expected(db)
+    # Simulate a cycle that committed the batch holding u0 (id 1) then died
+    u0 = db.get(sn.Harmonizer, 1)
+    u0.creative_spark, u0.last_passive_aura_timestamp = expected[1]
+    db.add(
+        sn.SystemState(
+            key=sn.PASSIVE_AURA_CURSOR_KEY,
+            value=json.dumps({"cycle": NOW.isoformat(), "last_id": 1}),
+        )
+    )
+    db.commit()
+
+    later = NOW + datetime.timedelta(hours=3)
+    assert sn.accrue_passive_aura(db, now=later, batch_size=2) == 3
+    assert _state(db) == expected
+
+
+def test_unstamped_rows_start_accruing_from_first_pass(db):
+    u3 = db.get(sn.Harmonizer, 4)
+    u3.last_passive_aura_timestamp = None
+    db.commit()
+    spark = u3.creative_spark
+
+    assert sn.accrue_passive_aura(db, now=NOW, batch_size=2) == 3
+    assert _state(db)[4] == (spark, NOW)
+
+    later = NOW + datetime.timedelta(hours=2)
+    assert sn.accrue_passive_aura(db, now=later, batch_size=2) == 4
+    gain = Decimal(0.9) * Decimal(7200 / 3600) * sn.Config.PASSIVE_AURA_GAIN_MULTIPLIER
+    assert _state(db)[4] == (str(Decimal(spark) + gain), later)
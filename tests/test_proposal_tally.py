@@ -0,0 +1,134 @@
+import datetime
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+import proposal_tally
+import scientific_utils
+from proposal_tally import USER_FIELDS, ProposalTally
+
+NOW = datetime.datetime(2026, 6, 1, tzinfo=datetime.timezone.utc)
+SPECIES = ["human", "ai", "company"]
+
+
+@pytest.fixture(autouse=True)
+def frozen_clock(monkeypatch):
+    monkeypatch.setattr(scientific_utils, "now_utc", lambda: NOW)
+    monkeypatch.setattr(proposal_tally, "now_utc", lambda: NOW)
+
+
+def _users():
+    return {
+        "ann": {"harmony_score": "120.5", "is_genesis": True,
+                "join_time": "2024-03-01T00:00:00Z", "species": "human"},
+        "bob": {"harmony_score": "80", "is_genesis": False, "species": "human"},
+        "cy": {"harmony_score": "95.25", "is_genesis": False, "species": "ai"},
+        "dee": {"harmony_score": "60", "is_genesis": False, "species": "company",
+                "consent_given": False},
+        "eve": {"harmony_score": "42", "is_genesis": True,
+                "join_time": "2025-11-11T11:11:11Z", "species": "company"},
+    }
+
+
+def _reference(users, votes):
+    """The original full-scan tally."""
+    def weight(u):
+        w = Decimal(u["harmony_score"])
+        if u["is_genesis"]:
+            join = datetime.datetime.fromisoformat(u["join_time"].replace("Z", "+00:00"))
+            w *= scientific_utils.calculate_genesis_bonus_decay(join, 4)
+        return w
+
+    total = sum((weight(u) for u in users.values()), Decimal("0"))
+    sv = {s: {"yes": Decimal("0"), "no": Decimal("0"), "total": Decimal("0")} for s in SPECIES}
+    voted = Decimal("0")
+    for voter, vote in votes.items():
+        u = users.get(voter)
+        if u and u.get("consent_given", True):
+            w = weight(u)
+            sv[u["species"]][vote] += w
+            sv[u["species"]]["total"] += w
+            voted += w
+    active = [v for v in sv.values() if v["total"] > 0]
+    share = Decimal("1") / len(active)
+    return {
+        "yes": sum((v["yes"] / v["total"]) * share for v in active),
+        "no": sum((v["no"] / v["total"]) * share for v in active),
+        "quorum": voted / total,
+    }
+
+
+def _build(users):
+    tally = ProposalTally(SPECIES, 4)
+    names = list(users)
+    cols = {f: [users[n].get(f) for n in names] for f in USER_FIELDS}
+    tally.rebuild(names, cols)
+    return tally
+
+
+def test_tally_matches_full_scan():
+    users = _users()
+    votes = {"ann": "yes", "bob": "no", "cy": "yes", "dee": "yes", "eve": "no"}
+    tally = _build(users)
+    tally.load_votes("p1", votes)
+    assert tally.tally("p1") == _reference(users, votes)
+    assert tally.verify("p1")
+
+
+def test_incremental_votes_and_user_changes():
+    users = _users()
+    tally = _build(users)
+    tally.load_votes("p1", {})
+    votes = {}
+    for voter, vote in [("ann", "yes"), ("cy", "no"), ("eve", "yes"), ("cy", "yes")]:
+        tally.record_vote("p1", voter, vote)
+        votes[voter] = vote
+    assert tally.tally("p1") == _reference(users, votes)
+
+    users["cy"] = {**users["cy"], "harmony_score": "10", "consent_given": False}
+    tally.upsert_user("cy", users["cy"])
+    users["fay"] = {"harmony_score": "33", "is_genesis": False, "species": "ai"}
+    tally.upsert_user("fay", users["fay"])
+    tally.record_vote("p1", "fay", "no")
+    votes["fay"] = "no"
+
+    expected = _reference(users, votes)
+    result = tally.tally("p1")
+    for key in ("yes", "no", "quorum"):
+        assert abs(result[key] - expected[key]) < Decimal("1e-20")
+    assert tally.verify("p1")
+
+
+def test_verify_detects_stale_index():
+    users = _users()
+    tally = _build(users)
+    tally.load_votes("p1", {"bob": "yes", "cy": "no"})
+    users["bob"]["harmony_score"] = "500"
+    fresh = _build(users)
+    fresh.load_votes("p1", {"bob": "yes", "cy": "no"})
+    assert not tally.verify("p1", fresh.tally("p1"))
+
+
+def test_verify_tolerates_rounding_in_running_sums():
+    users = {
+        f"u{i}": {
+            "harmony_score": str(Decimal(i * 7919 % 100003 + 2) / 7),
+            "is_genesis": False,
+            "species": SPECIES[i % 3],
+        }
+        for i in range(50)
+    }
+    tally = _build(users)
+    tally.load_votes("p1", {})
+    for i in range(500):
+        tally.record_vote("p1", f"u{(i * i + 2) % 50}", "yes" if i * 2 % 3 else "no")
+    fast, slow = tally.tally("p1"), tally.recompute("p1")
+    # Running and fresh sums round differently in the last places
+    assert any(fast[k] != slow[k] for k in fast)
+    assert tally.verify("p1")
@@ -0,0 +1,94 @@
+import math
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from quantum_sim import ENTANGLEMENT_NORMALIZATION_FACTOR, QuantumContext
+from quantum_sim.entanglement import EntanglementStore
+
+
+class _DictReference:
+    """Per-entry decay over a plain dict, as QuantumContext used to do."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.pairs = {}
+
+    def entangle(self, a, b, factor, bidirectional):
+        pair = tuple(sorted((a, b)))
+        self.pairs[pair] = self.pairs.get(pair, 0.0) + factor
+        if bidirectional:
+            rev = (pair[1], pair[0])
+            self.pairs[rev] = self.pairs.get(rev, 0.0) + factor
+
+    def step(self, dt):
+        decay = math.exp(-self.rate * dt)
+        for pair in list(self.pairs):
+            self.pairs[pair] *= decay
+            if self.pairs[pair] < 1e-6:
+                del self.pairs[pair]
+
+    def predict(self, uid):
+        aggregated = {}
+        for pair, weight in self.pairs.items():
+            key = tuple(sorted(pair))
+            aggregated[key] = max(aggregated.get(key, 0.0), weight)
+        total = sum(w for p, w in aggregated.items() if uid in p)
+        return min(1.0, total / ENTANGLEMENT_NORMALIZATION_FACTOR)
+
+
+def test_lazy_decay_matches_per_entry_decay():
+    rng = random.Random(5)
+    ctx = QuantumContext(decoherence_rate=0.8)
+    ref = _DictReference(0.8)
+    users = [f"u{i}" for i in range(12)]
+    for _ in range(400):
+        if rng.random() < 0.7:
+            a, b = rng.choice(users), rng.choice(users)
+            factor = rng.choice([0.0, 1e-7, rng.random()])
+            bidirectional = rng.random() < 0.6
+            ctx.entangle_entities(a, b, factor, bidirectional=bidirectional)
+            ref.entangle(a, b, factor, bidirectional)
+        else:
+            dt = rng.choice([0.5, 2.0, 6.0])
+            ctx.step(dt)
+            ref.step(dt)
+
+        assert set(ctx.entangled_pairs) == set(ref.pairs)
+        for pair, weight in ref.pairs.items():
+            assert ctx.entangled_pairs[pair] == pytest.approx(weight, rel=1e-9, abs=1e-12)
+        assert ctx.entanglement.total() == pytest.approx(sum(ref.pairs.values()), abs=1e-9)
+        prediction = ctx.quantum_prediction_engine(users)["predicted_interactions"]
+        for uid in users:
+            assert prediction[uid] == pytest.approx(ref.predict(uid), abs=1e-9)
+
+
+def test_store_adjacency_and_renormalization():
+    store = EntanglementStore()
+    store.add(("a", "b"), 2.0)
+    store.add(("b", "a"), 3.0)
+    store.add(("a", "c"), 1.0)
+    assert store.neighbors("a") == {"b": 3.0, "c": 1.0}
+    assert store.node_weight("a") == 4.0
+
+    # Long runs fold the global scale back into the stored weights
+    for _ in range(10):
+        store.decay(1e-30)
+        store.add(("a", "b"), 1.0)
+    assert store._scale > 1e-100
+    assert set(store.keys()) == {("a", "b")}
+    assert store.weight(("a", "b")) == pytest.approx(1.0)
+    assert store.neighbors("c") == {}
+    assert store.node_weight("c") == 0.0
+    assert store.neighbors("a") == {"b": pytest.approx(1.0)}
+
+    for _ in range(400):
+        store.decay(0.1)
+    assert len(store) == 0 and store.total() == 0.0
+    assert store.node_weight("a") == 0.0
@@ -0,0 +1,131 @@
+import sys
+import threading
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("streamlit")
+pytestmark = pytest.mark.requires_streamlit
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import superNova_2177 as sn
+
+
+@pytest.fixture
+def storage():
+    engine = create_engine("sqlite://")
+    sn.Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        for i in range(3):
+            db.add(
+                sn.Harmonizer(username=f"u{i}", email=f"u{i}@x", hashed_password="x")
+            )
+        db.commit()
+    return engine, Session, sn.SQLAlchemyStorage(Session)
+
+
+def test_transaction_batches_writes(storage):
+    engine, Session, st = storage
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cur, stmt, params, ctx, many: statements.append(stmt.split()[0]),
+    )
+    with st.transaction():
+        users = st.get_users_many(["u0", "u1", "u2", "missing"])
+        assert set(users) == {"u0", "u1", "u2"}
+        for name, data in users.items():
+            data["bio"] = f"bio-{name}"
+            st.set_user(name, data)
+        st.set_coin(
+            "c1",
+            {
+                "coin_id": "c1",
+                "owner": "u1",
+                "creator": "u1",
+                "value": Decimal("5"),
+                "reactor_escrow": "0",
+            },
+        )
+        assert st.get_user("u1")["bio"] == "bio-u1"
+        assert st.get_coin("c1")["value"] == Decimal("5")
+
+    assert statements.count("UPDATE") == 1
+    with Session() as db:
+        bios = {h.username: h.bio for h in db.query(sn.Harmonizer).all()}
+        assert bios == {"u0": "bio-u0", "u1": "bio-u1", "u2": "bio-u2"}
+    coin = st.get_coin("c1")
+    assert coin["owner"] == "u1" and Decimal(coin["value"]) == Decimal("5")
+
+
+def test_transaction_rolls_back_on_error(storage):
+    _, Session, st = storage
+    with pytest.raises(RuntimeError):
+        with st.transaction():
+            st.set_user("u0", {"bio": "changed"})
+            raise RuntimeError
+    with Session() as db:
+        assert db.query(sn.Harmonizer).filter_by(username="u0").one().bio == ""
+
+
+def test_in_memory_rollback_restores_mutations():
+    st = sn.InMemoryStorage()
+    st.set_user("a", {"karma": "1"})
+    with pytest.raises(RuntimeError):
+        with st.transaction():
+            st.get_user("a")["karma"] = "2"
+            st.set_user("b", {})
+            raise RuntimeError
+    assert st.users == {"a": {"karma": "1"}}
+
+
+def test_in_memory_transactions_are_per_thread():
+    st = sn.InMemoryStorage()
+    entered, done = threading.Event(), threading.Event()
+
+    def other():
+        with st.transaction():
+            entered.set()
+            done.wait(5)
+            st.set_user("b", {"karma": "2"})
+
+    thread = threading.Thread(target=other)
+    thread.start()
+    entered.wait(5)
+    # Rolling back this thread's transaction must not undo the other thread's writes
+    with pytest.raises(RuntimeError):
+        with st.transaction():
+            st.set_user("a", {"karma": "1"})
+            done.set()
+            thread.join()
+            raise RuntimeError
+    assert st.users == {"b": {"karma": "2"}}
+
+
+def test_delete_in_transaction_drops_name_from_search_after_commit(storage, monkeypatch):
+    from username_index import UsernameIndex
+
+    engine, Session, st = storage
+    index = UsernameIndex()
+    monkeypatch.setattr(sn, "get_username_index", lambda: index)
+    with Session() as db:
+        assert [name for _, name in index.search(db, "u")] == ["u0", "u1", "u2"]
+
+    with pytest.raises(RuntimeError):
+        with st.transaction():
+            st.delete_user("u2")
+            raise RuntimeError("abort")
+    with st.transaction():
+        st.delete_user("u1")
+        st.delete_user("missing")
+    with Session() as db:
+        assert [name for _, name in index.search(db, "u")] == ["u0", "u2"]
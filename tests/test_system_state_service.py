@@ -0,0 +1,96 @@
+import sys
+import threading
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from db_models import Base, SystemState
+from system_state_utils import service
+from system_state_utils.service import SystemStateService, get_config_override
+
+
+@pytest.fixture
+def Session(tmp_path, monkeypatch):
+    monkeypatch.setattr(service, "_CACHE", None)
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'state.db'}", connect_args={"timeout": 30}
+    )
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(
+        engine, "before_cursor_execute", lambda *args: statements.append(args[2])
+    )
+    factory = sessionmaker(bind=engine)
+    factory.statements = statements
+    yield factory
+    engine.dispose()
+
+
+def test_reads_are_cached_and_writes_update_the_cache(Session):
+    with Session() as db:
+        state = SystemStateService(db)
+        assert state.get_state("system_entropy", "1000") == "1000"
+        state.get_state("system_entropy", "1000")
+        selects = [s for s in Session.statements if s.startswith("SELECT")]
+        assert len(selects) == 1
+
+        state.set_state("system_entropy", "990")
+        del Session.statements[:]
+        assert state.get_state("system_entropy", "1000") == "990"
+        assert Session.statements == []
+
+
+def test_increment_is_atomic_under_concurrency(Session):
+    def worker():
+        with Session() as db:
+            state = SystemStateService(db)
+            for _ in range(20):
+                state.increment("community_wellspring", Decimal("0.1"), default="0.0")
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    with Session() as db:
+        row = db.query(SystemState).filter_by(key="community_wellspring").one()
+        assert Decimal(row.value) == Decimal("8.0")
+
+
+def test_increment_retries_when_the_cached_value_is_stale(Session):
+    with Session() as db:
+        state = SystemStateService(db)
+        assert state.increment("system_entropy", -5, default="1000") == "995"
+        # Another process writes behind this process' cache
+        with Session() as other:
+            other.query(SystemState).filter_by(key="system_entropy").update(
+                {"value": "500"}
+            )
+            other.commit()
+        assert state.get_state("system_entropy", "1000") == "995"
+        assert state.increment("system_entropy", -5) == "495"
+        assert state.get_state("system_entropy", "1000") == "495"
+
+
+def test_config_overrides_are_served_from_memory(Session):
+    with Session() as db:
+        db.add(SystemState(key="config_override:ALPHA", value="0.5"))
+        db.commit()
+        assert get_config_override(db, "ALPHA") == "0.5"
+        del Session.statements[:]
+        assert get_config_override(db, "BETA") is None
+        assert Session.statements == []
+
+        SystemStateService(db).set_state("config_override:BETA", "2")
+        del Session.statements[:]
+        assert get_config_override(db, "BETA") == "2"
+        assert SystemStateService(db).get_state("config_override:ALPHA", "") == "0.5"
+        assert Session.statements == []
@@ -0,0 +1,173 @@
+import datetime
+import math
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from db_models import Base, Harmonizer, VibeNode
+from hook_manager import HookManager
+from hooks import events
+import tag_histogram
+from tag_histogram import TagHistogram
+
+NOW = datetime.datetime(2026, 5, 1, 12, 0, 0)
+TAGS = [["art"], ["art", "music"], ["code"], [], None, ["music", "zen", "art"]]
+
+
+def _entropy(counter):
+    total = sum(counter.values())
+    return -sum((c / total) * math.log2(c / total) for c in counter.values()) if total else 0.0
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tags.db'}")
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as s:
+        s.add(Harmonizer(username="a", email="a@x", hashed_password="x"))
+        for i in range(30):
+            s.add(
+                VibeNode(
+                    name=f"n{i}",
+                    author_id=1,
+                    tags=TAGS[i % len(TAGS)],
+                    created_at=NOW - datetime.timedelta(hours=i * 1.5),
+                )
+            )
+        s.commit()
+    with Session() as s:
+        yield s
+    engine.dispose()
+
+
+def _reference(db, now, hours=24, limit=10):
+    nodes = db.query(VibeNode).all()
+    window = Counter()
+    for n in nodes:
+        if n.created_at >= now - datetime.timedelta(hours=hours) and n.tags:
+            window.update(n.tags)
+    recent = Counter()
+    for n in sorted(nodes, key=lambda n: n.created_at, reverse=True)[:limit]:
+        recent.update(n.tags or [])
+    neg = math.log2(len(recent)) - _entropy(recent) if recent else 0.0
+    return _entropy(window), neg
+
+
+def test_backfill_matches_full_scan(db):
+    hist = TagHistogram(24, 10, hooks=HookManager())
+    entropy, negentropy = _reference(db, NOW)
+    assert hist.content_entropy(db, now=NOW) == pytest.approx(entropy)
+    assert hist.negentropy(db) == pytest.approx(negentropy)
+
+
+def test_notifications_and_catch_up_avoid_rescans(db):
+    hooks = HookManager()
+    hist = TagHistogram(24, 10, hooks=hooks)
+    hist.content_entropy(db, now=NOW)
+
+    statements = []
+    event.listen(
+        db.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cur, stmt, params, ctx, many: statements.append(stmt),
+    )
+    later = NOW + datetime.timedelta(minutes=30)
+    node = VibeNode(name="new", author_id=1, tags=["zen", "zen"], created_at=later)
+    db.add(node)
+    db.commit()
+    payload = {"vibenode_id": node.id, "tags": node.tags, "created_at": node.created_at}
+    hooks.fire_hooks(events.VIBENODE_CREATED, payload)
+    # Unannounced row is picked up by the id catch-up; the announced one is
+    # not counted twice.
+    db.add(VibeNode(name="quiet", author_id=1, tags=["code"], created_at=later))
+    db.commit()
+
+    entropy, negentropy = _reference(db, later)
+    statements.clear()
+    assert hist.content_entropy(db, now=later) == pytest.approx(entropy)
+    assert hist.negentropy(db) == pytest.approx(negentropy)
+    reads = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert reads and all("vibenodes.id >" in s for s in reads)
+
+    # Sliding the window forward expires old buckets
+    future = NOW + datetime.timedelta(hours=30)
+    assert hist.content_entropy(db, now=future) == pytest.approx(
+        _reference(db, future)[0]
+    )
+
+
+def test_catch_up_query_does_not_hold_the_lock(db):
+    hooks = HookManager()
+    hist = TagHistogram(24, 10, hooks=hooks)
+    hist.content_entropy(db, now=NOW)
+    started, release = threading.Event(), threading.Event()
+
+    def stall(*args):
+        started.set()
+        release.wait(5)
+
+    event.listen(db.get_bind(), "before_cursor_execute", stall)
+    reader = threading.Thread(target=hist.sync, args=(db, NOW))
+    reader.start()
+    try:
+        assert started.wait(5)
+        # A notification is applied while the catch-up query is in flight
+        done = threading.Event()
+        notify = threading.Thread(
+            target=lambda: (
+                hooks.fire_hooks(
+                    events.VIBENODE_CREATED,
+                    {"vibenode_id": 99, "tags": ["zen"], "created_at": NOW},
+                ),
+                done.set(),
+            )
+        )
+        notify.start()
+        assert done.wait(2)
+    finally:
+        release.set()
+        reader.join(5)
+    assert hist.recent.totals["zen"] >= 1
+
+
+def test_lower_id_written_without_notification_is_counted(db):
+    hooks = HookManager()
+    hist = TagHistogram(24, 10, hooks=hooks)
+    hist.content_entropy(db, now=NOW)
+
+    # Another worker commits id 40 silently after id 41 was announced here
+    announced = VibeNode(id=41, name="loud", author_id=1, tags=["zen"], created_at=NOW)
+    db.add(announced)
+    db.commit()
+    hooks.fire_hooks(
+        events.VIBENODE_CREATED,
+        {"vibenode_id": 41, "tags": ["zen"], "created_at": NOW},
+    )
+    db.add(VibeNode(id=40, name="quiet", author_id=1, tags=["code"], created_at=NOW))
+    db.commit()
+
+    entropy, negentropy = _reference(db, NOW)
+    assert hist.content_entropy(db, now=NOW) == pytest.approx(entropy)
+    assert hist.negentropy(db) == pytest.approx(negentropy)
+    assert hist.watermark == 41 and not hist._notified
+
+
+def test_get_tag_histogram_follows_app_config(db, monkeypatch):
+    monkeypatch.setattr(tag_histogram, "_HISTOGRAM", None)
+    hist = tag_histogram.get_tag_histogram(24, 10)
+    hist.negentropy(db)
+    assert tag_histogram.get_tag_histogram(12, 5) is hist
+    assert (hist.window_hours, hist.sample_limit) == (12, 5)
+    assert hist.content_entropy(db, now=NOW) == pytest.approx(_reference(db, NOW, 12, 5)[0])
+    assert hist.negentropy(db) == pytest.approx(_reference(db, NOW, 12, 5)[1])
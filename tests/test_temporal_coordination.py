@@ -0,0 +1,75 @@
+import itertools
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from network import network_coordination_detector as ncd
+
+
+def _validations(seed=7, validators=12, per_validator=15):
+    rng = random.Random(seed)
+    base = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    records = []
+    for v in range(validators):
+        for _ in range(per_validator):
+            ts = base + timedelta(seconds=rng.randrange(0, 6 * 3600))
+            records.append({"validator_id": f"v{v}", "timestamp": ts.isoformat()})
+    rng.shuffle(records)
+    # Exactly one window apart must still count as close
+    records.append({"validator_id": "edge_a", "timestamp": "2025-03-02T00:00:00Z"})
+    for minute in (5, 5, 5):
+        records.append(
+            {"validator_id": "edge_b", "timestamp": f"2025-03-02T00:0{minute}:00+00:00"}
+        )
+    return records
+
+
+def _reference(validations):
+    stamps = {}
+    for v in validations:
+        ts = datetime.fromisoformat(v["timestamp"].replace("Z", "+00:00"))
+        stamps.setdefault(v["validator_id"], []).append(ts)
+    window = timedelta(minutes=ncd.Config.TEMPORAL_WINDOW_MINUTES)
+    clusters = []
+    for v1, v2 in itertools.combinations(stamps, 2):
+        close = sum(1 for a in stamps[v1] for b in stamps[v2] if abs(a - b) <= window)
+        if close >= ncd.Config.MIN_TEMPORAL_OCCURRENCES:
+            clusters.append((v1, v2, close))
+    return clusters
+
+
+def _result(out):
+    return [
+        (c["validators"][0], c["validators"][1], c["close_submissions"])
+        for c in out["temporal_clusters"]
+    ]
+
+
+def test_sweep_matches_pairwise_reference(monkeypatch):
+    validations = _validations()
+    expected = _reference(validations)
+    assert ("edge_a", "edge_b", 3) in expected
+
+    out = ncd.detect_temporal_coordination(validations)
+    assert _result(out) == expected
+    assert out["flags"] == [f"temporal_coordination_{a}_{b}" for a, b, _ in expected]
+
+    # Small batches split the sweep across several workers
+    monkeypatch.setattr(ncd.Config, "TEMPORAL_PAIR_BATCH", 50)
+    assert _result(ncd.detect_temporal_coordination(validations)) == expected
+
+    monkeypatch.setattr(ncd, "np", None)
+    assert _result(ncd.detect_temporal_coordination(validations)) == expected
+
+
+def test_process_pool_reads_shared_timeline(monkeypatch):
+    validations = _validations(seed=3, validators=6, per_validator=10)
+    monkeypatch.setattr(ncd, "USE_PROCESS_POOL", True)
+    monkeypatch.setattr(ncd.Config, "TEMPORAL_PAIR_BATCH", 20)
+    out = ncd.detect_temporal_coordination(validations)
+    assert _result(out) == _reference(validations)
@@ -0,0 +1,104 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+import username_index
+from db_models import Base, Harmonizer
+from username_index import UsernameIndex
+
+NAMES = ["alice", "alicia", "malice", "bob", "bobby", "roberta", "al", "AlexanderTheGreat"]
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        for name in NAMES:
+            db.add(Harmonizer(username=name, email=f"{name}@x", hashed_password="x"))
+        db.commit()
+    yield engine
+    engine.dispose()
+
+
+def _names(index, db, q, limit=5):
+    return [name for _, name in index.search(db, q, limit)]
+
+
+def test_ranks_prefix_then_substring_then_fuzzy(engine):
+    index = UsernameIndex()
+    with sessionmaker(bind=engine)() as db:
+        assert _names(index, db, "al") == ["al", "alice", "alicia", "AlexanderTheGreat"]
+        assert _names(index, db, "ALIC") == ["alice", "alicia", "malice"]
+        assert _names(index, db, "obert") == ["roberta"]
+        # Typo still finds the intended names
+        assert _names(index, db, "alcie")[:1] == ["alice"]
+        assert _names(index, db, "bobb") == ["bobby", "bob"]
+        assert _names(index, db, "robrta") == ["roberta"]
+        assert _names(index, db, "zzz") == []
+        assert _names(index, db, "   ") == []
+
+
+def test_serves_keystrokes_from_memory_and_tracks_new_users(engine, monkeypatch):
+    monkeypatch.setattr(username_index.Config, "SYNC_INTERVAL_SECONDS", 3600)
+    index = UsernameIndex()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+    with sessionmaker(bind=engine)() as db:
+        for q in ["a", "al", "ali", "alic", "alice", "al", "bob"]:
+            index.search(db, q)
+        assert len(statements) == 1
+
+        user = Harmonizer(username="alicorn", email="alicorn@x", hashed_password="x")
+        db.add(user)
+        db.commit()
+        index.add(db, user.id, user.username)
+        # The cached "alic" result was evicted; "bob" was not
+        assert "alicorn" in _names(index, db, "alic")
+        assert ("bob", 5) in index._cache
+
+        db.delete(user)
+        db.commit()
+        index.discard(db, "alicorn")
+        assert "alicorn" not in _names(index, db, "alic")
+
+
+def test_sync_picks_up_rows_added_elsewhere(engine, monkeypatch):
+    monkeypatch.setattr(username_index.Config, "SYNC_INTERVAL_SECONDS", 0)
+    index = UsernameIndex()
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        assert _names(index, db, "zed") == []
+    with Session() as other:
+        other.add(Harmonizer(username="zedd", email="zedd@x", hashed_password="x"))
+        other.commit()
+    with Session() as db:
+        assert _names(index, db, "zed") == ["zedd"]
+
+
+def test_rebuild_loads_without_the_lock_and_keeps_concurrent_changes(engine):
+    index = UsernameIndex()
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        assert _names(index, db, "bob") == ["bob", "bobby"]
+        # Another process deletes bobby; the rebuild should drop it
+        db.query(Harmonizer).filter_by(username="bobby").delete()
+        db.commit()
+
+        def during_load(*args):
+            # Runs while the rebuild queries, so it would deadlock on the lock
+            index.add(db, 100, "bobcat")
+            index.discard(db, "bob")
+
+        event.listen(engine, "before_cursor_execute", during_load, once=True)
+        index.rebuild(db)
+        assert _names(index, db, "bob") == ["bobcat"]
+        assert _names(index, db, "alic") == ["alice", "alicia", "malice"]
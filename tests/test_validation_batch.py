@@ -0,0 +1,96 @@
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+import validation_certifier as vc
+from diversity_analyzer import compute_diversity_score
+import network.network_coordination_detector as ncd
+from network.network_coordination_detector import analyze_coordination_patterns
+from temporal_consistency_checker import analyze_temporal_consistency
+from validation_batch import ValidationBatch, attach_batch
+from validators.reputation_influence_tracker import compute_validator_reputations
+
+NOW = datetime(2025, 6, 1)
+
+
+def _validations(seed=3, count=240):
+    rng = random.Random(seed)
+    base = datetime(2025, 5, 1)
+    records = []
+    for i in range(count):
+        ts = base + timedelta(minutes=rng.randrange(0, 30 * 24 * 60))
+        if i % 7 == 0:
+            ts = ts.replace(tzinfo=timezone(timedelta(hours=rng.choice([-5, 2]))))
+        records.append(
+            {
+                "validator_id": f"v{rng.randrange(15)}",
+                "hypothesis_id": f"h{rng.randrange(10)}",
+                "score": round(rng.random(), 2),
+                "timestamp": ts.isoformat(),
+                "specialty": rng.choice(["bio", "physics", "", None]),
+                "affiliation": rng.choice(["lab_a", "lab_b", "lab_c"]),
+                "note": rng.choice(["I agree with this", "strongly refute the claim", ""]),
+            }
+        )
+    records += [
+        {"validator_id": "", "score": 0.4, "timestamp": "2025-05-03T10:00:00"},
+        {"score": "bad", "timestamp": "2025-05-04T11:00:00Z"},
+        {"validator_id": "v1", "timestamp": "not a time"},
+    ]
+    return records
+
+
+def _analyze(validations):
+    consensus = {f"h{i}": 0.5 for i in range(10)}
+    reputation = compute_validator_reputations(validations, consensus, current_time=NOW)
+    return {
+        "diversity": compute_diversity_score(validations),
+        "reputation": reputation,
+        "temporal": analyze_temporal_consistency(
+            validations, reputation["validator_reputations"]
+        ),
+        "coordination": analyze_coordination_patterns(validations),
+    }
+
+
+def test_batch_matches_list_input():
+    validations = _validations()
+    batch = ValidationBatch.of(validations)
+    assert ValidationBatch.of(batch) is batch
+    assert batch.invalid_timestamps == 1
+    assert batch.validator_id(len(validations) - 3, "missing") == ""
+    assert batch.validator_id(len(validations) - 2, "missing") == "missing"
+    assert _analyze(batch) == _analyze(validations)
+
+    with batch.shared() as handle, attach_batch(handle) as attached:
+        assert _analyze(attached) == _analyze(validations)
+
+
+def test_process_pool_certification_matches_threads(monkeypatch):
+    validations = _validations(seed=11, count=120)
+
+    def certify():
+        result = vc.certify_validations_comprehensive(validations)
+        result.pop("analysis_timestamp")
+        return result
+
+    threaded = certify()
+    monkeypatch.setattr(vc.Config, "USE_PROCESS_POOL", True)
+    assert certify() == threaded
+
+
+def test_semantic_coordination_keeps_its_tuned_encoder(monkeypatch):
+    models = []
+
+    def service(model_name):
+        models.append(model_name)
+        raise RuntimeError("offline")
+
+    monkeypatch.setattr(ncd, "get_embedding_service", service)
+    ncd.detect_semantic_coordination(_validations())
+    assert models == ["paraphrase-MiniLM-L6-v2"]
@@ -0,0 +1,69 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+import virtual_diary
+from virtual_diary import store
+
+
+@pytest.fixture
+def diary_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "_STORES", {})
+    path = tmp_path / "virtual_diary.json"
+    monkeypatch.setenv("VIRTUAL_DIARY_FILE", str(path))
+    yield path
+    for diary in store._STORES.values():
+        diary.close()
+
+
+def test_legacy_json_is_migrated_once(diary_path):
+    diary_path.write_text(json.dumps([{"note": f"old {i}"} for i in range(5)]))
+
+    assert [e["note"] for e in virtual_diary.load_entries(limit=2)] == ["old 3", "old 4"]
+    assert not diary_path.exists()
+    assert Path(f"{diary_path}.migrated").exists()
+
+    virtual_diary.add_entry({"note": "new"})
+    virtual_diary.flush_entries()
+    # A fresh store over the same files must not migrate again
+    store._STORES.clear()
+    notes = [e["note"] for e in virtual_diary.load_entries(limit=10)]
+    assert notes == ["old 0", "old 1", "old 2", "old 3", "old 4", "new"]
+
+
+def test_writes_are_batched_and_visible_to_reads(diary_path):
+    log = Path(f"{diary_path}l")
+    for i in range(3):
+        virtual_diary.add_entry({"note": f"n{i}", "action": "remix"})
+    diary = store.get_diary_store()
+    diary._wake.acquire()
+    try:
+        # Nothing hits the disk until the flusher or a reader drains the queue
+        assert len(diary._pending) == 3
+    finally:
+        diary._wake.release()
+    assert [e["note"] for e in virtual_diary.load_entries(limit=2)] == ["n1", "n2"]
+    assert len(log.read_text().splitlines()) == 3
+
+
+def test_tail_crosses_rotated_files(diary_path, monkeypatch):
+    monkeypatch.setattr(store.Config, "MAX_BYTES", 200)
+    monkeypatch.setattr(store.Config, "TAIL_BLOCK_BYTES", 16)
+    for i in range(40):
+        virtual_diary.add_entry({"note": f"entry {i:02d}"})
+        virtual_diary.flush_entries()
+    log = Path(f"{diary_path}l")
+    assert Path(f"{log}.1").exists() and Path(f"{log}.3").exists()
+    assert not Path(f"{log}.4").exists()
+    assert log.stat().st_size <= 200
+
+    with log.open("ab") as f:
+        f.write(b'{"note": "trunc')
+    recent = virtual_diary.load_entries(limit=12)
+    assert [e["note"] for e in recent] == [f"entry {i:02d}" for i in range(28, 40)]
@@ -0,0 +1,105 @@
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+root = Path(__file__).resolve().parents[1]
+if str(root) not in sys.path:
+    sys.path.insert(0, str(root))
+
+from validators.strategies import voting_consensus_engine as vce
+from validators.strategies.voting_consensus_engine import VotingMethod
+
+NOW = datetime(2026, 1, 15)
+
+
+def _decay(vote):
+    return vce._time_decay_factor(vote.get("timestamp"), NOW, vce.Config.VOTE_DECAY_HALF_LIFE_DAYS)
+
+
+def _reference_reputation_weighted(votes, reputations, temporal):
+    """The per-vote loop the columnar path replaced."""
+    totals, decisions, weighted = 0.0, {}, 0.0
+    for vote in votes:
+        vid = vote["validator_id"]
+        weight = (
+            (reputations.get(vid, 0.5) * 0.7 + temporal.get(vid, 0.5) * 0.3)
+            * float(vote.get("confidence", 0.5))
+            * _decay(vote)
+        )
+        weighted += float(vote.get("score", 0.5)) * weight
+        decisions[vote.get("decision", "abstain")] = (
+            decisions.get(vote.get("decision", "abstain"), 0.0) + weight
+        )
+        totals += weight
+    top = max(decisions, key=decisions.get)
+    return round(weighted / totals, 3), round(decisions[top] / totals, 3), top
+
+
+def _votes(seed, count=30):
+    rng = random.Random(seed)
+    return [
+        {
+            "validator_id": f"v{i}",
+            "score": round(rng.random(), 2),
+            "confidence": round(rng.uniform(0.2, 1.0), 2),
+            "decision": rng.choice(["approve", "reject", "abstain"]),
+            "credits": rng.choice([1, 4, 9]),
+            "ranking": rng.sample(["a", "b", "c"], 3),
+            "timestamp": (NOW - timedelta(days=rng.randrange(90))).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_reputation_weighted_matches_per_vote_loop(seed):
+    votes = _votes(seed)
+    rng = random.Random(seed)
+    reputations = {v["validator_id"]: round(rng.uniform(0.2, 1.0), 2) for v in votes}
+    temporal = {v["validator_id"]: round(rng.random(), 2) for v in votes[::2]}
+    result = vce.aggregate_validator_votes(
+        votes, VotingMethod.REPUTATION_WEIGHTED, reputations, 0.5, temporal, current_time=NOW
+    )
+    score, confidence, top = _reference_reputation_weighted(votes, reputations, temporal)
+    assert result["consensus_decision"] == pytest.approx(score, abs=1e-3)
+    assert result["consensus_confidence"] == pytest.approx(confidence, abs=1e-3)
+    assert result["vote_breakdown"]["top_decision"] == top
+
+
+def test_multi_hop_delegation_reaches_final_voter():
+    votes = [
+        {"validator_id": "a", "decision": "yes", "delegate_to": "b"},
+        {"validator_id": "b", "decision": "yes", "delegate_to": "c"},
+        {"validator_id": "c", "decision": "no"},
+        {"validator_id": "d", "decision": "yes"},
+        {"validator_id": "e", "decision": "yes", "delegate_to": "f"},
+        {"validator_id": "f", "decision": "yes", "delegate_to": "e"},
+    ]
+    reputations = {"a": 0.5, "b": 0.4, "c": 0.3, "d": 1.0, "e": 0.9, "f": 0.9}
+    result = vce.aggregate_validator_votes(
+        votes, VotingMethod.MAJORITY_RULE, reputations, 0.5, current_time=NOW
+    )
+    # c votes with 0.3 + 0.4 + 0.5 = 1.2; the e <-> f cycle is dropped
+    assert result["vote_breakdown"]["decision_counts"] == {"no": 12, "yes": 10}
+    assert result["valid_votes"] == 2
+    assert result["quorum_met"] is False
+
+
+def test_batch_matches_individual_calls():
+    vote_sets = {f"h{i}": _votes(i, count=4 + i) for i in range(6)}
+    vote_sets["empty"] = []
+    vote_sets["few"] = vote_sets["h0"][:2]
+    reputations = {f"v{i}": 0.3 + i / 20 for i in range(12)}
+    for method in VotingMethod:
+        batch = vce.aggregate_vote_sets(
+            vote_sets, method, reputations, {"h1": 0.9}, current_time=NOW
+        )
+        assert batch == {
+            key: vce.aggregate_validator_votes(
+                votes, method, reputations, {"h1": 0.9}.get(key), current_time=NOW
+            )
+            for key, votes in vote_sets.items()
+        }
@@ -0,0 +1,390 @@
+"""In-memory username search for ``/users/search``.
+
+``Harmonizer.username.ilike('%q%')`` cannot use the username index and scans
+the table on every keystroke of the type-ahead box.  :class:`UsernameIndex`
+keeps every ``(id, username)`` pair in memory instead:
+
+- a sorted list of lowercased names answers prefix queries with a binary
+  search;
+- an inverted index from trigrams to user ids answers substring queries by
+  intersecting the postings of the query's trigrams, smallest first;
+- when fewer than ``limit`` names contain the query, names sharing at least
+  ``Config.MIN_TRIGRAM_OVERLAP`` of the query's trigrams become typo
+  candidates, kept if their prefix is within ``Config.MAX_EDITS`` edits
+  (transpositions count once) of the query;
+- ranked results for recent queries are kept in an LRU cache; adding or
+  removing a name only evicts the cached queries it could affect.
+
+Prefix matches rank first (shortest name first), then substring matches by
+position, then fuzzy matches.  Queries shorter than three characters are
+served by prefix only.
+
+The index is built on first use from one column-only query and picks up
+users registered elsewhere with an ``id > max_id`` query at most every
+``Config.SYNC_INTERVAL_SECONDS``.  :meth:`UsernameIndex.rebuild` reloads it
+so deletions made by other processes drop out; the API calls it from a
+background task every ``Config.REBUILD_INTERVAL_SECONDS``.  A rebuild builds
+the new structures without holding the lock, swaps them in, and replays the
+names added or removed while it was loading.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from db_models import Harmonizer
+
+logger = logging.getLogger("superNova_2177.username_index")
+
+
+class Config:
+    DEFAULT_LIMIT = 5
+    MAX_LIMIT = 50
+    # Seconds between checks for users added by other processes
+    SYNC_INTERVAL_SECONDS = 1.0
+    # Seconds between full rebuilds, which also drop deleted users
+    REBUILD_INTERVAL_SECONDS = 600.0
+    # Prefix and substring candidates ranked per stage
+    CANDIDATE_LIMIT = 200
+    # Share of query trigrams a typo candidate must contain
+    MIN_TRIGRAM_OVERLAP = 0.3
+    # Edits tolerated between a query and a name prefix; queries shorter
+    # than LONG_QUERY characters tolerate one
+    MAX_EDITS = 2
+    LONG_QUERY = 6
+    # Postings longer than this carry too little signal to count for fuzzy
+    # matches and would make a keystroke scan most of the index
+    MAX_FUZZY_POSTING = 20000
+    CACHE_SIZE = 1024
+
+
+Match = Tuple[int, str]
+
+
+def _trigrams(name: str) -> Set[str]:
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _query_trigrams(query: str) -> Set[str]:
+    # No trailing pad: the query is usually an unfinished prefix
+    padded = f"  {query}"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Optimal string alignment distance between ``a`` and ``b``."""
+    prev2: List[int] = []
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        row = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            row[j] = min(prev[j] + 1, row[j - 1] + 1, prev[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                row[j] = min(row[j], prev2[j - 2] + 1)
+        prev2, prev = prev, row
+    return prev[-1]
+
+
+class UsernameIndex:
+    """Trigram and prefix index over ``Harmonizer.username`` for one database."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # Serializes rebuilds; reentrant so sync() can build on first use
+        self._rebuild_lock = threading.RLock()
+        self._bind: Any = None
+        self._names: Dict[int, str] = {}
+        self._sorted: List[Tuple[str, int]] = []
+        self._postings: Dict[str, Set[int]] = {}
+        self._max_id = 0
+        self._built = False
+        self._synced_at = 0.0
+        # Ids inserted or removed while a rebuild is loading, else None
+        self._changes: Optional[Set[int]] = None
+        self._cache: "OrderedDict[Tuple[str, int], List[Match]]" = OrderedDict()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    def _bind_to(self, db: Session) -> None:
+        # Caller holds ``self.lock``
+        bind = db.get_bind()
+        if bind is not self._bind:
+            self._reset()
+            self._bind = bind
+
+    def _reset(self) -> None:
+        self._names = {}
+        self._sorted = []
+        self._postings = {}
+        self._max_id = 0
+        self._built = False
+        self._changes = None
+        self._cache.clear()
+
+    def _insert(self, user_id: int, username: str) -> None:
+        if user_id in self._names:
+            self._remove(user_id)
+        lower = username.lower()
+        self._names[user_id] = username
+        if self._changes is not None:
+            self._changes.add(user_id)
+        bisect.insort(self._sorted, (lower, user_id))
+        for gram in _trigrams(lower):
+            self._postings.setdefault(gram, set()).add(user_id)
+        self._max_id = max(self._max_id, user_id)
+
+    def _remove(self, user_id: int) -> Optional[str]:
+        username = self._names.pop(user_id, None)
+        if username is None:
+            return None
+        if self._changes is not None:
+            self._changes.add(user_id)
+        lower = username.lower()
+        pos = bisect.bisect_left(self._sorted, (lower, user_id))
+        if pos < len(self._sorted) and self._sorted[pos] == (lower, user_id):
+            del self._sorted[pos]
+        for gram in _trigrams(lower):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(user_id)
+                if not posting:
+                    del self._postings[gram]
+        return username
+
+    def _evict(self, username: str) -> None:
+        # Only queries sharing a trigram with (or contained in) the name can
+        # rank it, so every other cached result stays valid
+        lower = username.lower()
+        grams = _trigrams(lower)
+        stale = [
+            key
+            for key in self._cache
+            if key[0] in lower or not grams.isdisjoint(_query_trigrams(key[0]))
+        ]
+        for key in stale:
+            del self._cache[key]
+
+    @staticmethod
+    def _build(
+        rows: List[Match],
+    ) -> Tuple[Dict[int, str], List[Tuple[str, int]], Dict[str, Set[int]]]:
+        # Runs without ``self.lock``; the result is swapped in by rebuild()
+        names: Dict[int, str] = {}
+        ordered: List[Tuple[str, int]] = []
+        postings: Dict[str, Set[int]] = {}
+        for user_id, username in rows:
+            lower = username.lower()
+            names[user_id] = username
+            ordered.append((lower, user_id))
+            for gram in _trigrams(lower):
+                postings.setdefault(gram, set()).add(user_id)
+        ordered.sort()
+        return names, ordered, postings
+
+    def _load(self, db: Session, after: int = 0) -> List[Match]:
+        rows = db.execute(
+            select(Harmonizer.id, Harmonizer.username)
+            .where(Harmonizer.id > after)
+            .order_by(Harmonizer.id)
+        ).all()
+        return [(uid, name) for uid, name in rows if name]
+
+    def rebuild(self, db: Session) -> None:
+        """Reload every name from ``db`` and swap the new index in.
+
+        Loading and building run without :attr:`lock`, so searches keep being
+        served from the previous index meanwhile.
+        """
+        with self._rebuild_lock:
+            now = time.monotonic()
+            with self.lock:
+                self._bind_to(db)
+                bind = self._bind
+                self._changes = set()
+            rows = self._load(db)
+            names, ordered, postings = self._build(rows)
+            with self.lock:
+                changes, self._changes = self._changes, None
+                if self._bind is not bind or changes is None:
+                    return
+                current = {user_id: self._names.get(user_id) for user_id in changes}
+                self._names, self._sorted, self._postings = names, ordered, postings
+                self._max_id = max(names, default=0)
+                self._built = True
+                self._synced_at = now
+                self._cache.clear()
+                # Names added or removed while loading win over the loaded rows
+                for user_id, username in current.items():
+                    if username is None:
+                        self._remove(user_id)
+                    elif names.get(user_id) != username:
+                        self._insert(user_id, username)
+            logger.info("Built username index over %d users", len(rows))
+
+    def sync(self, db: Session) -> None:
+        """Build the index on first use and pick up rows added elsewhere."""
+        now = time.monotonic()
+        with self.lock:
+            self._bind_to(db)
+            bind = self._bind
+            built = self._built
+            if built:
+                if now - self._synced_at < Config.SYNC_INTERVAL_SECONDS:
+                    return
+                self._synced_at = now
+            after = self._max_id
+        if not built:
+            with self._rebuild_lock:
+                with self.lock:
+                    built = self._built and self._bind is bind
+                if not built:
+                    self.rebuild(db)
+            return
+        rows = self._load(db, after)
+        with self.lock:
+            if self._bind is not bind:
+                return
+            for user_id, username in rows:
+                if self._names.get(user_id) != username:
+                    self._insert(user_id, username)
+                    self._evict(username)
+
+    def add(self, db: Session, user_id: int, username: str) -> None:
+        """Index a newly registered or renamed user."""
+        with self.lock:
+            self._bind_to(db)
+            if not self._built:
+                return
+            previous = self._names.get(user_id)
+            if previous == username:
+                return
+            self._insert(user_id, username)
+            if previous is not None:
+                self._evict(previous)
+            self._evict(username)
+
+    def discard(self, db: Session, username: str) -> None:
+        """Drop ``username`` from the index after its user was deleted."""
+        lower = username.lower()
+        with self.lock:
+            self._bind_to(db)
+            pos = bisect.bisect_left(self._sorted, (lower,))
+            while pos < len(self._sorted) and self._sorted[pos][0] == lower:
+                user_id = self._sorted[pos][1]
+                if self._names.get(user_id) == username:
+                    self._remove(user_id)
+                    self._evict(username)
+                    return
+                pos += 1
+
+    # ------------------------------------------------------------------
+    # Queries
+    def search(self, db: Session, query: str, limit: int = Config.DEFAULT_LIMIT) -> List[Match]:
+        """Return up to ``limit`` ``(id, username)`` pairs best matching ``query``."""
+        query = query.strip().lower()
+        limit = max(1, min(int(limit), Config.MAX_LIMIT))
+        if not query:
+            return []
+        self.sync(db)
+        key = (query, limit)
+        with self.lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return list(cached)
+            results = self._rank(query, limit)
+            self._cache[key] = results
+            if len(self._cache) > Config.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return list(results)
+
+    def _rank(self, query: str, limit: int) -> List[Match]:
+        # Caller holds ``self.lock``
+        ranked: List[int] = []
+        seen: Set[int] = set()
+
+        def take(ids: Iterable[int]) -> None:
+            for user_id in ids:
+                if len(ranked) >= limit:
+                    return
+                if user_id not in seen:
+                    seen.add(user_id)
+                    ranked.append(user_id)
+
+        take(self._prefix(query))
+        if len(ranked) < limit and len(query) >= 3:
+            take(self._substring(query))
+        if len(ranked) < limit and len(query) >= 3:
+            take(self._fuzzy(query, seen))
+        return [(user_id, self._names[user_id]) for user_id in ranked]
+
+    def _prefix(self, query: str) -> List[int]:
+        pos = bisect.bisect_left(self._sorted, (query,))
+        end = min(len(self._sorted), pos + Config.CANDIDATE_LIMIT)
+        matches = []
+        for lower, user_id in self._sorted[pos:end]:
+            if not lower.startswith(query):
+                break
+            matches.append((len(lower), lower, user_id))
+        return [user_id for _, _, user_id in sorted(matches)]
+
+    def _substring(self, query: str) -> List[int]:
+        grams = {query[i:i + 3] for i in range(len(query) - 2)}
+        postings = sorted((self._postings.get(g, set()) for g in grams), key=len)
+        if not postings or not postings[0]:
+            return []
+        smallest, rest = postings[0], postings[1:]
+        matches = []
+        for user_id in smallest:
+            if all(user_id in p for p in rest):
+                lower = self._names[user_id].lower()
+                at = lower.find(query)
+                if at > 0:
+                    matches.append((at, len(lower), lower, user_id))
+                    if len(matches) >= Config.CANDIDATE_LIMIT:
+                        break
+        return [user_id for *_, user_id in sorted(matches)]
+
+    def _fuzzy(self, query: str, seen: Set[int]) -> List[int]:
+        grams = _query_trigrams(query)
+        counts: Dict[int, int] = {}
+        for gram in grams:
+            posting = self._postings.get(gram)
+            if posting and len(posting) <= Config.MAX_FUZZY_POSTING:
+                for user_id in posting:
+                    counts[user_id] = counts.get(user_id, 0) + 1
+        need = max(1, math.ceil(Config.MIN_TRIGRAM_OVERLAP * len(grams)))
+        max_edits = Config.MAX_EDITS if len(query) >= Config.LONG_QUERY else 1
+        matches = []
+        for user_id, shared in counts.items():
+            if shared < need or user_id in seen:
+                continue
+            lower = self._names[user_id].lower()
+            edits = _edit_distance(query, lower[: len(query)])
+            if edits <= max_edits:
+                matches.append((edits, -shared, len(lower), lower, user_id))
+        return [user_id for *_, user_id in sorted(matches)]
+
+
+_INDEX: Optional[UsernameIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_username_index() -> UsernameIndex:
+    """Return the process-wide :class:`UsernameIndex`."""
+    global _INDEX
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = UsernameIndex()
+        return _INDEX
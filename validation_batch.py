@@ -0,0 +1,326 @@
+"""
+validation_batch.py — Parse-once columnar view of validation records
+
+The integrity analyzers (diversity, reputation, temporal consistency and
+coordination) all walk the same validation dictionaries.  A
+:class:`ValidationBatch` parses them once into columns that every analyzer
+reads without re-parsing:
+
+- ``validator_id``, ``hypothesis_id``, ``specialty``, ``affiliation`` and
+  validator type interned into ``int32`` codes (``-1`` when missing or falsy)
+  over per-column value tables;
+- timestamps as ``int64`` microseconds since the Unix epoch (naive values are
+  taken as UTC) plus the original UTC offset, so wall-clock hours and ISO
+  strings can be recovered exactly;
+- ``float(v.get("score", 0.5))`` as a ``float64`` column with validity masks.
+
+Numeric columns can be placed in ``multiprocessing.shared_memory`` with
+:meth:`ValidationBatch.shared`; worker processes rebuild a read-only batch
+from the returned :class:`SharedBatch` handle via :func:`attach_batch`
+without re-parsing or receiving pickled column data.
+"""
+
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    from dateutil import parser
+except Exception:  # pragma: no cover - optional dependency may be missing
+    parser = None  # type: ignore[assignment]
+
+logger = logging.getLogger("superNova_2177.validation_batch")
+logger.propagate = False
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = _EPOCH.replace(tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+_US_PER_SECOND = 1_000_000
+_US_PER_HOUR = 3600 * _US_PER_SECOND
+
+# ``offset`` value for timestamps written without a UTC offset
+NAIVE = np.iinfo(np.int32).min
+
+CATEGORIES = ("validator", "hypothesis", "specialty", "affiliation", "validator_type")
+NUMERIC_COLUMNS = CATEGORIES + (
+    "micros",
+    "offset",
+    "has_timestamp",
+    "score",
+    "score_ok",
+    "score_given",
+)
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, returning ``None`` when it is unusable."""
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str) or not value or len(value) > 40:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        pass
+    if parser is not None:
+        try:
+            return parser.isoparse(value)
+        except (ValueError, OverflowError):
+            return None
+    return None
+
+
+def to_micros(ts: datetime) -> int:
+    """Exact integer microseconds since the epoch; naive values are UTC."""
+    if ts.tzinfo is None:
+        return (ts - _EPOCH) // _MICROSECOND
+    return (ts - _EPOCH_UTC) // _MICROSECOND
+
+
+def from_micros(micros: int, offset: int) -> datetime:
+    """Rebuild the parsed ``datetime``, including its UTC offset if it had one."""
+    if offset == NAIVE:
+        return _EPOCH + timedelta(microseconds=micros)
+    tz = timezone(timedelta(seconds=offset))
+    return (_EPOCH_UTC + timedelta(microseconds=micros)).astimezone(tz)
+
+
+class _Interner:
+    __slots__ = ("codes", "table")
+
+    def __init__(self) -> None:
+        self.codes: Dict[Any, int] = {}
+        self.table: List[Any] = []
+
+    def __call__(self, value: Any) -> int:
+        if not value:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.table)
+            self.table.append(value)
+        return code
+
+
+@dataclass(frozen=True)
+class SharedBatch:
+    """Picklable handle to a batch whose numeric columns live in shared memory."""
+
+    name: str
+    size: int
+    layout: Tuple[Tuple[str, str, int], ...]
+    tables: Dict[str, List[Any]]
+    notes: List[Any]
+    blank_validators: Dict[int, Any]
+
+
+@dataclass
+class ValidationBatch:
+    """Columnar validation records shared read-only by the integrity analyzers."""
+
+    size: int
+    columns: Dict[str, Any]
+    tables: Dict[str, List[Any]]
+    notes: List[Any] = field(default_factory=list)
+    invalid_timestamps: int = 0
+    # Rows whose ``validator_id`` key is present but falsy, with its raw value
+    blank_validators: Dict[int, Any] = field(default_factory=dict)
+    _notes_lower: Optional[List[str]] = field(default=None, repr=False)
+
+    @classmethod
+    def of(cls, validations: Union["ValidationBatch", Sequence[Dict[str, Any]]]) -> "ValidationBatch":
+        """Return ``validations`` as a batch, parsing it if necessary."""
+        if isinstance(validations, cls):
+            return validations
+        return cls.from_validations(validations or [])
+
+    @classmethod
+    def from_validations(cls, validations: Sequence[Dict[str, Any]]) -> "ValidationBatch":
+        n = len(validations)
+        interners = {name: _Interner() for name in CATEGORIES}
+        codes: Dict[str, List[int]] = {name: [] for name in CATEGORIES}
+        micros: List[int] = []
+        offset: List[int] = []
+        has_timestamp: List[bool] = []
+        score: List[float] = []
+        score_ok: List[bool] = []
+        score_given: List[bool] = []
+        notes: List[Any] = []
+        blank_validators: Dict[int, Any] = {}
+        parsed: Dict[str, Optional[Tuple[int, int]]] = {}
+        invalid = 0
+
+        for row, v in enumerate(validations):
+            validator = interners["validator"](v.get("validator_id"))
+            if validator < 0 and "validator_id" in v:
+                blank_validators[row] = v["validator_id"]
+            codes["validator"].append(validator)
+            codes["hypothesis"].append(interners["hypothesis"](v.get("hypothesis_id")))
+            codes["specialty"].append(interners["specialty"](v.get("specialty")))
+            codes["affiliation"].append(interners["affiliation"](v.get("affiliation")))
+            codes["validator_type"].append(
+                interners["validator_type"](v.get("validator_type") or v.get("type"))
+            )
+
+            raw_ts = v.get("timestamp")
+            if isinstance(raw_ts, str) and raw_ts in parsed:
+                stamp = parsed[raw_ts]
+            else:
+                stamp = None
+                ts = parse_timestamp(raw_ts)
+                if ts is not None:
+                    off = ts.utcoffset()
+                    stamp = (to_micros(ts), NAIVE if off is None else int(off.total_seconds()))
+                if isinstance(raw_ts, str):
+                    parsed[raw_ts] = stamp
+            has_timestamp.append(stamp is not None)
+            if stamp is None:
+                micros.append(0)
+                offset.append(NAIVE)
+                if raw_ts:
+                    invalid += 1
+            else:
+                micros.append(stamp[0])
+                offset.append(stamp[1])
+
+            score_given.append(v.get("score") is not None)
+            try:
+                score.append(float(v.get("score", 0.5)))
+                score_ok.append(True)
+            except (ValueError, TypeError):
+                score.append(float("nan"))
+                score_ok.append(False)
+
+            notes.append(v.get("note", ""))
+
+        if invalid:
+            logger.warning(f"{invalid} validations have unparseable timestamps")
+
+        columns: Dict[str, Any] = {
+            name: np.array(values, dtype=np.int32) for name, values in codes.items()
+        }
+        columns.update(
+            micros=np.array(micros, dtype=np.int64),
+            offset=np.array(offset, dtype=np.int32),
+            has_timestamp=np.array(has_timestamp, dtype=bool),
+            score=np.array(score, dtype=np.float64),
+            score_ok=np.array(score_ok, dtype=bool),
+            score_given=np.array(score_given, dtype=bool),
+        )
+        tables = {name: interners[name].table for name in CATEGORIES}
+        return cls(n, columns, tables, notes, invalid, blank_validators)
+
+    # ------------------------------------------------------------------
+    # Accessors
+    def __len__(self) -> int:
+        return self.size
+
+    def __getattr__(self, name: str) -> Any:
+        columns = self.__dict__.get("columns")
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    @property
+    def validators(self) -> List[Any]:
+        return self.tables["validator"]
+
+    @property
+    def hypotheses(self) -> List[Any]:
+        return self.tables["hypothesis"]
+
+    @property
+    def notes_lower(self) -> List[str]:
+        """``str(note).lower()`` per row, computed on first use."""
+        if self._notes_lower is None:
+            self._notes_lower = [str(note).lower() for note in self.notes]
+        return self._notes_lower
+
+    def hours(self) -> Any:
+        """Wall-clock hour of each timestamp in its own UTC offset."""
+        local = self.micros + np.where(
+            self.offset == NAIVE, 0, self.offset.astype(np.int64) * _US_PER_SECOND
+        )
+        return (local // _US_PER_HOUR) % 24
+
+    def group_rows(self, column: str, mask: Any = None) -> List[Tuple[int, Any]]:
+        """Group row indices by ``column`` code, in order of first appearance.
+
+        Rows with a missing code or excluded by the boolean ``mask`` are
+        skipped; each group's rows keep their original order.
+        """
+        codes = self.columns[column]
+        keep = codes >= 0 if mask is None else mask & (codes >= 0)
+        rows = np.flatnonzero(keep)
+        if not len(rows):
+            return []
+        order = np.argsort(codes[rows], kind="stable")
+        rows = rows[order]
+        sorted_codes = codes[rows]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        groups = np.split(rows, starts[1:])
+        groups.sort(key=lambda g: g[0])
+        return [(int(codes[g[0]]), g) for g in groups]
+
+    def validator_id(self, row: int, default: Any = None) -> Any:
+        """The row's raw ``validator_id``, or ``default`` if the key is absent."""
+        code = int(self.validator[row])
+        if code >= 0:
+            return self.validators[code]
+        return self.blank_validators.get(row, default)
+
+    def timestamp(self, row: int) -> datetime:
+        return from_micros(int(self.micros[row]), int(self.offset[row]))
+
+    # ------------------------------------------------------------------
+    # Shared memory
+    @contextmanager
+    def shared(self) -> Iterator[SharedBatch]:
+        """Copy the numeric columns into shared memory for worker processes."""
+        layout = []
+        position = 0
+        for name in NUMERIC_COLUMNS:
+            column = self.columns[name]
+            # Keep every column 8-byte aligned inside the block
+            position = -(-position // 8) * 8
+            layout.append((name, column.dtype.str, position))
+            position += column.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(position, 1))
+        try:
+            for name, dtype, start in layout:
+                view = np.ndarray(self.size, dtype=dtype, buffer=shm.buf, offset=start)
+                view[:] = self.columns[name]
+                del view
+            yield SharedBatch(
+                shm.name, self.size, tuple(layout), self.tables, self.notes, self.blank_validators
+            )
+        finally:
+            shm.close()
+            shm.unlink()
+
+
+@contextmanager
+def attach_batch(handle: SharedBatch) -> Iterator[ValidationBatch]:
+    """Rebuild a read-only :class:`ValidationBatch` over ``handle``'s memory."""
+    shm = shared_memory.SharedMemory(name=handle.name)
+    columns: Dict[str, Any] = {}
+    try:
+        for name, dtype, start in handle.layout:
+            view = np.ndarray(handle.size, dtype=dtype, buffer=shm.buf, offset=start)
+            view.flags.writeable = False
+            columns[name] = view
+        yield ValidationBatch(
+            handle.size,
+            columns,
+            handle.tables,
+            handle.notes,
+            blank_validators=handle.blank_validators,
+        )
+    finally:
+        columns.clear()
+        shm.close()
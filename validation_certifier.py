@@ -9,7 +9,10 @@ This is the primary interface for comprehensive validation analysis in superNova
 """
 
 import logging
-from typing import List, Dict, Any, Tuple
+import os
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, Tuple
 from datetime import datetime
 from statistics import mean
 
@@ -18,6 +21,7 @@ from diversity_analyzer import compute_diversity_score
 from validators.reputation_influence_tracker import compute_validator_reputations
 from network.network_coordination_detector import analyze_coordination_patterns
 from temporal_consistency_checker import analyze_temporal_consistency, assess_temporal_trust_factor
+from validation_batch import SharedBatch, ValidationBatch, attach_batch
 
 logger = logging.getLogger("superNova_2177.certifier")
 logger.propagate = False
@@ -54,6 +58,10 @@ class Config:
 
     MAX_NOTE_SCORE = 1.0
 
+    # Threads are the default; ``CERTIFIER_USE_PROCESS_POOL=1`` runs the
+    # analyzers in spawned processes over a shared-memory validation batch.
+    USE_PROCESS_POOL = os.environ.get("CERTIFIER_USE_PROCESS_POOL") == "1"
+
 def score_validation(val: Dict[str, Any]) -> float:
     """
     Score a single validation based on confidence, signal strength, and note sentiment.
@@ -159,6 +167,36 @@ def calculate_integrity_score(
     }
 
 
+def _run_shared(func: Callable[..., Any], handle: SharedBatch, *args: Any) -> Any:
+    """Process-pool entry point: run ``func`` on the batch behind ``handle``."""
+    with attach_batch(handle) as batch:
+        return func(batch, *args)
+
+
+def _run_analyzers(
+    submit: Callable[..., "Future[Any]"],
+    consensus_scores: Dict[str, float],
+) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """Fan the analyzers out through ``submit(func, *args)``."""
+    diversity_future = submit(compute_diversity_score)
+    coordination_future = submit(analyze_coordination_patterns)
+    reputation_future = submit(compute_validator_reputations, consensus_scores)
+
+    # Reputation is needed for temporal analysis
+    reputation_result = reputation_future.result()
+    temporal_future = submit(
+        analyze_temporal_consistency,
+        reputation_result.get("validator_reputations", {}),
+    )
+
+    return (
+        diversity_future.result(),
+        reputation_result,
+        temporal_future.result(),
+        coordination_future.result(),
+    )
+
+
 def run_full_integrity_analysis(
     validations: List[Dict[str, Any]],
     avg_score: float,
@@ -168,32 +206,25 @@ def run_full_integrity_analysis(
 
     consensus_scores = {"default_hypothesis": avg_score}
 
-    # Run diversity, coordination, and reputation analysis concurrently
-    import concurrent.futures
+    # Parse the records once; every analyzer reads the same columns
+    batch = ValidationBatch.of(validations)
 
-    with concurrent.futures.ThreadPoolExecutor() as executor:
-        diversity_future = executor.submit(compute_diversity_score, validations)
-        coordination_future = executor.submit(
-            analyze_coordination_patterns, validations
-        )
-        reputation_future = executor.submit(
-            compute_validator_reputations,
-            validations,
-            consensus_scores,
-        )
-
-        # Reputation is needed for temporal analysis
-        reputation_result = reputation_future.result()
-
-        temporal_future = executor.submit(
-            analyze_temporal_consistency,
-            validations,
-            reputation_result.get("validator_reputations", {}),
-        )
-
-        diversity_result = diversity_future.result()
-        coordination_result = coordination_future.result()
-        temporal_result = temporal_future.result()
+    # Run diversity, coordination, and reputation analysis concurrently
+    if Config.USE_PROCESS_POOL:
+        with batch.shared() as handle, ProcessPoolExecutor(
+            mp_context=get_context("spawn")
+        ) as executor:
+            results = _run_analyzers(
+                lambda func, *args: executor.submit(_run_shared, func, handle, *args),
+                consensus_scores,
+            )
+    else:
+        with ThreadPoolExecutor() as executor:
+            results = _run_analyzers(
+                lambda func, *args: executor.submit(func, batch, *args),
+                consensus_scores,
+            )
+    diversity_result, reputation_result, temporal_result, coordination_result = results
 
     integrity_analysis = calculate_integrity_score(
         diversity_result,
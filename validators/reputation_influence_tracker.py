@@ -9,14 +9,19 @@ Used in superNova_2177 to weight validations and detect manipulation.
 """
 
 import logging
-from typing import List, Dict, Any, Optional
-from collections import defaultdict
+from typing import List, Dict, Any, Optional, Union
 from statistics import mean, stdev
 from datetime import datetime
 
+import numpy as np
+
+from validation_batch import ValidationBatch, to_micros
+
 logger = logging.getLogger("superNova_2177.reputation")
 logger.propagate = False
 
+_US_PER_DAY = 86_400 * 1_000_000
+
 class Config:
     DEFAULT_REPUTATION = 0.5
     MAX_REPUTATION = 1.0
@@ -39,7 +44,7 @@ class Config:
     DECAY_HALF_LIFE_DAYS = 90
 
 def compute_validator_reputations(
-    all_validations: List[Dict[str, Any]],
+    all_validations: Union[List[Dict[str, Any]], ValidationBatch],
     consensus_scores: Dict[str, float],
     temporal_trust: Optional[Dict[str, float]] = None,
     diversity_scores: Optional[Dict[str, float]] = None,
@@ -51,7 +56,8 @@ def compute_validator_reputations(
     Compute reputation scores for each validator based on their validation patterns.
 
     Args:
-        all_validations: List of validations across multiple hypotheses
+        all_validations: List of validations across multiple hypotheses, or
+            an already parsed ``ValidationBatch``
         consensus_scores: Average score per hypothesis_id
         temporal_trust: Optional trust factors for validators (0.0-1.0)
         diversity_scores: Optional diversity contributions per validator (0.0-1.0)
@@ -64,7 +70,8 @@ def compute_validator_reputations(
         - flags: List of suspicious behavior patterns
         - stats: Summary statistics
     """
-    if not all_validations:
+    batch = ValidationBatch.of(all_validations)
+    if not batch.size:
         logger.warning("No validations provided for reputation computation")
         return {
             "validator_reputations": {},
@@ -87,41 +94,32 @@ def compute_validator_reputations(
     if half_life <= 0:
         half_life = Config.DECAY_HALF_LIFE_DAYS
 
-    validator_scores = defaultdict(list)
-    validator_deviations = defaultdict(list)
-    last_timestamps: Dict[str, datetime] = {}
-
-    for v in all_validations:
-        try:
-            validator = v.get("validator_id")
-            hypothesis = v.get("hypothesis_id")
-            val_score = float(v.get("score", 0.5))
-            timestamp_str = v.get("timestamp")
-
-            if not validator or not hypothesis:
-                continue
-
-            consensus = consensus_scores.get(hypothesis)
-            if consensus is None:
-                continue
-
-            deviation = abs(val_score - consensus)
-            agreement_score = max(0.0, 1.0 - deviation)
-
-            validator_scores[validator].append(agreement_score)
-            validator_deviations[validator].append(deviation)
-            if timestamp_str:
-                try:
-                    ts = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                    prev = last_timestamps.get(validator)
-                    if not prev or ts > prev:
-                        last_timestamps[validator] = ts
-                except Exception as e:
-                    logger.warning(f"Invalid timestamp for validator {validator}: {e}")
-
-        except (ValueError, TypeError) as e:
-            logger.warning(f"Invalid validation data: {v} - {e}")
-            continue
+    # Agreement with the hypothesis consensus, computed over whole columns
+    consensus_by_code = np.array(
+        [
+            np.nan if consensus_scores.get(h) is None else float(consensus_scores[h])
+            for h in batch.hypotheses
+        ],
+        dtype=np.float64,
+    )
+    usable = batch.score_ok & (batch.hypothesis >= 0)
+    consensus = np.full(batch.size, np.nan)
+    consensus[usable] = consensus_by_code[batch.hypothesis[usable]]
+    usable &= ~np.isnan(consensus)
+    deviation = np.abs(batch.score - consensus)
+    agreement = np.where(1.0 - deviation > 0.0, 1.0 - deviation, 0.0)
+
+    validator_scores: Dict[str, List[float]] = {}
+    validator_deviations: Dict[str, List[float]] = {}
+    last_timestamps: Dict[str, int] = {}
+    for code, rows in batch.group_rows("validator", usable):
+        validator = batch.validators[code]
+        validator_scores[validator] = agreement[rows].tolist()
+        validator_deviations[validator] = deviation[rows].tolist()
+        stamped = rows[batch.has_timestamp[rows]]
+        if len(stamped):
+            last_timestamps[validator] = int(batch.micros[stamped].max())
+    current_micros = to_micros(current_time)
 
     reputations = {}
     flags = []
@@ -145,8 +143,8 @@ def compute_validator_reputations(
             final_reputation = max(Config.MIN_REPUTATION, min(Config.MAX_REPUTATION, reputation))
 
             ts = last_timestamps.get(validator)
-            if ts:
-                age_days = (current_time - ts).days
+            if ts is not None:
+                age_days = (current_micros - ts) // _US_PER_DAY
                 decay_factor = 0.5 ** (age_days / half_life)
                 final_reputation *= decay_factor
 
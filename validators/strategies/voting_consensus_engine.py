@@ -9,13 +9,15 @@ Used in superNova_2177 to formalize multi-validator decision making.
 """
 
 import logging
-from typing import List, Dict, Any, Optional
-from collections import Counter, defaultdict
+from typing import Callable, List, Dict, Any, Optional, Tuple
+from collections import Counter
+from functools import cached_property
 from statistics import mean
-from math import sqrt
 from enum import Enum
 from datetime import datetime
 
+import numpy as np
+
 logger = logging.getLogger("superNova_2177.voting")
 logger.propagate = False
 
@@ -92,73 +94,91 @@ def aggregate_validator_votes(
     if not votes:
         return _empty_consensus_result("no_votes")
 
-    # Validate inputs
-    reputations = reputations or {}
-    temporal_trust = temporal_trust or {}
-    diversity_score = diversity_score or 0.0
-    current_time = current_time or datetime.utcnow()
-
-    # Filter valid votes
-    valid_votes = []
-    for vote in votes:
-        validator_id = vote.get("validator_id")
-        if not validator_id:
-            continue
+    packer = _VotePacker(reputations, temporal_trust, current_time)
+    return _aggregate_packed(
+        packer.pack(votes),
+        len(votes),
+        method,
+        diversity_score or 0.0,
+        cross_validation_history,
+    )
+
+
+def aggregate_vote_sets(
+    vote_sets: Dict[str, List[Dict[str, Any]]],
+    method: VotingMethod = VotingMethod.REPUTATION_WEIGHTED,
+    reputations: Optional[Dict[str, float]] = None,
+    diversity_scores: Optional[Dict[str, float]] = None,
+    temporal_trust: Optional[Dict[str, float]] = None,
+    *,
+    current_time: Optional[datetime] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Aggregate the vote sets of many hypotheses in one call.
+
+    Validator lookups and timestamp decay are computed once and shared by
+    every set; each set is then aggregated exactly as
+    :func:`aggregate_validator_votes` would.
 
-        # Check minimum reputation threshold
-        reputation = reputations.get(validator_id, 0.5)
-        if reputation < Config.MIN_REPUTATION_FOR_VOTE:
+    Args:
+        vote_sets: Mapping of hypothesis id to its list of votes
+        method: Voting aggregation method to use for every set
+        reputations: Optional reputation scores per validator
+        diversity_scores: Optional diversity score per hypothesis id
+        temporal_trust: Optional temporal trust scores per validator
+        current_time: Optional datetime for time-decay calculations
+
+    Returns:
+        Dict mapping each hypothesis id to its consensus result
+    """
+    packer = _VotePacker(reputations, temporal_trust, current_time)
+    diversity_scores = diversity_scores or {}
+    results: Dict[str, Dict[str, Any]] = {}
+    for key, votes in vote_sets.items():
+        if not votes:
+            results[key] = _empty_consensus_result("no_votes")
             continue
+        results[key] = _aggregate_packed(
+            packer.pack(votes),
+            len(votes),
+            method,
+            diversity_scores.get(key) or 0.0,
+            None,
+        )
+    return results
 
-        valid_votes.append(vote)
 
-    if len(valid_votes) < Config.MIN_VALIDATORS_FOR_CONSENSUS:
+def _aggregate_packed(
+    packed: Optional["_PackedVotes"],
+    total_votes: int,
+    method: VotingMethod,
+    diversity_score: float,
+    cross_validation_history: Optional[List[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Run the selected strategy over packed votes and attach metadata."""
+    if packed is None or not packed.size:
         return _empty_consensus_result("insufficient_quorum")
 
-    # Apply delegation before processing
-    valid_votes, reputations = _apply_delegation(valid_votes, reputations)
-
     # Check diversity and temporal requirements
     flags = []
     if diversity_score < Config.MIN_DIVERSITY_SCORE:
         flags.append("low_diversity_warning")
 
-    avg_temporal_trust = mean(
-        temporal_trust.get(v.get("validator_id"), 0.5) for v in valid_votes
-    )
+    avg_temporal_trust = float(packed.temporal.mean())
     if avg_temporal_trust < Config.MIN_TEMPORAL_TRUST:
         flags.append("low_temporal_trust")
 
     # Route to appropriate aggregation method
-    if method == VotingMethod.WEIGHTED_AVERAGE:
-        result = _weighted_average_consensus(valid_votes, reputations, current_time=current_time)
-    elif method == VotingMethod.MAJORITY_RULE:
-        result = _majority_rule_consensus(valid_votes, reputations, current_time=current_time)
-    elif method == VotingMethod.SUPERMAJORITY:
-        result = _supermajority_consensus(valid_votes, reputations, current_time=current_time)
-    elif method == VotingMethod.CONSENSUS_THRESHOLD:
-        result = _consensus_threshold_vote(valid_votes, reputations, current_time=current_time)
-    elif method == VotingMethod.RANKED_CHOICE:
-        result = _ranked_choice_consensus(valid_votes, reputations, current_time=current_time)
-    elif method == VotingMethod.QUADRATIC:
-        result = _quadratic_voting_consensus(valid_votes, reputations, current_time=current_time)
-    elif method == VotingMethod.REPUTATION_WEIGHTED:
-        result = _reputation_weighted_consensus(
-            valid_votes, reputations, temporal_trust, current_time=current_time
-        )
-    else:
-        result = _reputation_weighted_consensus(
-            valid_votes, reputations, temporal_trust, current_time=current_time
-        )
+    strategy = _STRATEGIES.get(method, _reputation_weighted_consensus)
+    result = strategy(packed)
 
     # Add metadata
     result.update(
         {
             "voting_method": method.value,
-            "total_validators": len(votes),
-            "valid_votes": len(valid_votes),
-            "quorum_met": len(valid_votes)
-            >= Config.MIN_VALIDATORS_FOR_CONSENSUS,
+            "total_validators": total_votes,
+            "valid_votes": packed.size,
+            "quorum_met": packed.size >= Config.MIN_VALIDATORS_FOR_CONSENSUS,
             "diversity_score": diversity_score,
             "flags": flags,
         }
@@ -182,38 +202,228 @@ def aggregate_validator_votes(
     return result
 
 
-def _weighted_average_consensus(
-    votes: List[Dict[str, Any]],
-    reputations: Dict[str, float],
-    *,
-    current_time: datetime,
-) -> Dict[str, Any]:
-    """Simple weighted average of numerical scores."""
-    weighted_sum = 0.0
-    total_weight = 0.0
-    confidences = []
-
-    for vote in votes:
-        validator_id = vote.get("validator_id")
-        score = float(vote.get("score", 0.5))
-        confidence = float(vote.get("confidence", 0.5))
-
-        weight = reputations.get(validator_id, 0.5)
-        weight = min(
-            weight * Config.MAX_REPUTATION_WEIGHT,
-            Config.MAX_REPUTATION_WEIGHT,
-        )
-        weight *= _time_decay_factor(
-            vote.get("timestamp"), current_time, Config.VOTE_DECAY_HALF_LIFE_DAYS
+class _Interner:
+    """Map hashable values to dense codes in order of first appearance."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self) -> None:
+        self.codes: Dict[Any, int] = {}
+        self.values: List[Any] = []
+
+    def __call__(self, value: Any) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class _PackedVotes:
+    """Columns of the votes that survived filtering and delegation.
+
+    ``reputation`` already includes delegated weight.  Scores, confidences
+    and credits are parsed on first use so a strategy that does not read
+    them never fails on malformed values.
+    """
+
+    def __init__(
+        self,
+        votes: List[Dict[str, Any]],
+        reputation: np.ndarray,
+        temporal: np.ndarray,
+        decay: np.ndarray,
+        decision: np.ndarray,
+        decisions: List[Any],
+    ) -> None:
+        self.votes = votes
+        self.size = len(votes)
+        self.reputation = reputation
+        self.temporal = temporal
+        self.decay = decay
+        self.decision = decision
+        self.decisions = decisions
+
+    def _floats(self, key: str, default: Any) -> np.ndarray:
+        return np.array([float(v.get(key, default)) for v in self.votes], dtype=float)
+
+    @cached_property
+    def score(self) -> np.ndarray:
+        return self._floats("score", 0.5)
+
+    @cached_property
+    def confidence(self) -> np.ndarray:
+        return self._floats("confidence", 0.5)
+
+    @cached_property
+    def credits(self) -> np.ndarray:
+        return self._floats("credits", 1)
+
+
+class _VotePacker:
+    """Pack vote lists into :class:`_PackedVotes`, sharing lookups across calls.
+
+    Validator reputations and temporal trust are looked up once per
+    validator, and each distinct timestamp is parsed and decayed once.
+    """
+
+    def __init__(
+        self,
+        reputations: Optional[Dict[str, float]],
+        temporal_trust: Optional[Dict[str, float]],
+        current_time: Optional[datetime],
+    ) -> None:
+        self.reputations = reputations or {}
+        self.temporal_trust = temporal_trust or {}
+        self.current_time = current_time or datetime.utcnow()
+        self._validators = _Interner()
+        self._reputation: List[float] = []
+        self._temporal: List[float] = []
+        self._arrays: Tuple[np.ndarray, np.ndarray] = (np.empty(0), np.empty(0))
+        self._decay: Dict[str, float] = {}
+
+    def _validator(self, validator_id: Any) -> int:
+        code = self._validators(validator_id)
+        if code == len(self._reputation):
+            self._reputation.append(self.reputations.get(validator_id, 0.5))
+            self._temporal.append(self.temporal_trust.get(validator_id, 0.5))
+        return code
+
+    def _validator_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        if len(self._arrays[0]) != len(self._reputation):
+            self._arrays = (
+                np.array(self._reputation, dtype=float),
+                np.array(self._temporal, dtype=float),
+            )
+        return self._arrays
+
+    def _decay_factor(self, timestamp: Any) -> float:
+        factor = _time_decay_factor(timestamp, self.current_time, Config.VOTE_DECAY_HALF_LIFE_DAYS)
+        if isinstance(timestamp, str):
+            self._decay[timestamp] = factor
+        return factor
+
+    def pack(self, votes: List[Dict[str, Any]]) -> Optional[_PackedVotes]:
+        """Filter, resolve delegation and pack ``votes``.
+
+        Returns ``None`` when fewer than ``MIN_VALIDATORS_FOR_CONSENSUS``
+        votes pass the validator and reputation filters.
+        """
+        reputation = self._reputation
+        known = self._validators.codes.get
+        known_decay = self._decay.get
+        minimum = Config.MIN_REPUTATION_FOR_VOTE
+        eligible = 0
+        kept: List[Dict[str, Any]] = []
+        codes: List[int] = []
+        decay: List[float] = []
+        decision_codes: List[int] = []
+        decisions: Dict[Any, int] = {}
+        delegations: List[Tuple[int, Any]] = []
+
+        for vote in votes:
+            validator_id = vote.get("validator_id")
+            if not validator_id:
+                continue
+            code = known(validator_id)
+            if code is None:
+                code = self._validator(validator_id)
+            # Check minimum reputation threshold
+            if reputation[code] < minimum:
+                continue
+            eligible += 1
+
+            delegate_to = vote.get("delegate_to")
+            if delegate_to:
+                delegations.append((code, delegate_to))
+                continue
+
+            kept.append(vote)
+            codes.append(code)
+            timestamp = vote.get("timestamp")
+            factor = known_decay(timestamp) if isinstance(timestamp, str) else None
+            decay.append(self._decay_factor(timestamp) if factor is None else factor)
+            decision = vote.get("decision", "abstain")
+            index = decisions.get(decision)
+            if index is None:
+                index = decisions[decision] = len(decisions)
+            decision_codes.append(index)
+
+        if eligible < Config.MIN_VALIDATORS_FOR_CONSENSUS:
+            return None
+
+        delegated = self._resolve_delegation(delegations) if delegations else {}
+        reputations, temporal = self._validator_arrays()
+        code_array = np.array(codes, dtype=np.int64)
+        vote_reputation = reputations[code_array]
+        for index, code in enumerate(codes):
+            if code in delegated:
+                vote_reputation[index] = delegated[code]
+        return _PackedVotes(
+            kept,
+            vote_reputation,
+            temporal[code_array],
+            np.array(decay, dtype=float),
+            np.array(decision_codes, dtype=np.int64),
+            list(decisions),
         )
 
-        weighted_sum += score * weight
-        total_weight += weight
-        confidences.append(confidence * weight)
+    def _resolve_delegation(self, delegations: List[Tuple[int, Any]]) -> Dict[int, float]:
+        """Move delegated weight to the end of each delegation chain.
+
+        Delegations form parent pointers between validators; a union-find
+        ``find`` with path compression maps every delegate to the validator
+        that actually votes at the end of its chain.  Each delegating vote
+        adds its validator's reputation there and is dropped.  Weight caught
+        in a delegation cycle is discarded.
+        """
+        parent: Dict[int, int] = {}
+        targets: List[Tuple[int, int]] = []
+        for code, delegate_to in delegations:
+            target = self._validator(delegate_to)
+            parent.setdefault(code, target)
+            targets.append((code, target))
+
+        root: Dict[int, int] = {}
+
+        def find(node: int) -> int:
+            path = []
+            seen = set()
+            while node in parent and node not in root:
+                if node in seen:
+                    node = -1  # cycle: nobody at the end of the chain
+                    break
+                seen.add(node)
+                path.append(node)
+                node = parent[node]
+            found = root.get(node, node)
+            for step in path:
+                root[step] = found
+            return found
+
+        weights: Dict[int, float] = {}
+        for code, target in targets:
+            final = find(target)
+            if final < 0:
+                continue
+            base = weights.get(final, self._reputation[final])
+            weights[final] = base + self._reputation[code]
+        return weights
+
+
+def _weighted_average_consensus(votes: _PackedVotes) -> Dict[str, Any]:
+    """Simple weighted average of numerical scores."""
+    weights = (
+        np.minimum(votes.reputation * Config.MAX_REPUTATION_WEIGHT, Config.MAX_REPUTATION_WEIGHT)
+        * votes.decay
+    )
+    total_weight = float(weights.sum())
+    weighted_sum = float((votes.score * weights).sum())
+    weighted_confidence = float((votes.confidence * weights).sum())
 
     consensus_score = weighted_sum / total_weight if total_weight > 0 else 0.0
     consensus_confidence = (
-        sum(confidences) / total_weight if total_weight > 0 else 0.0
+        weighted_confidence / total_weight if total_weight > 0 else 0.0
     )
 
     return {
@@ -222,43 +432,25 @@ def _weighted_average_consensus(
         "vote_breakdown": {
             "method": "weighted_average",
             "total_weight": round(total_weight, 3),
-            "raw_average": round(
-                mean([float(v.get("score", 0.5)) for v in votes]), 3
-            ),
+            "raw_average": round(float(votes.score.mean()), 3),
         },
     }
 
 
-def _majority_rule_consensus(
-    votes: List[Dict[str, Any]],
-    reputations: Dict[str, float],
-    *,
-    current_time: datetime,
-) -> Dict[str, Any]:
+def _majority_rule_consensus(votes: _PackedVotes) -> Dict[str, Any]:
     """Majority rule with reputation-weighted vote counting."""
-    decisions = []
-    total_weight = 0.0
-
-    for vote in votes:
-        validator_id = vote.get("validator_id")
-        decision = vote.get("decision", "abstain")
-        weight = reputations.get(validator_id, 0.5)
-        decay = _time_decay_factor(
-            vote.get("timestamp"), current_time, Config.VOTE_DECAY_HALF_LIFE_DAYS
-        )
-        weight *= decay
-
-        decisions.extend([decision] * max(1, int(weight * 10)))  # Weight by reputation
-        total_weight += weight
-
-    if not decisions:
+    if not votes.size:
         return _empty_consensus_result("no_valid_decisions")
 
-    decision_counts = Counter(decisions)
-    winning_decision = decision_counts.most_common(1)[0][0]
-    winning_count = decision_counts[winning_decision]
+    # Each vote counts int(weight * 10) times, at least once
+    weights = votes.reputation * votes.decay
+    counts = np.maximum(1, (weights * 10).astype(np.int64))
+    tally = np.bincount(votes.decision, weights=counts, minlength=len(votes.decisions))
 
-    confidence = winning_count / len(decisions)
+    # ``argmax`` keeps the first decision seen among ties, like Counter
+    winner = int(tally.argmax())
+    winning_decision = votes.decisions[winner]
+    confidence = float(tally[winner] / tally.sum())
     meets_majority = confidence >= Config.MAJORITY_THRESHOLD
 
     return {
@@ -268,21 +460,18 @@ def _majority_rule_consensus(
         "consensus_confidence": round(confidence, 3),
         "vote_breakdown": {
             "method": "majority_rule",
-            "decision_counts": dict(decision_counts),
+            "decision_counts": {
+                decision: int(count) for decision, count in zip(votes.decisions, tally)
+            },
             "majority_threshold": Config.MAJORITY_THRESHOLD,
             "meets_threshold": meets_majority,
         },
     }
 
 
-def _supermajority_consensus(
-    votes: List[Dict[str, Any]],
-    reputations: Dict[str, float],
-    *,
-    current_time: datetime,
-) -> Dict[str, Any]:
+def _supermajority_consensus(votes: _PackedVotes) -> Dict[str, Any]:
     """Supermajority rule (2/3+) with reputation weighting."""
-    result = _majority_rule_consensus(votes, reputations, current_time=current_time)
+    result = _majority_rule_consensus(votes)
 
     confidence = result["consensus_confidence"]
     meets_supermajority = confidence >= Config.SUPERMAJORITY_THRESHOLD
@@ -306,14 +495,9 @@ def _supermajority_consensus(
     return result
 
 
-def _consensus_threshold_vote(
-    votes: List[Dict[str, Any]],
-    reputations: Dict[str, float],
-    *,
-    current_time: datetime,
-) -> Dict[str, Any]:
+def _consensus_threshold_vote(votes: _PackedVotes) -> Dict[str, Any]:
     """High consensus threshold (80%+) for critical decisions."""
-    result = _majority_rule_consensus(votes, reputations, current_time=current_time)
+    result = _majority_rule_consensus(votes)
 
     confidence = result["consensus_confidence"]
     meets_consensus = confidence >= Config.CONSENSUS_THRESHOLD
@@ -337,47 +521,27 @@ def _consensus_threshold_vote(
     return result
 
 
-def _reputation_weighted_consensus(
-    votes: List[Dict[str, Any]],
-    reputations: Dict[str, float],
-    temporal_trust: Dict[str, float],
-    *,
-    current_time: datetime,
-) -> Dict[str, Any]:
+def _reputation_weighted_consensus(votes: _PackedVotes) -> Dict[str, Any]:
     """Advanced consensus using reputation and temporal trust weighting."""
-    weighted_scores = []
-    total_weight = 0.0
-    decision_weights = defaultdict(float)
-
-    for vote in votes:
-        validator_id = vote.get("validator_id")
-        score = float(vote.get("score", 0.5))
-        decision = vote.get("decision", "abstain")
-        confidence = float(vote.get("confidence", 0.5))
-
-        # Combine reputation and temporal trust
-        reputation = reputations.get(validator_id, 0.5)
-        temporal = temporal_trust.get(validator_id, 0.5)
-        decay = _time_decay_factor(
-            vote.get("timestamp"), current_time, Config.VOTE_DECAY_HALF_LIFE_DAYS
-        )
-        combined_weight = (reputation * 0.7 + temporal * 0.3) * confidence * decay
-
-        weighted_scores.append(score * combined_weight)
-        decision_weights[decision] += combined_weight
-        total_weight += combined_weight
+    # Combine reputation and temporal trust
+    combined = (
+        (votes.reputation * 0.7 + votes.temporal * 0.3) * votes.confidence * votes.decay
+    )
+    total_weight = float(combined.sum())
+    decision_weights = np.bincount(
+        votes.decision, weights=combined, minlength=len(votes.decisions)
+    )
 
     # Calculate consensus score
     consensus_score = (
-        sum(weighted_scores) / total_weight if total_weight > 0 else 0.0
+        float((votes.score * combined).sum()) / total_weight if total_weight > 0 else 0.0
     )
 
     # Find consensus decision
-    if decision_weights:
-        consensus_decision = max(decision_weights, key=decision_weights.get)
-        decision_confidence = (
-            decision_weights[consensus_decision] / total_weight
-        )
+    if votes.decisions:
+        top = int(decision_weights.argmax())
+        consensus_decision = votes.decisions[top]
+        decision_confidence = float(decision_weights[top]) / total_weight
     else:
         consensus_decision = "no_decision"
         decision_confidence = 0.0
@@ -389,93 +553,102 @@ def _reputation_weighted_consensus(
             "method": "reputation_weighted",
             "total_weight": round(total_weight, 3),
             "decision_weights": {
-                k: round(v, 3) for k, v in decision_weights.items()
+                k: round(float(v), 3) for k, v in zip(votes.decisions, decision_weights)
             },
             "top_decision": consensus_decision,
         },
     }
 
 
-def _ranked_choice_consensus(
-    votes: List[Dict[str, Any]],
-    reputations: Dict[str, float],
-    *,
-    current_time: datetime,
-) -> Dict[str, Any]:
+def _ranked_choice_consensus(votes: _PackedVotes) -> Dict[str, Any]:
     """Ranked choice voting using Borda count."""
-    ranking_scores = defaultdict(float)
-    total_points = 0.0
-    for vote in votes:
+    choices = _Interner()
+    choice_codes: List[int] = []
+    points: List[int] = []
+    owners: List[int] = []
+    for index, vote in enumerate(votes.votes):
         ranking = vote.get("ranking")
-        validator_id = vote.get("validator_id")
         if not ranking or not isinstance(ranking, list):
             continue
-        weight = reputations.get(validator_id, 0.5)
-        weight *= _time_decay_factor(
-            vote.get("timestamp"), current_time, Config.VOTE_DECAY_HALF_LIFE_DAYS
-        )
         n = len(ranking)
         for i, choice in enumerate(ranking):
-            points = n - i
-            ranking_scores[choice] += points * weight
-            total_points += points * weight
+            choice_codes.append(choices(choice))
+            points.append(n - i)
+            owners.append(index)
 
-    if not ranking_scores:
+    if not choice_codes:
         return _empty_consensus_result("no_valid_rankings")
 
-    winner = max(ranking_scores, key=ranking_scores.get)
-    confidence = ranking_scores[winner] / total_points if total_points else 0.0
+    weights = votes.reputation * votes.decay
+    contributions = np.asarray(points, dtype=float) * weights[np.asarray(owners)]
+    ranking_scores = np.bincount(choice_codes, weights=contributions)
+    total_points = float(contributions.sum())
+
+    top = int(ranking_scores.argmax())
+    confidence = float(ranking_scores[top]) / total_points if total_points else 0.0
 
     return {
-        "consensus_decision": winner,
+        "consensus_decision": choices.values[top],
         "consensus_confidence": round(confidence, 3),
         "vote_breakdown": {
             "method": "ranked_choice",
-            "ranking_scores": {k: round(v, 3) for k, v in ranking_scores.items()},
+            "ranking_scores": {
+                k: round(float(v), 3) for k, v in zip(choices.values, ranking_scores)
+            },
         },
     }
 
 
-def _quadratic_voting_consensus(
-    votes: List[Dict[str, Any]],
-    reputations: Dict[str, float],
-    *,
-    current_time: datetime,
-) -> Dict[str, Any]:
+def _quadratic_voting_consensus(votes: _PackedVotes) -> Dict[str, Any]:
     """Quadratic voting where credits translate to sqrt-weighted votes."""
-    decision_weights = defaultdict(float)
-    total_weight = 0.0
-    for vote in votes:
-        validator_id = vote.get("validator_id")
-        decision = vote.get("decision")
-        credits = float(vote.get("credits", 1))
-        if not decision:
-            continue
-        weight = reputations.get(validator_id, 0.5) * sqrt(max(0.0, credits))
-        weight *= _time_decay_factor(
-            vote.get("timestamp"), current_time, Config.VOTE_DECAY_HALF_LIFE_DAYS
-        )
-        decision_weights[decision] += weight
-        total_weight += weight
-
-    if not decision_weights:
+    credits = votes.credits
+    decisions = _Interner()
+    codes = np.fromiter(
+        (decisions(d) if d else -1 for d in (v.get("decision") for v in votes.votes)),
+        dtype=np.int64,
+        count=votes.size,
+    )
+    cast = codes >= 0
+    if not cast.any():
         return _empty_consensus_result("no_valid_decisions")
 
-    winner = max(decision_weights, key=decision_weights.get)
-    confidence = decision_weights[winner] / total_weight if total_weight else 0.0
+    # ``credits > 0`` also maps NaN to zero, as ``max(0.0, credits)`` does
+    weights = (
+        votes.reputation[cast]
+        * np.sqrt(np.where(credits[cast] > 0, credits[cast], 0.0))
+        * votes.decay[cast]
+    )
+    decision_weights = np.bincount(codes[cast], weights=weights)
+    total_weight = float(weights.sum())
+
+    top = int(decision_weights.argmax())
+    confidence = float(decision_weights[top]) / total_weight if total_weight else 0.0
     meets_majority = confidence >= Config.MAJORITY_THRESHOLD
 
     return {
-        "consensus_decision": winner if meets_majority else "no_consensus",
+        "consensus_decision": decisions.values[top] if meets_majority else "no_consensus",
         "consensus_confidence": round(confidence, 3),
         "vote_breakdown": {
             "method": "quadratic",
-            "decision_weights": {k: round(v, 3) for k, v in decision_weights.items()},
+            "decision_weights": {
+                k: round(float(v), 3) for k, v in zip(decisions.values, decision_weights)
+            },
             "meets_threshold": meets_majority,
         },
     }
 
 
+_STRATEGIES: Dict[VotingMethod, Callable[[_PackedVotes], Dict[str, Any]]] = {
+    VotingMethod.WEIGHTED_AVERAGE: _weighted_average_consensus,
+    VotingMethod.MAJORITY_RULE: _majority_rule_consensus,
+    VotingMethod.SUPERMAJORITY: _supermajority_consensus,
+    VotingMethod.CONSENSUS_THRESHOLD: _consensus_threshold_vote,
+    VotingMethod.RANKED_CHOICE: _ranked_choice_consensus,
+    VotingMethod.QUADRATIC: _quadratic_voting_consensus,
+    VotingMethod.REPUTATION_WEIGHTED: _reputation_weighted_consensus,
+}
+
+
 def _empty_consensus_result(reason: str) -> Dict[str, Any]:
     """Return empty consensus result with specified reason."""
     return {
@@ -504,24 +677,6 @@ def _time_decay_factor(
         return 1.0
 
 
-def _apply_delegation(
-    votes: List[Dict[str, Any]],
-    reputations: Dict[str, float],
-) -> (List[Dict[str, Any]], Dict[str, float]):
-    """Aggregate delegate weights into delegatee reputations."""
-    updated_reps = reputations.copy()
-    filtered_votes = []
-    for v in votes:
-        delegate_to = v.get("delegate_to")
-        vid = v.get("validator_id")
-        if delegate_to:
-            weight = reputations.get(vid, 0.5)
-            updated_reps[delegate_to] = updated_reps.get(delegate_to, 0.5) + weight
-        else:
-            filtered_votes.append(v)
-    return filtered_votes, updated_reps
-
-
 def _update_cross_validation_history(
     history: List[Dict[str, Any]], result: Dict[str, Any]
 ) -> Dict[str, Any]:
@@ -1,16 +1,17 @@
 """Minimal virtual diary interface.
 
-Diary entries are stored as dictionaries in ``virtual_diary.json``. Each entry
-may contain a ``timestamp`` and free form ``note`` text.  The optional
-``rfc_ids`` field stores a list of referenced RFC identifiers.  This module only
-provides a lightweight loader used by the tests and the Streamlit UI.
+Diary entries are dictionaries stored one per line in ``virtual_diary.jsonl``
+(see :mod:`virtual_diary.store`). Each entry may contain a ``timestamp`` and
+free form ``note`` text.  The optional ``rfc_ids`` field stores a list of
+referenced RFC identifiers.  An existing ``virtual_diary.json`` list is
+migrated on first use.  Set ``VIRTUAL_DIARY_FILE`` to choose another path.
 """
 
-import json
 import logging
-import os
 from typing import Any, Dict, List
 
+from .store import get_diary_store
+
 logger = logging.getLogger(__name__)
 logger.propagate = False
 
@@ -23,32 +24,25 @@ def load_entries(limit: int = 20) -> List[Dict[str, Any]]:
     limit:
         Maximum number of entries to return.
     """
-    path = os.environ.get("VIRTUAL_DIARY_FILE", "virtual_diary.json")
     try:
-        with open(path, "r") as f:
-            data = json.load(f)
-        if isinstance(data, list):
-            return data[-limit:]
+        return get_diary_store().tail(limit)
     except Exception:
         logger.exception("Failed to load virtual diary")
     return []
 
-__all__ = ["load_entries"]
+__all__ = ["load_entries", "add_entry", "flush_entries"]
 
 def add_entry(entry: Dict[str, Any]) -> None:
-    """Append ``entry`` to the virtual diary file."""
-    path = os.environ.get("VIRTUAL_DIARY_FILE", "virtual_diary.json")
+    """Append ``entry`` to the virtual diary; it is written in the background."""
     try:
-        data: List[Dict[str, Any]] = []
-        if os.path.exists(path):
-            with open(path, "r") as f:
-                loaded = json.load(f)
-                if isinstance(loaded, list):
-                    data = loaded
-        data.append(entry)
-        with open(path, "w") as f:
-            json.dump(data, f, default=str)
+        get_diary_store().append(entry)
     except Exception:
         logger.exception("Failed to update virtual diary")
 
 
+def flush_entries() -> None:
+    """Write any entries still queued by :func:`add_entry`."""
+    try:
+        get_diary_store().flush()
+    except Exception:
+        logger.exception("Failed to update virtual diary")
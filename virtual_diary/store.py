@@ -0,0 +1,240 @@
+"""Append-only JSON Lines storage for the virtual diary.
+
+Each diary entry is one JSON object per line, so:
+
+- :meth:`DiaryStore.append` only queues the entry; a background thread
+  writes queued entries in a single append every
+  ``Config.FLUSH_INTERVAL_SECONDS`` (or as soon as
+  ``Config.FLUSH_BATCH_SIZE`` are waiting), instead of rewriting the file;
+- :meth:`DiaryStore.tail` reads blocks backwards from the end of the file
+  and decodes only the requested entries;
+- once the active file would exceed ``Config.MAX_BYTES`` it is rotated to
+  ``<name>.1`` (older files shift up to ``Config.BACKUP_COUNT``) and tail
+  reads continue into the rotated files when needed.
+
+A legacy ``virtual_diary.json`` list is copied into the log the first time a
+store is opened and then renamed to ``<name>.migrated``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+logger.propagate = False
+
+
+class Config:
+    MAX_BYTES = 5 * 1024 * 1024
+    BACKUP_COUNT = 3
+    FLUSH_INTERVAL_SECONDS = 0.5
+    FLUSH_BATCH_SIZE = 256
+    TAIL_BLOCK_BYTES = 64 * 1024
+
+
+def resolve_paths(path: str) -> Tuple[str, Optional[str]]:
+    """Return ``(log_path, legacy_path)`` for a configured diary path.
+
+    ``virtual_diary.json`` maps to ``virtual_diary.jsonl`` with the ``.json``
+    file as its legacy source.  Any other path is used as the log itself and
+    is migrated in place if it still holds a JSON list.
+    """
+    if path.endswith(".jsonl"):
+        return path, path[:-1]
+    if path.endswith(".json"):
+        return path + "l", path
+    return path, None
+
+
+def _encode(entry: Dict[str, Any]) -> bytes:
+    return (json.dumps(entry, default=str) + "\n").encode("utf-8")
+
+
+def _reverse_lines(path: str, block_size: int) -> Iterator[bytes]:
+    """Yield the lines of ``path`` from last to first without reading it all."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        position = f.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            step = min(block_size, position)
+            position -= step
+            f.seek(position)
+            lines = (f.read(step) + remainder).split(b"\n")
+            # The first piece may be the tail of a line that starts earlier
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if remainder.strip():
+            yield remainder
+
+
+class DiaryStore:
+    """Buffered, rotating JSON Lines diary bound to one file."""
+
+    def __init__(self, path: str) -> None:
+        self.path, self.legacy_path = resolve_paths(path)
+        self._lock = threading.RLock()
+        self._wake = threading.Condition(self._lock)
+        self._pending: List[bytes] = []
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        self._migrate()
+
+    # ------------------------------------------------------------------
+    # Migration
+    def _read_legacy(self, path: str) -> Optional[List[Any]]:
+        try:
+            with open(path, "r") as f:
+                head = f.read(1)
+                while head and head.isspace():
+                    head = f.read(1)
+                if head != "[":
+                    return None
+                f.seek(0)
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.exception("Failed to read legacy virtual diary %s", path)
+            return None
+        return data if isinstance(data, list) else None
+
+    def _migrate(self) -> None:
+        """Copy a legacy JSON list into the log once."""
+        source = self.legacy_path or self.path
+        if source == self.path or not os.path.exists(self.path):
+            entries = self._read_legacy(source)
+        else:
+            entries = None
+        if entries is None:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(b"".join(_encode(e) for e in entries))
+        os.replace(tmp, self.path)
+        if source != self.path:
+            os.replace(source, f"{source}.migrated")
+        logger.info("Migrated %d virtual diary entries to %s", len(entries), self.path)
+
+    # ------------------------------------------------------------------
+    # Writing
+    def append(self, entry: Dict[str, Any]) -> None:
+        """Queue ``entry`` for the background flusher."""
+        line = _encode(entry)
+        with self._lock:
+            self._pending.append(line)
+            if self._closed:
+                self.flush()
+                return
+            if self._flusher is None or not self._flusher.is_alive():
+                self._flusher = threading.Thread(
+                    target=self._run, name="virtual-diary-flusher", daemon=True
+                )
+                self._flusher.start()
+            if len(self._pending) >= Config.FLUSH_BATCH_SIZE:
+                self._wake.notify()
+
+    def _run(self) -> None:
+        with self._lock:
+            while not self._closed:
+                self._wake.wait(Config.FLUSH_INTERVAL_SECONDS)
+                try:
+                    self.flush()
+                except Exception:
+                    logger.exception("Failed to update virtual diary")
+
+    def flush(self) -> None:
+        """Write every queued entry to disk."""
+        with self._lock:
+            if not self._pending:
+                return
+            data = b"".join(self._pending)
+            try:
+                size = os.path.getsize(self.path)
+            except FileNotFoundError:
+                size = 0
+            if size and size + len(data) > Config.MAX_BYTES:
+                self._rotate()
+            with open(self.path, "ab") as f:
+                f.write(data)
+            self._pending.clear()
+
+    def _rotate(self) -> None:
+        if Config.BACKUP_COUNT <= 0:
+            os.remove(self.path)
+            return
+        for index in range(Config.BACKUP_COUNT - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+            self.flush()
+
+    # ------------------------------------------------------------------
+    # Reading
+    def tail(self, limit: int) -> List[Dict[str, Any]]:
+        """Return up to ``limit`` most recent entries, oldest first."""
+        if limit <= 0:
+            return []
+        with self._lock:
+            self.flush()
+            files = [self.path] + [
+                f"{self.path}.{index}" for index in range(1, Config.BACKUP_COUNT + 1)
+            ]
+            entries: List[Dict[str, Any]] = []
+            for path in files:
+                for line in _reverse_lines(path, Config.TAIL_BLOCK_BYTES):
+                    try:
+                        entries.append(json.loads(line))
+                    except ValueError:
+                        logger.warning("Skipping malformed diary line in %s", path)
+                        continue
+                    if len(entries) >= limit:
+                        break
+                if len(entries) >= limit or not os.path.exists(path):
+                    break
+        entries.reverse()
+        return entries
+
+
+_STORES: Dict[str, DiaryStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_diary_store(path: Optional[str] = None) -> DiaryStore:
+    """Return the process-wide :class:`DiaryStore` for ``path``.
+
+    ``path`` defaults to ``$VIRTUAL_DIARY_FILE`` or ``virtual_diary.json``.
+    """
+    path = path or os.environ.get("VIRTUAL_DIARY_FILE", "virtual_diary.json")
+    with _STORES_LOCK:
+        store = _STORES.get(path)
+        if store is None:
+            store = _STORES[path] = DiaryStore(path)
+        return store
+
+
+@atexit.register
+def _flush_all() -> None:
+    with _STORES_LOCK:
+        stores = list(_STORES.values())
+    for store in stores:
+        try:
+            store.close()
+        except Exception:
+            logger.exception("Failed to update virtual diary")